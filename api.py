@@ -14,7 +14,7 @@ import redis.asyncio as redis
 import uvicorn
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, Response
-from fastapi.responses import FileResponse
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
@@ -54,15 +54,16 @@ from src.persistence.postgres_knowledge_base import PostgresKnowledgeBase
 from src.orchestration.task_manager import TaskStatus
 from src.orchestration.research_orchestrator import ResearchOrchestrator
 from src.orchestration.parallel_task_coordinator import ParallelTaskCoordinator
+from src.orchestration.payload_store import create_payload_store
+from src.orchestration.worker_pools import POOL_NAMES, WorkerPoolManager
 from src.orchestration.rate_limiter import RateLimiter
-from src.orchestration.communication_bus import CommunicationBus
 from src.api.dok_taxonomy_endpoints import router as dok_router
 from src.api.project_data_endpoints import router as project_data_router
 from src.agents.research.dok_workflow_orchestrator import DOKWorkflowOrchestrator
 from src.models.research_types import ResearchType, DataAggregationConfig
-from src.llm import LLMClient
 from src.export.csv_exporter import CSVExporter
 from src.export.project_csv_exporter import ProjectCSVExporter
+from src.runtime import get_runtime
 
 # Load environment variables
 load_dotenv(override=True)
@@ -129,6 +130,11 @@ class ProjectUpdate(BaseModel):
     description: Optional[str] = None
 
 
+class WorkerPoolResize(BaseModel):
+    """Model for resizing a worker pool."""
+    size: int  # Workers per worker instance
+
+
 class Project(BaseModel):
     """Model for a project."""
     id: str
@@ -181,24 +187,21 @@ async def startup_event():
     """Initialize connections and systems on startup."""
     global redis_client, global_kb, global_research_orchestrator, global_task_coordinator, global_csv_exporter
     
-    # Get configuration from environment variables
-    redis_url = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
-    storage_path = os.environ.get("STORAGE_PATH", "data/storage")
+    # One pool per resource, shared by the endpoints, orchestrators and task coordinator
+    runtime = get_runtime()
     
     # Initialize PostgreSQL Knowledge Base
-    global_kb = PostgresKnowledgeBase(storage_path=storage_path)
     try:
-        await global_kb.connect()
+        global_kb = await runtime.connect_knowledge_base()
         print(f"Connected to PostgreSQL Knowledge Base: {global_kb.host}:{global_kb.port}/{global_kb.database}")
     except Exception as e:
         print(f"Failed to connect to PostgreSQL: {e}")
         raise
     
     # Initialize Redis connection
-    redis_client = redis.Redis.from_url(redis_url)
     try:
-        await redis_client.ping()
-        print(f"Connected to Redis at {redis_url}")
+        redis_client = await runtime.redis()
+        print(f"Connected to Redis at {runtime.redis_url}")
     except Exception as e:
         print(f"Failed to connect to Redis: {e}")
         raise
@@ -211,10 +214,7 @@ async def startup_event():
     
     # Initialize Research Orchestrator
     try:
-        communication_bus = CommunicationBus(redis_url=redis_url)
-        await communication_bus.connect()
-        
-        llm_client = LLMClient(config_path=os.getenv("LLM_CONFIG", "config/llm_config.json"))
+        llm_client = runtime.llm_client
         
         # Initialize Enhanced Research Orchestrator components
         llm_config = {
@@ -231,8 +231,10 @@ async def startup_event():
         global_task_coordinator = ParallelTaskCoordinator(
             redis_client=redis_client,
             rate_limiter=rate_limiter,
-            worker_pool_size=10
+            worker_pool_size=10,
+            payload_store=create_payload_store(global_kb)
         )
+        global_task_coordinator.llm_client = llm_client
         
         # Initialize DOK workflow orchestrator
         from src.database.dok_taxonomy_repository import DOKTaxonomyRepository
@@ -254,7 +256,7 @@ async def startup_event():
         
         # Initialize project CSV exporter with project data repository
         from src.database.project_data_repository import ProjectDataRepository
-        project_data_repository = ProjectDataRepository()
+        project_data_repository = ProjectDataRepository(global_kb)
         global global_project_csv_exporter
         global_project_csv_exporter = ProjectCSVExporter(project_data_repository=project_data_repository)
         
@@ -270,22 +272,24 @@ async def startup_event():
     except Exception as e:
         print(f"Failed to initialize Research Orchestrators: {e}")
         # Don't raise - API can still function without orchestrator
+    
+    runtime.log_startup("API")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up connections on shutdown."""
-    global redis_client, global_kb
+    global redis_client, global_kb, global_task_coordinator
     
-    # Clean up PostgreSQL connection pool
-    if global_kb:
-        await global_kb.disconnect()
-        print("Disconnected from PostgreSQL Knowledge Base")
+    # Let in-flight tasks finish before the connections close
+    if global_task_coordinator:
+        await global_task_coordinator.drain()
     
-    # Clean up Redis connection
-    if redis_client:
-        await redis_client.close()
-        print("Disconnected from Redis")
+    # Clean up the PostgreSQL pool and Redis connection
+    await get_runtime().close()
+    global_kb = None
+    redis_client = None
+    print("Disconnected from PostgreSQL Knowledge Base and Redis")
 
 
 @app.get("/")
@@ -522,10 +526,59 @@ async def delete_task(task_id: str):
             )
 
 
+@app.post("/tasks/{task_id}/resume")
+async def resume_task(task_id: str):
+    """Resume an interrupted data aggregation task from its last checkpoint."""
+    global global_research_orchestrator
+    if not global_research_orchestrator:
+        raise HTTPException(status_code=500, detail="Research orchestrator not initialized")
+
+    async with get_kb() as kb:
+        task = await kb.get_research_task(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if task.get("research_type") != ResearchType.DATA_AGGREGATION.value:
+        raise HTTPException(status_code=400, detail="Only data aggregation tasks can be resumed")
+    if task.get("status") == "completed":
+        raise HTTPException(status_code=409, detail="Task already completed")
+
+    config = task.get("aggregation_config")
+    if isinstance(config, str):
+        config = json.loads(config)
+    if not config:
+        raise HTTPException(status_code=400, detail="Task has no data aggregation configuration")
+
+    # Taking the lease here makes concurrent resumes of the same task fail fast
+    data_aggregation_orchestrator = global_research_orchestrator.data_aggregation_orchestrator
+    lease_token = await data_aggregation_orchestrator.acquire_lease(task_id)
+    if lease_token is None:
+        raise HTTPException(status_code=409, detail="Task is still running")
+
+    try:
+        checkpoints = await data_aggregation_orchestrator.data_aggregation_repository.get_checkpoints(task_id)
+    except Exception:
+        await data_aggregation_orchestrator.release_lease(task_id, lease_token)
+        raise
+
+    # Steps with a checkpoint are skipped by the workflow
+    asyncio.create_task(
+        global_research_orchestrator.execute_data_aggregation(
+            task_id=task_id, config=config, lease_token=lease_token
+        )
+    )
+
+    return {
+        "task_id": task_id,
+        "status": "processing",
+        "checkpointed_steps": len(checkpoints),
+        "message": "Data aggregation task resumed" if checkpoints else "Data aggregation task restarted without checkpoints"
+    }
+
+
 @app.get("/health")
 async def health_check():
     """Simple health check."""
-    global redis_client, global_kb
+    global redis_client, global_kb, global_task_coordinator
 
     status = {"status": "healthy", "redis": "disconnected", "postgresql": "disconnected"}
 
@@ -552,6 +605,15 @@ async def health_check():
         status["postgresql"] = "unhealthy"
         status["status"] = "unhealthy"
 
+    # Draining instances finish in-flight tasks and must not receive new work
+    if global_task_coordinator:
+        if global_task_coordinator.draining and status["status"] == "healthy":
+            status["status"] = "draining"
+        try:
+            status["draining_workers"] = await global_task_coordinator.worker_pools.draining_instances()
+        except Exception:
+            status["draining_workers"] = []
+
     return status
     # Check Redis connection
     if redis_client:
@@ -674,30 +736,96 @@ async def get_research_report(task_id: str):
 
 
 @app.get("/tasks/{task_id}/export/csv")
-async def export_aggregation_csv(task_id: str):
-    """Export data aggregation results as CSV."""
-    import os
-    
-    # Check if CSV file already exists from orchestrator
-    csv_path = f"exports/{task_id}_aggregation.csv"
-    
-    if os.path.exists(csv_path) and os.path.getsize(csv_path) > 0:
-        # Serve existing CSV file
-        return FileResponse(csv_path, filename=f"{task_id}_data.csv")
-    
-    # If no existing file, try to generate it
+async def export_aggregation_csv(task_id: str, gzip: bool = False):
+    """Export data aggregation results as CSV, streamed from the database; gzip=true compresses it."""
     global global_csv_exporter
     if not global_csv_exporter:
-        raise HTTPException(status_code=404, detail="CSV file not found and exporter not available")
+        raise HTTPException(status_code=503, detail="CSV exporter not available")
     
+    chunks = global_csv_exporter.stream(task_id, compress=gzip)
     try:
-        # Generate CSV export
-        csv_path = await global_csv_exporter.export(task_id)
-        
-        # Return CSV file
-        return FileResponse(csv_path, filename=f"{task_id}_data.csv")
+        # Read the header before responding, so a failing query still returns an error status
+        header = await chunks.__anext__()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to export CSV: {str(e)}")
+    
+    async def body():
+        yield header
+        async for chunk in chunks:
+            yield chunk
+    
+    filename = f"{task_id}_data.csv.gz" if gzip else f"{task_id}_data.csv"
+    return StreamingResponse(
+        body(),
+        media_type="application/gzip" if gzip else "text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+# Task Queue Administration Endpoints
+
+@app.get("/queue/dead-letter")
+async def list_dead_letter_tasks(limit: int = 100):
+    """List tasks that exhausted their retries, most recent failure first."""
+    global global_task_coordinator
+    if not global_task_coordinator:
+        raise HTTPException(status_code=500, detail="Task coordinator not initialized")
+
+    entries = await global_task_coordinator.list_dead_letters(limit=limit)
+    return {"count": len(entries), "tasks": entries}
+
+
+@app.post("/queue/dead-letter/{task_id}/requeue")
+async def requeue_dead_letter_task(task_id: str):
+    """Re-queue a dead-lettered task with a fresh retry budget."""
+    global global_task_coordinator
+    if not global_task_coordinator:
+        raise HTTPException(status_code=500, detail="Task coordinator not initialized")
+
+    task = await global_task_coordinator.requeue_dead_letter(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found in dead-letter queue")
+
+    return {"message": "Task re-queued", "task_id": task.id, "priority": task.priority}
+
+
+@app.get("/queue/pools")
+async def get_worker_pools():
+    """Get size, utilization and queue depth of each worker pool across all instances."""
+    global global_task_coordinator
+    if not global_task_coordinator:
+        raise HTTPException(status_code=500, detail="Task coordinator not initialized")
+
+    stats = await global_task_coordinator.worker_pools.cluster_stats()
+    queued = await global_task_coordinator.task_queue.pool_depths()
+    task_types = WorkerPoolManager.describe_pools()
+    for pool, pool_stats in stats["pools"].items():
+        pool_stats["queued"] = queued.get(pool, 0)
+        pool_stats["task_types"] = task_types.get(pool)
+    if global_task_coordinator.autoscaler is not None:
+        stats["autoscale"] = await global_task_coordinator.autoscaler.recommendation()
+    stats["queue_backend"] = global_task_coordinator.task_queue.backend
+    consumer_lag = await global_task_coordinator.task_queue.consumer_lag()
+    if consumer_lag:
+        stats["consumer_lag"] = consumer_lag
+    return stats
+
+
+@app.put("/queue/pools/{pool_name}")
+async def resize_worker_pool(pool_name: str, resize: WorkerPoolResize):
+    """Set the number of workers of a pool on every worker instance."""
+    global global_task_coordinator
+    if not global_task_coordinator:
+        raise HTTPException(status_code=500, detail="Task coordinator not initialized")
+    if pool_name not in POOL_NAMES:
+        raise HTTPException(status_code=404, detail=f"Unknown worker pool: {pool_name}")
+
+    try:
+        await global_task_coordinator.set_pool_size(pool_name, resize.size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"message": "Worker pool resized", "pool": pool_name, "size": resize.size}
 
 
 # Project Management Endpoints
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark task and monitoring event serialization.
+
+Compares the previous path (pydantic JSON-mode dump, stdlib json and
+keyword construction of the model) with each available codec as the
+coordinator uses it. Run from the repository root:
+
+    python scripts/benchmark_codec.py --iterations 20000
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add the repository root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.monitoring.models import MonitoringEvent, MonitoringEventType
+from src.orchestration.task_types import Task, TaskType
+from src.utils.codec import CODECS, get_codec
+
+
+def sample_task() -> Task:
+    """Build an extraction task shaped like the ones data aggregation queues."""
+    return Task(
+        type=TaskType.DATA_AGGREGATION_EXTRACT,
+        priority=1,
+        parent_task_id="research-123",
+        payload={
+            "project_id": "project-1",
+            "search_task_id": "search-456",
+            "entity_type": "company",
+            "attributes": ["name", "website", "headquarters", "founded", "employees"],
+            "sources": [
+                {"url": f"https://example.com/{i}", "title": f"Result {i}", "content": "lorem ipsum " * 40}
+                for i in range(5)
+            ],
+        },
+        depends_on=["search-456"],
+    )
+
+
+def sample_event() -> MonitoringEvent:
+    """Build a task completion event."""
+    return MonitoringEvent(
+        event_type=MonitoringEventType.TASK_COMPLETED.value,
+        project_id="project-1",
+        parent_task_id="research-123",
+        task_id="extract-789",
+        task_type="data_aggregation_extract",
+        worker_id=3,
+        status="completed",
+        duration_ms=1840,
+        meta={"entities": 12, "sources": 5},
+    )
+
+
+def measure(label: str, iterations: int, func, baseline: float = 0.0) -> float:
+    """Run func repeatedly and print its throughput, relative to a baseline if given."""
+    func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    rate = iterations / (time.perf_counter() - start)
+    speedup = f"{rate / baseline:5.1f}x" if baseline else "baseline"
+    print(f"  {label:<30} {rate:>10,.0f} ops/sec  {speedup}")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark task and event serialization")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    task = sample_task()
+    event = sample_event()
+    # Codecs that fell back to another one are not worth measuring twice
+    codecs = [codec for codec in map(get_codec, CODECS) if codec.name != "json"]
+
+    print(f"Task round trip ({args.iterations} iterations)")
+    baseline = measure(
+        "json + Task(**data)", args.iterations,
+        lambda: Task(**json.loads(json.dumps(task.model_dump(mode="json"))))
+    )
+    for codec in codecs:
+        measure(
+            f"{codec.name} + model_validate", args.iterations,
+            lambda codec=codec: Task.model_validate(codec.loads(codec.dumps(task.model_dump()))),
+            baseline
+        )
+
+    print(f"Event serialization ({args.iterations} iterations)")
+    baseline = measure("json", args.iterations, lambda: json.dumps(event.model_dump()))
+    for codec in codecs:
+        measure(codec.name, args.iterations, lambda codec=codec: codec.dumps(event.model_dump()), baseline)
+
+
+if __name__ == "__main__":
+    main()
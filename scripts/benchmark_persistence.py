@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark data aggregation writes against PostgreSQL.
+
+Compares storing sources and aggregation results one row at a time with the
+bulk writers of DataAggregationRepository, and prints rows/sec for each. It
+creates a throwaway research task and removes everything it wrote. Run from
+the repository root with the POSTGRES_* settings of a development database:
+
+    python scripts/benchmark_persistence.py --rows 5000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add the repository root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.database.data_aggregation_repository import DataAggregationRepository
+from src.persistence.postgres_knowledge_base import PostgresKnowledgeBase
+
+
+def sample_sources(run_id: str, variant: str, rows: int):
+    """Build search result sources shaped like the ones search tasks store."""
+    return [
+        {
+            "source_id": f"bench_{run_id}_{variant}_{i}",
+            "url": f"https://example.com/{variant}/{i}",
+            "title": f"Result {i}",
+            "description": "lorem ipsum " * 40,
+            "source_type": "web_search",
+            "provider": "benchmark",
+            "metadata": {"task_id": run_id, "search_query": "private schools", "content": "lorem ipsum " * 200},
+        }
+        for i in range(rows)
+    ]
+
+
+def sample_results(variant: str, rows: int):
+    """Build resolved entities shaped like the ones aggregation stores."""
+    return [
+        {
+            "entity_type": f"School {i}",
+            "entity_data": {"name": f"School {i}", "attributes": {"city": "Oakland", "enrollment": str(i)}},
+            "unique_identifier": f"{variant}-{i}",
+            "search_context": {"query": "private schools in Oakland"},
+        }
+        for i in range(rows)
+    ]
+
+
+def report(label: str, rows: int, elapsed: float, baseline: float = 0.0) -> float:
+    """Print throughput, relative to a baseline if given."""
+    rate = rows / elapsed
+    speedup = f"{rate / baseline:5.1f}x" if baseline else "baseline"
+    print(f"  {label:<30} {rate:>10,.0f} rows/sec  {speedup}")
+    return rate
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark data aggregation writes")
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    kb = PostgresKnowledgeBase()
+    await kb.connect()
+    repository = DataAggregationRepository(kb)
+    run_id = str(uuid.uuid4())
+    await kb.create_task(task_id=run_id, title="Persistence benchmark", description="Persistence benchmark")
+
+    try:
+        print(f"Sources ({args.rows} rows)")
+        start = time.perf_counter()
+        for source in sample_sources(run_id, "row", args.rows):
+            await repository.store_source(source)
+        baseline = report("store_source per row", args.rows, time.perf_counter() - start)
+        start = time.perf_counter()
+        await repository.store_sources(sample_sources(run_id, "bulk", args.rows))
+        report("store_sources", args.rows, time.perf_counter() - start, baseline)
+
+        print(f"Aggregation results ({args.rows} rows)")
+        start = time.perf_counter()
+        for result in sample_results("row", args.rows):
+            await repository.store_data_aggregation_result(task_id=run_id, **result)
+        baseline = report("store_..._result per row", args.rows, time.perf_counter() - start)
+        start = time.perf_counter()
+        await repository.store_data_aggregation_results(run_id, sample_results("bulk", args.rows))
+        report("store_..._results", args.rows, time.perf_counter() - start, baseline)
+        start = time.perf_counter()
+        await repository.store_data_aggregation_results(run_id, sample_results("bulk", args.rows))
+        report("store_..._results (updates)", args.rows, time.perf_counter() - start, baseline)
+    finally:
+        async with kb.pool.acquire() as conn:
+            await conn.execute("DELETE FROM data_aggregation_results WHERE task_id = $1", run_id)
+            await conn.execute("DELETE FROM sources WHERE source_id LIKE $1", f"bench_{run_id}_%")
+        await kb.delete_research_task(run_id)
+        await kb.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,17 @@
+-- Migration to add content-addressed storage for large task payloads and results
+-- Redis task messages keep only a reference to the blob
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS task_blobs (
+    digest CHAR(64) PRIMARY KEY,  -- SHA-256 of the data
+    data BYTEA NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    last_used_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Expired blobs are purged by last use
+CREATE INDEX IF NOT EXISTS idx_task_blobs_last_used ON task_blobs (last_used_at);
+
+COMMIT;
@@ -0,0 +1,14 @@
+-- Migration to add checkpoints of data aggregation runs
+-- A resumed run skips the steps that have a checkpoint
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS data_aggregation_checkpoints (
+    task_id VARCHAR(255) NOT NULL REFERENCES research_tasks(task_id) ON DELETE CASCADE,
+    step VARCHAR(100) NOT NULL,  -- enumeration, subspace:<index>, enrichment, resolution
+    state JSONB NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (task_id, step)
+);
+
+COMMIT;
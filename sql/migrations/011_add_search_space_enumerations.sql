@@ -0,0 +1,17 @@
+-- Migration to cache search space enumerations across data aggregation tasks
+-- Keyed by normalized search space, entity type and granularity
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS search_space_enumerations (
+    cache_key TEXT PRIMARY KEY,  -- <search space>|<entity type>|<granularity or "next">
+    search_space TEXT NOT NULL,
+    entity_type TEXT NOT NULL,
+    granularity VARCHAR(100),
+    subspaces JSONB NOT NULL,
+    source VARCHAR(50) NOT NULL DEFAULT 'llm',  -- llm or gazetteer
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+COMMIT;
@@ -0,0 +1,93 @@
+"""Split long documents into overlapping chunks for entity extraction."""
+
+import os
+import re
+from typing import List, Optional
+
+
+class ContentChunker:
+    """Split documents that exceed a token budget on structural boundaries.
+
+    A document is cut at the coarsest boundary that yields small enough
+    pieces: markdown headings, then blank lines, lines, sentences and finally
+    words. Pieces are joined back into chunks of at most max_tokens, and each
+    chunk after the first starts with the tail of the previous one, so an
+    entity described across a boundary is seen whole by at least one chunk.
+    """
+
+    # Rough token estimate for English text; avoids a tokenizer dependency
+    CHARS_PER_TOKEN = 4
+
+    # Boundaries to cut at, coarsest first; each piece keeps its trailing separator
+    BOUNDARIES = (
+        re.compile(r"\n(?=#{1,6}\s)"),
+        re.compile(r"\n\s*\n"),
+        re.compile(r"\n"),
+        re.compile(r"(?<=[.!?])\s+"),
+        re.compile(r"\s+"),
+    )
+
+    def __init__(self, max_tokens: Optional[int] = None, overlap_tokens: Optional[int] = None):
+        """Initialize the chunker."""
+        max_tokens = max_tokens or int(os.getenv("EXTRACTION_CHUNK_TOKENS", "3000"))
+        if overlap_tokens is None:
+            overlap_tokens = int(os.getenv("EXTRACTION_CHUNK_OVERLAP_TOKENS", "150"))
+        self.max_chars = max(1, max_tokens) * self.CHARS_PER_TOKEN
+        self.overlap_chars = min(max(0, overlap_tokens) * self.CHARS_PER_TOKEN, self.max_chars // 2)
+
+    @classmethod
+    def estimate_tokens(cls, text: str) -> int:
+        """Estimate the number of tokens in a text."""
+        return (len(text) + cls.CHARS_PER_TOKEN - 1) // cls.CHARS_PER_TOKEN
+
+    def split(self, content: str) -> List[str]:
+        """
+        Split a document into chunks that fit the token budget.
+
+        Args:
+            content: The document to split
+
+        Returns:
+            The chunks, in document order; a document within the budget is
+            returned as its only chunk
+        """
+        if len(content) <= self.max_chars:
+            return [content]
+
+        # Leave room in every chunk for the overlap carried over from the previous one
+        budget = self.max_chars - self.overlap_chars
+        chunks: List[str] = []
+        current = ""
+        for piece in self._pieces(content, budget, 0):
+            if current and len(current) + len(piece) > budget + (self.overlap_chars if chunks else 0):
+                chunks.append(current)
+                current = self._overlap(current)
+            current += piece
+        if current.strip():
+            chunks.append(current)
+        return chunks
+
+    def _pieces(self, text: str, budget: int, level: int) -> List[str]:
+        """Cut text at the coarsest boundary into pieces of at most budget characters."""
+        if len(text) <= budget:
+            return [text]
+        if level == len(self.BOUNDARIES):
+            return [text[start:start + budget] for start in range(0, len(text), budget)]
+
+        pieces = []
+        start = 0
+        for match in self.BOUNDARIES[level].finditer(text):
+            if match.end() > start:
+                pieces.extend(self._pieces(text[start:match.end()], budget, level + 1))
+                start = match.end()
+        if start < len(text):
+            pieces.extend(self._pieces(text[start:], budget, level + 1))
+        return pieces
+
+    def _overlap(self, chunk: str) -> str:
+        """Get the tail of a chunk to repeat at the start of the next one, starting at a word."""
+        if not self.overlap_chars:
+            return ""
+        tail = chunk[-self.overlap_chars:]
+        boundary = re.search(r"\s", tail)
+        return tail[boundary.end():] if boundary and boundary.end() < len(tail) else tail
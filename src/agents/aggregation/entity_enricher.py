@@ -0,0 +1,177 @@
+"""Batched attribute enrichment for data aggregation entities."""
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
+
+from src.llm import LLMClient
+
+
+logger = logging.getLogger(__name__)
+
+
+# Attribute values that count as missing
+MISSING_VALUES = {"", "unknown", "n/a", "none", "null"}
+
+# Entity attributes that place an entity, in order of preference
+LOCALITY_ATTRIBUTES = ("city", "county", "location", "region", "state")
+
+
+@dataclass
+class EnrichmentBatch:
+    """Entities enriched together by one search and one extraction prompt."""
+    entity_indexes: List[int]
+    names: List[str]
+    attributes: List[str]  # Attributes missing from at least one entity of the batch
+    locality: Optional[str] = None
+
+    @property
+    def query(self) -> str:
+        """Get the combined search query for the batch."""
+        # Format: "Entity A" OR "Entity B" locality attribute1 attribute2
+        names = " OR ".join(f'"{name}"' for name in self.names)
+        return " ".join(part for part in (names, self.locality, " ".join(self.attributes)) if part)
+
+
+class EntityEnricher:
+    """Fill in missing entity attributes for many entities per search and per LLM call.
+
+    Entities are grouped by locality and each group is split into batches of
+    at most batch_size entities. A batch is enriched by one combined search and
+    one extraction prompt returning the attributes of every entity in it, where
+    per-entity enrichment costs one search and one LLM call for each entity.
+    Entities whose target attributes are already filled are not enriched.
+    """
+
+    # Characters of each search result included in an extraction prompt
+    MAX_RESULT_CHARS = 3000
+
+    def __init__(self, llm_client: LLMClient, batch_size: Optional[int] = None):
+        """Initialize the entity enricher."""
+        self.llm_client = llm_client
+        self.batch_size = max(1, batch_size or int(os.getenv("ENRICHMENT_BATCH_SIZE", "10")))
+
+    @staticmethod
+    def missing_attributes(entity: Dict[str, Any], attributes: List[str]) -> List[str]:
+        """Get the target attributes an entity has no value for."""
+        values = entity.get("attributes") or {}
+        return [
+            attribute for attribute in attributes
+            if str(values.get(attribute) or "").strip().lower() in MISSING_VALUES
+        ]
+
+    @staticmethod
+    def locality(entity: Dict[str, Any]) -> Optional[str]:
+        """Get the place an entity is in, if one of its attributes names it."""
+        values = entity.get("attributes") or {}
+        for attribute in LOCALITY_ATTRIBUTES:
+            value = str(values.get(attribute) or "").strip()
+            if value and value.lower() not in MISSING_VALUES:
+                return value
+        return None
+
+    def plan(self, entities: List[Tuple[int, Dict[str, Any]]], attributes: List[str]) -> List[EnrichmentBatch]:
+        """
+        Group entities that miss attributes into enrichment batches.
+
+        Args:
+            entities: (index, entity) pairs; batches refer to entities by index
+            attributes: Target attributes
+
+        Returns:
+            Batches of entities sharing a locality, in order of first entity
+        """
+        by_locality: Dict[Optional[str], List[Tuple[int, Dict[str, Any], List[str]]]] = {}
+        for index, entity in entities:
+            missing = self.missing_attributes(entity, attributes)
+            if missing:
+                by_locality.setdefault(self.locality(entity), []).append((index, entity, missing))
+
+        batches = []
+        for locality, members in by_locality.items():
+            for start in range(0, len(members), self.batch_size):
+                chunk = members[start:start + self.batch_size]
+                missing = {attribute for _, _, member_missing in chunk for attribute in member_missing}
+                batches.append(EnrichmentBatch(
+                    entity_indexes=[index for index, _, _ in chunk],
+                    names=[entity.get("name", "Unknown Entity") for _, entity, _ in chunk],
+                    attributes=[attribute for attribute in attributes if attribute in missing],
+                    locality=locality
+                ))
+        return sorted(batches, key=lambda batch: batch.entity_indexes[0])
+
+    def max_results(self, batch_size: int) -> int:
+        """Get the number of search results to request for a batch."""
+        return min(20, 3 * batch_size + 2)
+
+    async def extract(self,
+                      entities: List[Dict[str, Any]],
+                      attributes: List[str],
+                      search_results: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """
+        Extract attributes for several entities from shared search results in one LLM call.
+
+        Args:
+            entities: The entities to extract attributes for
+            attributes: The attributes to extract
+            search_results: Search result documents covering the entities
+
+        Returns:
+            One dictionary of attribute values per entity, in input order;
+            attributes that were not found are "Unknown"
+        """
+        unknown = [{attribute: "Unknown" for attribute in attributes} for _ in entities]
+
+        combined_text = "\n\n".join([
+            f"Source: {result.get('title', 'Unknown')}\n{result.get('content', '')[:self.MAX_RESULT_CHARS]}"
+            for result in search_results[:len(entities) + 2]
+            if result.get('content')
+        ])
+        if not combined_text.strip():
+            return unknown
+
+        names = "\n".join(f"{i + 1}. {entity.get('name', 'Unknown')}" for i, entity in enumerate(entities))
+        prompt = f"""Extract the following attributes for each of these entities from the provided search results.
+
+Target attributes: {', '.join(attributes)}
+
+Entities:
+{names}
+
+Search results:
+{combined_text}
+
+For each attribute, provide the most accurate value found in the search results. If an attribute is not found, use "Unknown".
+
+Return a JSON object keyed by entity number, including every entity:
+{{
+  "1": {{
+{', '.join([f'    "{attr}": "value or Unknown"' for attr in attributes])}
+  }}
+}}"""
+
+        try:
+            response = await self.llm_client.generate(prompt, use_reasoning_model=False)
+
+            # Clean the response - remove any markdown formatting
+            cleaned_response = response.strip()
+            if cleaned_response.startswith('```json'):
+                cleaned_response = cleaned_response[7:]
+            if cleaned_response.endswith('```'):
+                cleaned_response = cleaned_response[:-3]
+
+            by_entity = json.loads(cleaned_response.strip())
+            if not isinstance(by_entity, dict):
+                raise ValueError("Enrichment response is not a JSON object")
+        except Exception as e:
+            logger.warning(f"Failed to extract attributes for {len(entities)} entities: {e}")
+            return unknown
+
+        results = []
+        for i in range(len(entities)):
+            values = by_entity.get(str(i + 1))
+            values = values if isinstance(values, dict) else {}
+            results.append({attribute: values.get(attribute) or "Unknown" for attribute in attributes})
+        return results
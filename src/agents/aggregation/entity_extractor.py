@@ -1,10 +1,14 @@
 """Entity extractor for data aggregation tasks."""
 
+import asyncio
+import json
 import logging
-from typing import List, Dict, Any, Optional
+from typing import Awaitable, Callable, List, Dict, Any, Optional
 
 from src.llm import LLMClient
 from src.domain_processors.registry import get_global_registry
+from src.agents.aggregation.content_chunker import ContentChunker
+from src.agents.aggregation.entity_resolver import IncrementalEntityResolver
 
 
 logger = logging.getLogger(__name__)
@@ -17,6 +21,7 @@ class EntityExtractor:
         """Initialize the entity extractor."""
         self.llm_client = llm_client
         self.domain_registry = get_global_registry()
+        self.chunker = ContentChunker()
         
     async def extract(self, 
                      content: str, 
@@ -26,6 +31,9 @@ class EntityExtractor:
         """
         Extract entities with requested attributes from content.
         
+        Content over the chunker's token budget is split into overlapping
+        chunks that are extracted in parallel and merged.
+        
         Args:
             content: The content to extract entities from
             entity_type: The type of entities to extract
@@ -37,6 +45,13 @@ class EntityExtractor:
         """
         logger.info(f"Extracting {entity_type} entities with attributes: {attributes}")
         
+        chunks = self.chunker.split(content)
+        if len(chunks) > 1:
+            logger.info(f"Extracting {entity_type} entities from {len(chunks)} chunks of a {len(content)} character document")
+            return self.merge_entities(await asyncio.gather(*[
+                self.extract(chunk, entity_type, attributes, domain_hint) for chunk in chunks
+            ]))
+        
         # Check for domain-specific processor
         processor = None
         if domain_hint:
@@ -56,6 +71,151 @@ class EntityExtractor:
             entities = await self._general_extraction(content, entity_type, attributes)
         
         # Add unique identifiers to entities if a domain processor is available
+        self._add_unique_identifiers(entities, domain_hint)
+        
+        return entities
+    
+    @staticmethod
+    def merge_entities(entity_lists: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Merge the entities extracted from the chunks of one document.
+        
+        Entities repeated by overlapping chunks are merged by normalized name;
+        entities without a name are kept as they are.
+        """
+        resolver = IncrementalEntityResolver()
+        unnamed = []
+        for entities in entity_lists:
+            resolver.add(entities)
+            unnamed.extend(entity for entity in entities if not resolver.key(entity))
+        return resolver.resolved() + unnamed
+    
+    def supports_packing(self, domain_hint: Optional[str] = None) -> bool:
+        """Check whether several documents can be extracted in one prompt.
+        
+        Domain processors use their own single-document prompts, so packing
+        only applies to general-purpose extraction.
+        """
+        return not (domain_hint and self.domain_registry.get_processor_by_hint(domain_hint))
+    
+    @staticmethod
+    def pack_documents(contents: List[str], max_chars: int) -> List[List[int]]:
+        """
+        Greedily group documents into packs that fit a character budget.
+        
+        Args:
+            contents: Document contents to pack
+            max_chars: Maximum combined length of a pack
+            
+        Returns:
+            Lists of document indexes, one list per pack. Documents longer than
+            the budget get a pack of their own.
+        """
+        packs: List[List[int]] = []
+        current: List[int] = []
+        current_size = 0
+        
+        for index, content in enumerate(contents):
+            size = len(content)
+            if current and current_size + size > max_chars:
+                packs.append(current)
+                current, current_size = [], 0
+            current.append(index)
+            current_size += size
+        
+        if current:
+            packs.append(current)
+        return packs
+    
+    async def extract_many(self,
+                           contents: List[str],
+                           entity_type: str,
+                           attributes: List[str],
+                           domain_hint: Optional[str] = None,
+                           acquire_llm: Optional[Callable[[], Awaitable[Any]]] = None) -> List[List[Dict[str, Any]]]:
+        """
+        Extract entities from several documents, packing them into one prompt when possible.
+        
+        Errors of the LLM call itself, such as rate limiting, are raised so the
+        caller's retry policy applies. Only a malformed packed answer falls back
+        to extracting the documents one by one.
+        
+        Args:
+            contents: The documents to extract entities from
+            entity_type: The type of entities to extract
+            attributes: List of attributes to extract for each entity
+            domain_hint: Optional domain hint for specialized processing
+            acquire_llm: Optional rate limiter acquisition awaited before each
+                extra LLM call of the one-by-one fallback
+            
+        Returns:
+            One list of extracted entities per document, in input order
+        """
+        if len(contents) == 1 or not self.supports_packing(domain_hint):
+            return list(await asyncio.gather(*[
+                self.extract(content, entity_type, attributes, domain_hint) for content in contents
+            ]))
+        
+        logger.info(f"Extracting {entity_type} entities from {len(contents)} packed documents")
+        
+        documents = "\n\n".join(
+            f"### Document {i + 1}\n{content}" for i, content in enumerate(contents)
+        )
+        prompt = f"""
+Extract all {entity_type} from each of the following documents.
+For each entity, extract these attributes: {', '.join(attributes)}
+
+Return a JSON object keyed by document number. Each value is a JSON array with structure:
+[
+  {{
+    "name": "Entity Name",
+    "attributes": {{
+      "attribute1": "value1",
+      "attribute2": "value2"
+    }},
+    "confidence": 0.95
+  }}
+]
+Include every document number, using an empty array for documents without entities.
+
+{documents}
+"""
+        
+        response = await self.llm_client.generate(prompt, use_reasoning_model=False)
+        
+        try:
+            # Clean the response - remove any markdown formatting
+            cleaned_response = response.strip()
+            if cleaned_response.startswith('```json'):
+                cleaned_response = cleaned_response[7:]
+            if cleaned_response.endswith('```'):
+                cleaned_response = cleaned_response[:-3]
+            cleaned_response = cleaned_response.strip()
+            
+            by_document = json.loads(cleaned_response)
+            if not isinstance(by_document, dict):
+                raise ValueError("Packed extraction response is not a JSON object")
+            
+        except (AttributeError, ValueError) as e:
+            # A malformed packed answer must not lose documents; extract them one by one
+            logger.warning(f"Packed extraction returned malformed JSON, extracting documents individually: {e}")
+            
+            async def extract_one(content: str) -> List[Dict[str, Any]]:
+                if acquire_llm is not None:
+                    await acquire_llm()
+                return await self._general_extraction(content, entity_type, attributes, raise_errors=True)
+            
+            return list(await asyncio.gather(*[extract_one(content) for content in contents]))
+        
+        results = []
+        for i in range(len(contents)):
+            entities = by_document.get(str(i + 1), [])
+            results.append(entities if isinstance(entities, list) else [])
+        
+        logger.info(f"Extracted {sum(len(r) for r in results)} entities from {len(contents)} packed documents")
+        return results
+    
+    def _add_unique_identifiers(self, entities: List[Dict[str, Any]], domain_hint: Optional[str]):
+        """Copy the domain's unique identifier attribute onto each entity."""
         if domain_hint and entities:
             processor = self.domain_registry.get_processor_by_hint(domain_hint)
             if processor:
@@ -65,13 +225,12 @@ class EntityExtractor:
                         if "attributes" in entity:
                             unique_identifier = entity["attributes"].get(unique_id_field)
                             entity["unique_identifier"] = unique_identifier
-        
-        return entities
             
     async def _general_extraction(self, 
                                  content: str, 
                                  entity_type: str,
-                                 attributes: List[str]) -> List[Dict[str, Any]]:
+                                 attributes: List[str],
+                                 raise_errors: bool = False) -> List[Dict[str, Any]]:
         """
         General-purpose entity extraction using LLM.
         
@@ -79,6 +238,7 @@ class EntityExtractor:
             content: The content to extract entities from
             entity_type: The type of entities to extract
             attributes: List of attributes to extract for each entity
+            raise_errors: Whether to raise errors instead of returning no entities
             
         Returns:
             List of extracted entities with their attributes
@@ -107,9 +267,6 @@ Content:
         try:
             response = await self.llm_client.generate(prompt, use_reasoning_model=False)
             
-            # Parse JSON response
-            import json
-            
             # Clean the response - remove any markdown formatting
             cleaned_response = response.strip()
             if cleaned_response.startswith('```json'):
@@ -124,4 +281,6 @@ Content:
             
         except Exception as e:
             logger.error(f"Error in general entity extraction: {str(e)}")
+            if raise_errors:
+                raise
             return []
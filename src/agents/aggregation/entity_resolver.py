@@ -1,11 +1,14 @@
 """Entity resolver for data aggregation tasks."""
 
 import logging
-from typing import List, Dict, Any, Optional
+import re
+from typing import List, Dict, Any, Optional, Tuple
 from collections import defaultdict
+from difflib import SequenceMatcher
 
 from src.llm import LLMClient
 from src.domain_processors.registry import get_global_registry
+from src.agents.aggregation.entity_enricher import EntityEnricher
 
 
 logger = logging.getLogger(__name__)
@@ -64,7 +67,7 @@ class EntityResolver:
             
     async def _general_resolution(self, entities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        General entity resolution using name-based matching.
+        General entity resolution using blocked name, identifier and locality matching.
         
         Args:
             entities: List of entity data to resolve
@@ -75,28 +78,17 @@ class EntityResolver:
         if not entities:
             return []
         
-        # Group entities by name for potential merging
-        by_name = defaultdict(list)
-        
-        for entity in entities:
-            name = entity.get("name", "").strip().lower()
-            if name:
-                by_name[name].append(entity)
-        
-        # Merge entities with the same name
-        resolved = []
-        for name, group in by_name.items():
-            if len(group) == 1:
-                resolved.append(group[0])
-            else:
-                # Merge multiple entities with the same name
-                merged = self._merge_by_name(group)
-                resolved.append(merged)
+        # Entities are only compared within shared blocking keys, and
+        # clusters joined by a later match are merged through union-find
+        resolver = IncrementalEntityResolver()
+        resolver.add(entities)
+        resolved = resolver.resolved()
         
         logger.info(f"Resolved to {len(resolved)} unique entities")
         return resolved
     
-    def _merge_by_name(self, entities: List[Dict[str, Any]]) -> Dict[str, Any]:
+    @staticmethod
+    def _merge_by_name(entities: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Merge multiple entities with the same name.
         
@@ -165,3 +157,206 @@ class EntityResolver:
         """
         # For now, we'll just merge by name
         return self._merge_by_name(cluster)
+
+
+class IncrementalEntityResolver:
+    """Resolve entities as extraction results arrive, without comparing every pair.
+    
+    Each entity is indexed under blocking keys: its normalized name, its sorted
+    name tokens, its unique identifier, and its locality with the start of its
+    name. Only entities sharing a key are compared, so fuzzy matches are found
+    without an O(n^2) pass.
+    
+    Names match when their tokens differ only in punctuation, spacing, order,
+    a leading article or a plural "s". Anything fuzzier is accepted only for
+    entities in the same locality whose names differ by typos in long tokens,
+    since short names one letter apart ("St. Mary School", "St. Mark School")
+    are usually different entities. An entity that matches no earlier one opens a new
+    slot, which the aggregation pipeline can act on right away (for example,
+    start its enrichment); slot indexes never change. An entity matching
+    several clusters joins them with union-find, and resolved() returns one
+    entity per cluster.
+    
+    Slots keep a running merge of their members instead of the members, and
+    blocks hold at most MAX_BLOCK_SIZE slots, so memory grows with the number
+    of distinct entities rather than the number of mentions.
+    """
+    
+    MAX_BLOCK_SIZE = 100
+    
+    # Leading words ignored when blocking on the start of a name and when comparing names
+    LEADING_WORDS = {"the", "a", "an"}
+    
+    # Shorter name tokens must match exactly; a one-letter change often makes a different name
+    TYPO_MIN_TOKEN_LENGTH = 6
+    
+    def __init__(self, similarity_threshold: float = 0.85):
+        """Initialize an empty resolver."""
+        self.similarity_threshold = similarity_threshold
+        self._merged: List[Dict[str, Any]] = []  # Slot -> running merge of its members
+        self._counts: List[int] = []
+        self._confidence: List[float] = []
+        self._parents: List[int] = []  # Union-find forest over slots
+        self._blocks: Dict[str, List[int]] = {}
+    
+    @staticmethod
+    def key(entity: Dict[str, Any]) -> str:
+        """Get the normalized name entities are merged on."""
+        name = re.sub(r"[^\w\s]", "", (entity.get("name") or "").lower())
+        return re.sub(r"\s+", " ", name).strip()
+    
+    def add(self, entities: List[Dict[str, Any]]) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Add extracted entities.
+        
+        Args:
+            entities: Entities from one extraction result
+            
+        Returns:
+            (index in entities() order, entity) of each entity seen for the first time
+        """
+        new_entities = []
+        for entity in entities:
+            name = self.key(entity)
+            if not name:
+                continue
+            
+            keys = self._blocking_keys(entity, name)
+            candidates = sorted({self._find(slot) for key in keys for slot in self._blocks.get(key, ())})
+            roots = [root for root in candidates if self._matches(entity, name, self._merged[root])]
+            
+            if roots:
+                slot = roots[0]
+                for root in roots[1:]:
+                    # An entity missing a locality or identifier must not chain clusters that conflict on them
+                    if not self._conflicts(self._merged[slot], self._merged[root]):
+                        self._union(slot, root)
+                self._fold(slot, entity)
+            else:
+                slot = len(self._merged)
+                self._merged.append(entity)
+                self._counts.append(1)
+                self._confidence.append(entity.get("confidence", 0.0))
+                self._parents.append(slot)
+                new_entities.append((slot, entity))
+            
+            for key in keys:
+                block = self._blocks.setdefault(key, [])
+                if slot not in block and len(block) < self.MAX_BLOCK_SIZE:
+                    block.append(slot)
+        return new_entities
+    
+    def entities(self) -> List[Dict[str, Any]]:
+        """Get the merged entity of each slot, in the order the slots were opened."""
+        return list(self._merged)
+    
+    def resolved(self) -> List[Dict[str, Any]]:
+        """Get one merged entity per cluster of slots, in the order the clusters were first seen."""
+        clusters: Dict[int, List[int]] = {}
+        for slot in range(len(self._merged)):
+            clusters.setdefault(self._find(slot), []).append(slot)
+        
+        resolved = []
+        for slots in clusters.values():
+            if len(slots) == 1:
+                resolved.append(self._merged[slots[0]])
+                continue
+            merged = EntityResolver._merge_by_name([self._merged[slot] for slot in slots])
+            count = sum(self._counts[slot] for slot in slots)
+            merged["confidence"] = sum(self._confidence[slot] for slot in slots) / count
+            resolved.append(merged)
+        return resolved
+    
+    def __len__(self) -> int:
+        return len(self._merged)
+    
+    @classmethod
+    def _name_tokens(cls, name: str) -> List[str]:
+        """Get the tokens of a normalized name without leading articles and plural endings."""
+        tokens = name.split()
+        while len(tokens) > 1 and tokens[0] in cls.LEADING_WORDS:
+            tokens = tokens[1:]
+        return [
+            token[:-1] if len(token) > 3 and token.endswith("s") and not token.endswith("ss") else token
+            for token in tokens
+        ]
+    
+    def _blocking_keys(self, entity: Dict[str, Any], name: str) -> List[str]:
+        """Get the keys under which an entity is compared with earlier ones."""
+        tokens = name.split()
+        significant = [token for token in tokens if token not in self.LEADING_WORDS] or tokens
+        locality = (EntityEnricher.locality(entity) or "").lower()
+        keys = [
+            f"name:{name}",
+            f"tokens:{' '.join(sorted(self._name_tokens(name)))}",
+            f"locality:{locality}:{significant[0][:4]}"
+        ]
+        unique_identifier = entity.get("unique_identifier")
+        if unique_identifier:
+            keys.append(f"id:{unique_identifier}")
+        return keys
+    
+    @staticmethod
+    def _conflicts(entity: Dict[str, Any], other: Dict[str, Any]) -> bool:
+        """Check whether two entities have different unique identifiers or localities."""
+        unique_identifier, other_identifier = entity.get("unique_identifier"), other.get("unique_identifier")
+        if unique_identifier and other_identifier and unique_identifier != other_identifier:
+            return True
+        locality, other_locality = EntityEnricher.locality(entity), EntityEnricher.locality(other)
+        return bool(locality and other_locality and locality.lower() != other_locality.lower())
+    
+    def _matches(self, entity: Dict[str, Any], name: str, other: Dict[str, Any]) -> bool:
+        """Check whether an entity refers to the same thing as a slot's merged entity."""
+        unique_identifier, other_identifier = entity.get("unique_identifier"), other.get("unique_identifier")
+        if unique_identifier and other_identifier:
+            return unique_identifier == other_identifier
+        if self._conflicts(entity, other):
+            return False
+        
+        other_name = self.key(other)
+        if name == other_name:
+            return True
+        tokens, other_tokens = self._name_tokens(name), self._name_tokens(other_name)
+        if sorted(tokens) == sorted(other_tokens) or "".join(tokens) == "".join(other_tokens):
+            return True
+        
+        # Typos only count as the same name for entities known to be in the same place
+        if not (EntityEnricher.locality(entity) and EntityEnricher.locality(other)):
+            return False
+        return self._typo_variants(tokens, other_tokens)
+    
+    def _typo_variants(self, tokens: List[str], other_tokens: List[str]) -> bool:
+        """Check whether two names differ only by typos in their long tokens."""
+        if len(tokens) != len(other_tokens):
+            return False
+        for token, other_token in zip(tokens, other_tokens):
+            if token == other_token:
+                continue
+            if min(len(token), len(other_token)) < self.TYPO_MIN_TOKEN_LENGTH:
+                return False
+            if SequenceMatcher(None, token, other_token).ratio() < self.similarity_threshold:
+                return False
+        return True
+    
+    def _fold(self, slot: int, entity: Dict[str, Any]):
+        """Merge an entity into a slot's running merge."""
+        self._counts[slot] += 1
+        self._confidence[slot] += entity.get("confidence", 0.0)
+        merged = EntityResolver._merge_by_name([self._merged[slot], entity])
+        merged["confidence"] = self._confidence[slot] / self._counts[slot]
+        self._merged[slot] = merged
+    
+    def _find(self, slot: int) -> int:
+        """Get the root slot of a slot's cluster, compressing the path to it."""
+        root = slot
+        while self._parents[root] != root:
+            root = self._parents[root]
+        while self._parents[slot] != root:
+            self._parents[slot], slot = root, self._parents[slot]
+        return root
+    
+    def _union(self, first: int, second: int):
+        """Join two clusters; the earlier slot becomes the root."""
+        first, second = self._find(first), self._find(second)
+        if first != second:
+            self._parents[max(first, second)] = min(first, second)
@@ -0,0 +1,123 @@
+"""Persistent cache of search space enumerations."""
+
+import json
+import logging
+import os
+import re
+from typing import List, Dict, Any, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class EnumerationCache:
+    """Search space enumerations reused across data aggregation tasks.
+
+    The subdivisions of a geography rarely change, so an enumeration is stored
+    under its normalized search space, entity type and granularity and read
+    back instead of asking the LLM again. Search spaces that were never
+    enumerated can be answered from an optional gazetteer file
+    (SEARCH_SPACE_GAZETTEER), a JSON object mapping a place to its next level
+    of subdivisions:
+
+        {
+          "California": {"level": "county", "subdivisions": ["Alameda County", "Alpine County"]},
+          "Alameda County, California": {"level": "city", "subdivisions": ["Oakland", "Berkeley"]}
+        }
+
+    Reading and writing the cache is best effort: when the repository is
+    unavailable the enumerator asks the LLM as before.
+    """
+
+    def __init__(self, repository=None, gazetteer_path: Optional[str] = None):
+        """Initialize the enumeration cache."""
+        self.repository = repository
+        self.gazetteer = self._load_gazetteer(gazetteer_path or os.getenv("SEARCH_SPACE_GAZETTEER"))
+
+    @staticmethod
+    def normalize(text: Optional[str]) -> str:
+        """Normalize a search space, entity type or granularity for lookups."""
+        text = re.sub(r"[^\w\s,]", " ", (text or "").lower())
+        text = re.sub(r"^\s*in\s+", "", text)
+        return re.sub(r"\s*,\s*", ", ", re.sub(r"\s+", " ", text)).strip(" ,")
+
+    def key(self, search_space: str, entity_type: str, granularity: Optional[str] = None) -> str:
+        """Get the cache key of an enumeration; without a granularity it is one level deep."""
+        return "|".join([
+            self.normalize(search_space),
+            self.normalize(entity_type),
+            self.normalize(granularity) or "next"
+        ])
+
+    async def get(self,
+                  search_space: str,
+                  entity_type: str,
+                  granularity: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """Get a cached enumeration as subspace dictionaries, or None if it was never stored."""
+        if self.repository is None:
+            return None
+        try:
+            return await self.repository.get_enumeration(self.key(search_space, entity_type, granularity))
+        except Exception as e:
+            logger.warning(f"Could not read cached enumeration of '{search_space}': {e}")
+            return None
+
+    async def put(self,
+                  search_space: str,
+                  entity_type: str,
+                  granularity: Optional[str],
+                  subspaces: List[Dict[str, Any]],
+                  source: str = "llm"):
+        """Store an enumeration for later tasks."""
+        if self.repository is None:
+            return
+        try:
+            await self.repository.save_enumeration(
+                cache_key=self.key(search_space, entity_type, granularity),
+                search_space=search_space,
+                entity_type=entity_type,
+                granularity=granularity,
+                subspaces=subspaces,
+                source=source
+            )
+        except Exception as e:
+            logger.warning(f"Could not cache enumeration of '{search_space}': {e}")
+
+    def gazetteer_subspaces(self, base_query: str, search_space: str) -> Optional[List[Dict[str, Any]]]:
+        """Build the next level of a search space from the gazetteer, or None if it is not listed."""
+        entry = self.gazetteer.get(self.normalize(search_space))
+        if not entry:
+            return None
+        place, level, subdivisions = entry
+        return [
+            {
+                "id": f"{level}_{index + 1:03d}",
+                "query": f"{base_query} in {name}, {place}",
+                "metadata": {
+                    "type": level,
+                    "parent": place,
+                    "name": name,
+                    "level": level,
+                    "source": "gazetteer"
+                }
+            }
+            for index, name in enumerate(subdivisions)
+        ]
+
+    def _load_gazetteer(self, path: Optional[str]) -> Dict[str, tuple]:
+        """Load the gazetteer as normalized place -> (place, level, subdivisions)."""
+        if not path:
+            return {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            gazetteer = {
+                self.normalize(place): (place, entry.get("level", "subdivision"), list(entry.get("subdivisions", [])))
+                for place, entry in entries.items()
+                if entry.get("subdivisions")
+            }
+            logger.info(f"Loaded gazetteer with {len(gazetteer)} places from {path}")
+            return gazetteer
+        except Exception as e:
+            logger.warning(f"Could not load gazetteer {path}: {e}")
+            return {}
@@ -1,12 +1,15 @@
 """Search space enumerator for data aggregation tasks."""
 
+import asyncio
 import logging
+import os
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 import json
 import uuid
 
 from src.llm import LLMClient
+from src.agents.aggregation.enumeration_cache import EnumerationCache
 
 
 logger = logging.getLogger(__name__)
@@ -21,25 +24,123 @@ class SearchSubspace:
 
 
 class SearchSpaceEnumerator:
-    """Dynamically decomposes search space using LLM with proper geographic hierarchies."""
+    """Dynamically decomposes search space using LLM with proper geographic hierarchies.
     
-    def __init__(self, llm_client: LLMClient):
+    Enumerations are looked up in the enumeration cache, then in its gazetteer,
+    before the LLM is asked; what the LLM returns is cached for later tasks.
+    """
+    
+    # Levels below the search space explored when enumerating down to a granularity
+    MAX_DEPTH = 3
+    
+    def __init__(self, llm_client: LLMClient, cache: Optional[EnumerationCache] = None):
         """Initialize the search space enumerator."""
         self.llm_client = llm_client
+        self.cache = cache or EnumerationCache()
+        # Sub-areas of a hierarchical enumeration are enumerated concurrently up to this limit
+        self.llm_slots = asyncio.Semaphore(int(os.getenv("ENUMERATION_CONCURRENCY", "8")))
     
     async def enumerate(self, 
                        base_query: str, 
-                       search_space: str) -> List[SearchSubspace]:
+                       search_space: str,
+                       granularity: Optional[str] = None) -> List[SearchSubspace]:
         """
         Enumerate search subspaces based on the base query and search space using LLM.
         
         Args:
             base_query: The base entity query (e.g., "private schools")
             search_space: The search space constraint (e.g., "in California")
+            granularity: Optional level to decompose down to (e.g., "city"); each
+                level above it is enumerated in parallel. Without it, the next
+                level below the search space is enumerated.
             
         Returns:
             List of SearchSubspace objects
         """
+        if not granularity:
+            return await self._enumerate_level(base_query, search_space)
+        
+        cached = await self.cache.get(search_space, base_query, granularity)
+        if cached:
+            logger.info(f"Reusing cached {granularity}-level enumeration of '{search_space}' with {len(cached)} subspaces")
+            return [SearchSubspace(**subspace) for subspace in cached]
+        
+        subspaces = await self._enumerate_down(base_query, search_space, granularity, 0)
+        if any(subspace.metadata.get("type") != "direct" for subspace in subspaces):
+            await self.cache.put(search_space, base_query, granularity, [asdict(subspace) for subspace in subspaces])
+        return subspaces
+    
+    async def _enumerate_down(self,
+                              base_query: str,
+                              search_space: str,
+                              granularity: str,
+                              depth: int) -> List[SearchSubspace]:
+        """Enumerate a search space level by level until its subspaces reach a granularity."""
+        subspaces = await self._enumerate_level(base_query, search_space)
+        if depth + 1 >= self.MAX_DEPTH:
+            return subspaces
+        
+        async def descend(subspace: SearchSubspace) -> List[SearchSubspace]:
+            if subspace.metadata.get("type") == "direct" or self._at_level(subspace, granularity):
+                return [subspace]
+            children = await self._enumerate_down(base_query, self._child_space(base_query, subspace), granularity, depth + 1)
+            if all(child.metadata.get("type") == "direct" for child in children):
+                # The area could not be decomposed further; search it as a whole
+                return [subspace]
+            return [
+                SearchSubspace(id=f"{subspace.id}_{child.id}", query=child.query, metadata=child.metadata)
+                for child in children
+            ]
+        
+        levels = await asyncio.gather(*[descend(subspace) for subspace in subspaces])
+        return [subspace for level in levels for subspace in level]
+    
+    @staticmethod
+    def _at_level(subspace: SearchSubspace, granularity: str) -> bool:
+        """Check whether a subspace is at the requested granularity."""
+        def singular(level: str) -> str:
+            level = EnumerationCache.normalize(level)
+            if level.endswith("ies"):
+                return level[:-3] + "y"
+            return level[:-1] if level.endswith("s") else level
+        
+        target = singular(granularity)
+        return any(
+            singular(str(subspace.metadata.get(field) or "")) == target
+            for field in ("level", "type")
+        )
+    
+    @staticmethod
+    def _child_space(base_query: str, subspace: SearchSubspace) -> str:
+        """Get the search space covering a subspace, to decompose it further."""
+        name = subspace.metadata.get("name")
+        if name:
+            parent = subspace.metadata.get("parent")
+            return f"in {name}, {parent}" if parent and parent not in name else f"in {name}"
+        query = subspace.query
+        return query[len(base_query):].strip() if query.startswith(base_query) else query
+    
+    async def _enumerate_level(self, base_query: str, search_space: str) -> List[SearchSubspace]:
+        """Enumerate the next level below a search space from the cache, the gazetteer or the LLM."""
+        cached = await self.cache.get(search_space, base_query)
+        if cached:
+            logger.info(f"Reusing cached enumeration of '{search_space}' with {len(cached)} subspaces")
+            return [SearchSubspace(**subspace) for subspace in cached]
+        
+        seeded = self.cache.gazetteer_subspaces(base_query, search_space)
+        if seeded:
+            logger.info(f"Enumerated '{search_space}' from the gazetteer with {len(seeded)} subspaces")
+            await self.cache.put(search_space, base_query, None, seeded, source="gazetteer")
+            return [SearchSubspace(**subspace) for subspace in seeded]
+        
+        async with self.llm_slots:
+            subspaces = await self._llm_enumerate(base_query, search_space)
+        if subspaces[0].metadata.get("type") != "direct":
+            await self.cache.put(search_space, base_query, None, [asdict(subspace) for subspace in subspaces])
+        return subspaces
+    
+    async def _llm_enumerate(self, base_query: str, search_space: str) -> List[SearchSubspace]:
+        """Ask the LLM for the next level below a search space, falling back to a direct search."""
         logger.info(f"Enumerating search space for '{base_query}' in '{search_space}'")
         
         # Use LLM to dynamically enumerate search space for any geography
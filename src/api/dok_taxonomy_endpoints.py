@@ -12,6 +12,7 @@ from pydantic import BaseModel
 
 from src.database.dok_taxonomy_repository import DOKTaxonomyRepository
 from src.persistence.postgres_knowledge_base import PostgresKnowledgeBase
+from src.runtime import get_runtime
 
 
 logger = logging.getLogger(__name__)
@@ -69,8 +70,8 @@ class BibliographyResponse(BaseModel):
 
 # Dependency to get DOK taxonomy repository
 async def get_dok_repository() -> DOKTaxonomyRepository:
-    """Get DOK taxonomy repository instance."""
-    return DOKTaxonomyRepository()
+    """Get a DOK taxonomy repository on the process's shared pool."""
+    return DOKTaxonomyRepository(get_runtime().knowledge_base)
 
 
 @router.get("/tasks/{task_id}/stats")
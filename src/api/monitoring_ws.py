@@ -12,6 +12,7 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
 from fastapi.websockets import WebSocketState
 
 from ..monitoring.models import MonitoringEvent, GlobalStats, QueueStats, utc_now
+from ..orchestration.task_streams import create_task_queue
 
 
 logger = logging.getLogger(__name__)
@@ -228,12 +229,11 @@ class MonitoringWebSocketManager:
                                   task_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Get current system snapshot for initial WebSocket data."""
         try:
-            # Get queue depths
+            # Get queue depths, summed across worker pools
+            task_queue = create_task_queue(self.redis_client)
             queue_stats = {}
-            for priority in ["high_priority", "normal_priority", "low_priority"]:
-                queue_key = f"nexus:tasks:{priority}"
-                depth = await self.redis_client.llen(queue_key)
-                queue_stats[priority] = depth
+            for priority, priority_name in task_queue.PRIORITY_NAMES.items():
+                queue_stats[priority_name] = await task_queue.depth(priority)
             
             # Get worker heartbeats (count active workers)
             heartbeat_pattern = "nexus:worker:heartbeat:*"
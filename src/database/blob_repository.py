@@ -0,0 +1,50 @@
+"""
+Database repository for out-of-band task payload storage.
+
+Large task payload and result fields are stored here by content digest so
+that Redis only holds references (see src/orchestration/payload_store.py).
+"""
+
+import logging
+from typing import Dict, List
+
+from src.database.base_repository import BaseRepository
+
+
+logger = logging.getLogger(__name__)
+
+
+class BlobRepository(BaseRepository):
+    """Repository for content-addressed task blobs."""
+    
+    async def put_many(self, blobs: Dict[str, bytes]):
+        """Store blobs keyed by their digest, refreshing the last use of existing ones."""
+        query = """
+            INSERT INTO task_blobs (digest, data, size_bytes)
+            VALUES ($1, $2, $3)
+            ON CONFLICT (digest) DO UPDATE SET last_used_at = NOW()
+        """
+        async with self.get_connection() as conn:
+            await conn.executemany(query, [(digest, data, len(data)) for digest, data in blobs.items()])
+    
+    async def get_many(self, digests: List[str]) -> Dict[str, bytes]:
+        """Load blobs by digest; missing blobs are left out."""
+        rows = await self.fetch_all(
+            "SELECT digest, data FROM task_blobs WHERE digest = ANY($1::char(64)[])",
+            digests
+        )
+        return {row["digest"]: bytes(row["data"]) for row in rows}
+    
+    async def purge(self, max_age: float) -> int:
+        """Delete blobs not used for max_age seconds."""
+        result = await self.execute_query(
+            "DELETE FROM task_blobs WHERE last_used_at < NOW() - make_interval(secs => $1)",
+            float(max_age)
+        )
+        try:
+            removed = int(result.split()[-1])
+        except (AttributeError, ValueError, IndexError):
+            removed = 0
+        if removed:
+            logger.info(f"Purged {removed} expired task blobs")
+        return removed
@@ -6,7 +6,8 @@ separating them from DOK taxonomy operations.
 """
 
 import logging
-from typing import Dict, List, Any, Optional
+import time
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
 from datetime import datetime, timezone
 import asyncpg
 import json
@@ -23,6 +24,15 @@ logger = logging.getLogger(__name__)
 class DataAggregationRepository(BaseRepository):
     """Repository for data aggregation operations."""
     
+    SOURCE_COLUMNS = (
+        "source_id", "url", "title", "description", "source_type", "provider",
+        "accessed_at", "metadata", "content_hash", "reliability_score"
+    )
+    RESULT_COLUMNS = (
+        "task_id", "entity_type", "entity_data", "unique_identifier", "search_context",
+        "created_at", "updated_at"
+    )
+    
     def __init__(self, knowledge_base):
         """Initialize the data aggregation repository."""
         super().__init__(knowledge_base)
@@ -44,41 +54,11 @@ class DataAggregationRepository(BaseRepository):
             source_id = source.get('source_id')
             title = source.get('title', 'Unknown')
             description_length = len(source.get('description', '')) if source.get('description') else 0
-            metadata = source.get('metadata', {})
-            metadata_task_id = metadata.get('task_id', 'unknown')
+            metadata_task_id = source.get('metadata', {}).get('task_id', 'unknown')
             
             logger.info(f"Storing source {source_id} for task {metadata_task_id} - Title: {title[:50]}..., Description length: {description_length}")
             
-            # Ensure metadata is properly serialized
-            metadata_json = None
-            if metadata:
-                try:
-                    metadata_json = json.dumps(metadata)
-                except (TypeError, ValueError) as serialize_error:
-                    logger.error(f"Failed to serialize metadata for source {source_id}: {serialize_error}")
-                    # Try to create a simplified metadata object
-                    simplified_metadata = {}
-                    for key, value in metadata.items():
-                        if isinstance(value, (str, int, float, bool, type(None))):
-                            simplified_metadata[key] = value
-                        else:
-                            simplified_metadata[key] = str(value)
-                    metadata_json = json.dumps(simplified_metadata)
-                    logger.info(f"Using simplified metadata for source {source_id}")
-            
-            await self.execute_query(
-                query,
-                source.get('source_id'),
-                source.get('url'),
-                source.get('title'),
-                source.get('description'),
-                source.get('source_type', 'web'),
-                source.get('provider', 'unknown'),
-                source.get('accessed_at', datetime.now(timezone.utc)),
-                metadata_json,
-                source.get('content_hash'),
-                source.get('reliability_score', 0.5)
-            )
+            await self.execute_query(query, *self._source_record(source))
             
             logger.info(f"Successfully stored source {source.get('source_id')}")
             return True
@@ -87,6 +67,107 @@ class DataAggregationRepository(BaseRepository):
             logger.error(f"Source data: {source}")
             return False
     
+    async def store_sources(self, sources: List[Dict[str, Any]]) -> int:
+        """
+        Store sources in one transaction, skipping ones that are already stored.
+        
+        Rows are copied into a staging table and inserted from there, so a
+        batch costs a few round trips however many sources it holds. If the
+        bulk write fails, each source is stored on its own instead.
+        
+        Returns:
+            Number of sources written
+        """
+        if not sources:
+            return 0
+        
+        records = [self._source_record(source) for source in sources]
+        columns = ", ".join(self.SOURCE_COLUMNS)
+        try:
+            [stored] = await self._copy_and_merge(
+                "sources", records, self.SOURCE_COLUMNS,
+                f"""
+                    INSERT INTO sources ({columns})
+                    SELECT DISTINCT ON (source_id) {columns} FROM sources_staging
+                    ON CONFLICT (source_id) DO NOTHING
+                """
+            )
+        except Exception as e:
+            logger.warning(f"Bulk source write failed, storing {len(sources)} sources one by one: {str(e)}")
+            stored = 0
+            for source in sources:
+                stored += await self.store_source(source)
+        return stored
+    
+    def _source_record(self, source: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Build the sources row for a source, in SOURCE_COLUMNS order."""
+        source_id = source.get('source_id')
+        metadata = source.get('metadata', {})
+        
+        # Ensure metadata is properly serialized
+        metadata_json = None
+        if metadata:
+            try:
+                metadata_json = json.dumps(metadata)
+            except (TypeError, ValueError) as serialize_error:
+                logger.error(f"Failed to serialize metadata for source {source_id}: {serialize_error}")
+                # Try to create a simplified metadata object
+                simplified_metadata = {}
+                for key, value in metadata.items():
+                    if isinstance(value, (str, int, float, bool, type(None))):
+                        simplified_metadata[key] = value
+                    else:
+                        simplified_metadata[key] = str(value)
+                metadata_json = json.dumps(simplified_metadata)
+                logger.info(f"Using simplified metadata for source {source_id}")
+        
+        return (
+            source_id,
+            source.get('url'),
+            source.get('title'),
+            source.get('description'),
+            source.get('source_type', 'web'),
+            source.get('provider', 'unknown'),
+            source.get('accessed_at', datetime.now(timezone.utc)),
+            metadata_json,
+            source.get('content_hash'),
+            source.get('reliability_score', 0.5)
+        )
+    
+    async def _copy_and_merge(self,
+                              table: str,
+                              records: List[Tuple[Any, ...]],
+                              columns: Tuple[str, ...],
+                              *merge_queries: str) -> List[int]:
+        """
+        Copy records into a staging table and merge them into a table in one transaction.
+        
+        Args:
+            table: Table to write; the staging table <table>_staging is modelled on it
+            records: Rows in column order
+            columns: Columns of the rows
+            merge_queries: Statements moving the staged rows into the table
+            
+        Returns:
+            Number of rows each merge statement wrote
+        """
+        start = time.perf_counter()
+        written = []
+        async with self.get_connection() as conn:
+            async with conn.transaction():
+                await conn.execute(
+                    f"CREATE TEMP TABLE {table}_staging (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+                )
+                await conn.copy_records_to_table(f"{table}_staging", records=records, columns=list(columns))
+                for merge_query in merge_queries:
+                    status = await conn.execute(merge_query)
+                    written.append(int(status.split()[-1]))
+        
+        elapsed = time.perf_counter() - start
+        logger.info(f"Wrote {len(records)} {table} rows in {elapsed:.3f}s "
+                    f"({len(records) / max(elapsed, 1e-6):,.0f} rows/sec)")
+        return written
+    
     async def get_search_results_for_task(self, task_id: str) -> List[Dict[str, Any]]:
         """Get all search results for a specific data aggregation task with retry logic."""
         query = """
@@ -193,6 +274,86 @@ class DataAggregationRepository(BaseRepository):
             logger.error(f"Error storing data aggregation result for task {task_id}: {str(e)}")
             return False
     
+    async def store_data_aggregation_results(self, task_id: str, results: List[Dict[str, Any]]) -> int:
+        """
+        Store data aggregation results in one transaction.
+        
+        A result whose unique identifier is already stored for the task updates
+        that row; other results are inserted. Rows are copied into a staging
+        table first, so a batch costs a few round trips however many entities
+        it holds. If the bulk write fails, each result is stored on its own.
+        
+        Args:
+            task_id: The research task identifier
+            results: Dicts with entity_type, entity_data and optionally
+                unique_identifier and search_context
+            
+        Returns:
+            Number of results written
+        """
+        if not results:
+            return 0
+        
+        now = datetime.now()
+        records = [
+            (
+                task_id,
+                result["entity_type"],
+                json.dumps(result["entity_data"]),
+                result.get("unique_identifier"),
+                json.dumps(result["search_context"]) if result.get("search_context") else None,
+                now,
+                now
+            )
+            for result in results
+        ]
+        columns = ", ".join(self.RESULT_COLUMNS)
+        try:
+            updated, inserted = await self._copy_and_merge(
+                "data_aggregation_results", records, self.RESULT_COLUMNS,
+                """
+                    UPDATE data_aggregation_results AS r
+                    SET entity_type = s.entity_type,
+                        entity_data = s.entity_data,
+                        search_context = s.search_context,
+                        updated_at = s.updated_at
+                    FROM (
+                        SELECT DISTINCT ON (task_id, unique_identifier) *
+                        FROM data_aggregation_results_staging
+                        WHERE unique_identifier IS NOT NULL
+                    ) AS s
+                    WHERE r.task_id = s.task_id AND r.unique_identifier = s.unique_identifier
+                """,
+                f"""
+                    INSERT INTO data_aggregation_results ({columns})
+                    SELECT {columns} FROM data_aggregation_results_staging
+                    WHERE unique_identifier IS NULL
+                    UNION ALL
+                    (
+                        SELECT DISTINCT ON (task_id, unique_identifier) {columns}
+                        FROM data_aggregation_results_staging AS s
+                        WHERE s.unique_identifier IS NOT NULL AND NOT EXISTS (
+                            SELECT 1 FROM data_aggregation_results AS r
+                            WHERE r.task_id = s.task_id AND r.unique_identifier = s.unique_identifier
+                        )
+                    )
+                """
+            )
+            logger.info(f"Stored data aggregation results for task {task_id}: {updated} updated, {inserted} inserted")
+            return updated + inserted
+        except Exception as e:
+            logger.warning(f"Bulk result write failed for task {task_id}, storing {len(results)} results one by one: {str(e)}")
+            stored = 0
+            for result in results:
+                stored += await self.store_data_aggregation_result(
+                    task_id=task_id,
+                    entity_type=result["entity_type"],
+                    entity_data=result["entity_data"],
+                    unique_identifier=result.get("unique_identifier"),
+                    search_context=result.get("search_context")
+                )
+            return stored
+    
     async def get_data_aggregation_results(self, task_id: str) -> List[Dict[str, Any]]:
         """Get all data aggregation results for a task."""
         query = """
@@ -217,3 +378,130 @@ class DataAggregationRepository(BaseRepository):
         except Exception as e:
             logger.error(f"Error fetching data aggregation results for task {task_id}: {str(e)}")
             return []
+    
+    async def get_data_aggregation_attribute_names(self, task_id: str) -> List[str]:
+        """Get the sorted attribute names used by any data aggregation result of a task."""
+        row = await self.fetch_one(
+            """
+            SELECT COALESCE(array_agg(DISTINCT attribute ORDER BY attribute), '{}') AS attributes
+            FROM data_aggregation_results r
+            CROSS JOIN LATERAL jsonb_object_keys(
+                CASE WHEN jsonb_typeof(r.entity_data->'attributes') = 'object'
+                     THEN r.entity_data->'attributes' ELSE '{}'::jsonb END
+            ) AS attribute
+            WHERE r.task_id = $1
+            """,
+            task_id
+        )
+        return list(row['attributes']) if row else []
+    
+    async def iter_data_aggregation_results(self,
+                                            task_id: str,
+                                            batch_size: int = 500) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the name, unique identifier and attributes of a task's data aggregation results.
+        
+        Rows are read through a server-side cursor, batch_size rows at a time,
+        so memory use does not grow with the number of results.
+        
+        Args:
+            task_id: The research task identifier
+            batch_size: Number of rows fetched per round trip
+            
+        Yields:
+            Dictionaries with name, unique_identifier and attributes, newest first
+        """
+        query = """
+            SELECT entity_data->>'name' AS name,
+                   unique_identifier,
+                   entity_data->'attributes' AS attributes
+            FROM data_aggregation_results
+            WHERE task_id = $1
+            ORDER BY created_at DESC
+        """
+        async with self.get_connection() as conn:
+            # Server-side cursors only live inside a transaction
+            async with conn.transaction():
+                async for row in conn.cursor(query, task_id, prefetch=batch_size):
+                    attributes = row['attributes']
+                    if isinstance(attributes, str):
+                        attributes = json.loads(attributes)
+                    yield {
+                        "name": row['name'],
+                        "unique_identifier": row['unique_identifier'],
+                        "attributes": attributes if isinstance(attributes, dict) else {}
+                    }
+    
+    async def save_checkpoints(self, task_id: str, steps: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Persist the state of completed steps of a data aggregation run.
+        
+        Args:
+            task_id: The research task identifier
+            steps: Mapping of step name to its state; a step saved again replaces its state
+        """
+        if not steps:
+            return
+        
+        query = """
+            INSERT INTO data_aggregation_checkpoints (task_id, step, state, updated_at)
+            VALUES ($1, $2, $3, NOW())
+            ON CONFLICT (task_id, step) DO UPDATE
+            SET state = EXCLUDED.state, updated_at = EXCLUDED.updated_at
+        """
+        async with self.get_connection() as conn:
+            await conn.executemany(query, [(task_id, step, json.dumps(state)) for step, state in steps.items()])
+    
+    async def get_checkpoints(self, task_id: str) -> Dict[str, Dict[str, Any]]:
+        """Get the state of each checkpointed step of a data aggregation run."""
+        rows = await self.fetch_all(
+            "SELECT step, state FROM data_aggregation_checkpoints WHERE task_id = $1",
+            task_id
+        )
+        return {
+            row['step']: json.loads(row['state']) if isinstance(row['state'], str) else row['state']
+            for row in rows
+        }
+    
+    async def delete_checkpoints(self, task_id: str) -> None:
+        """Delete the checkpoints of a data aggregation run."""
+        await self.execute_query("DELETE FROM data_aggregation_checkpoints WHERE task_id = $1", task_id)
+    
+    async def get_enumeration(self, cache_key: str) -> Optional[List[Dict[str, Any]]]:
+        """Get the cached subspaces of a search space enumeration, or None if it is not cached."""
+        row = await self.fetch_one(
+            "SELECT subspaces FROM search_space_enumerations WHERE cache_key = $1",
+            cache_key
+        )
+        if not row:
+            return None
+        return json.loads(row['subspaces']) if isinstance(row['subspaces'], str) else row['subspaces']
+    
+    async def save_enumeration(self,
+                               cache_key: str,
+                               search_space: str,
+                               entity_type: str,
+                               granularity: Optional[str],
+                               subspaces: List[Dict[str, Any]],
+                               source: str = "llm") -> None:
+        """
+        Cache the subspaces of a search space enumeration.
+        
+        Args:
+            cache_key: Normalized search space, entity type and granularity
+            search_space: The search space as given
+            entity_type: The entity type the subspace queries search for
+            granularity: The level enumerated down to, or None for the next level
+            subspaces: The subspace dictionaries (id, query, metadata)
+            source: Where the enumeration came from ("llm" or "gazetteer")
+        """
+        await self.execute_query(
+            """
+            INSERT INTO search_space_enumerations
+                (cache_key, search_space, entity_type, granularity, subspaces, source, updated_at)
+            VALUES ($1, $2, $3, $4, $5, $6, NOW())
+            ON CONFLICT (cache_key) DO UPDATE
+            SET subspaces = EXCLUDED.subspaces, source = EXCLUDED.source, updated_at = EXCLUDED.updated_at
+            """,
+            cache_key, search_space, entity_type, granularity, json.dumps(subspaces), source
+        )
@@ -17,6 +17,8 @@ class DataAggregationConfig(BaseModel):
     attributes: List[str] = Field(..., description="Attributes to extract for each entity")
     search_space: str = Field(..., description="Geographic or categorical search space (e.g., 'in California')")
     domain_hint: Optional[str] = Field(None, description="Domain hint for specialized processing (e.g., 'education.private_schools')")
+    granularity: Optional[str] = Field(None, description="Level to decompose the search space down to (e.g., 'county', 'city'); defaults to the next level below the search space")
+    pipeline_mode: Optional[str] = Field(None, description="'streaming' resolves and enriches entities as extractions finish, 'phased' waits for every extraction first; defaults to DATA_AGGREGATION_PIPELINE")
     
     model_config = ConfigDict(
         json_schema_extra={
@@ -1,15 +1,15 @@
 """Event bus for publishing monitoring events via Redis Pub/Sub."""
 
 import asyncio
-import json
 import logging
 import os
 import random
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 import redis.asyncio as redis
 
 from .models import MonitoringEvent
+from ..utils.codec import get_codec
 
 
 logger = logging.getLogger(__name__)
@@ -28,6 +28,7 @@ class EventBus:
         self.stats_channel = os.getenv("MONITORING_STATS_CHANNEL", "nexus:events:stats")
         self.project_channel_prefix = os.getenv("MONITORING_PROJECT_CHANNEL_PREFIX", "nexus:events:project:")
         self.max_event_size = int(os.getenv("MONITORING_MAX_EVENT_SIZE_BYTES", "8192"))
+        self.codec = get_codec()
         
         # Retry configuration
         self.max_retries = 3
@@ -51,24 +52,7 @@ class EventBus:
             return True  # No-op when disabled
         
         try:
-            # Serialize event to JSON
-            event_data = event.model_dump()
-            
-            # Truncate if too large
-            event_json = json.dumps(event_data)
-            if len(event_json.encode('utf-8')) > self.max_event_size:
-                # Truncate meta field first
-                if event_data.get('meta'):
-                    event_data['meta'] = {"truncated": True, "original_size": len(event_json)}
-                    event_json = json.dumps(event_data)
-                
-                # If still too large, truncate message and error
-                if len(event_json.encode('utf-8')) > self.max_event_size:
-                    if event_data.get('message'):
-                        event_data['message'] = event_data['message'][:500] + "... [truncated]"
-                    if event_data.get('error'):
-                        event_data['error'] = event_data['error'][:500] + "... [truncated]"
-                    event_json = json.dumps(event_data)
+            event_json = self._serialize(event)
             
             # Publish to global channel
             success = await self._publish_with_retry(self.events_channel, event_json)
@@ -88,6 +72,60 @@ class EventBus:
             logger.error(f"Failed to publish monitoring event: {e}")
             return False
     
+    async def publish_many(self, events: List[MonitoringEvent]) -> bool:
+        """Publish several monitoring events in a single Redis round trip.
+        
+        Each event goes to the same channels as with publish(); the project
+        channel is taken from the event's project_id. Falls back to publishing
+        events one by one if the pipelined publish fails.
+        
+        Returns:
+            True if all events were published, False otherwise
+        """
+        if not self.enabled or not events:
+            return True
+        
+        try:
+            pipeline = self.redis_client.pipeline(transaction=False)
+            for event in events:
+                event_json = self._serialize(event)
+                pipeline.publish(self.events_channel, event_json)
+                if event.project_id:
+                    pipeline.publish(f"{self.project_channel_prefix}{event.project_id}", event_json)
+                if event.event_type in ["stats_snapshot", "queue_depth_update"]:
+                    pipeline.publish(self.stats_channel, event_json)
+            
+            await asyncio.wait_for(pipeline.execute(), timeout=self.timeout * len(events))
+            return True
+            
+        except Exception as e:
+            logger.warning(f"Batched publish of {len(events)} events failed, publishing individually: {e}")
+            results = [await self.publish(event, project_id=event.project_id) for event in events]
+            return all(results)
+    
+    def _serialize(self, event: MonitoringEvent) -> str:
+        """Serialize an event to JSON, truncating it to the maximum event size."""
+        event_data = event.model_dump()
+        event_json = self.codec.dumps(event_data)
+        # Characters are at most 4 bytes, so short events skip measuring the encoding
+        if len(event_json) * 4 <= self.max_event_size or len(event_json.encode('utf-8')) <= self.max_event_size:
+            return event_json
+        
+        # Truncate meta field first
+        if event_data.get('meta'):
+            event_data['meta'] = {"truncated": True, "original_size": len(event_json)}
+            event_json = self.codec.dumps(event_data)
+        
+        # If still too large, truncate message and error
+        if len(event_json.encode('utf-8')) > self.max_event_size:
+            if event_data.get('message'):
+                event_data['message'] = event_data['message'][:500] + "... [truncated]"
+            if event_data.get('error'):
+                event_data['error'] = event_data['error'][:500] + "... [truncated]"
+            event_json = self.codec.dumps(event_data)
+        
+        return event_json
+    
     async def _publish_with_retry(self, channel: str, message: str) -> bool:
         """Publish message to Redis channel with retry logic."""
         for attempt in range(self.max_retries + 1):
@@ -144,7 +182,33 @@ class EventBus:
                                error: Optional[str] = None,
                                meta: Optional[Dict[str, Any]] = None) -> bool:
         """Publish a task-related event."""
-        event = MonitoringEvent(
+        event = self.build_task_event(
+            event_type=event_type,
+            task_id=task_id,
+            parent_task_id=parent_task_id,
+            project_id=project_id,
+            task_type=task_type,
+            worker_id=worker_id,
+            status=status,
+            retry_count=retry_count,
+            duration_ms=duration_ms,
+            error=error,
+            meta=meta
+        )
+        return await self.publish(event, project_id=self._s(project_id))
+    
+    def build_task_event(self, event_type: str, task_id: str,
+                         parent_task_id: Optional[str] = None,
+                         project_id: Optional[str] = None,
+                         task_type: Optional[str] = None,
+                         worker_id: Optional[int] = None,
+                         status: Optional[str] = None,
+                         retry_count: Optional[int] = None,
+                         duration_ms: Optional[int] = None,
+                         error: Optional[str] = None,
+                         meta: Optional[Dict[str, Any]] = None) -> MonitoringEvent:
+        """Build a task-related event without publishing it (see publish_many)."""
+        return MonitoringEvent(
             event_type=event_type,
             task_id=self._s(task_id),
             parent_task_id=self._s(parent_task_id),
@@ -157,7 +221,6 @@ class EventBus:
             error=error,
             meta=meta
         )
-        return await self.publish(event, project_id=self._s(project_id))
     
     async def publish_phase_event(self, event_type: str, phase: str,
                                 parent_task_id: str,
@@ -179,14 +242,27 @@ class EventBus:
                                    queue_stats: Optional[Dict[str, int]] = None,
                                    workers_online: Optional[int] = None,
                                    parent_task_id: Optional[str] = None,
-                                   project_id: Optional[str] = None) -> bool:
-        """Publish a statistics snapshot event."""
+                                   project_id: Optional[str] = None,
+                                   wait_histograms: Optional[Dict[str, Dict[str, float]]] = None,
+                                   consumer_lag: Optional[Dict[str, Dict[str, Any]]] = None) -> bool:
+        """Publish a statistics snapshot event.
+        
+        wait_histograms carries cumulative queue wait-time buckets per priority;
+        consumer_lag the group lag and pending entries of stream queues.
+        """
+        meta = {}
+        if workers_online is not None:
+            meta["workers_online"] = workers_online
+        if wait_histograms is not None:
+            meta["wait_histograms"] = wait_histograms
+        if consumer_lag is not None:
+            meta["consumer_lag"] = consumer_lag
         event = MonitoringEvent(
             event_type="stats_snapshot",
             parent_task_id=self._s(parent_task_id),
             project_id=self._s(project_id),
             counts=counts,
             queue=queue_stats,
-            meta={"workers_online": workers_online} if workers_online is not None else None
+            meta=meta or None
         )
         return await self.publish(event, project_id=self._s(project_id))
\ No newline at end of file
@@ -47,7 +47,8 @@ class NexusAgents:
                  storage_path: str = None,
                  neo4j_uri: str = None,
                  neo4j_user: str = None,
-                 neo4j_password: str = None):
+                 neo4j_password: str = None,
+                 knowledge_base: PostgresKnowledgeBase = None):
         """
         Initialize the Nexus Agents system.
         
@@ -59,6 +60,7 @@ class NexusAgents:
             neo4j_uri: The URI for the Neo4j database.
             neo4j_user: The username for the Neo4j database.
             neo4j_password: The password for the Neo4j database.
+            knowledge_base: A shared knowledge base whose pool the caller owns.
         """
         self.llm_client = llm_client
         self.communication_bus = communication_bus
@@ -78,8 +80,9 @@ class NexusAgents:
         mcp_client = MCPClient()
         self.mcp_client = MCPSearchClient(mcp_client)
         
-        # Initialize PostgreSQL KnowledgeBase for operation tracking
-        self.knowledge_base = PostgresKnowledgeBase(storage_path=storage_path or "data/storage")
+        # Initialize PostgreSQL KnowledgeBase for operation tracking, unless the caller shares its own
+        self._owns_knowledge_base = knowledge_base is None
+        self.knowledge_base = knowledge_base or PostgresKnowledgeBase(storage_path=storage_path or "data/storage")
         
         # Initialize DOK workflow orchestrator with proper repository
         from src.agents.research.dok_workflow_orchestrator import DOKWorkflowOrchestrator
@@ -93,7 +96,8 @@ class NexusAgents:
     async def start(self):
         """Start the Nexus Agents system."""
         # Connect to PostgreSQL knowledge base
-        await self.knowledge_base.connect()
+        if self.knowledge_base.pool is None:
+            await self.knowledge_base.connect()
         print(f"Connected to PostgreSQL knowledge base")
         
         # Connect to the communication bus
@@ -126,8 +130,9 @@ class NexusAgents:
         await self.communication_bus.disconnect()
         
         # Disconnect from PostgreSQL knowledge base
-        await self.knowledge_base.disconnect()
-        print(f"Disconnected from PostgreSQL knowledge base")
+        if self._owns_knowledge_base:
+            await self.knowledge_base.disconnect()
+            print(f"Disconnected from PostgreSQL knowledge base")
     
     async def _create_and_start_agents(self):
         """Create and start all agents."""
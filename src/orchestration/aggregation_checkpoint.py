@@ -0,0 +1,119 @@
+"""Checkpoints that let an interrupted data aggregation run resume where it stopped."""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+class AggregationCheckpoint:
+    """Completed steps of a data aggregation run, persisted as they finish.
+
+    The steps are:
+    - "enumeration": the enumerated search subspaces
+    - "subspace:<index>": the IDs of a subspace's search and extraction tasks,
+      and once its extraction finished, the extracted entities
+    - "enrichment": the enriched entities and search counts
+    - "resolution": the resolved entities and search counts
+
+    A run that finds steps left by an earlier run skips them. Saving is best
+    effort: a checkpoint that cannot be written only costs repeated work if
+    the run is resumed.
+    """
+
+    ENUMERATION = "enumeration"
+    ENRICHMENT = "enrichment"
+    RESOLUTION = "resolution"
+
+    def __init__(self, repository, task_id: str, steps: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.repository = repository
+        self.task_id = task_id
+        self.steps: Dict[str, Dict[str, Any]] = dict(steps or {})
+        self._subspace_of: Dict[str, int] = {}  # Extraction task ID -> subspace index
+
+    @classmethod
+    async def load(cls, repository, task_id: str) -> "AggregationCheckpoint":
+        """Load the checkpoints of a run, or start without any if they cannot be read."""
+        try:
+            steps = await repository.get_checkpoints(task_id)
+        except Exception as e:
+            logger.warning(f"Could not load checkpoints of data aggregation task {task_id}: {e}")
+            steps = {}
+        return cls(repository, task_id, steps)
+
+    @property
+    def resumed(self) -> bool:
+        """Whether an earlier run of the task left checkpoints."""
+        return bool(self.steps)
+
+    @staticmethod
+    def subspace_step(index: int) -> str:
+        return f"subspace:{index}"
+
+    def get(self, step: str) -> Optional[Dict[str, Any]]:
+        """Get the state of a step, or None if it has no checkpoint."""
+        return self.steps.get(step)
+
+    def subspace(self, index: int) -> Dict[str, Any]:
+        """Get the state of a subspace, empty if it was never submitted."""
+        return self.steps.get(self.subspace_step(index), {})
+
+    async def save(self, step: str, state: Dict[str, Any]):
+        """Checkpoint the state of a step."""
+        await self.save_many({step: state})
+
+    async def save_many(self, steps: Dict[str, Dict[str, Any]]):
+        """Checkpoint the state of several steps in one write."""
+        # Updated before the write so concurrent savers see each other's steps
+        self.steps.update(steps)
+        try:
+            await self.repository.save_checkpoints(self.task_id, steps)
+        except Exception as e:
+            logger.warning(f"Could not checkpoint {len(steps)} steps of data aggregation task {self.task_id}: {e}")
+
+    async def track_subspaces(self, task_ids: Dict[int, Tuple[str, str]]):
+        """Checkpoint the (search task ID, extraction task ID) of subspaces about to be submitted."""
+        steps = {}
+        for index, (search_task_id, extraction_task_id) in task_ids.items():
+            self._subspace_of[extraction_task_id] = index
+            steps[self.subspace_step(index)] = {
+                "search_task_id": search_task_id,
+                "extraction_task_id": extraction_task_id
+            }
+        await self.save_many(steps)
+
+    def tracks(self, extraction_task_id: str) -> bool:
+        """Whether an extraction task belongs to a tracked subspace that is not yet extracted."""
+        index = self._subspace_of.get(extraction_task_id)
+        return index is not None and not self.subspace(index).get("extracted")
+
+    async def record_extraction(self, extraction_task_id: str, entities: List[Dict[str, Any]]):
+        """Checkpoint the entities extracted for a subspace."""
+        index = self._subspace_of.get(extraction_task_id)
+        if index is None:
+            return
+        # The sequence replays extractions in the order they were resolved,
+        # which keeps merged entity indexes, and so enrichment task IDs, stable
+        await self.save(self.subspace_step(index), {
+            **self.subspace(index),
+            "extracted": True,
+            "sequence": len(self.extractions()),
+            "entities": entities
+        })
+
+    def extractions(self) -> List[List[Dict[str, Any]]]:
+        """Get the entities of each extracted subspace, in the order they were extracted."""
+        extracted = [
+            state for step, state in self.steps.items()
+            if step.startswith("subspace:") and state.get("extracted")
+        ]
+        return [state["entities"] for state in sorted(extracted, key=lambda state: state["sequence"])]
+
+    async def clear(self):
+        """Delete the checkpoints once the run completed."""
+        self.steps = {}
+        try:
+            await self.repository.delete_checkpoints(self.task_id)
+        except Exception as e:
+            logger.warning(f"Could not delete checkpoints of data aggregation task {self.task_id}: {e}")
@@ -0,0 +1,128 @@
+"""Autoscaling of worker pools from queue backlog, task latency and rate-limit headroom."""
+
+import json
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional
+
+import redis.asyncio as aioredis
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AutoscalePolicy:
+    """Bounds and targets of the worker autoscaler."""
+    min_workers: int = 1  # per pool and instance
+    max_workers: int = 20  # per pool and instance
+    target_drain_seconds: float = 60.0  # time in which the backlog should be worked off
+    low_headroom: float = 0.1  # below this rate-limit headroom more workers would only wait
+    scale_down_cooldown: float = 60.0  # seconds between shrinking steps of a pool
+    default_task_seconds: float = 5.0  # assumed latency until tasks have been measured
+
+
+class WorkerAutoscaler:
+    """Sizes worker pools so each pool's backlog drains within a target time.
+
+    The worker-seconds needed by a pool are estimated as backlog times the
+    p95 task latency. Dividing by the drain target gives the workers needed
+    across the cluster, which are split over the live instances within the
+    per-instance bounds. Pools whose provider rate limit is nearly exhausted
+    are not grown, since new workers would only wait on the limiter. Growth is
+    applied at once; shrinking is one worker at a time after a cooldown, and
+    never below a floor such as a pool size set by an administrator.
+
+    The process count that would let every pool run the workers it needs is
+    published to Redis for external orchestration (docker-compose scale, a
+    Kubernetes HPA external metric) to consume.
+    """
+
+    RECOMMENDATION_KEY = "nexus:autoscale:recommendation"
+    RECOMMENDED_PROCESSES_KEY = "nexus:autoscale:recommended_processes"
+    RECOMMENDATION_TTL = 120
+
+    def __init__(self, redis_client: aioredis.Redis, policy: Optional[AutoscalePolicy] = None,
+                 latency_window: int = 200):
+        self.redis_client = redis_client
+        self.policy = policy or AutoscalePolicy()
+        self.latency_window = latency_window
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._last_scale_down: Dict[str, float] = {}
+
+    def observe(self, pool: str, seconds: float):
+        """Record the worker time one task of a pool took."""
+        window = self._latencies.get(pool)
+        if window is None:
+            window = self._latencies[pool] = deque(maxlen=self.latency_window)
+        window.append(seconds)
+
+    def p95_latency(self, pool: str) -> Optional[float]:
+        """Get the 95th percentile of recent task latencies of a pool."""
+        window = self._latencies.get(pool)
+        if not window:
+            return None
+        ordered = sorted(window)
+        return ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+
+    def needed_workers(self, pool: str, backlog: int, busy: int, cluster_size: int, headroom: float) -> int:
+        """Estimate the workers a pool needs across the cluster."""
+        latency = self.p95_latency(pool) or self.policy.default_task_seconds
+        needed = busy + math.ceil(backlog * latency / self.policy.target_drain_seconds)
+        if headroom < self.policy.low_headroom:
+            # The provider is the bottleneck; hold the pool at its current size
+            needed = min(needed, cluster_size)
+        return needed
+
+    def decide(self, pool: str, current: int, needed: int, instances: int,
+               now: Optional[float] = None, floor: int = 0) -> int:
+        """Get this instance's new size for a pool, keeping at least floor workers."""
+        now = now or time.time()
+        target = math.ceil(needed / max(instances, 1))
+        target = max(self.policy.min_workers, min(self.policy.max_workers, target), floor)
+
+        if target >= current:
+            return target
+        # Shrink gradually so a brief lull does not drop capacity needed moments later
+        if now - self._last_scale_down.get(pool, 0.0) < self.policy.scale_down_cooldown:
+            return current
+        self._last_scale_down[pool] = now
+        return current - 1
+
+    def recommended_processes(self, needed: Dict[str, int]) -> int:
+        """Get the process count that lets every pool run the workers it needs."""
+        return max(
+            [1] + [math.ceil(workers / self.policy.max_workers) for workers in needed.values()]
+        )
+
+    async def publish_recommendation(self, needed: Dict[str, int], instances: int,
+                                     details: Optional[Dict[str, Dict[str, Any]]] = None) -> int:
+        """Publish the recommended worker process count to Redis.
+
+        Returns:
+            The recommended number of worker processes
+        """
+        processes = self.recommended_processes(needed)
+        recommendation = {
+            "processes": processes,
+            "current_processes": instances,
+            "needed_workers": needed,
+            "pools": details or {},
+            "ts": time.time()
+        }
+        pipeline = self.redis_client.pipeline()
+        pipeline.set(self.RECOMMENDATION_KEY, json.dumps(recommendation), ex=self.RECOMMENDATION_TTL)
+        pipeline.set(self.RECOMMENDED_PROCESSES_KEY, processes, ex=self.RECOMMENDATION_TTL)
+        await pipeline.execute()
+
+        if processes != instances:
+            logger.info(f"Autoscaler recommends {processes} worker processes (currently {instances})")
+        return processes
+
+    async def recommendation(self) -> Optional[Dict[str, Any]]:
+        """Get the latest published recommendation."""
+        raw = await self.redis_client.get(self.RECOMMENDATION_KEY)
+        return json.loads(raw) if raw else None
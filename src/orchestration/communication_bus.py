@@ -39,6 +39,8 @@ class CommunicationBus:
     
     async def connect(self):
         """Connect to Redis."""
+        if self.redis_client is not None:
+            return
         self.redis_client = redis.Redis.from_url(self.redis_url)
         self.pubsub = self.redis_client.pubsub()
         self.running = True
@@ -59,6 +61,7 @@ class CommunicationBus:
         
         if self.redis_client:
             await self.redis_client.aclose()
+            self.redis_client = None
     
     async def publish_message(self, message: Any = None, **kwargs):
         """Publish a message to a topic.
@@ -2,16 +2,19 @@
 
 import asyncio
 import logging
+import os
+import time
 import uuid
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional, Set, Tuple
 import json
-import io
-import csv
 from datetime import datetime, timezone
 
-from src.agents.aggregation.search_space_enumerator import SearchSpaceEnumerator
+from src.agents.aggregation.search_space_enumerator import SearchSpaceEnumerator, SearchSubspace
+from src.agents.aggregation.enumeration_cache import EnumerationCache
 from src.agents.aggregation.entity_extractor import EntityExtractor
-from src.agents.aggregation.entity_resolver import EntityResolver
+from src.agents.aggregation.entity_enricher import EntityEnricher
+from src.agents.aggregation.entity_resolver import EntityResolver, IncrementalEntityResolver
+from src.orchestration.aggregation_checkpoint import AggregationCheckpoint
 from src.orchestration.parallel_task_coordinator import ParallelTaskCoordinator
 from src.orchestration.task_types import TaskType, Task, TaskStatus
 from src.models.research_types import ResearchType
@@ -22,10 +25,34 @@ from src.monitoring.models import MonitoringEventType
 
 logger = logging.getLogger(__name__)
 
+# Extend a workflow's lease while it still owns it, or take it back if it lapsed unclaimed
+RENEW_LEASE_SCRIPT = """
+local owner = redis.call('GET', KEYS[1])
+if owner == ARGV[1] or not owner then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# Drop a workflow's lease only if it still owns it
+RELEASE_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
 
 class DataAggregationOrchestrator:
     """Orchestrates data aggregation workflow."""
     
+    # Minimum seconds between progress snapshots while waiting for a phase
+    PROGRESS_SNAPSHOT_INTERVAL = 5.0
+    
+    # Seconds a workflow's lease outlives its last renewal, after a crash for instance
+    LEASE_TTL = 60
+    
     def __init__(self,
                  llm_client,
                  data_aggregation_repository: DataAggregationRepository,
@@ -34,13 +61,20 @@ class DataAggregationOrchestrator:
         self.llm_client = llm_client
         self.data_aggregation_repository = data_aggregation_repository
         self.task_coordinator = task_coordinator
+        self._renew_lease_script = None
+        self._release_lease_script = None
+        
+        # "streaming" resolves and enriches entities as extractions finish; "phased"
+        # collects every extraction result before enrichment starts
+        self.pipeline_mode = os.getenv("DATA_AGGREGATION_PIPELINE", "streaming").strip().lower()
         
         # Initialize event bus for monitoring
         self.event_bus = task_coordinator.event_bus
         
         # Initialize agents
-        self.search_enumerator = SearchSpaceEnumerator(llm_client)
+        self.search_enumerator = SearchSpaceEnumerator(llm_client, EnumerationCache(data_aggregation_repository))
         self.entity_extractor = EntityExtractor(llm_client)
+        self.entity_enricher = EntityEnricher(llm_client)
         self.entity_resolver = EntityResolver(llm_client)
         
         # Ensure the repository has a knowledge base reference
@@ -56,19 +90,35 @@ class DataAggregationOrchestrator:
         
     async def execute_data_aggregation(self,
                                        task_id: str,
-                                       config: Dict[str, Any]) -> Dict[str, Any]:
+                                       config: Dict[str, Any],
+                                       lease_token: Optional[str] = None) -> Dict[str, Any]:
         """
         Execute complete data aggregation workflow using parallel task coordination.
         
+        Completed steps are checkpointed as the workflow runs, so running a task
+        again after an interruption resumes it rather than starting over.
+        
         Args:
             task_id: The research task identifier
             config: The data aggregation configuration
+            lease_token: Token of a lease already taken with acquire_lease; the
+                workflow takes the lease itself if omitted
             
         Returns:
             Dictionary with execution results
         """
         logger.info(f"Starting data aggregation workflow for task {task_id}")
         
+        if lease_token is None:
+            try:
+                lease_token = await self.acquire_lease(task_id)
+            except Exception as e:
+                # Renewals take the lease once Redis is reachable and nobody else holds it
+                logger.warning(f"Failed to take lease of data aggregation task {task_id}: {e}")
+                lease_token = self._new_lease_token()
+            if lease_token is None:
+                raise RuntimeError(f"Data aggregation task {task_id} is already running")
+        
         # Get project ID for monitoring
         project_id = config.get('project_id')
         if not project_id:
@@ -78,6 +128,9 @@ class DataAggregationOrchestrator:
             except Exception:
                 project_id = None
         
+        # Renewed while the workflow runs so other processes can tell it is alive
+        lease = asyncio.create_task(self._hold_lease(task_id, lease_token))
+        
         try:
             # Ensure research task exists in database
             existing_task = await self.data_aggregation_repository.knowledge_base.get_research_task(task_id)
@@ -99,328 +152,62 @@ class DataAggregationOrchestrator:
                 )
                 logger.info(f"Created research task {task_id} in database")
             
-            # 1. Enumerate search space
-            await self.event_bus.publish_phase_event(
-                event_type=MonitoringEventType.PHASE_STARTED.value,
-                phase="enumeration",
-                parent_task_id=task_id,
-                project_id=project_id,
-                message="Starting search space enumeration"
-            )
-            
-            subspaces = await self.search_enumerator.enumerate(
-                base_query=config["entities"][0],  # e.g., "private schools"
-                search_space=config["search_space"]  # e.g., "in California"
-            )
-            
-            await self.event_bus.publish_phase_event(
-                event_type=MonitoringEventType.PHASE_COMPLETED.value,
-                phase="enumeration",
-                parent_task_id=task_id,
-                project_id=project_id,
-                counts={"subspaces": len(subspaces)},
-                message=f"Enumerated {len(subspaces)} search subspaces"
-            )
-            
-            # Store search space enumeration operation data
-            await self.data_aggregation_repository.knowledge_base.create_task_operation(
-                task_id=task_id,
-                agent_type="data_aggregation_orchestrator",
-                operation_type="data_aggregation_search_space",
-                status="completed",
-                result_data={
-                    "subspaces": [
-                        {
-                            "id": subspace.id,
-                            "query": subspace.query,
-                            "metadata": subspace.metadata
-                        }
-                        for subspace in subspaces
-                    ],
-                    "base_query": config["entities"][0],
-                    "search_space": config["search_space"]
-                },
-                operation_name="Search Space Enumeration"
-            )
-            
-            # 2. Create search tasks for parallel execution
-            await self.event_bus.publish_phase_event(
-                event_type=MonitoringEventType.PHASE_STARTED.value,
-                phase="search",
-                parent_task_id=task_id,
-                project_id=project_id,
-                message="Starting parallel search tasks"
-            )
-            
-            search_tasks = []
-            for i, subspace in enumerate(subspaces):
-                query = subspace.query
-                if not query:
-                    logger.warning(f"No query found in subspace {i+1}, skipping")
-                    continue
-                
-                # Create task with unique ID
-                task = Task(
-                    id=f"{task_id}_search_{i}",
-                    type=TaskType.DATA_AGGREGATION_SEARCH,
-                    payload={
-                        "task_id": task_id,
-                        "project_id": project_id,  # Include project_id in payload
-                        "query": query,
-                        "subspace": {
-                            "id": subspace.id,
-                            "query": subspace.query,
-                            "metadata": subspace.metadata
-                        },
-                        "subspace_index": i
-                    },
-                    priority=1,  # High priority for data aggregation
-                    parent_task_id=task_id  # Set parent task ID
-                )
-                search_tasks.append(task)
-                logger.info(f"Created search task {task.id} for query: {query}")
-            
-            if not search_tasks:
-                logger.warning(f"No valid search tasks created for task {task_id}")
-                return {
-                    "status": "failed",
-                    "error": "No valid search spaces provided",
-                    "total_spaces": len(subspaces),
-                    "successful_searches": 0,
-                    "failed_searches": len(subspaces)
-                }
-            
-            # Submit tasks to parallel task coordinator
-            logger.info(f"Submitting {len(search_tasks)} search tasks for parallel execution")
-            
-            # Debug logging for task details
-            for task in search_tasks:
-                logger.info(f"Task details - ID: {task.id}, Type: {task.type}, Priority: {task.priority}")
-                logger.info(f"Task payload keys: {list(task.payload.keys())}")
-                logger.info(f"Task query: {task.payload.get('query', 'NO_QUERY')}")
-            
-            await self.task_coordinator.submit_tasks(search_tasks, priority=1)
-            
-            # Verify tasks were submitted by checking Redis directly
-            logger.info("Verifying task submission in Redis...")
-            for task in search_tasks:
-                try:
-                    # Check if task status was set (using correct key format)
-                    status_key = f"nexus:task:{task.id}:status"
-                    status = await self.task_coordinator.redis_client.get(status_key)
-                    logger.info(f"Task {task.id} status in Redis: {status}")
-                    
-                    # Check if task data was stored (using correct key format)
-                    data_key = f"nexus:task:{task.id}:data"
-                    data = await self.task_coordinator.redis_client.get(data_key)
-                    logger.info(f"Task {task.id} data in Redis: {'PRESENT' if data else 'MISSING'}")
-                except Exception as e:
-                    logger.error(f"Error checking Redis for task {task.id}: {e}")
-            
-            # Wait for all search tasks to complete
-            logger.info(f"Waiting for {len(search_tasks)} search tasks to complete...")
+            checkpoint = await AggregationCheckpoint.load(self.data_aggregation_repository, task_id)
+            if checkpoint.resumed:
+                logger.info(f"Resuming data aggregation task {task_id} from {len(checkpoint.steps)} checkpointed steps")
             
-            # Start periodic progress monitoring
-            progress_task = asyncio.create_task(
-                self._monitor_task_progress(task_id, project_id, "search")
-            )
-            
-            try:
-                await self._wait_for_search_tasks([task.id for task in search_tasks])
-            finally:
-                progress_task.cancel()
-                try:
-                    await progress_task
-                except asyncio.CancelledError:
-                    pass
-            
-            # Collect results from completed tasks
-            successful_searches = 0
-            failed_searches = 0
-            
-            for task in search_tasks:
-                try:
-                    task_result = await self.task_coordinator.get_task_status(task.id)
-                    is_completed = False
-                    
-                    # Check if task is completed - look at both status field and result dict
-                    if task_result:
-                        if hasattr(task_result, 'status') and task_result.status == TaskStatus.COMPLETED:
-                            is_completed = True
-                        # Also check the result dict for completion status (this is the key fix)
-                        elif hasattr(task_result, 'result') and task_result.result:
-                            result_dict = task_result.result
-                            if isinstance(result_dict, dict):
-                                if result_dict.get('status') == 'completed':
-                                    is_completed = True
+            resolution = checkpoint.get(AggregationCheckpoint.RESOLUTION)
+            if resolution:
+                resolved_entities = resolution["entities"]
+                searches = resolution["searches"]
+            else:
+                enrichment = checkpoint.get(AggregationCheckpoint.ENRICHMENT)
+                if enrichment:
+                    enriched_entities = enrichment["entities"]
+                    searches = enrichment["searches"]
+                else:
+                    # 1. Enumerate search space
+                    subspaces = await self._enumerate_search_space(task_id, project_id, config, checkpoint)
                     
-                    if is_completed:
-                        successful_searches += 1
-                        logger.info(f"Search task {task.id} completed successfully")
-                    else:
-                        failed_searches += 1
-                        error_msg = getattr(task_result, 'error', None) if task_result else None
-                        logger.warning(f"Search task {task.id} failed: {error_msg}")
-                except Exception as e:
-                    failed_searches += 1
-                    logger.error(f"Error checking status of task {task.id}: {e}")
-            
-            logger.info(f"Search phase completed: {successful_searches} successful, {failed_searches} failed")
-            
-            # Check if we have any successful searches
-            if successful_searches == 0:
-                error_msg = f"All searches failed for task {task_id}"
-                logger.error(error_msg)
-                await self.data_aggregation_repository.knowledge_base.create_task_operation(
-                    task_id=task_id,
-                    agent_type="search_agent",
-                    operation_type="mcp_search",
-                    status="failed",
-                    result_data={
-                        "error": error_msg,
-                        "subspaces_attempted": len(subspaces)
-                    }
-                )
-                raise RuntimeError(error_msg)
-            
-            # Publish search phase completion
-            await self.event_bus.publish_phase_event(
-                event_type=MonitoringEventType.PHASE_COMPLETED.value,
-                phase="search",
-                parent_task_id=task_id,
-                project_id=project_id,
-                counts={"successful": successful_searches, "failed": failed_searches},
-                message=f"Search phase completed: {successful_searches} successful, {failed_searches} failed"
-            )
-
-            # 3. Collect search results from database (they were stored by the parallel tasks)
-            search_results = await self._collect_search_results(task_id)
-            logger.info(f"Collected {len(search_results)} search results from database")
-            
-            # 4. Extract entities from search results
-            await self.event_bus.publish_phase_event(
-                event_type=MonitoringEventType.PHASE_STARTED.value,
-                phase="extraction",
-                parent_task_id=task_id,
-                project_id=project_id,
-                message="Starting entity extraction from search results"
-            )
-            
-            extraction_tasks = []
-            
-            for i, result in enumerate(search_results):
-                # Extract content from the search result
-                content = result.get("content", "")
-                
-                # Only create extraction task if we have content
-                if content and content.strip():
-                    task = Task(
-                        id=f"extract_{task_id}_{i}_{uuid.uuid4().hex[:8]}",
-                        type=TaskType.DATA_AGGREGATION_EXTRACT,
-                        payload={
-                            "content": content,
-                            "entity_type": config["entities"][0],
-                            "attributes": config["attributes"],
-                            "task_id": task_id,
-                            "domain_hint": config.get("domain_hint")
-                        }
+                    # 2-5. Search subspaces, extract entities and enrich them
+                    enriched_entities, searches = await self._search_extract_and_enrich(
+                        task_id, project_id, config, subspaces, checkpoint
                     )
-                    extraction_tasks.append(task)
-                    logger.info(f"Created extraction task {task.id} for search result {i}")
-                else:
-                    logger.info(f"Skipping extraction task for search result {i} - no content")
-            
-            logger.info(f"Total extraction tasks created: {len(extraction_tasks)}")
-            
-            # Submit extraction tasks to coordinator
-            if extraction_tasks:
-                await self.task_coordinator.submit_tasks(extraction_tasks)
-                logger.info(f"Submitted {len(extraction_tasks)} extraction tasks to coordinator")
-                
-                # Start progress monitoring for extraction
-                extraction_progress_task = asyncio.create_task(
-                    self._monitor_task_progress(task_id, project_id, "extraction")
-                )
-                
-                try:
-                    # Wait for extraction tasks to complete
-                    await self._wait_for_extraction_tasks([task.id for task in extraction_tasks])
-                finally:
-                    extraction_progress_task.cancel()
-                    try:
-                        await extraction_progress_task
-                    except asyncio.CancelledError:
-                        pass
+                    if enriched_entities is None:
+                        return {"status": "failed", "error": "No valid search spaces provided", **searches}
+                    await checkpoint.save(AggregationCheckpoint.ENRICHMENT, {
+                        "entities": enriched_entities,
+                        "searches": searches
+                    })
                 
-                # Publish extraction phase completion
+                # 6. Resolve entities
                 await self.event_bus.publish_phase_event(
-                    event_type=MonitoringEventType.PHASE_COMPLETED.value,
-                    phase="extraction",
+                    event_type=MonitoringEventType.PHASE_STARTED.value,
+                    phase="resolution",
                     parent_task_id=task_id,
                     project_id=project_id,
-                    counts={"extraction_tasks": len(extraction_tasks)},
-                    message=f"Extraction phase completed with {len(extraction_tasks)} tasks"
+                    message="Starting entity resolution"
+                )
+                
+                resolved_entities = await self.entity_resolver.resolve_entities(
+                    entities=enriched_entities,
+                    domain_hint=config.get("domain_hint")
                 )
-            else:
-                logger.warning("No extraction tasks created - no search results with content found")
                 
-                # Still publish completion event for empty extraction
                 await self.event_bus.publish_phase_event(
                     event_type=MonitoringEventType.PHASE_COMPLETED.value,
-                    phase="extraction",
+                    phase="resolution",
                     parent_task_id=task_id,
                     project_id=project_id,
-                    counts={"extraction_tasks": 0},
-                    message="Extraction phase completed with no tasks (no content found)"
+                    counts={"resolved_entities": len(resolved_entities)},
+                    message=f"Resolution phase completed with {len(resolved_entities)} entities"
                 )
+                await checkpoint.save(AggregationCheckpoint.RESOLUTION, {
+                    "entities": resolved_entities,
+                    "searches": searches
+                })
             
-            # 5. Collect extracted entities
-            await self.event_bus.publish_phase_event(
-                event_type=MonitoringEventType.PHASE_STARTED.value,
-                phase="enrichment",
-                parent_task_id=task_id,
-                project_id=project_id,
-                message="Starting entity enrichment"
-            )
-            
-            all_entities = await self._collect_extracted_entities(task_id)
-            
-            # 6. Enrich entities with attribute-specific searches
-            enriched_entities = await self._enrich_entity_attributes(task_id, all_entities, config["attributes"])
-            
-            await self.event_bus.publish_phase_event(
-                event_type=MonitoringEventType.PHASE_COMPLETED.value,
-                phase="enrichment",
-                parent_task_id=task_id,
-                project_id=project_id,
-                counts={"entities": len(enriched_entities)},
-                message=f"Enrichment phase completed with {len(enriched_entities)} entities"
-            )
-            
-            # 7. Resolve entities
-            await self.event_bus.publish_phase_event(
-                event_type=MonitoringEventType.PHASE_STARTED.value,
-                phase="resolution",
-                parent_task_id=task_id,
-                project_id=project_id,
-                message="Starting entity resolution"
-            )
-            
-            resolved_entities = await self.entity_resolver.resolve_entities(
-                entities=enriched_entities,
-                domain_hint=config.get("domain_hint")
-            )
-            
-            await self.event_bus.publish_phase_event(
-                event_type=MonitoringEventType.PHASE_COMPLETED.value,
-                phase="resolution",
-                parent_task_id=task_id,
-                project_id=project_id,
-                counts={"resolved_entities": len(resolved_entities)},
-                message=f"Resolution phase completed with {len(resolved_entities)} entities"
-            )
-            
-            # 8. Store in database
+            # 7. Store in database
             await self.event_bus.publish_phase_event(
                 event_type=MonitoringEventType.PHASE_STARTED.value,
                 phase="storage",
@@ -431,9 +218,6 @@ class DataAggregationOrchestrator:
             
             await self._store_aggregation_results(task_id, resolved_entities, config.get("domain_hint"))
             
-            # 9. Generate CSV
-            csv_path = await self._generate_csv(task_id, resolved_entities)
-            
             await self.event_bus.publish_phase_event(
                 event_type=MonitoringEventType.PHASE_COMPLETED.value,
                 phase="storage",
@@ -443,6 +227,9 @@ class DataAggregationOrchestrator:
                 message=f"Storage phase completed with {len(resolved_entities)} entities stored"
             )
             
+            # Nothing is left to resume
+            await checkpoint.clear()
+            
             # Update task status to completed
             await self.data_aggregation_repository.knowledge_base.update_research_task_status(
                 task_id=task_id,
@@ -453,11 +240,10 @@ class DataAggregationOrchestrator:
             
             return {
                 "status": "completed",
-                "total_spaces": len(subspaces),
-                "successful_searches": successful_searches,
-                "failed_searches": failed_searches,
+                **searches,
                 "entity_count": len(resolved_entities),
-                "csv_path": csv_path
+                # The CSV is streamed from the stored results when requested
+                "csv_url": f"/tasks/{task_id}/export/csv"
             }
             
         except Exception as e:
@@ -469,184 +255,414 @@ class DataAggregationOrchestrator:
                 error_message=str(e)
             )
             raise
-            
-            # 3. Extract entities from search results
-            extraction_results = []
-            
-            logger.info(f"Creating extraction tasks for {len(search_results)} search results")
-            
-            for i, result in enumerate(search_results):
-                # Extract content from the search result
-                content = ""
-                if isinstance(result, dict):
-                    # Try multiple possible field names for content
-                    content = (
-                        result.get("content") or 
-                        result.get("text") or 
-                        result.get("snippet") or 
-                        result.get("body") or 
-                        ""
-                    )
-                
-                # Log content length for debugging
-                content_length = len(content) if content else 0
-                logger.info(f"Search result {i} content length: {content_length}")
-                
-                # Only create extraction task if we have content
-                if content and content.strip():
-                    task = Task(
-                        id=f"extract_{task_id}_{i}_{uuid.uuid4().hex[:8]}",
-                        type=TaskType.DATA_AGGREGATION_EXTRACT,
-                        payload={
-                            "content": content,
-                            "entity_type": config["entities"][0],
-                            "attributes": config["attributes"],
-                            "task_id": task_id,
-                            "domain_hint": config.get("domain_hint")
-                        }
-                    )
-                    extraction_tasks.append(task)
-                    logger.info(f"Created extraction task {task.id} for search result {i}")
-                else:
-                    logger.info(f"Skipping extraction task for search result {i} - no content")
-            
-            logger.info(f"Total extraction tasks created: {len(extraction_tasks)}")
-            
-            # Submit extraction tasks to coordinator
-            if extraction_tasks:
-                await self.task_coordinator.submit_tasks(extraction_tasks)
-                logger.info(f"Submitted {len(extraction_tasks)} extraction tasks to coordinator")
-                
-                # Wait for extraction tasks to complete
-                await self._wait_for_extraction_tasks([task.id for task in extraction_tasks])
-            else:
-                logger.warning("No extraction tasks created - no search results with content found")
-
+        finally:
+            lease.cancel()
+            await self.release_lease(task_id, lease_token)
     
-    async def _collect_search_results(self, task_id: str) -> List[Dict[str, Any]]:
+    async def _enumerate_search_space(self,
+                                      task_id: str,
+                                      project_id: Optional[str],
+                                      config: Dict[str, Any],
+                                      checkpoint: AggregationCheckpoint) -> List[SearchSubspace]:
         """
-        Collect search results for a task from the database.
+        Enumerate the search subspaces of a task, or reuse the checkpointed ones.
         
         Args:
             task_id: The research task identifier
+            project_id: Optional project identifier for monitoring events
+            config: The data aggregation configuration
+            checkpoint: Checkpoints of the run
             
         Returns:
-            List of search results
+            The search subspaces
         """
-        # Collect search results from the database using data aggregation repository
-        search_results = []
+        enumeration = checkpoint.get(AggregationCheckpoint.ENUMERATION)
+        if enumeration:
+            logger.info(f"Reusing {len(enumeration['subspaces'])} checkpointed search subspaces for task {task_id}")
+            return [SearchSubspace(**subspace) for subspace in enumeration["subspaces"]]
         
-        try:
-            # Get search results from database - this should return the actual search content
-            # The task_id parameter is the parent task ID, which is what the sources are stored under
-            db_results = await self.data_aggregation_repository.get_search_results_for_task(task_id)
+        await self.event_bus.publish_phase_event(
+            event_type=MonitoringEventType.PHASE_STARTED.value,
+            phase="enumeration",
+            parent_task_id=task_id,
+            project_id=project_id,
+            message="Starting search space enumeration"
+        )
+        
+        subspaces = await self.search_enumerator.enumerate(
+            base_query=config["entities"][0],  # e.g., "private schools"
+            search_space=config["search_space"],  # e.g., "in California"
+            granularity=config.get("granularity")  # e.g., "city"; defaults to the next level down
+        )
+        
+        await self.event_bus.publish_phase_event(
+            event_type=MonitoringEventType.PHASE_COMPLETED.value,
+            phase="enumeration",
+            parent_task_id=task_id,
+            project_id=project_id,
+            counts={"subspaces": len(subspaces)},
+            message=f"Enumerated {len(subspaces)} search subspaces"
+        )
+        
+        subspace_states = [
+            {
+                "id": subspace.id,
+                "query": subspace.query,
+                "metadata": subspace.metadata
+            }
+            for subspace in subspaces
+        ]
+        
+        # Store search space enumeration operation data
+        await self.data_aggregation_repository.knowledge_base.create_task_operation(
+            task_id=task_id,
+            agent_type="data_aggregation_orchestrator",
+            operation_type="data_aggregation_search_space",
+            status="completed",
+            result_data={
+                "subspaces": subspace_states,
+                "base_query": config["entities"][0],
+                "search_space": config["search_space"]
+            },
+            operation_name="Search Space Enumeration"
+        )
+        
+        await checkpoint.save(AggregationCheckpoint.ENUMERATION, {"subspaces": subspace_states})
+        return subspaces
+    
+    async def _search_extract_and_enrich(self,
+                                         task_id: str,
+                                         project_id: Optional[str],
+                                         config: Dict[str, Any],
+                                         subspaces: List[SearchSubspace],
+                                         checkpoint: AggregationCheckpoint) -> Tuple[Optional[List[Dict[str, Any]]], Dict[str, int]]:
+        """
+        Search every subspace, extract entities from the results and enrich them.
+        
+        Subspaces extracted by an earlier run are not searched again; their
+        entities come from the checkpoint. Subspaces that run submitted but did
+        not finish are resubmitted under the same task IDs, so workers skip the
+        tasks that completed in the meantime and extractions keep the sources
+        they claimed.
+        
+        Args:
+            task_id: The research task identifier
+            project_id: Optional project identifier for monitoring events
+            config: The data aggregation configuration
+            subspaces: The search subspaces
+            checkpoint: Checkpoints of the run
             
-            logger.info(f"Found {len(db_results)} search results in database for parent task {task_id}")
+        Returns:
+            The enriched entities, or None if no search task could be created,
+            and the search counts
+        """
+        # 2. Create search tasks for parallel execution
+        await self.event_bus.publish_phase_event(
+            event_type=MonitoringEventType.PHASE_STARTED.value,
+            phase="search",
+            parent_task_id=task_id,
+            project_id=project_id,
+            message="Starting parallel search tasks"
+        )
+        
+        search_tasks = []
+        extraction_tasks = []
+        subspace_task_ids = {}
+        extracted_subspaces = 0
+        for i, subspace in enumerate(subspaces):
+            query = subspace.query
+            if not query:
+                logger.warning(f"No query found in subspace {i+1}, skipping")
+                continue
+            
+            state = checkpoint.subspace(i)
+            if state.get("extracted"):
+                extracted_subspaces += 1
+                continue
+            
+            # Create task with unique ID
+            task = Task(
+                id=f"{task_id}_search_{i}",
+                type=TaskType.DATA_AGGREGATION_SEARCH,
+                payload={
+                    "task_id": task_id,
+                    "project_id": project_id,  # Include project_id in payload
+                    "query": query,
+                    "subspace": {
+                        "id": subspace.id,
+                        "query": subspace.query,
+                        "metadata": subspace.metadata
+                    },
+                    "subspace_index": i
+                },
+                priority=1,  # High priority for data aggregation
+                parent_task_id=task_id  # Set parent task ID
+            )
+            search_tasks.append(task)
+            logger.debug(f"Created search task {task.id} for query: {query}")
+            
+            # Each search gets an extraction task that is released as soon as the
+            # search completes, so extraction overlaps with the remaining searches
+            extraction_tasks.append(Task(
+                id=state.get("extraction_task_id") or f"extract_{task_id}_{i}_{uuid.uuid4().hex[:8]}",
+                type=TaskType.DATA_AGGREGATION_EXTRACT,
+                payload={
+                    "entity_type": config["entities"][0],
+                    "attributes": config["attributes"],
+                    "task_id": task_id,
+                    "domain_hint": config.get("domain_hint")
+                },
+                priority=1,
+                parent_task_id=task_id,
+                depends_on=[task.id]
+            ))
+            subspace_task_ids[i] = (task.id, extraction_tasks[-1].id)
+        
+        if not search_tasks and not extracted_subspaces:
+            logger.warning(f"No valid search tasks created for task {task_id}")
+            return None, {
+                "total_spaces": len(subspaces),
+                "successful_searches": 0,
+                "failed_searches": len(subspaces)
+            }
+        
+        if extracted_subspaces:
+            logger.info(f"Skipping {extracted_subspaces} subspaces extracted before task {task_id} was interrupted")
+        
+        # Record the task IDs before submitting them so a resumed run reuses them
+        await checkpoint.track_subspaces(subspace_task_ids)
+        
+        if search_tasks:
+            # Submit tasks to parallel task coordinator
+            logger.info(f"Submitting {len(search_tasks)} search tasks and {len(extraction_tasks)} dependent extraction tasks for parallel execution")
             
-            # Log the structure of db_results for debugging
-            logger.debug(f"DB results structure: {type(db_results)} with {len(db_results)} items")
+            # Debug logging for task details
+            for task in search_tasks:
+                logger.debug(f"Task details - ID: {task.id}, Type: {task.type}, Priority: {task.priority}")
+                logger.debug(f"Task payload keys: {list(task.payload.keys())}")
+                logger.debug(f"Task query: {task.payload.get('query', 'NO_QUERY')}")
             
-            # Process database results into the format expected by extraction tasks
-            for i, result in enumerate(db_results):
-                # Extract content from the search result - handle metadata properly
-                content = ""
-                source_metadata = {}
+            await self.task_coordinator.submit_tasks(search_tasks + extraction_tasks, priority=1)
+        
+        await self.event_bus.publish_phase_event(
+            event_type=MonitoringEventType.PHASE_STARTED.value,
+            phase="extraction",
+            parent_task_id=task_id,
+            project_id=project_id,
+            message="Starting entity extraction as search results arrive"
+        )
+        
+        streaming = (config.get("pipeline_mode") or self.pipeline_mode) != "phased"
+        if streaming:
+            await self.event_bus.publish_phase_event(
+                event_type=MonitoringEventType.PHASE_STARTED.value,
+                phase="enrichment",
+                parent_task_id=task_id,
+                project_id=project_id,
+                message="Starting entity enrichment as entities are extracted"
+            )
+        
+        # Wait for all search tasks and the extraction tasks they release
+        logger.info(f"Waiting for {len(search_tasks)} search tasks and their extraction tasks to complete...")
+        if streaming:
+            all_entities = await self._stream_extracted_entities(
+                task_id, project_id, extraction_tasks, config["attributes"], checkpoint
+            )
+        else:
+            await self._wait_for_phase(task_id, project_id, "search and extraction")
+        
+        # Collect results from completed tasks; subspaces extracted earlier were searched successfully
+        successful_searches = extracted_subspaces
+        failed_searches = 0
+        
+        for task in search_tasks:
+            try:
+                task_result = await self.task_coordinator.get_task_status(task.id)
+                is_completed = False
                 
-                if isinstance(result, dict):
-                    # Parse metadata if it's stored as a string (JSON)
-                    metadata = result.get("metadata", {})
-                    if isinstance(metadata, str):
-                        try:
-                            import json
-                            source_metadata = json.loads(metadata)
-                            logger.debug(f"Result {i}: Parsed metadata from string, keys: {list(source_metadata.keys())}")
-                        except json.JSONDecodeError:
-                            source_metadata = {}
-                            logger.debug(f"Result {i}: Failed to parse metadata JSON")
-                    else:
-                        source_metadata = metadata.copy() if metadata else {}
-                        logger.debug(f"Result {i}: Metadata is already dict, keys: {list(source_metadata.keys())}")
-                    
-                    # Try to get content from metadata first (data aggregation search results)
-                    content = source_metadata.get("content", "")
-                    logger.debug(f"Result {i}: Content from metadata.content = {len(content) if content else 0} chars")
-                    
-                    # Fallback to description field (general search results)
-                    if not content:
-                        content = result.get("description", "")
-                        logger.debug(f"Result {i}: Content from description = {len(content) if content else 0} chars")
-                    
-                    # Fallback to other possible content fields
-                    if not content:
-                        content = (
-                            result.get("content") or 
-                            result.get("text") or 
-                            result.get("snippet") or 
-                            result.get("body") or 
-                            ""
-                        )
-                        logger.debug(f"Result {i}: Content from other fields = {len(content) if content else 0} chars")
+                # Check if task is completed - look at both status field and result dict
+                if task_result:
+                    if hasattr(task_result, 'status') and TaskStatus(task_result.status) == TaskStatus.COMPLETED:
+                        is_completed = True
+                    # Also check the result dict for completion status (this is the key fix)
+                    elif hasattr(task_result, 'result') and task_result.result:
+                        result_dict = task_result.result
+                        if isinstance(result_dict, dict):
+                            if result_dict.get('status') == 'completed':
+                                is_completed = True
                 
-                # Only add results with actual content
-                if content and content.strip():
-                    search_results.append({
-                        "content": content,
-                        "metadata": source_metadata  # Use the parsed metadata
-                    })
-                    logger.debug(f"Collected search result {i} with content length: {len(content)}")
+                if is_completed:
+                    successful_searches += 1
+                    logger.debug(f"Search task {task.id} completed successfully")
                 else:
-                    logger.debug(f"Skipping result {i} with no content: {result.get('source_id', 'unknown')}")
+                    failed_searches += 1
+                    error_msg = getattr(task_result, 'error', None) if task_result else None
+                    logger.warning(f"Search task {task.id} failed: {error_msg}")
+            except Exception as e:
+                failed_searches += 1
+                logger.error(f"Error checking status of task {task.id}: {e}")
+        
+        logger.info(f"Search phase completed: {successful_searches} successful, {failed_searches} failed")
+        
+        # Check if we have any successful searches
+        if successful_searches == 0:
+            error_msg = f"All searches failed for task {task_id}"
+            logger.error(error_msg)
+            await self.data_aggregation_repository.knowledge_base.create_task_operation(
+                task_id=task_id,
+                agent_type="search_agent",
+                operation_type="mcp_search",
+                status="failed",
+                result_data={
+                    "error": error_msg,
+                    "subspaces_attempted": len(subspaces)
+                }
+            )
+            raise RuntimeError(error_msg)
+        
+        # Publish search phase completion
+        await self.event_bus.publish_phase_event(
+            event_type=MonitoringEventType.PHASE_COMPLETED.value,
+            phase="search",
+            parent_task_id=task_id,
+            project_id=project_id,
+            counts={"successful": successful_searches, "failed": failed_searches},
+            message=f"Search phase completed: {successful_searches} successful, {failed_searches} failed"
+        )
+
+        # 3. Extraction ran as each search completed; failed searches failed their extraction
+        try:
+            duplicate_sources = await self.task_coordinator.count_duplicate_sources(task_id)
+        except Exception as e:
+            logger.warning(f"Could not count near-duplicate sources of task {task_id}: {e}")
+            duplicate_sources = 0
+        if duplicate_sources:
+            logger.info(f"Skipped extraction of {duplicate_sources} near-duplicate sources for task {task_id}")
+        
+        await self.event_bus.publish_phase_event(
+            event_type=MonitoringEventType.PHASE_COMPLETED.value,
+            phase="extraction",
+            parent_task_id=task_id,
+            project_id=project_id,
+            counts={"extraction_tasks": len(extraction_tasks), "duplicate_sources_skipped": duplicate_sources},
+            message=f"Extraction phase completed with {len(extraction_tasks)} tasks"
+        )
+        
+        if streaming:
+            # 4-5. Entities were merged and their enrichment searches ran as extractions finished
+            enriched_entities, enrichment_counts = await self._merge_enrichment_results(task_id, all_entities, config["attributes"])
+        else:
+            # 4. Collect extracted entities
+            await self.event_bus.publish_phase_event(
+                event_type=MonitoringEventType.PHASE_STARTED.value,
+                phase="enrichment",
+                parent_task_id=task_id,
+                project_id=project_id,
+                message="Starting entity enrichment"
+            )
             
-            logger.info(f"Collected {len(search_results)} search results for parent task {task_id}")
-            return search_results
+            all_entities = await self._collect_extracted_entities(task_id, checkpoint)
             
+            # 5. Enrich entities with attribute-specific searches
+            enriched_entities, enrichment_counts = await self._enrich_entity_attributes(task_id, all_entities, config["attributes"])
+        
+        await self.event_bus.publish_phase_event(
+            event_type=MonitoringEventType.PHASE_COMPLETED.value,
+            phase="enrichment",
+            parent_task_id=task_id,
+            project_id=project_id,
+            counts={"entities": len(enriched_entities), **enrichment_counts},
+            message=f"Enrichment phase completed with {len(enriched_entities)} entities"
+        )
+        
+        return enriched_entities, {
+            "total_spaces": len(subspaces),
+            "successful_searches": successful_searches,
+            "failed_searches": failed_searches,
+            "duplicate_sources_skipped": duplicate_sources
+        }
+    
+    def _lease_key(self, task_id: str) -> str:
+        """Get Redis key held while a workflow runs for a task."""
+        return f"nexus:data_aggregation:{task_id}:lease"
+    
+    def _new_lease_token(self) -> str:
+        """Create a token identifying one workflow run as a lease owner."""
+        return f"{self.task_coordinator.instance_id}:{uuid.uuid4().hex}"
+    
+    async def acquire_lease(self, task_id: str) -> Optional[str]:
+        """
+        Take the task's lease unless a workflow for it is running in any process.
+        
+        Returns:
+            The lease token to pass to execute_data_aggregation, or None if the
+            lease is held by another workflow
+        """
+        token = self._new_lease_token()
+        acquired = await self.task_coordinator.redis_client.set(
+            self._lease_key(task_id), token, nx=True, ex=self.LEASE_TTL
+        )
+        return token if acquired else None
+    
+    async def _hold_lease(self, task_id: str, token: str):
+        """Keep renewing the task's lease until cancelled or taken over."""
+        while True:
+            await asyncio.sleep(self.LEASE_TTL / 3)
+            try:
+                if self._renew_lease_script is None:
+                    self._renew_lease_script = self.task_coordinator.redis_client.register_script(RENEW_LEASE_SCRIPT)
+                renewed = await self._renew_lease_script(
+                    keys=[self._lease_key(task_id)], args=[token, self.LEASE_TTL]
+                )
+            except Exception as e:
+                logger.warning(f"Failed to renew lease of data aggregation task {task_id}: {e}")
+                continue
+            if not renewed:
+                logger.warning(f"Lease of data aggregation task {task_id} was taken over by another workflow")
+                return
+    
+    async def release_lease(self, task_id: str, token: str):
+        """Release the task's lease if this workflow still owns it."""
+        try:
+            if self._release_lease_script is None:
+                self._release_lease_script = self.task_coordinator.redis_client.register_script(RELEASE_LEASE_SCRIPT)
+            await self._release_lease_script(keys=[self._lease_key(task_id)], args=[token])
         except Exception as e:
-            logger.error(f"Error collecting search results for parent task {task_id}: {str(e)}")
-            logger.error(f"Parent task ID being searched: {task_id}")
-            # Re-raise the exception so it's properly handled by the orchestrator
-            raise
+            logger.warning(f"Failed to release lease of data aggregation task {task_id}: {e}")
     
-    async def _collect_extracted_entities(self, task_id: str) -> List[Dict[str, Any]]:
+    async def _collect_extracted_entities(self,
+                                          task_id: str,
+                                          checkpoint: Optional[AggregationCheckpoint] = None) -> List[Dict[str, Any]]:
         """
         Collect extracted entities for a task.
         
         Args:
             task_id: The research task identifier
+            checkpoint: Optional checkpoints of the run; completed extractions are
+                recorded in it, and entities of subspaces extracted by an earlier
+                run are included
             
         Returns:
             List of extracted entities
         """
-        # Collect extracted entities from the task coordinator
-        # This would fetch task results from Redis
         extracted_entities = []
         
         try:
-            # Get all task result keys from Redis that match our extraction task pattern
-            pattern = f"{self.task_coordinator.TASK_STATUS_PREFIX}:extract_{task_id}_*:result"
-            result_keys = await self.task_coordinator.redis_client.keys(pattern)
+            # Read the results indexed under the aggregation task rather than scanning the keyspace
+            results = await self.task_coordinator.get_group_results(task_id, f"extract_{task_id}_")
             
-            logger.info(f"Found {len(result_keys)} extraction task result keys for task {task_id}")
+            logger.info(f"Found {len(results)} extraction task results for task {task_id}")
             
-            # For each result key, get the task result
-            for result_key in result_keys:
-                # Get the raw result data directly
-                result_data = await self.task_coordinator.redis_client.get(result_key)
-                
-                if result_data:
-                    # Decode bytes to string if needed
-                    if isinstance(result_data, bytes):
-                        result_data = result_data.decode('utf-8')
-                    
-                    # If result_data is a string, parse JSON
-                    if isinstance(result_data, str):
-                        task_result = json.loads(result_data)
-                    else:
-                        # If it's already a dict, use it directly
-                        task_result = result_data
-                    
-                    # If task completed successfully, add its entities to our list
-                    if task_result and task_result.get("status") == "completed" and "entities" in task_result:
+            for extraction_task_id, task_result in results.items():
+                # If task completed successfully, add its entities to our list
+                if task_result and task_result.get("status") == "completed" and "entities" in task_result:
+                    if checkpoint is None:
                         extracted_entities.extend(task_result["entities"])
+                    elif checkpoint.tracks(extraction_task_id):
+                        await checkpoint.record_extraction(extraction_task_id, task_result["entities"])
+            
+            if checkpoint is not None:
+                extracted_entities = [entity for entities in checkpoint.extractions() for entity in entities]
             
             logger.info(f"Collected {len(extracted_entities)} extracted entities for task {task_id}")
             return extracted_entities
@@ -655,9 +671,12 @@ class DataAggregationOrchestrator:
             logger.error(f"Error collecting extracted entities for task {task_id}: {str(e)}")
             return []
     
-    async def _enrich_entity_attributes(self, task_id: str, entities: List[Dict[str, Any]], attributes: List[str]) -> List[Dict[str, Any]]:
+    async def _enrich_entity_attributes(self,
+                                        task_id: str,
+                                        entities: List[Dict[str, Any]],
+                                        attributes: List[str]) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
         """
-        Enrich entities by searching for specific attributes of each entity.
+        Enrich entities by searching for their missing attributes in batches.
         
         Args:
             task_id: The research task identifier
@@ -665,33 +684,14 @@ class DataAggregationOrchestrator:
             attributes: List of attributes to search for
             
         Returns:
-            List of enriched entities with populated attributes
+            List of enriched entities with populated attributes, and the number
+            of enrichment searches and LLM calls made
         """
         logger.info(f"Starting attribute enrichment for {len(entities)} entities with attributes: {attributes}")
         
-        enrichment_tasks = []
-        
-        for i, entity in enumerate(entities):
-            entity_name = entity.get("name", "Unknown Entity")
-            
-            # Create search query for this entity's attributes
-            # Format: "Entity Name" attribute1 attribute2 attribute3
-            attribute_query = f'"{entity_name}" {" ".join(attributes)}'
-            
-            # Create enrichment task
-            task = Task(
-                id=f"enrich_{task_id}_{i}",
-                type="search",
-                payload={
-                    "query": attribute_query,
-                    "max_results": 5,  # Fewer results needed for attribute enrichment
-                    "task_id": task_id,
-                    "entity_name": entity_name,
-                    "target_attributes": attributes
-                }
-            )
-            enrichment_tasks.append(task)
-            logger.info(f"Created enrichment task for entity '{entity_name}' with query: {attribute_query}")
+        enrichment_tasks = self._enrichment_tasks(task_id, list(enumerate(entities)), attributes)
+        for task in enrichment_tasks:
+            logger.info(f"Created enrichment task for {len(task.payload['entity_names'])} entities with query: {task.payload['query']}")
         
         # Submit enrichment tasks
         if enrichment_tasks:
@@ -699,259 +699,240 @@ class DataAggregationOrchestrator:
             logger.info(f"Submitted {len(enrichment_tasks)} enrichment tasks")
             
             # Wait for enrichment tasks to complete
-            await self._wait_for_search_tasks([task.id for task in enrichment_tasks])
+            await self._wait_for_phase(task_id, None, "enrichment")
             
             # Collect enrichment results and merge with entities
-            enriched_entities = await self._merge_enrichment_results(task_id, entities, attributes)
+            enriched_entities, counts = await self._merge_enrichment_results(task_id, entities, attributes)
             
             logger.info(f"Completed attribute enrichment for {len(enriched_entities)} entities")
-            return enriched_entities
+            return enriched_entities, counts
         else:
             logger.warning("No enrichment tasks created")
-            return entities
+            return entities, {"enrichment_searches": 0, "enrichment_llm_calls": 0}
     
-    async def _merge_enrichment_results(self, task_id: str, entities: List[Dict[str, Any]], attributes: List[str]) -> List[Dict[str, Any]]:
+    def _enrichment_tasks(self,
+                          task_id: str,
+                          entities: List[Tuple[int, Dict[str, Any]]],
+                          attributes: List[str]) -> List[Task]:
+        """Create the attribute searches for batches of entities; the entity indexes in their IDs tie the results back."""
+        return [
+            Task(
+                id=f"enrich_{task_id}_{'-'.join(str(index) for index in batch.entity_indexes)}",
+                type="search",
+                payload={
+                    "query": batch.query,
+                    "max_results": self.entity_enricher.max_results(len(batch.names)),
+                    "task_id": task_id,
+                    "entity_names": batch.names,
+                    "target_attributes": batch.attributes
+                }
+            )
+            for batch in self.entity_enricher.plan(entities, attributes)
+        ]
+    
+    async def _stream_extracted_entities(self,
+                                         task_id: str,
+                                         project_id: Optional[str],
+                                         extraction_tasks: List[Task],
+                                         attributes: List[str],
+                                         checkpoint: Optional[AggregationCheckpoint] = None) -> List[Dict[str, Any]]:
         """
-        Merge enrichment search results back into entities.
+        Wait for the search and extraction tasks, resolving entities as each extraction finishes.
+        
+        Every entity seen for the first time gets its enrichment search submitted
+        right away under the same parent task, so enrichment overlaps with the
+        remaining searches and extractions and the wait covers it too.
         
         Args:
             task_id: The research task identifier
-            entities: Original entities to enrich
-            attributes: List of attributes that were searched for
+            project_id: Optional project identifier for monitoring events
+            extraction_tasks: The extraction tasks whose results to stream
+            attributes: Attributes to enrich the entities with
+            checkpoint: Optional checkpoints of the run; each finished extraction
+                is recorded in it, and extractions recorded by an earlier run are
+                resolved first
             
         Returns:
-            List of entities with enriched attributes
+            Entities merged by name, indexed like their enrichment tasks
         """
-        try:
-            # Get enrichment task results from Redis
-            pattern = f"{self.task_coordinator.TASK_STATUS_PREFIX}:enrich_{task_id}_*:result"
-            result_keys = await self.task_coordinator.redis_client.keys(pattern)
-            
-            logger.info(f"Found {len(result_keys)} enrichment result keys")
-            
-            # Create a map of entity index to enrichment results
-            enrichment_data = {}
-            
-            for result_key in result_keys:
-                # Extract entity index from key (enrich_taskid_INDEX)
-                key_parts = result_key.decode('utf-8').split(':')
-                task_part = key_parts[1]  # enrich_taskid_INDEX
-                entity_index = int(task_part.split('_')[-1])  # Get INDEX
-                
-                # Get the search results
-                result_data = await self.task_coordinator.redis_client.get(result_key)
-                if result_data:
-                    if isinstance(result_data, bytes):
-                        result_data = result_data.decode('utf-8')
-                    
-                    task_result = json.loads(result_data) if isinstance(result_data, str) else result_data
-                    
-                    if task_result and task_result.get("status") == "completed":
-                        enrichment_data[entity_index] = task_result.get("results", [])
-            
-            # Enrich each entity with its corresponding search results
-            enriched_entities = []
-            
-            for i, entity in enumerate(entities):
-                enriched_entity = entity.copy()
-                
-                # Get enrichment results for this entity
-                search_results = enrichment_data.get(i, [])
-                
-                if search_results:
-                    # Extract attributes from search results using LLM
-                    extracted_attributes = await self._extract_attributes_from_search(search_results, attributes, entity.get("name", "Unknown"))
-                    
-                    # Merge extracted attributes into entity
-                    if not enriched_entity.get("attributes"):
-                        enriched_entity["attributes"] = {}
-                    
-                    enriched_entity["attributes"].update(extracted_attributes)
-                
-                enriched_entities.append(enriched_entity)
-            
-            logger.info(f"Successfully merged enrichment results for {len(enriched_entities)} entities")
-            return enriched_entities
-            
-        except Exception as e:
-            logger.error(f"Error merging enrichment results: {str(e)}")
-            return entities  # Return original entities if enrichment fails
+        resolver = IncrementalEntityResolver()
+        if checkpoint is not None:
+            # Replayed in their original order, earlier entities keep their indexes
+            # and batches are planned as they were, so workers skip the enrichment
+            # tasks that already completed
+            replayed = []
+            for entities in checkpoint.extractions():
+                replayed.extend(self._enrichment_tasks(task_id, resolver.add(entities), attributes))
+            if replayed:
+                await self.task_coordinator.submit_tasks(replayed)
+        
+        extraction_ids = {task.id for task in extraction_tasks}
+        absorbed: Set[str] = set()
+        absorbing: Set[asyncio.Task] = set()
+        
+        async def absorb(extraction_id: str):
+            try:
+                task_result = await self.task_coordinator.get_task_status(extraction_id)
+                result = task_result.result if task_result else None
+                if not result or result.get("status") != "completed":
+                    return
+                entities = result.get("entities", [])
+                new_entities = resolver.add(entities)
+                if checkpoint is not None:
+                    await checkpoint.record_extraction(extraction_id, entities)
+                # The entities of an extraction come from one subspace, so they batch well
+                enrichment_tasks = self._enrichment_tasks(task_id, new_entities, attributes)
+                if enrichment_tasks:
+                    await self.task_coordinator.submit_tasks(enrichment_tasks)
+            except Exception as e:
+                logger.error(f"Error streaming entities of extraction task {extraction_id}: {e}")
+        
+        def start_absorbing(extraction_id: str):
+            absorbed.add(extraction_id)
+            absorb_task = asyncio.create_task(absorb(extraction_id))
+            absorbing.add(absorb_task)
+            absorb_task.add_done_callback(absorbing.discard)
+        
+        def on_settled(settled_id: str, status: str):
+            if settled_id in extraction_ids and settled_id not in absorbed and status == TaskStatus.COMPLETED.value:
+                start_absorbing(settled_id)
+        
+        while True:
+            await self._wait_for_phase(task_id, project_id, "search, extraction and enrichment", on_settled=on_settled)
+            # Completions are pushed over pub/sub, which may drop messages; read the rest directly
+            for extraction_id in extraction_ids - absorbed:
+                start_absorbing(extraction_id)
+            if not absorbing:
+                break
+            # Absorbing the last extractions may submit more enrichment tasks to wait for
+            await asyncio.gather(*list(absorbing))
+        
+        logger.info(f"Streamed {len(resolver)} distinct entities from {len(extraction_ids)} extraction tasks for task {task_id}")
+        return resolver.entities()
     
-    async def _extract_attributes_from_search(self, search_results: List[Dict[str, Any]], target_attributes: List[str], entity_name: str) -> Dict[str, str]:
+    async def _merge_enrichment_results(self,
+                                        task_id: str,
+                                        entities: List[Dict[str, Any]],
+                                        attributes: List[str]) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
         """
-        Extract specific attributes from search results using LLM.
+        Merge enrichment search results back into entities.
+        
+        Each batch's search results are read by one LLM call filling in the
+        missing attributes of every entity in the batch.
         
         Args:
-            search_results: List of search result documents
-            target_attributes: List of attributes to extract
-            entity_name: Name of the entity being enriched
+            task_id: The research task identifier
+            entities: Original entities to enrich
+            attributes: List of attributes that were searched for
             
         Returns:
-            Dictionary of extracted attributes
+            List of entities with enriched attributes, and the number of
+            enrichment searches and LLM calls made
         """
+        counts = {"enrichment_searches": 0, "enrichment_llm_calls": 0}
         try:
-            # Combine search results into a single text
-            combined_text = "\n\n".join([
-                f"Source: {result.get('title', 'Unknown')}\n{result.get('content', '')}"
-                for result in search_results[:3]  # Use top 3 results
-                if result.get('content')
-            ])
-            
-            if not combined_text.strip():
-                return {attr: "Unknown" for attr in target_attributes}
-            
-            # Create extraction prompt
-            prompt = f"""Extract the following attributes for "{entity_name}" from the provided search results.
-
-Target attributes: {', '.join(target_attributes)}
-
-Search results:
-{combined_text}
-
-For each attribute, provide the most accurate value found in the search results. If an attribute is not found, respond with "Unknown".
-
-Respond in JSON format:
-{{
-{', '.join([f'  "{attr}": "value or Unknown"' for attr in target_attributes])}
-}}"""
-            
-            # Use LLM to extract attributes
-            response = await self.llm_client.generate(prompt)
-            
-            # Parse JSON response
-            try:
-                extracted_data = json.loads(response)
-                # Ensure all target attributes are present
-                result = {}
-                for attr in target_attributes:
-                    result[attr] = extracted_data.get(attr, "Unknown")
-                return result
-            except json.JSONDecodeError:
-                logger.warning(f"Failed to parse LLM response as JSON for entity {entity_name}")
-                return {attr: "Unknown" for attr in target_attributes}
+            # Get enrichment task results indexed under the aggregation task
+            results = await self.task_coordinator.get_group_results(task_id, f"enrich_{task_id}_")
+            counts["enrichment_searches"] = len(results)
+            
+            logger.info(f"Found {len(results)} enrichment results")
+            
+            # Map each batch of entity indexes to its search results (task IDs are enrich_taskid_I-J-K)
+            batches = []
+            
+            for enrichment_task_id, task_result in results.items():
+                entity_indexes = [int(index) for index in enrichment_task_id.rsplit('_', 1)[-1].split('-')]
+                if task_result and task_result.get("status") == "completed" and task_result.get("results"):
+                    members = [
+                        index for index in entity_indexes
+                        if index < len(entities) and self.entity_enricher.missing_attributes(entities[index], attributes)
+                    ]
+                    if members:
+                        batches.append((members, task_result["results"]))
+            
+            async def extract(members: List[int], search_results: List[Dict[str, Any]]):
+                missing = {
+                    attribute for index in members
+                    for attribute in self.entity_enricher.missing_attributes(entities[index], attributes)
+                }
+                batch_attributes = [attribute for attribute in attributes if attribute in missing]
+                await self.task_coordinator.rate_limiter.acquire_llm("task_model")
+                values = await self.entity_enricher.extract([entities[index] for index in members], batch_attributes, search_results)
+                return members, values
+            
+            extracted = await asyncio.gather(*[extract(members, search_results) for members, search_results in batches])
+            counts["enrichment_llm_calls"] = len(extracted)
+            
+            # Enrich each entity with the attributes it was missing
+            enriched_entities = [entity.copy() for entity in entities]
+            
+            for members, values in extracted:
+                for index, entity_values in zip(members, values):
+                    enriched_entity = enriched_entities[index]
+                    enriched_attributes = dict(enriched_entity.get("attributes") or {})
+                    for attribute in self.entity_enricher.missing_attributes(enriched_entity, attributes):
+                        if attribute in entity_values:
+                            enriched_attributes[attribute] = entity_values[attribute]
+                    enriched_entity["attributes"] = enriched_attributes
+            
+            enriched_count = sum(len(members) for members, _ in extracted)
+            if enriched_count:
+                saved = 1 - counts["enrichment_llm_calls"] / enriched_count
+                logger.info(
+                    f"Enriched {enriched_count} entities with {counts['enrichment_searches']} searches and "
+                    f"{counts['enrichment_llm_calls']} LLM calls instead of {enriched_count} of each "
+                    f"({saved:.0%} fewer calls)"
+                )
+            logger.info(f"Successfully merged enrichment results for {len(enriched_entities)} entities")
+            return enriched_entities, counts
             
         except Exception as e:
-            logger.error(f"Error extracting attributes for entity {entity_name}: {str(e)}")
-            return {attr: "Unknown" for attr in target_attributes}
+            logger.error(f"Error merging enrichment results: {str(e)}")
+            return entities, counts  # Return original entities if enrichment fails
     
-    async def _wait_for_search_tasks(self, task_ids: List[str]) -> bool:
+    async def _wait_for_phase(self,
+                              task_id: str,
+                              project_id: Optional[str],
+                              phase: str,
+                              on_settled: Optional[Callable[[str, str], None]] = None) -> Dict[str, Any]:
         """
-        Wait for search tasks to complete with retry mechanism and delays.
+        Wait for all child tasks of the aggregation task to finish.
         Data aggregation workflows should run indefinitely until completion.
         
-        Args:
-            task_ids: List of task IDs to wait for
-            
-        Returns:
-            bool: True if all tasks completed successfully
-        """
-        logger.info(f"Waiting for {len(task_ids)} search tasks to complete...")
-        
-        # Simple check with reduced logging
-        check_count = 0
-        while True:
-            check_count += 1
-            completed_count = 0
-            failed_count = 0
-            pending_count = 0
-            
-            if check_count % 10 == 1:  # Log every 10th check to reduce verbosity
-                logger.info(f"Status check #{check_count} for {len(task_ids)} tasks")
-            
-            for task_id in task_ids:
-                task_result = await self.task_coordinator.get_task_status(task_id)
-                
-                # Check if task is completed - look at both status field and result dict
-                is_completed = False
-                is_failed = False
-                
-                if task_result:
-                    # Check the status field first
-                    if hasattr(task_result, 'status') and task_result.status == TaskStatus.COMPLETED:
-                        is_completed = True
-                    elif hasattr(task_result, 'status') and task_result.status == TaskStatus.FAILED:
-                        is_failed = True
-                    # Also check the result dict for completion status (this is the key fix)
-                    elif hasattr(task_result, 'result') and task_result.result:
-                        result_dict = task_result.result
-                        if isinstance(result_dict, dict):
-                            if result_dict.get('status') == 'completed':
-                                is_completed = True
-                            elif result_dict.get('status') == 'failed':
-                                is_failed = True
-                
-                if is_completed:
-                    completed_count += 1
-                elif is_failed:
-                    failed_count += 1
-                else:
-                    pending_count += 1
-            
-            logger.info(f"Task status: {completed_count} completed, {failed_count} failed, {pending_count} pending")
-            
-            # If all tasks are completed (success or failure), break the loop
-            if completed_count + failed_count == len(task_ids):
-                logger.info(f"All search tasks completed: {completed_count} successful, {failed_count} failed")
-                return True
-            
-            # Wait before checking again
-            await asyncio.sleep(2.0)
-    
-    async def _wait_for_extraction_tasks(self, task_ids: List[str]) -> bool:
-        """
-        Wait for extraction tasks to complete without global timeout.
-        Data aggregation workflows should run indefinitely until completion.
+        Workers push completions to the task group, so this does not poll task
+        statuses. Progress snapshots are published at most every
+        PROGRESS_SNAPSHOT_INTERVAL seconds.
         
         Args:
-            task_ids: List of extraction task IDs to wait for
+            task_id: The research task identifier (parent of the child tasks)
+            project_id: Optional project identifier for monitoring events
+            phase: Name of the phase being waited for, used for logging
+            on_settled: Optional callback invoked with the ID and status of each
+                child task as it finishes
             
         Returns:
-            True when all tasks completed (no timeout mechanism)
+            Final progress counts of the task group
         """
-        import asyncio
+        last_snapshot = 0.0
         
-        # Check task completion status periodically
-        while True:
-            completed_count = 0
-            failed_count = 0
-            pending_count = 0
-            
-            for task_id in task_ids:
-                task_result = await self.task_coordinator.get_task_status(task_id)
-                is_completed = False
-                is_failed = False
-                
-                # Check if task is completed - look at both status field and result dict
-                if task_result:
-                    if hasattr(task_result, 'status') and task_result.status == TaskStatus.COMPLETED:
-                        is_completed = True
-                    elif hasattr(task_result, 'status') and task_result.status == TaskStatus.FAILED:
-                        is_failed = True
-                    # Also check the result dict for completion status
-                    elif hasattr(task_result, 'result') and task_result.result:
-                        result_dict = task_result.result
-                        if isinstance(result_dict, dict):
-                            if result_dict.get('status') == 'completed':
-                                is_completed = True
-                            elif result_dict.get('status') == 'failed':
-                                is_failed = True
-                
-                if is_completed:
-                    completed_count += 1
-                elif is_failed:
-                    failed_count += 1
-                else:
-                    pending_count += 1
-            
-            logger.info(f"Extraction task completion status: {completed_count} completed, {failed_count} failed, {pending_count} pending")
-            
-            # If all tasks are completed (success or failure), return True
-            if completed_count + failed_count == len(task_ids):
-                logger.info(f"All extraction tasks completed: {completed_count} successful, {failed_count} failed")
-                return True
-            
-            # Wait before checking again
-            await asyncio.sleep(1.0)
+        async def publish_progress(progress: Dict[str, Any]):
+            nonlocal last_snapshot
+            if on_settled and progress.get("task_id"):
+                on_settled(progress["task_id"], progress.get("status"))
+            now = time.monotonic()
+            if progress.get("pending", 0) and now - last_snapshot < self.PROGRESS_SNAPSHOT_INTERVAL:
+                return
+            last_snapshot = now
+            await self.event_bus.publish_stats_snapshot(
+                counts={status: int(progress.get(status, 0)) for status in ("completed", "failed", "pending")},
+                parent_task_id=task_id,
+                project_id=project_id
+            )
+        
+        progress = await self.task_coordinator.wait_for_group(task_id, on_progress=publish_progress)
+        logger.info(f"All {phase} tasks finished for task {task_id}: "
+                    f"{progress.get('completed', 0)} completed, {progress.get('failed', 0)} failed in total")
+        return progress
     
     async def _store_aggregation_results(self, task_id: str, entities: List[Dict[str, Any]], domain_hint: Optional[str] = None) -> bool:
         """
@@ -966,6 +947,7 @@ Respond in JSON format:
             True if successful, False otherwise
         """
         try:
+            results = []
             for entity in entities:
                 # Extract unique identifier if available
                 unique_identifier = entity.get("unique_identifier") or None
@@ -988,116 +970,18 @@ Respond in JSON format:
                                 unique_identifier = entity["attributes"][field]
                                 break
                 
-                # Store entity in database using the data_aggregation_repository method
-                await self.data_aggregation_repository.store_data_aggregation_result(
-                    task_id=task_id,
-                    entity_type=entity.get("name", "Unknown Entity"),
-                    entity_data=entity,
-                    unique_identifier=unique_identifier,
-                    search_context=entity.get("search_context", {})
-                )
-            
-            logger.info(f"Stored {len(entities)} aggregation results for task {task_id}")
+                results.append({
+                    "entity_type": entity.get("name", "Unknown Entity"),
+                    "entity_data": entity,
+                    "unique_identifier": unique_identifier,
+                    "search_context": entity.get("search_context", {})
+                })
+            
+            # One bulk write for all entities rather than a round trip per entity
+            stored = await self.data_aggregation_repository.store_data_aggregation_results(task_id, results)
+            logger.info(f"Stored {stored} aggregation results for task {task_id}")
             return True
             
         except Exception as e:
             logger.error(f"Error storing aggregation results for task {task_id}: {str(e)}")
             return False
-    
-    async def _generate_csv(self, task_id: str, entities: List[Dict[str, Any]]) -> str:
-        """
-        Generate CSV export of aggregation results.
-        
-        Args:
-            task_id: The research task identifier
-            entities: List of resolved entities
-            
-        Returns:
-            Path to the generated CSV file
-        """
-        try:
-            # Determine all unique attributes
-            all_attributes = set()
-            for entity in entities:
-                if entity.get("attributes"):
-                    all_attributes.update(entity["attributes"].keys())
-            
-            # Create CSV in memory
-            output = io.StringIO()
-            writer = csv.DictWriter(
-                output, 
-                fieldnames=["name", "unique_identifier"] + sorted(list(all_attributes))
-            )
-            writer.writeheader()
-            
-            # Write rows
-            for entity in entities:
-                row = {
-                    "name": entity.get("name", "Unknown"),
-                    "unique_identifier": entity.get("unique_identifier", "")
-                }
-                if entity.get("attributes"):
-                    row.update(entity["attributes"])
-                writer.writerow(row)
-            
-            # Save to file
-            csv_path = f"exports/{task_id}_aggregation.csv"
-            
-            # Ensure exports directory exists
-            import os
-            os.makedirs("exports", exist_ok=True)
-            
-            with open(csv_path, "w") as f:
-                f.write(output.getvalue())
-            
-            logger.info(f"Generated CSV export for task {task_id} at {csv_path}")
-            return csv_path
-            
-        except Exception as e:
-            logger.error(f"Error generating CSV for task {task_id}: {str(e)}")
-            raise
-    
-    async def _monitor_task_progress(self, parent_task_id: str, project_id: Optional[str], phase: str):
-        """Monitor progress of child tasks and publish periodic updates."""
-        while True:
-            try:
-                # Get child task IDs from task group
-                group_key = f"nexus:task_group:{parent_task_id}"
-                child_task_ids = await self.task_coordinator.redis_client.smembers(group_key)
-                
-                if not child_task_ids:
-                    await asyncio.sleep(5)
-                    continue
-                
-                # Count task statuses
-                counts = {"completed": 0, "failed": 0, "pending": 0, "processing": 0}
-                
-                # Use pipeline for efficient status checking
-                pipeline = self.task_coordinator.redis_client.pipeline()
-                for task_id in child_task_ids:
-                    status_key = f"nexus:task:{task_id.decode() if isinstance(task_id, bytes) else task_id}:status"
-                    pipeline.get(status_key)
-                
-                statuses = await pipeline.execute()
-                
-                for status in statuses:
-                    if status:
-                        status_str = status.decode() if isinstance(status, bytes) else status
-                        counts[status_str] = counts.get(status_str, 0) + 1
-                    else:
-                        counts["pending"] += 1
-                
-                # Publish progress snapshot
-                await self.event_bus.publish_stats_snapshot(
-                    counts=counts,
-                    parent_task_id=parent_task_id,
-                    project_id=project_id
-                )
-                
-                await asyncio.sleep(5)  # Update every 5 seconds
-                
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.warning(f"Error monitoring task progress: {e}")
-                await asyncio.sleep(5)
@@ -1,9 +1,12 @@
 """Parallel task coordinator for managing task execution with rate limiting."""
 
 import asyncio
+import hashlib
 import json
 import os
-from typing import List, Dict, Any, Optional, Set
+import socket
+import time
+from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime, timezone
 import logging
 
@@ -11,8 +14,22 @@ from redis import Redis
 import redis.asyncio as aioredis
 
 from .rate_limiter import RateLimiter
+from .task_streams import create_task_queue
+from .task_groups import TaskGroupTracker, ProgressCallback
+from .task_dag import TaskDependencyGraph
+from .task_dedup import TaskDeduplicator
+from .payload_store import PayloadStore, create_payload_store
+from .retry_policy import RetryPolicy
+from .autoscaler import AutoscalePolicy, WorkerAutoscaler
+from .priority_scheduler import PriorityScheduler, WaitTimeHistogram, parse_priority_weights
+from .worker_pools import (
+    DEFAULT_POOL, POOL_NAMES, WorkerPoolManager, default_pool_sizes, parse_pool_sizes, pool_for
+)
 from .task_types import Task, TaskStatus, TaskResult, TaskType
 from ..monitoring.event_bus import EventBus
+from ..utils.codec import get_codec
+from ..utils.content_fingerprint import MAX_BAND_DISTANCE, MIN_WORDS, content_hash, simhash, word_count
+from ..utils.ttl_cache import TTLCache
 from ..monitoring.models import MonitoringEventType
 
 
@@ -27,10 +44,25 @@ class ParallelTaskCoordinator:
     TASK_STATUS_PREFIX = "nexus:task"
     RATE_LIMIT_PREFIX = "nexus:rate_limit"
     
+    # Result keys read per MGET when collecting a group's results
+    RESULT_READ_BATCH = 500
+    
+    # Task fields serialized as ISO timestamps
+    TASK_TIMESTAMP_FIELDS = ("created_at", "started_at", "completed_at")
+    
+    # Small LLM tasks that are claimed and executed together as micro-batches
+    BATCHABLE_TASK_TYPES = {
+        TaskType.SUMMARIZATION.value,
+        TaskType.DOK_CATEGORIZATION.value,
+        TaskType.ENTITY_EXTRACTION.value,
+        TaskType.DATA_AGGREGATION_EXTRACT.value
+    }
+    
     def __init__(self, 
                  redis_client: aioredis.Redis,
                  rate_limiter: RateLimiter,
-                 worker_pool_size: int = 10):
+                 worker_pool_size: int = 10,
+                 payload_store: Optional[PayloadStore] = None):
         self.redis_client = redis_client
         self.rate_limiter = rate_limiter
         self.worker_pool_size = worker_pool_size
@@ -38,6 +70,7 @@ class ParallelTaskCoordinator:
         self._shutdown = False
         self.data_aggregation_repository = None
         self.dok_repository = None
+        self.llm_client = None  # Shared client set by the runtime; batches create their own otherwise
         
         # Initialize event bus for monitoring
         self.event_bus = EventBus(redis_client)
@@ -46,20 +79,114 @@ class ParallelTaskCoordinator:
         self.heartbeat_interval = int(os.getenv("MONITORING_HEARTBEAT_INTERVAL_SEC", "10"))
         self.heartbeat_ttl = int(os.getenv("MONITORING_HEARTBEAT_TTL_SEC", "30"))
         
+        # Reliable queue configuration
+        self.instance_id = os.getenv("WORKER_INSTANCE_ID") or f"{socket.gethostname()}-{os.getpid()}"
+        self.reaper_interval = int(os.getenv("TASK_REAPER_INTERVAL_SEC", "15"))
+        # Redis lists or Redis Streams, selected by TASK_QUEUE_BACKEND
+        self.task_queue = create_task_queue(redis_client)
+        self._reaper_task: Optional[asyncio.Task] = None
+        
+        # Graceful drain: workers stop claiming and in-flight tasks get this long to finish
+        self.draining = False
+        self.drain_timeout = float(os.getenv("TASK_DRAIN_TIMEOUT_SEC", "60"))
+        self._drained_tasks = 0
+        
+        # Delayed retry configuration
+        self.retry_policy = RetryPolicy(
+            base_delay=float(os.getenv("TASK_RETRY_BASE_DELAY_SEC", "2")),
+            max_delay=float(os.getenv("TASK_RETRY_MAX_DELAY_SEC", "300"))
+        )
+        self.retry_promote_interval = float(os.getenv("TASK_RETRY_PROMOTE_INTERVAL_SEC", "1"))
+        self._promoter_task: Optional[asyncio.Task] = None
+        
+        # Group completion tracking
+        self.task_groups = TaskGroupTracker(
+            redis_client,
+            recheck_interval=float(os.getenv("TASK_GROUP_RECHECK_INTERVAL_SEC", "30"))
+        )
+        
+        # Tasks held until their dependencies complete
+        self.task_dag = TaskDependencyGraph(redis_client, self.task_queue)
+        
+        # Duplicate submissions within the window resolve to the original task
+        self.deduplicator = TaskDeduplicator(
+            redis_client,
+            window=int(os.getenv("TASK_IDEMPOTENCY_WINDOW_SEC", "3600"))
+        )
+        
+        # Encoding of queued tasks and stored results (TASK_CODEC)
+        self.codec = get_codec()
+        
+        # Large payload and result fields are kept out of Redis
+        self.payload_store = payload_store or create_payload_store()
+        self.blob_ttl = int(os.getenv("TASK_BLOB_TTL_SEC", "172800"))
+        self._last_blob_purge = 0.0
+        
+        # Parent task ID -> project ID; unknown parents are cached briefly
+        self._project_ids: TTLCache[str] = TTLCache(
+            max_entries=int(os.getenv("TASK_PROJECT_CACHE_SIZE", "10000")),
+            ttl=float(os.getenv("TASK_PROJECT_CACHE_TTL_SEC", "3600"))
+        )
+        self.project_cache_negative_ttl = float(os.getenv("TASK_PROJECT_CACHE_NEGATIVE_TTL_SEC", "60"))
+        
+        # Micro-batch configuration
+        self.batch_size = int(os.getenv("TASK_BATCH_SIZE", "8"))
+        self.batch_max_chars = int(os.getenv("TASK_BATCH_MAX_CHARS", "12000"))
+        
+        # Sources whose content fingerprints differ in at most this many bits are
+        # extracted once per aggregation task; a negative distance disables it
+        self.source_dedup_distance = min(int(os.getenv("SOURCE_DEDUP_MAX_DISTANCE", "3")), MAX_BAND_DISTANCE)
+        
+        # Worker pools: each pool claims only its own queues with its own concurrency
+        self.pool_sizes = default_pool_sizes(worker_pool_size)
+        pool_spec = os.getenv("TASK_WORKER_POOLS")
+        if pool_spec:
+            self.pool_sizes.update(parse_pool_sizes(pool_spec))
+        self.worker_pools = WorkerPoolManager(redis_client)
+        self.pool_supervisor_interval = float(os.getenv("TASK_POOL_SUPERVISOR_INTERVAL_SEC", "5"))
+        self._pool_workers: Dict[str, Dict[int, asyncio.Task]] = {pool: {} for pool in POOL_NAMES}
+        self._retired_workers: Set[int] = set()
+        self._pool_busy: Dict[str, int] = {pool: 0 for pool in POOL_NAMES}
+        self._pool_processed: Dict[str, int] = {pool: 0 for pool in POOL_NAMES}
+        self._next_worker_id = 0
+        self._pool_supervisor_task: Optional[asyncio.Task] = None
+        # Last pool sizes read from Redis; only changes to them override the autoscaler
+        self._configured_pool_sizes: Dict[str, int] = {}
+        
+        # Opt-in: pool sizes follow backlog, task latency and rate-limit headroom within bounds
+        self.autoscaler: Optional[WorkerAutoscaler] = None
+        if os.getenv("TASK_AUTOSCALE_ENABLED", "false").lower() == "true":
+            self.autoscaler = WorkerAutoscaler(redis_client, AutoscalePolicy(
+                min_workers=int(os.getenv("TASK_AUTOSCALE_MIN_WORKERS", "1")),
+                max_workers=int(os.getenv("TASK_AUTOSCALE_MAX_WORKERS", "20")),
+                target_drain_seconds=float(os.getenv("TASK_AUTOSCALE_TARGET_DRAIN_SEC", "60")),
+                scale_down_cooldown=float(os.getenv("TASK_AUTOSCALE_COOLDOWN_SEC", "60"))
+            ))
+        
+        # Weighted round-robin across priorities, so low priority work is never starved
+        priority_weights = parse_priority_weights(os.getenv("TASK_PRIORITY_WEIGHTS", "high:6,normal:3,low:1"))
+        self.priority_schedulers = {pool: PriorityScheduler(priority_weights) for pool in POOL_NAMES}
+        self.queue_wait = WaitTimeHistogram(self.task_queue.PRIORITY_NAMES)
+        
         logger.info("ParallelTaskCoordinator initialized with Redis client and rate limiter")
     
-    def _get_queue_key(self, priority: int) -> str:
-        """Get Redis key for priority queue."""
-        priority_map = {
-            0: "low_priority",
-            1: "normal_priority", 
-            2: "high_priority"
-        }
-        return f"{self.TASK_QUEUE_PREFIX}:{priority_map.get(priority, 'normal_priority')}"
+    def _consumer_id(self, worker_id: int) -> str:
+        """Get the cluster-unique consumer ID for a worker coroutine."""
+        return f"{self.instance_id}:{worker_id}"
     
     async def submit_tasks(self, tasks: List[Task], priority: int = 0):
-        """Submit tasks to Redis queue with priority."""
+        """Submit tasks to Redis queue with priority.
+        
+        Tasks with the same idempotency key as a task submitted within the
+        suppression window are not queued again; they resolve to the original
+        task's status, result and group outcome.
+        """
+        duplicates = await self.deduplicator.suppress(
+            tasks, TaskStatus.COMPLETED.value, TaskStatus.FAILED.value
+        )
+        
         pipeline = self.redis_client.pipeline()
+        held_tasks = []
         
         for task in tasks:
             # Override priority if specified
@@ -68,15 +195,33 @@ class ParallelTaskCoordinator:
             
             # Resolve parent task ID and project ID for monitoring
             parent_task_id = task.parent_task_id or task.payload.get('task_id')
+            
+            if task.id in duplicates:
+                # Still tracked in its group; settled when the original settles
+                if parent_task_id:
+                    self.task_groups.add(pipeline, parent_task_id, task.id)
+                logger.info(f"Task {task.id} duplicates task {duplicates[task.id][0]}; not queued")
+                continue
+            
+            # Stamp the project into the payload so workers never look it up
             project_id = await self._resolve_project_id(task, parent_task_id)
+            if project_id and not task.payload.get('project_id'):
+                task.payload['project_id'] = project_id
+            
+            # Held tasks are stamped when their dependencies release them
+            task.enqueued_at = None if task.depends_on else time.time()
             
             # Serialize task
-            task_data = task.model_dump(mode='json')
-            task_json = json.dumps(task_data)
+            task_json = await self._serialize_task(task)
             
-            # Add to appropriate priority queue
-            queue_key = self._get_queue_key(task.priority)
-            pipeline.lpush(queue_key, task_json)
+            # Add to the priority queue of the task type's pool; tasks with
+            # dependencies are held until released
+            task_type_str = task.type.value if hasattr(task.type, 'value') else str(task.type)
+            queue_key = self.task_queue.queue_key_for(task_type_str, task.priority)
+            if task.depends_on:
+                held_tasks.append((task, task_json))
+            else:
+                self.task_queue.enqueue(pipeline, task_json, task.priority, pool_for(task_type_str))
             
             # Store task status
             status_key = f"{self.TASK_STATUS_PREFIX}:{task.id}:status"
@@ -91,50 +236,92 @@ class ParallelTaskCoordinator:
                 group_key = f"nexus:task_group:{parent_task_id}"
                 pipeline.sadd(group_key, task.id)
                 pipeline.expire(group_key, 86400)  # 24 hour TTL
+                self.task_groups.add(pipeline, parent_task_id, task.id)
             
             # Log the exact Redis keys being used for debugging
             logger.debug(f"Task {task.id}: queue_key={queue_key}, status_key={status_key}, data_key={data_key}")
         
         await pipeline.execute()
         
-        # Publish monitoring events for each task
+        # Duplicates of tasks that already finished settle right away
         for task in tasks:
+            original_id, original_status = duplicates.get(task.id, (None, None))
             parent_task_id = task.parent_task_id or task.payload.get('task_id')
-            project_id = await self._resolve_project_id(task, parent_task_id)
+            if original_status and parent_task_id:
+                await self._settle_task(task, parent_task_id, TaskStatus(original_status))
+        
+        # Hold dependent tasks after their status and data are stored
+        failed_dependents = []
+        for task, task_json in held_tasks:
+            outcome = await self.task_dag.hold(
+                task.id, task_json, str(task.type), task.priority, task.depends_on, TaskStatus.FAILED.value
+            )
+            if outcome < 0:
+                failed_dependents.append(task)
+        
+        # Publish monitoring events for each queued task
+        for task in tasks:
+            if task.id in duplicates:
+                continue
+            parent_task_id = task.parent_task_id or task.payload.get('task_id')
+            # Resolved and stamped into the payload above
+            project_id = task.payload.get('project_id')
             
+            task_type_str = task.type.value if hasattr(task.type, 'value') else str(task.type)
             await self.event_bus.publish_task_event(
                 event_type=MonitoringEventType.TASK_ENQUEUED.value,
                 task_id=task.id,
                 parent_task_id=parent_task_id,
                 project_id=project_id,
-                task_type=task.type.value if hasattr(task.type, 'value') else str(task.type),
+                task_type=task_type_str,
                 status=TaskStatus.PENDING.value,
                 meta={
                     "priority": task.priority,
-                    "queue": self._get_queue_key(task.priority)
+                    "queue": self.task_queue.queue_key_for(task_type_str, task.priority),
+                    "depends_on": len(task.depends_on)
                 }
             )
         
-        logger.info(f"Submitted {len(tasks)} tasks to queue")
+        for task in failed_dependents:
+            await self._fail_held_task(task, "A dependency of this task has already failed")
+        
+        logger.info(f"Submitted {len(tasks) - len(duplicates)} tasks to queue")
         # Log task IDs for verification
-        task_ids = [task.id for task in tasks]
+        task_ids = [task.id for task in tasks if task.id not in duplicates]
         logger.info(f"Submitted task IDs: {task_ids}")
     
     async def process_tasks(self):
         """Process tasks from queue respecting rate limits."""
-        logger.info(f"Starting task processing with {self.worker_pool_size} workers")
+        # Pool sizes set at runtime through the admin API take precedence
+        try:
+            self._configured_pool_sizes = await self.worker_pools.get_sizes()
+            self.pool_sizes.update(self._configured_pool_sizes)
+        except Exception as e:
+            logger.warning(f"Could not load worker pool sizes: {e}")
+        logger.info(f"Starting task processing with worker pools {self.pool_sizes}")
         
         # Start queue depth monitoring
         await self.start_queue_depth_monitor()
         
+        # Start reaper for tasks orphaned by dead workers
+        self.start_queue_reaper()
+        
+        # Start promoter for delayed retries
+        self.start_retry_promoter()
+        
         # Start worker tasks
-        for i in range(self.worker_pool_size):
-            worker = asyncio.create_task(self._worker(i))
-            self.active_workers.add(worker)
-            worker.add_done_callback(self.active_workers.discard)
+        for pool, size in self.pool_sizes.items():
+            self.resize_pool(pool, size)
         
-        # Wait for all workers to complete
-        await asyncio.gather(*self.active_workers, return_exceptions=True)
+        # Start supervisor applying pool resizes and reporting utilization
+        self._pool_supervisor_task = asyncio.create_task(self._pool_supervisor())
+        
+        # Wait for all workers to complete; pools may grow while we wait
+        while self.active_workers or not self._shutdown:
+            if self.active_workers:
+                await asyncio.gather(*list(self.active_workers), return_exceptions=True)
+            else:
+                await asyncio.sleep(self.pool_supervisor_interval)
     
     async def process_all_tasks(self, timeout: Optional[float] = None):
         """Process all tasks until queues are empty or timeout."""
@@ -158,6 +345,43 @@ class ParallelTaskCoordinator:
         # Shutdown workers
         await self.shutdown()
     
+    async def drain(self, timeout: Optional[float] = None) -> int:
+        """Stop claiming tasks, let in-flight tasks finish, then shut down.
+        
+        Workers exit after their current task or batch. Tasks still running at
+        the deadline are cancelled and re-queued together with the checkpoint
+        of their partial progress, so the next worker resumes them.
+        
+        Args:
+            timeout: Seconds in-flight tasks get to finish (TASK_DRAIN_TIMEOUT_SEC by default)
+            
+        Returns:
+            Number of tasks re-queued unfinished
+        """
+        timeout = self.drain_timeout if timeout is None else timeout
+        logger.info(f"Draining task coordinator; in-flight tasks have {timeout}s to finish")
+        self.draining = True
+        try:
+            await self.worker_pools.set_draining(self.instance_id, time.time() + timeout + self.heartbeat_ttl)
+        except Exception as e:
+            logger.warning(f"Could not mark instance {self.instance_id} as draining: {e}")
+        
+        workers = list(self.active_workers)
+        if workers:
+            _, unfinished = await asyncio.wait(workers, timeout=timeout)
+            for worker in unfinished:
+                worker.cancel()
+            await asyncio.gather(*unfinished, return_exceptions=True)
+            if unfinished:
+                logger.warning(f"Drain deadline reached; re-queued {self._drained_tasks} unfinished tasks")
+        
+        await self.shutdown()
+        try:
+            await self.worker_pools.clear_draining(self.instance_id)
+        except Exception as e:
+            logger.warning(f"Could not clear draining mark of instance {self.instance_id}: {e}")
+        return self._drained_tasks
+    
     async def shutdown(self):
         """Shutdown all workers gracefully."""
         logger.info("Shutting down task coordinator")
@@ -167,6 +391,13 @@ class ParallelTaskCoordinator:
         for worker in self.active_workers:
             worker.cancel()
         
+        if self._reaper_task:
+            self._reaper_task.cancel()
+        if self._promoter_task:
+            self._promoter_task.cancel()
+        if self._pool_supervisor_task:
+            self._pool_supervisor_task.cancel()
+        
         # Wait for cancellation
         await asyncio.gather(*self.active_workers, return_exceptions=True)
     
@@ -193,6 +424,10 @@ class ParallelTaskCoordinator:
         logger.debug(f"Task status check for {task_id}: status={status}, result={result is not None}, error={error}")
         
         if not status:
+            # A suppressed duplicate resolves to the task it duplicates
+            original_id = await self.deduplicator.original_of(task_id)
+            if original_id and original_id != task_id:
+                return await self.get_task_status(original_id)
             logger.debug(f"No status found for task {task_id} - returning None")
             return None
         
@@ -211,43 +446,235 @@ class ParallelTaskCoordinator:
         return TaskResult(
             task_id=task_id,
             status=task_status,
-            result=json.loads(result) if result else None,
+            result=await self.payload_store.hydrate(self.codec.loads(result)) if result else None,
             error=error.decode() if error and isinstance(error, bytes) else error
         )
     
-    async def _worker(self, worker_id: int):
-        """Worker coroutine that processes tasks."""
-        logger.info(f"Worker {worker_id} started")
+    async def count_duplicate_sources(self, parent_task_id: str) -> int:
+        """Get the number of sources a parent task's extractions skipped as near-duplicates."""
+        return await self.task_groups.duplicate_count(parent_task_id)
+    
+    async def get_group_results(self, parent_task_id: str, task_id_prefix: str = "") -> Dict[str, Dict[str, Any]]:
+        """Get the stored results of a parent task's child tasks.
+        
+        Reads the group's result index, so the cost scales with the group's own
+        results rather than the keyspace. Results stored before the index existed
+        are found with a SCAN over the task ID prefix instead.
+        
+        Args:
+            parent_task_id: The parent task whose child results to read
+            task_id_prefix: Only return tasks whose ID starts with this prefix
+            
+        Returns:
+            Hydrated results keyed by task ID, in task ID order
+        """
+        task_ids = [task_id for task_id in await self.task_groups.result_task_ids(parent_task_id)
+                    if task_id.startswith(task_id_prefix)]
+        if not task_ids and task_id_prefix:
+            pattern = f"{self.TASK_STATUS_PREFIX}:{task_id_prefix}*:result"
+            prefix_length = len(self.TASK_STATUS_PREFIX) + 1
+            task_ids = sorted([
+                (key.decode() if isinstance(key, bytes) else key)[prefix_length:-len(":result")]
+                async for key in self.redis_client.scan_iter(match=pattern, count=1000)
+            ])
+        
+        results: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(task_ids), self.RESULT_READ_BATCH):
+            batch = task_ids[start:start + self.RESULT_READ_BATCH]
+            raws = await self.redis_client.mget([f"{self.TASK_STATUS_PREFIX}:{task_id}:result" for task_id in batch])
+            for task_id, raw in zip(batch, raws):
+                if raw:
+                    results[task_id] = await self.payload_store.hydrate(self.codec.loads(raw))
+        return results
+    
+    def resize_pool(self, pool: str, size: int):
+        """Grow or shrink a worker pool on this instance.
+        
+        Surplus workers are retired: they finish their current task and exit.
+        
+        Raises:
+            ValueError: If the pool is unknown or the size is negative
+        """
+        if pool not in POOL_NAMES:
+            raise ValueError(f"Unknown worker pool '{pool}'")
+        if size < 0:
+            raise ValueError("Worker pool size must not be negative")
+        
+        self.pool_sizes[pool] = size
+        if self.draining:
+            # Draining instances only finish what they hold
+            return
+        live = [w for w in self._pool_workers[pool] if w not in self._retired_workers]
+        for _ in range(size - len(live)):
+            worker_id = self._next_worker_id
+            self._next_worker_id += 1
+            worker = asyncio.create_task(self._worker(worker_id, pool))
+            self._pool_workers[pool][worker_id] = worker
+            self.active_workers.add(worker)
+            worker.add_done_callback(self.active_workers.discard)
+        # Retire the newest workers first
+        for worker_id in sorted(live, reverse=True)[:max(0, len(live) - size)]:
+            self._retired_workers.add(worker_id)
+        
+        if len(live) != size:
+            logger.info(f"Worker pool '{pool}' resized from {len(live)} to {size} workers")
+    
+    async def set_pool_size(self, pool: str, size: int):
+        """Set a pool's size on every worker instance.
+        
+        The size is stored in Redis and applied by each instance's pool
+        supervisor; a processing instance applies it immediately.
+        
+        Raises:
+            ValueError: If the pool is unknown or the size is negative
+        """
+        await self.worker_pools.set_size(pool, size)
+        if self._pool_supervisor_task is not None:
+            self._configured_pool_sizes[pool] = size
+            self.resize_pool(pool, size)
+    
+    def pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get size and utilization of this instance's worker pools."""
+        stats = {}
+        for pool in POOL_NAMES:
+            size = len([w for w in self._pool_workers[pool] if w not in self._retired_workers])
+            busy = self._pool_busy[pool]
+            stats[pool] = {
+                "size": size,
+                "busy": busy,
+                "processed": self._pool_processed[pool],
+                "utilization": round(busy / size, 3) if size else 0.0
+            }
+        return stats
+    
+    async def _pool_supervisor(self):
+        """Apply pool sizes set at runtime, report pool utilization and autoscale pools."""
+        while not self._shutdown:
+            try:
+                for pool, size in (await self.worker_pools.get_sizes()).items():
+                    if size != self._configured_pool_sizes.get(pool):
+                        self._configured_pool_sizes[pool] = size
+                        self.resize_pool(pool, size)
+                
+                await self.worker_pools.report(self.instance_id, self.pool_stats())
+                
+                if self.autoscaler is not None:
+                    await self._autoscale()
+                
+                await asyncio.sleep(self.pool_supervisor_interval)
+                
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.warning(f"Worker pool supervisor error: {e}")
+                await asyncio.sleep(self.pool_supervisor_interval)
+    
+    async def _autoscale(self):
+        """Resize this instance's pools and publish the recommended process count."""
+        cluster = await self.worker_pools.cluster_stats()
+        queued = await self.task_queue.pool_depths()
+        headroom = {
+            "search": self.rate_limiter.mcp_headroom(),
+            "llm": self.rate_limiter.llm_headroom()
+        }
+        
+        needed = {}
+        details = {}
+        for pool in POOL_NAMES:
+            pool_cluster = cluster["pools"].get(pool, {})
+            needed[pool] = self.autoscaler.needed_workers(
+                pool,
+                backlog=queued.get(pool, 0),
+                busy=pool_cluster.get("busy", 0),
+                cluster_size=pool_cluster.get("size", 0),
+                headroom=headroom.get(pool, 1.0)
+            )
+            size = self.pool_sizes[pool]
+            configured = self._configured_pool_sizes.get(pool)
+            if configured != 0:
+                # A pool sized through the admin API is never shrunk below that size;
+                # a pool sized to zero stays disabled
+                size = self.autoscaler.decide(pool, size, needed[pool], cluster["instances"],
+                                              floor=configured or 0)
+            if size != self.pool_sizes[pool]:
+                self.resize_pool(pool, size)
+            
+            p95 = self.autoscaler.p95_latency(pool)
+            details[pool] = {
+                "backlog": queued.get(pool, 0),
+                "p95_seconds": round(p95, 3) if p95 is not None else None,
+                "headroom": round(headroom.get(pool, 1.0), 3),
+                "size": size
+            }
+        
+        await self.autoscaler.publish_recommendation(needed, cluster["instances"], details)
+    
+    async def _worker(self, worker_id: int, pool: str = DEFAULT_POOL):
+        """Worker coroutine that processes tasks from one pool's queues."""
+        logger.info(f"Worker {worker_id} started in pool '{pool}'")
         
         # Publish worker started event
         await self.event_bus.publish_worker_event(
             event_type=MonitoringEventType.WORKER_STARTED.value,
             worker_id=worker_id,
-            message=f"Worker {worker_id} started"
+            message=f"Worker {worker_id} started in pool '{pool}'"
         )
         
-        # Start heartbeat task
+        consumer_id = self._consumer_id(worker_id)
+        
+        # Start heartbeat task; the heartbeat must exist before we claim work
+        # so the reaper does not mistake this consumer for a dead one
+        await self.redis_client.set(self.task_queue.heartbeat_key(consumer_id), "active", ex=self.heartbeat_ttl)
+        await self.task_queue.register_consumer(consumer_id)
         heartbeat_task = asyncio.create_task(self._worker_heartbeat(worker_id))
         
         try:
-            while not self._shutdown:
+            while not self._shutdown and not self.draining and worker_id not in self._retired_workers:
+                in_flight: List[Tuple[Task, str]] = []
                 try:
-                    # Get task from queue
-                    task = await self._get_next_task()
-                    if not task:
+                    # Claim task from the pool's queues into this worker's processing list
+                    claimed = await self._get_next_task(consumer_id, pool)
+                    if not claimed:
                         await asyncio.sleep(0.1)
                         continue
                     
-                    # Process task
-                    await self._process_task(task, worker_id)
+                    task, task_json = claimed
+                    in_flight = [claimed]
+                    self._pool_busy[pool] += 1
+                    started = time.monotonic()
+                    try:
+                        # Small LLM tasks of the same type and model are executed together
+                        batch = await self._claim_batch(consumer_id, task)
+                        if batch:
+                            batch.insert(0, claimed)
+                            in_flight = batch
+                            await self._process_batch([t for t, _ in batch], worker_id)
+                            await self.task_queue.ack_many(consumer_id, [(t.id, raw) for t, raw in batch])
+                            self._pool_processed[pool] += len(batch)
+                            self._observe_latency(pool, time.monotonic() - started, len(batch))
+                            continue
+                        
+                        # Process task, then acknowledge it. A task that is never
+                        # acknowledged is re-queued by the reaper.
+                        await self._process_task(task, worker_id)
+                        await self.task_queue.ack(consumer_id, task_json, task.id)
+                        self._pool_processed[pool] += 1
+                        self._observe_latency(pool, time.monotonic() - started, 1)
+                    finally:
+                        self._pool_busy[pool] -= 1
                     
                 except asyncio.CancelledError:
+                    if self.draining and in_flight:
+                        await self._requeue_drained(consumer_id, in_flight, worker_id)
                     logger.info(f"Worker {worker_id} cancelled")
                     break
                 except Exception as e:
                     logger.error(f"Worker {worker_id} error: {e}", exc_info=True)
                     await asyncio.sleep(1)
         finally:
+            self._pool_workers[pool].pop(worker_id, None)
+            self._retired_workers.discard(worker_id)
+            
             # Cancel heartbeat task
             heartbeat_task.cancel()
             try:
@@ -255,6 +682,13 @@ class ParallelTaskCoordinator:
             except asyncio.CancelledError:
                 pass
             
+            # Drop the heartbeat so any task left in flight is recovered promptly
+            try:
+                await self.redis_client.delete(self.task_queue.heartbeat_key(consumer_id))
+                await self.task_queue.unregister_consumer(consumer_id)
+            except Exception as e:
+                logger.warning(f"Worker {worker_id} failed to clean up consumer state: {e}")
+            
             # Publish worker stopped event
             await self.event_bus.publish_worker_event(
                 event_type=MonitoringEventType.WORKER_STOPPED.value,
@@ -264,19 +698,125 @@ class ParallelTaskCoordinator:
         
         logger.info(f"Worker {worker_id} stopped")
     
-    async def _get_next_task(self) -> Optional[Task]:
-        """Get next task from priority queues."""
-        # Check queues in priority order
-        for priority in [2, 1, 0]:  # High, normal, low
-            queue_key = self._get_queue_key(priority)
-            
-            # Try to pop from queue
-            task_json = await self.redis_client.rpop(queue_key)
-            if task_json:
-                task_data = json.loads(task_json)
-                return Task(**task_data)
+    async def _requeue_drained(self, consumer_id: str, in_flight: List[Tuple[Task, str]], worker_id: int):
+        """Re-queue tasks interrupted by a drain with the checkpoint of their progress."""
+        for task, task_json in in_flight:
+            try:
+                task.status = TaskStatus.PENDING
+                task.enqueued_at = time.time()
+                requeued_json = await self._serialize_task(task)
+                
+                # Queue the checkpointed copy before dropping the claimed one;
+                # a duplicate delivery is skipped once either completes
+                pipeline = self.redis_client.pipeline()
+                self.task_queue.enqueue(pipeline, requeued_json, task.priority, pool_for(str(task.type)))
+                pipeline.set(f"{self.TASK_STATUS_PREFIX}:{task.id}:status", TaskStatus.PENDING.value, ex=3600)
+                pipeline.set(f"{self.TASK_STATUS_PREFIX}:{task.id}:data", requeued_json, ex=3600)
+                await pipeline.execute()
+                await self.task_queue.ack(consumer_id, task_json, task.id)
+                self._drained_tasks += 1
+                
+                await self.event_bus.publish_task_event(
+                    event_type=MonitoringEventType.TASK_STALLED.value,
+                    task_id=task.id,
+                    parent_task_id=task.parent_task_id or task.payload.get('task_id'),
+                    worker_id=worker_id,
+                    status=TaskStatus.PENDING.value,
+                    meta={"action": "requeued", "reason": "drain", "checkpointed": task.checkpoint is not None}
+                )
+            except Exception as e:
+                # Left in flight; the reaper re-queues it without the checkpoint
+                logger.warning(f"Could not re-queue drained task {task.id}: {e}")
+    
+    def _observe_latency(self, pool: str, seconds: float, tasks: int):
+        """Record the worker time per task of a processed task or batch."""
+        if self.autoscaler is not None:
+            for _ in range(tasks):
+                self.autoscaler.observe(pool, seconds / tasks)
+    
+    async def _get_next_task(self, consumer_id: str, pool: str = DEFAULT_POOL) -> Optional[Tuple[Task, str]]:
+        """Claim next task from a pool's priority queues.
         
-        return None
+        Returns:
+            Tuple of the task and its raw serialized form (needed to acknowledge it),
+            or None if all of the pool's queues are empty
+        """
+        # Check queues in weighted round-robin order of priorities
+        task_json = await self.task_queue.claim(
+            consumer_id, self.priority_schedulers[pool].next_order(), pool
+        )
+        if not task_json:
+            return None
+        
+        try:
+            task = await self._deserialize_task(task_json)
+        except Exception as e:
+            await self._discard_unloadable_task(consumer_id, task_json, e)
+            return None
+        
+        self.queue_wait.observe(task.priority, task.enqueued_at)
+        return task, task_json
+    
+    async def _claim_batch(self, consumer_id: str, task: Task) -> List[Tuple[Task, str]]:
+        """Claim queued tasks that can be executed together with the given task.
+        
+        Returns:
+            Additional (task, raw serialized task) pairs, empty if the task is not batchable
+        """
+        task_type_str = task.type if isinstance(task.type, str) else task.type.value
+        if self.batch_size <= 1 or task_type_str not in self.BATCHABLE_TASK_TYPES:
+            return []
+        
+        raw_tasks = await self.task_queue.claim_batch(
+            consumer_id, task_type_str, task.model_type, task.priority, self.batch_size - 1
+        )
+        
+        batch = []
+        for task_json in raw_tasks:
+            try:
+                batch_task = await self._deserialize_task(task_json)
+            except Exception as e:
+                await self._discard_unloadable_task(consumer_id, task_json, e)
+                continue
+            self.queue_wait.observe(batch_task.priority, batch_task.enqueued_at)
+            batch.append((batch_task, task_json))
+        return batch
+    
+    async def _serialize_task(self, task: Task) -> str:
+        """Serialize a task for Redis, moving large payload fields to the blob store."""
+        task_data = task.model_dump()
+        task_data["payload"] = await self.payload_store.spill(task_data["payload"])
+        task_data["result"] = await self.payload_store.spill(task_data["result"])
+        task_data["checkpoint"] = await self.payload_store.spill(task_data["checkpoint"])
+        return self.codec.dumps(task_data)
+    
+    async def _deserialize_task(self, task_json: str) -> Task:
+        """Load a serialized task, restoring payload fields from the blob store."""
+        task_data = self.codec.loads(task_json)
+        task_data["payload"] = await self.payload_store.hydrate(task_data.get("payload"))
+        task_data["result"] = await self.payload_store.hydrate(task_data.get("result"))
+        task_data["checkpoint"] = await self.payload_store.hydrate(task_data.get("checkpoint"))
+        # Queued tasks were validated when submitted and written by _serialize_task,
+        # so the claim path rebuilds them without validation; only the timestamps
+        # need converting back
+        if "id" not in task_data or "type" not in task_data:
+            raise ValueError("Queued task has no id or type")
+        for field in self.TASK_TIMESTAMP_FIELDS:
+            if task_data.get(field):
+                task_data[field] = datetime.fromisoformat(task_data[field])
+        return Task.model_construct(**task_data)
+    
+    async def _discard_unloadable_task(self, consumer_id: str, task_json: str, error: Exception):
+        """Remove a claimed task that cannot be loaded so it is not re-delivered forever."""
+        task_id = self.task_queue._task_id(task_json)
+        if isinstance(error, LookupError) and task_id:
+            # The payload expired from the blob store; keep the task for inspection
+            logger.error(f"Dead-lettering task {task_id} with missing payload: {error}")
+            await self.task_queue.dead_letter(task_id, task_json, str(error))
+        else:
+            # Unparseable payloads would be re-delivered forever; drop them
+            logger.error(f"Discarding malformed task from queue: {error}")
+        await self.task_queue.discard(consumer_id, task_json, task_id)
     
     async def _process_task(self, task: Task, worker_id: int):
         """Process a single task with rate limiting."""
@@ -290,6 +830,13 @@ class ParallelTaskCoordinator:
         
         start_time = datetime.now(timezone.utc)
         
+        # Skip duplicate deliveries of a task that already completed
+        if await self.redis_client.exists(self._completion_key(task.id)):
+            logger.info(f"Worker {worker_id} skipping already completed task {task.id}")
+            # The delivery that completed it may have died before settling its group
+            await self._on_task_completed(task, parent_task_id)
+            return
+        
         try:
             # Update task status
             await self._update_task_status(task.id, TaskStatus.PROCESSING)
@@ -307,6 +854,7 @@ class ParallelTaskCoordinator:
                 retry_count=task.retry_count
             )
             
+            # Data aggregation extraction acquires the LLM rate limit per packed prompt
             llm_task_types = [TaskType.SUMMARIZATION, TaskType.DOK_CATEGORIZATION, 
                              TaskType.ENTITY_EXTRACTION, TaskType.REASONING]
             search_task_types = [TaskType.SEARCH, TaskType.DATA_AGGREGATION_SEARCH]
@@ -332,9 +880,9 @@ class ParallelTaskCoordinator:
             task.status = TaskStatus.COMPLETED
             task.result = result
             
-            # Store result
-            await self._store_task_result(task.id, result)
-            await self._update_task_status(task.id, TaskStatus.COMPLETED)
+            # Store result and its side effects before recording completion, so a
+            # delivery that fails or dies on the way is retried instead of skipped
+            await self._store_task_result(task.id, result, parent_task_id)
             
             # Check for data aggregation search tasks (handle both string and enum values)
             is_data_aggregation_task = (
@@ -345,10 +893,21 @@ class ParallelTaskCoordinator:
             
             if is_data_aggregation_task:
                 if self.data_aggregation_repository is None:
+                    # Skip storage if repository is not available
                     logger.error(f"Data aggregation repository is None for task {task.id} - cannot store results!")
-                    return  # Skip storage if repository is not available
-                await self._store_data_aggregation_search_result(task, result)
+                else:
+                    await self._store_data_aggregation_search_result(task, result)
+            
+            await self._update_task_status(task.id, TaskStatus.COMPLETED)
+            
+            # Completion is idempotent: only the first delivery to finish records it.
+            # Writes of a later delivery repeat the same result and sources.
+            if not await self._mark_completed(task.id, worker_id):
+                logger.info(f"Task {task.id} was already completed by another delivery")
+                return
             
+            # Results are stored; let waiters on the group know
+            await self._on_task_completed(task, parent_task_id)
             
             # Calculate duration
             duration_ms = int((datetime.now(timezone.utc) - start_time).total_seconds() * 1000)
@@ -373,48 +932,191 @@ class ParallelTaskCoordinator:
             # Calculate duration
             duration_ms = int((datetime.now(timezone.utc) - start_time).total_seconds() * 1000)
             
-            # Update task status
-            task.error = str(e)
-            task.retry_count += 1
+            await self._handle_task_failure(task, e, worker_id, parent_task_id, project_id,
+                                            task_type_str, duration_ms)
+    
+    async def _handle_task_failure(self, task: Task, e: Exception, worker_id: int,
+                                   parent_task_id: Optional[str], project_id: Optional[str],
+                                   task_type_str: str, duration_ms: int):
+        """Schedule a delayed retry for a failed task, or dead-letter it when retries are exhausted."""
+        # Update task status
+        task.error = str(e)
+        task.retry_count += 1
+        
+        if task.retry_count < task.max_retries:
+            # Schedule a delayed retry instead of hitting the provider again immediately
+            retry_delay = self.retry_policy.next_delay(
+                task.retry_count,
+                retry_after=RetryPolicy.retry_after_hint(e)
+            )
+            task.status = TaskStatus.RETRYING
+            await self._schedule_retry(task, retry_delay)
             
-            if task.retry_count < task.max_retries:
-                # Requeue for retry
-                task.status = TaskStatus.RETRYING
-                await self.submit_tasks([task])
-                
-                # Publish retry event
-                await self.event_bus.publish_task_event(
-                    event_type=MonitoringEventType.TASK_RETRY.value,
-                    task_id=task.id,
-                    parent_task_id=parent_task_id,
-                    project_id=project_id,
-                    task_type=task_type_str,
-                    worker_id=worker_id,
-                    status=TaskStatus.RETRYING.value,
-                    retry_count=task.retry_count,
-                    duration_ms=duration_ms,
-                    error=str(e)
-                )
-                
-                logger.info(f"Requeued task {task.id} for retry ({task.retry_count}/{task.max_retries})")
-            else:
-                # Mark as failed
-                await self._update_task_status(task.id, TaskStatus.FAILED)
-                await self._store_task_error(task.id, str(e))
-                
-                # Publish task failed event
-                await self.event_bus.publish_task_event(
-                    event_type=MonitoringEventType.TASK_FAILED.value,
+            # Publish retry event
+            await self.event_bus.publish_task_event(
+                event_type=MonitoringEventType.TASK_RETRY.value,
+                task_id=task.id,
+                parent_task_id=parent_task_id,
+                project_id=project_id,
+                task_type=task_type_str,
+                worker_id=worker_id,
+                status=TaskStatus.RETRYING.value,
+                retry_count=task.retry_count,
+                duration_ms=duration_ms,
+                error=str(e),
+                meta={"retry_in_ms": int(retry_delay * 1000)}
+            )
+            
+            logger.info(f"Scheduled task {task.id} for retry in {retry_delay:.1f}s ({task.retry_count}/{task.max_retries})")
+        else:
+            # Mark as failed and park in the dead-letter queue for inspection
+            task.status = TaskStatus.FAILED
+            await self._update_task_status(task.id, TaskStatus.FAILED)
+            await self._store_task_error(task.id, str(e))
+            await self.task_queue.dead_letter(task.id, await self._serialize_task(task), str(e))
+            await self._settle_task(task, parent_task_id, TaskStatus.FAILED)
+            await self._fail_dependents(task.id, str(e))
+            
+            # Publish task failed event
+            await self.event_bus.publish_task_event(
+                event_type=MonitoringEventType.TASK_FAILED.value,
+                task_id=task.id,
+                parent_task_id=parent_task_id,
+                project_id=project_id,
+                task_type=task_type_str,
+                worker_id=worker_id,
+                status=TaskStatus.FAILED.value,
+                retry_count=task.retry_count,
+                duration_ms=duration_ms,
+                error=str(e)
+            )
+
+    async def _process_batch(self, tasks: List[Task], worker_id: int):
+        """Process a micro-batch of compatible tasks.
+        
+        Status updates, results and monitoring events for the whole batch are
+        written in one pipeline each instead of per task. Tasks that fail are
+        retried or dead-lettered individually.
+        """
+        logger.info(f"Worker {worker_id} processing batch of {len(tasks)} tasks (type: {tasks[0].type})")
+        
+        start_time = datetime.now(timezone.utc)
+        task_type_str = tasks[0].type if isinstance(tasks[0].type, str) else tasks[0].type.value
+        
+        # Skip duplicate deliveries of tasks that already completed
+        pipeline = self.redis_client.pipeline()
+        for task in tasks:
+            pipeline.exists(self._completion_key(task.id))
+        completed = await pipeline.execute()
+        for task, done in zip(tasks, completed):
+            if done:
+                logger.info(f"Worker {worker_id} skipping already completed task {task.id}")
+                await self._on_task_completed(task, task.parent_task_id or task.payload.get('task_id'))
+        tasks = [task for task, done in zip(tasks, completed) if not done]
+        if not tasks:
+            return
+        
+        # Resolve monitoring metadata
+        metadata = {}
+        for task in tasks:
+            parent_task_id = task.parent_task_id or task.payload.get('task_id')
+            metadata[task.id] = (parent_task_id, await self._resolve_project_id(task, parent_task_id))
+        
+        pipeline = self.redis_client.pipeline()
+        for task in tasks:
+            task.started_at = start_time
+            pipeline.set(f"{self.TASK_STATUS_PREFIX}:{task.id}:status", TaskStatus.PROCESSING.value, ex=3600)
+        await pipeline.execute()
+        
+        await self.event_bus.publish_many([
+            self.event_bus.build_task_event(
+                event_type=MonitoringEventType.TASK_STARTED.value,
+                task_id=task.id,
+                parent_task_id=metadata[task.id][0],
+                project_id=metadata[task.id][1],
+                task_type=task_type_str,
+                worker_id=worker_id,
+                status=TaskStatus.PROCESSING.value,
+                retry_count=task.retry_count
+            )
+            for task in tasks
+        ])
+        
+        outcomes = await self._execute_batch(tasks)
+        
+        completed_at = datetime.now(timezone.utc)
+        duration_ms = int((completed_at - start_time).total_seconds() * 1000)
+        succeeded = [(task, result) for task, result in zip(tasks, outcomes)
+                     if not isinstance(result, BaseException)]
+        
+        # Results are written in the same transaction as the completion marks, so a
+        # task is never marked completed without its result. Completion is
+        # idempotent: only the first delivery to finish records it.
+        marked = []
+        if succeeded:
+            stored_results = [await self.payload_store.spill(result) for _, result in succeeded]
+            pipeline = self.redis_client.pipeline()
+            for (task, _), stored_result in zip(succeeded, stored_results):
+                pipeline.set(f"{self.TASK_STATUS_PREFIX}:{task.id}:result", self.codec.dumps(stored_result), ex=86400)
+                pipeline.set(f"{self.TASK_STATUS_PREFIX}:{task.id}:status", TaskStatus.COMPLETED.value, ex=3600)
+                if metadata[task.id][0]:
+                    self.task_groups.index_result(pipeline, metadata[task.id][0], task.id)
+            for task, _ in succeeded:
+                pipeline.set(self._completion_key(task.id), self._consumer_id(worker_id), nx=True, ex=86400)
+            marked = (await pipeline.execute())[-len(succeeded):]
+        
+        winners = []
+        for (task, result), was_marked in zip(succeeded, marked):
+            if not was_marked:
+                logger.info(f"Task {task.id} was already completed by another delivery")
+                continue
+            task.completed_at = completed_at
+            task.status = TaskStatus.COMPLETED
+            task.result = result
+            winners.append(task)
+        
+        if winners:
+            await asyncio.gather(*[
+                self._on_task_completed(task, metadata[task.id][0]) for task in winners
+            ])
+            
+            await self.event_bus.publish_many([
+                self.event_bus.build_task_event(
+                    event_type=MonitoringEventType.TASK_COMPLETED.value,
                     task_id=task.id,
-                    parent_task_id=parent_task_id,
-                    project_id=project_id,
+                    parent_task_id=metadata[task.id][0],
+                    project_id=metadata[task.id][1],
                     task_type=task_type_str,
                     worker_id=worker_id,
-                    status=TaskStatus.FAILED.value,
-                    retry_count=task.retry_count,
-                    duration_ms=duration_ms,
-                    error=str(e)
+                    status=TaskStatus.COMPLETED.value,
+                    duration_ms=duration_ms
                 )
+                for task in winners
+            ])
+        
+        for task, outcome in zip(tasks, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Worker {worker_id} failed task {task.id}: {outcome}")
+                await self._handle_task_failure(task, outcome, worker_id, metadata[task.id][0],
+                                                metadata[task.id][1], task_type_str, duration_ms)
+        
+        logger.info(f"Worker {worker_id} completed {len(winners)}/{len(tasks)} batched tasks")
+    
+    async def _execute_batch(self, tasks: List[Task]) -> List[Any]:
+        """Execute a micro-batch of tasks of the same type and model.
+        
+        Returns:
+            One result dictionary or exception per task, in input order
+        """
+        task_type_str = tasks[0].type if isinstance(tasks[0].type, str) else tasks[0].type.value
+        if task_type_str == TaskType.DATA_AGGREGATION_EXTRACT.value:
+            return await self._execute_data_aggregation_extract_batch(tasks)
+        
+        async def execute(task: Task) -> Dict[str, Any]:
+            await self.rate_limiter.acquire_llm(task.model_type)
+            return await self._execute_task(task)
+        
+        return list(await asyncio.gather(*[execute(task) for task in tasks], return_exceptions=True))
     
     async def _execute_task(self, task: Task) -> Dict[str, Any]:
         """Execute the actual task."""
@@ -436,13 +1138,9 @@ class ParallelTaskCoordinator:
                     "processed_at": datetime.now(timezone.utc).isoformat()
                 }
         except Exception as e:
+            # Propagate so the failure is retried with backoff or dead-lettered
             logger.error(f"Task execution failed: {e}", exc_info=True)
-            return {
-                "status": "failed",
-                "task_type": task.type if isinstance(task.type, str) else task.type.value,
-                "error": str(e),
-                "processed_at": datetime.now(timezone.utc).isoformat()
-            }
+            raise
     
     async def _execute_data_aggregation_search(self, task: Task) -> Dict[str, Any]:
         """Execute data aggregation search task with high result limit."""
@@ -466,8 +1164,12 @@ class ParallelTaskCoordinator:
             # Initialize the search client to ensure connections are ready
             await search_client.initialize()
             
-            # Use the unified search_web method which handles result processing properly
-            all_results = await search_client.search_web(query, max_results=20)
+            # Resume with the results found before a drain interrupted the task
+            all_results = (task.checkpoint or {}).get("results")
+            if all_results is None:
+                # Use the unified search_web method which handles result processing properly
+                all_results = await search_client.search_web(query, max_results=20)
+                task.checkpoint = {"results": all_results}
             
             # If no results found, try a more general search approach
             if not all_results:
@@ -504,50 +1206,298 @@ class ParallelTaskCoordinator:
     
     async def _execute_data_aggregation_extract(self, task: Task) -> Dict[str, Any]:
         """Execute data aggregation extraction task."""
+        outcome = (await self._execute_data_aggregation_extract_batch([task]))[0]
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+    
+    async def _execute_data_aggregation_extract_batch(self, tasks: List[Task]) -> List[Any]:
+        """Execute extraction tasks, packing short documents into shared prompts.
+        
+        A task extracts either the content in its payload or, when it depends on
+        search tasks, the content of their results. Documents are grouped by
+        entity type, attributes and domain hint; each group is packed up to the
+        batch character budget and every packed prompt acquires the LLM rate
+        limit once. Documents over the extraction token budget are first split
+        into overlapping chunks, whose entities are merged per document.
+        
+        Returns:
+            One result dictionary or exception per task, in input order
+        """
         # Import here to avoid circular dependencies
+        from ..agents.aggregation.content_chunker import ContentChunker
         from ..agents.aggregation.entity_extractor import EntityExtractor
         from ..domain_processors.registry import get_global_registry
         from ..llm import LLMClient
         
-        try:
-            # Get content and parameters from task payload
-            content = task.payload.get("content", "")
-            entity_type = task.payload.get("entity_type", "")
-            attributes = task.payload.get("attributes", [])
-            domain_hint = task.payload.get("domain_hint")
-            
-            if not content:
-                raise ValueError("Missing content in task payload")
+        outcomes: List[Any] = [None] * len(tasks)
+        entities_by_task: Dict[int, List[Dict[str, Any]]] = {}
+        # (task index, document number) -> entities of each chunk of the document
+        chunk_entities: Dict[Tuple[int, int], List[List[Dict[str, Any]]]] = {}
+        # (task index, document number, chunk number, chunk, digest)
+        documents: List[Tuple[int, int, int, str, str]] = []
+        groups: Dict[tuple, List[int]] = {}
+        chunker = ContentChunker()
+        
+        for index, task in enumerate(tasks):
+            try:
+                contents = await self._extraction_contents(task)
+            except Exception as e:
+                outcomes[index] = e
+                continue
             
-            # Initialize entity extractor with LLM client
-            llm_client = LLMClient()
+            entities_by_task[index] = []
+            key = (
+                task.payload.get("entity_type", ""),
+                tuple(task.payload.get("attributes", [])),
+                task.payload.get("domain_hint")
+            )
+            # Documents extracted before a drain interrupted the task are not sent again
+            extracted = (task.checkpoint or {}).get("extracted", {})
+            for number, content in enumerate(contents):
+                chunks = chunker.split(content)
+                chunk_entities[(index, number)] = [[] for _ in chunks]
+                for chunk_number, chunk in enumerate(chunks):
+                    digest = hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+                    if digest in extracted:
+                        chunk_entities[(index, number)][chunk_number] = extracted[digest]
+                        continue
+                    groups.setdefault(key, []).append(len(documents))
+                    documents.append((index, number, chunk_number, chunk, digest))
+        
+        packs = []
+        if groups:
+            llm_client = self.llm_client or LLMClient()
             entity_extractor = EntityExtractor(llm_client)
             
-            # Initialize domain processors with LLM client if domain hint is provided
-            if domain_hint:
-                domain_registry = get_global_registry()
-                processor = domain_registry.get_processor_by_hint(domain_hint)
-                if processor and hasattr(processor, 'llm_client'):
-                    processor.llm_client = llm_client
-            
-            # Extract entities
-            entities = await entity_extractor.extract(content, entity_type, attributes, domain_hint)
-            
-            logger.info(f"Entity extraction completed for task {task.id}: {len(entities)} entities")
-            
-            # Log the extracted entities for debugging
-            logger.debug(f"Extracted entities for task {task.id}: {entities}")
+            for key, document_indexes in groups.items():
+                domain_hint = key[2]
+                if domain_hint:
+                    processor = get_global_registry().get_processor_by_hint(domain_hint)
+                    if processor and hasattr(processor, 'llm_client'):
+                        processor.llm_client = llm_client
+                
+                if entity_extractor.supports_packing(domain_hint):
+                    contents = [documents[d][3] for d in document_indexes]
+                    for pack in EntityExtractor.pack_documents(contents, self.batch_max_chars):
+                        packs.append((key, [document_indexes[j] for j in pack]))
+                else:
+                    packs.extend((key, [d]) for d in document_indexes)
+        
+        async def extract_pack(key: tuple, document_indexes: List[int]):
+            entity_type, attributes, domain_hint = key
+            model_type = tasks[documents[document_indexes[0]][0]].model_type
+            try:
+                await self.rate_limiter.acquire_llm(model_type)
+                extracted = await entity_extractor.extract_many(
+                    [documents[d][3] for d in document_indexes],
+                    entity_type, list(attributes), domain_hint,
+                    acquire_llm=lambda: self.rate_limiter.acquire_llm(model_type)
+                )
+            except Exception as e:
+                logger.error(f"Entity extraction failed for {len(document_indexes)} documents: {e}", exc_info=True)
+                for d in document_indexes:
+                    outcomes[documents[d][0]] = e
+                return
+            for d, entities in zip(document_indexes, extracted):
+                index, number, chunk_number, _, digest = documents[d]
+                chunk_entities[(index, number)][chunk_number] = entities
+                checkpoint = tasks[index].checkpoint = tasks[index].checkpoint or {}
+                checkpoint.setdefault("extracted", {})[digest] = entities
+        
+        await asyncio.gather(*[extract_pack(key, indexes) for key, indexes in packs])
+        
+        for (index, _), entity_lists in chunk_entities.items():
+            # Overlapping chunks of a document repeat the entities near their boundaries
+            entities_by_task[index].extend(
+                entity_lists[0] if len(entity_lists) == 1 else EntityExtractor.merge_entities(entity_lists)
+            )
+        
+        for index, entities in entities_by_task.items():
+            if outcomes[index] is None:
+                outcomes[index] = self._extraction_result(tasks[index], entities)
+                logger.info(f"Entity extraction completed for task {tasks[index].id}: {len(entities)} entities")
+        
+        logger.info(f"Entity extraction completed for {len(tasks)} tasks in {len(packs)} prompts")
+        return outcomes
+    
+    async def _extraction_contents(self, task: Task) -> List[str]:
+        """Get the documents an extraction task extracts entities from.
+        
+        Tasks without content in their payload read the results of the search
+        tasks they depend on. Each source URL is extracted once per parent task,
+        and so is each group of near-duplicate contents found under different URLs.
+        """
+        content = task.payload.get("content", "")
+        if content:
+            return [content]
+        if not task.depends_on:
+            raise ValueError("Missing content in task payload")
+        
+        pipeline = self.redis_client.pipeline()
+        for dependency in task.depends_on:
+            pipeline.get(f"{self.TASK_STATUS_PREFIX}:{dependency}:result")
+        raw_results = await pipeline.execute()
+        
+        sources = []
+        for raw in raw_results:
+            if not raw:
+                continue
+            search_task_result = await self.payload_store.hydrate(self.codec.loads(raw))
+            for search_result in search_task_result.get("results", []):
+                content = self._search_result_content(search_result)
+                if content and content.strip():
+                    sources.append((search_result.get('url') or content[:200], content))
+        
+        parent_task_id = task.parent_task_id or task.payload.get('task_id')
+        if parent_task_id and sources:
+            claimed = await self.task_groups.claim_sources(parent_task_id, task.id, [url for url, _ in sources])
+            sources = [(url, content) for url, content in sources if url in claimed]
             
-            return {
-                "status": "completed",
-                "task_type": task.type if isinstance(task.type, str) else task.type.value,
-                "entities": entities,
-                "processed_at": datetime.now(timezone.utc).isoformat()
-            }
+            if self.source_dedup_distance >= 0:
+                fingerprints = {
+                    url: simhash(content) for url, content in sources if word_count(content) >= MIN_WORDS
+                }
+                kept = await self.task_groups.claim_fingerprints(parent_task_id, fingerprints, self.source_dedup_distance)
+                if len(kept) < len(fingerprints):
+                    logger.info(f"Skipping {len(fingerprints) - len(kept)} near-duplicate sources for task {task.id}")
+                sources = [(url, content) for url, content in sources if url not in fingerprints or url in kept]
+        
+        return list({url: content for url, content in sources}.values())
+    
+    @staticmethod
+    def _extraction_result(task: Task, entities: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the result dictionary of an extraction task."""
+        return {
+            "status": "completed",
+            "task_type": task.type if isinstance(task.type, str) else task.type.value,
+            "entities": entities,
+            "processed_at": datetime.now(timezone.utc).isoformat()
+        }
+    
+    async def _schedule_retry(self, task: Task, delay: float):
+        """Store a failed task and schedule it to be re-queued after a delay."""
+        task.enqueued_at = time.time() + delay
+        task_json = await self._serialize_task(task)
+        
+        pipeline = self.redis_client.pipeline()
+        pipeline.set(f"{self.TASK_STATUS_PREFIX}:{task.id}:status", TaskStatus.RETRYING.value, ex=3600)
+        pipeline.set(f"{self.TASK_STATUS_PREFIX}:{task.id}:data", task_json, ex=3600)
+        await pipeline.execute()
+        
+        await self.task_queue.schedule(task_json, time.time() + delay)
+    
+    async def list_dead_letters(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Get tasks that exhausted their retries, most recent first."""
+        return await self.task_queue.list_dead_letters(limit)
+    
+    async def requeue_dead_letter(self, task_id: str) -> Optional[Task]:
+        """Move a dead-lettered task back onto its queue with a fresh retry budget.
+        
+        Returns:
+            The re-queued task, or None if it was not in the dead-letter queue
+        """
+        entry = await self.task_queue.pop_dead_letter(task_id)
+        if entry is None:
+            return None
+        
+        task = await self._deserialize_task(self.codec.dumps(entry["task"]))
+        task.retry_count = 0
+        task.error = None
+        task.status = TaskStatus.PENDING
+        
+        await self.redis_client.delete(f"{self.TASK_STATUS_PREFIX}:{task.id}:error")
+        await self.submit_tasks([task])
+        logger.info(f"Re-queued dead-lettered task {task.id}")
+        return task
+    
+    async def wait_for_group(self,
+                             parent_task_id: str,
+                             on_progress: Optional[ProgressCallback] = None,
+                             timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Wait until every task submitted under a parent task has completed or failed.
+        
+        Completion is pushed by the workers, so waiting costs no status polling.
+        
+        Args:
+            parent_task_id: The parent task whose child tasks to wait for
+            on_progress: Optional callback invoked with progress counts
+                ({"pending", "completed", "failed"}) as tasks finish
+            timeout: Optional maximum time to wait in seconds
             
+        Returns:
+            Final progress counts of the group
+        """
+        return await self.task_groups.wait(parent_task_id, on_progress=on_progress, timeout=timeout)
+    
+    async def _on_task_completed(self, task: Task, parent_task_id: Optional[str]):
+        """Settle a completed task in its group and release tasks depending on it."""
+        await self._settle_task(task, parent_task_id, TaskStatus.COMPLETED)
+        try:
+            released = await self.task_dag.release(task.id)
         except Exception as e:
-            logger.error(f"Entity extraction failed for task {task.id}: {e}", exc_info=True)
-            raise
+            # A redelivery of the task releases its dependents when it finds it completed
+            logger.warning(f"Failed to release dependents of task {task.id}: {e}")
+            return
+        if released:
+            logger.info(f"Task {task.id} released {len(released)} dependent tasks")
+    
+    async def _fail_dependents(self, task_id: str, error: str):
+        """Fail every held task that depends on a task that will never complete."""
+        for dependent_id in await self.task_dag.pop_dependents(task_id):
+            task_json = await self.task_dag.discard(dependent_id)
+            if task_json:
+                await self._fail_held_task(await self._deserialize_task(task_json),
+                                           f"Dependency {task_id} failed: {error}")
+    
+    async def _fail_held_task(self, task: Task, error: str):
+        """Mark a task that never ran as failed because of a failed dependency."""
+        logger.warning(f"Failing task {task.id}: {error}")
+        task.status = TaskStatus.FAILED
+        task.error = error
+        await self._update_task_status(task.id, TaskStatus.FAILED)
+        await self._store_task_error(task.id, error)
+        
+        parent_task_id = task.parent_task_id or task.payload.get('task_id')
+        await self.event_bus.publish_task_event(
+            event_type=MonitoringEventType.TASK_FAILED.value,
+            task_id=task.id,
+            parent_task_id=parent_task_id,
+            project_id=await self._resolve_project_id(task, parent_task_id),
+            task_type=task.type if isinstance(task.type, str) else task.type.value,
+            status=TaskStatus.FAILED.value,
+            error=error
+        )
+        await self._settle_task(task, parent_task_id, TaskStatus.FAILED)
+        await self._fail_dependents(task.id, error)
+    
+    async def _settle_task(self, task: Task, parent_task_id: Optional[str], status: TaskStatus):
+        """Record a task's terminal status in its group and in those of its suppressed duplicates."""
+        try:
+            if parent_task_id:
+                await self.task_groups.settle(parent_task_id, task.id, status.value)
+            for follower_parent_id, follower_id in await self.deduplicator.pop_followers(task.id):
+                await self.task_groups.settle(follower_parent_id, follower_id, status.value)
+            if status == TaskStatus.FAILED and task.idempotency_key:
+                # A failed task must not suppress resubmissions of itself
+                await self.deduplicator.release(task.idempotency_key, task.id)
+        except Exception as e:
+            logger.warning(f"Failed to settle task {task.id} in group {parent_task_id}: {e}")
+    
+    def _completion_key(self, task_id: str) -> str:
+        """Get Redis key marking a task as completed."""
+        return f"{self.TASK_STATUS_PREFIX}:{task_id}:completed"
+    
+    async def _mark_completed(self, task_id: str, worker_id: int) -> bool:
+        """Record task completion exactly once.
+        
+        Returns:
+            True if this call recorded the completion, False if it was already recorded
+        """
+        marked = await self.redis_client.set(
+            self._completion_key(task_id), self._consumer_id(worker_id), nx=True, ex=86400
+        )
+        return bool(marked)
     
     async def _update_task_status(self, task_id: str, status: TaskStatus):
         """Update task status in Redis."""
@@ -555,10 +1505,15 @@ class ParallelTaskCoordinator:
         await self.redis_client.set(status_key, status.value, ex=3600)
         logger.debug(f"Updated task status for {task_id}: {status.value}")
     
-    async def _store_task_result(self, task_id: str, result: Dict[str, Any]):
-        """Store task result in Redis."""
+    async def _store_task_result(self, task_id: str, result: Dict[str, Any], parent_task_id: Optional[str] = None):
+        """Store task result in Redis and index it under its parent task."""
         result_key = f"{self.TASK_STATUS_PREFIX}:{task_id}:result"
-        await self.redis_client.set(result_key, json.dumps(result), ex=86400)  # 24 hour TTL
+        stored_result = await self.payload_store.spill(result)
+        pipeline = self.redis_client.pipeline()
+        pipeline.set(result_key, self.codec.dumps(stored_result), ex=86400)  # 24 hour TTL
+        if parent_task_id:
+            self.task_groups.index_result(pipeline, parent_task_id, task_id)
+        await pipeline.execute()
     
     async def _store_task_error(self, task_id: str, error: str):
         """Store task error in Redis."""
@@ -566,11 +1521,9 @@ class ParallelTaskCoordinator:
         await self.redis_client.set(error_key, error, ex=86400)
     
     async def _all_queues_empty(self) -> bool:
-        """Check if all priority queues are empty."""
+        """Check if all priority queues of all pools are empty."""
         for priority in [0, 1, 2]:
-            queue_key = self._get_queue_key(priority)
-            length = await self.redis_client.llen(queue_key)
-            if length > 0:
+            if await self.task_queue.depth(priority) > 0:
                 return False
         return True
     
@@ -580,7 +1533,6 @@ class ParallelTaskCoordinator:
             # For data aggregation search tasks, we just need to store the search results
             # The data aggregation orchestrator will collect them and process entities
             search_results = result.get("results", [])
-            stored_count = 0
             
             # Check if data_aggregation_repository is available
             if self.data_aggregation_repository is None:
@@ -591,17 +1543,10 @@ class ParallelTaskCoordinator:
             if not search_results:
                 return
             
-            # Store each search result in the database using the knowledge base
+            # Collect the search results and store them in one bulk write
+            sources = []
             for i, search_result in enumerate(search_results):
-                # Extract content from result - try multiple field names
-                content = (
-                    search_result.get('content') or 
-                    search_result.get('text') or 
-                    search_result.get('description') or 
-                    search_result.get('snippet') or 
-                    search_result.get('body') or 
-                    ""
-                )
+                content = self._search_result_content(search_result)
                 
                 if content and content.strip():
                     # Create unique source ID - use the parent task_id for consistency
@@ -625,7 +1570,6 @@ class ParallelTaskCoordinator:
                         logger.error(f"Task payload: {task.payload}")
                         continue  # Skip this result if we don't have a parent task ID
                     
-                    # Log the metadata being stored for debugging
                     metadata_to_store = {
                         "task_id": parent_task_id,
                         "search_query": task.payload.get("query", ""),
@@ -641,23 +1585,21 @@ class ParallelTaskCoordinator:
                         except (TypeError, ValueError):
                             metadata_to_store["search_subspace"] = str(metadata_to_store["search_subspace"])
                     
-                    logger.info(f"Storing result {i} for parent_task_id={parent_task_id}")
-                    
-                    # Store source in database with proper metadata structure
-                    await self.data_aggregation_repository.store_source({
+                    # Source with proper metadata structure
+                    sources.append({
                         "source_id": source_id,
                         "url": search_result.get('url', ''),
                         "title": truncated_title,
                         "description": content[:500] if content else '',
+                        "content_hash": content_hash(content),
                         "source_type": "web_search",
                         "provider": search_result.get('provider', search_result.get('tool', 'unknown')),
                         "metadata": metadata_to_store
                     })
-                    
-                    stored_count += 1
             
-            if stored_count > 0:
-                logger.info(f"Stored {stored_count} search results for task {task.id}")
+            if sources:
+                stored_count = await self.data_aggregation_repository.store_sources(sources)
+                logger.info(f"Stored {stored_count} of {len(sources)} search results for task {task.id}")
             
         except Exception as e:
             logger.error(f"Error storing data aggregation search result for task {task.id}: {str(e)}")
@@ -665,49 +1607,78 @@ class ParallelTaskCoordinator:
             logger.error(f"Result data: {result}")
             raise  # Re-raise the exception so it's properly handled
     
+    @staticmethod
+    def _search_result_content(search_result: Dict[str, Any]) -> str:
+        """Extract content from a search result - try multiple field names."""
+        return (
+            search_result.get('content') or 
+            search_result.get('text') or 
+            search_result.get('description') or 
+            search_result.get('snippet') or 
+            search_result.get('body') or 
+            ""
+        )
+    
     async def _resolve_project_id(self, task: Task, parent_task_id: Optional[str]) -> Optional[str]:
-        """Resolve project ID for monitoring events."""
+        """Resolve project ID for monitoring events.
+        
+        Tasks carry their project in the payload once submitted; other lookups
+        go through an in-process cache that also remembers unknown parents.
+        """
+        # Try task payload first
+        project_id = task.payload.get('project_id')
+        if project_id or not parent_task_id:
+            return project_id
+        
+        hit, project_id = self._project_ids.get(parent_task_id)
+        if hit:
+            return project_id
+        
         try:
-            # Try task payload first
-            project_id = task.payload.get('project_id')
-            if project_id:
-                return project_id
-            
-            # Try cached metadata
-            if parent_task_id:
-                meta_key = f"nexus:task_meta:{parent_task_id}"
-                cached_project_id = await self.redis_client.hget(meta_key, "project_id")
-                if cached_project_id:
-                    return cached_project_id.decode() if isinstance(cached_project_id, bytes) else cached_project_id
-                
-                # Try knowledge base lookup (if available)
-                # Note: This requires access to the knowledge base, which we'll handle gracefully
-                try:
-                    # Import here to avoid circular imports
-                    from ...api import global_kb
-                    if global_kb:
-                        task_data = await global_kb.get_research_task(parent_task_id)
-                        if task_data and task_data.get('project_id'):
-                            project_id = task_data['project_id']
-                            # Cache for future use
-                            await self.redis_client.hset(meta_key, "project_id", project_id)
-                            await self.redis_client.expire(meta_key, 86400)  # 24 hour TTL
-                            return project_id
-                except Exception as e:
-                    logger.debug(f"Could not resolve project_id via KB for {parent_task_id}: {e}")
-            
-            return None
-            
+            project_id = await self._lookup_project_id(parent_task_id)
         except Exception as e:
+            # Not cached, so the lookup is retried once Redis or the database recovers
             logger.warning(f"Error resolving project_id: {e}")
             return None
+        
+        self._project_ids.set(parent_task_id, project_id,
+                              ttl=None if project_id else self.project_cache_negative_ttl)
+        return project_id
+    
+    async def _lookup_project_id(self, parent_task_id: str) -> Optional[str]:
+        """Look up a parent task's project in Redis, then in the knowledge base."""
+        # Try cached metadata
+        meta_key = f"nexus:task_meta:{parent_task_id}"
+        cached_project_id = await self.redis_client.hget(meta_key, "project_id")
+        if cached_project_id:
+            return cached_project_id.decode() if isinstance(cached_project_id, bytes) else cached_project_id
+        
+        # Try knowledge base lookup (if available)
+        knowledge_base = getattr(self.data_aggregation_repository, 'knowledge_base', None)
+        if knowledge_base is None:
+            return None
+        try:
+            task_data = await knowledge_base.get_research_task(parent_task_id)
+        except Exception as e:
+            logger.debug(f"Could not resolve project_id via KB for {parent_task_id}: {e}")
+            return None
+        
+        if task_data and task_data.get('project_id'):
+            project_id = str(task_data['project_id'])
+            # Share with other workers
+            pipeline = self.redis_client.pipeline()
+            pipeline.hset(meta_key, "project_id", project_id)
+            pipeline.expire(meta_key, 86400)  # 24 hour TTL
+            await pipeline.execute()
+            return project_id
+        return None
     
     async def _worker_heartbeat(self, worker_id: int):
         """Send periodic heartbeat for worker."""
         while not self._shutdown:
             try:
                 # Store heartbeat in Redis with TTL
-                heartbeat_key = f"nexus:worker:heartbeat:{worker_id}"
+                heartbeat_key = self.task_queue.heartbeat_key(self._consumer_id(worker_id))
                 await self.redis_client.set(heartbeat_key, "active", ex=self.heartbeat_ttl)
                 
                 # Publish heartbeat event
@@ -724,6 +1695,61 @@ class ParallelTaskCoordinator:
                 logger.warning(f"Worker {worker_id} heartbeat error: {e}")
                 await asyncio.sleep(self.heartbeat_interval)
     
+    def start_queue_reaper(self):
+        """Start background task that re-queues orphaned and expired tasks."""
+        if self._reaper_task is None:
+            self._reaper_task = asyncio.create_task(self._queue_reaper())
+    
+    async def _queue_reaper(self):
+        """Periodically recover tasks from dead workers and expired leases."""
+        while not self._shutdown:
+            try:
+                requeued = await self.task_queue.reap()
+                for task_id in requeued:
+                    await self.event_bus.publish_task_event(
+                        event_type=MonitoringEventType.TASK_STALLED.value,
+                        task_id=task_id,
+                        status=TaskStatus.PENDING.value,
+                        meta={"action": "requeued"}
+                    )
+                
+                # Stream queues keep acknowledged tasks for replay until trimmed
+                await self.task_queue.trim()
+                
+                # Blobs outlive the Redis keys referencing them; purge expired ones hourly
+                if time.time() - self._last_blob_purge > 3600:
+                    self._last_blob_purge = time.time()
+                    await self.payload_store.purge(self.blob_ttl)
+                
+                await asyncio.sleep(self.reaper_interval)
+                
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.warning(f"Queue reaper error: {e}")
+                await asyncio.sleep(self.reaper_interval)
+    
+    def start_retry_promoter(self):
+        """Start background task that queues delayed retries once they are due."""
+        if self._promoter_task is None:
+            self._promoter_task = asyncio.create_task(self._retry_promoter())
+    
+    async def _retry_promoter(self):
+        """Move due tasks from the scheduled set onto their priority queues."""
+        while not self._shutdown:
+            try:
+                promoted = await self.task_queue.promote_due()
+                if promoted:
+                    logger.info(f"Promoted {promoted} delayed retries to the task queues")
+                
+                await asyncio.sleep(self.retry_promote_interval)
+                
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.warning(f"Retry promoter error: {e}")
+                await asyncio.sleep(self.retry_promote_interval)
+    
     async def start_queue_depth_monitor(self):
         """Start background task to monitor queue depths."""
         if not hasattr(self, '_queue_monitor_task') or self._queue_monitor_task is None:
@@ -733,16 +1759,23 @@ class ParallelTaskCoordinator:
         """Monitor queue depths and publish updates."""
         while not self._shutdown:
             try:
-                # Get queue depths
+                # Get queue depths, summed across pools, and per pool
                 queue_stats = {}
-                for priority_name in ["high_priority", "normal_priority", "low_priority"]:
-                    queue_key = f"{self.TASK_QUEUE_PREFIX}:{priority_name}"
-                    depth = await self.redis_client.llen(queue_key)
-                    queue_stats[priority_name] = depth
+                for priority, priority_name in self.task_queue.PRIORITY_NAMES.items():
+                    queue_stats[priority_name] = await self.task_queue.depth(priority)
+                for pool, depth in (await self.task_queue.pool_depths()).items():
+                    queue_stats[f"{pool}_pool"] = depth
+                
+                # Average Redis memory of a queued task, to size the payload threshold
+                bytes_per_task = await self.task_queue.memory_per_task()
+                if bytes_per_task is not None:
+                    queue_stats["bytes_per_task"] = bytes_per_task
                 
-                # Publish queue depth update
+                # Publish queue depth update with queue wait times per priority
                 await self.event_bus.publish_stats_snapshot(
-                    queue_stats=queue_stats
+                    queue_stats=queue_stats,
+                    wait_histograms=self.queue_wait.snapshot(),
+                    consumer_lag=await self.task_queue.consumer_lag() or None
                 )
                 
                 await asyncio.sleep(10)  # Update every 10 seconds
@@ -0,0 +1,186 @@
+"""Out-of-band storage for large task payload and result fields."""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..utils.codec import get_codec
+
+
+logger = logging.getLogger(__name__)
+
+
+# Marker key of a field that was moved to the blob store
+BLOB_REF_KEY = "$blob"
+
+
+class FileBlobStore:
+    """Content-addressed blob store on the local filesystem.
+
+    Blobs are sharded by the first bytes of their SHA-256 digest. Writing an
+    existing blob only refreshes its modification time, which purge() uses to
+    expire blobs that are no longer referenced.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def _path(self, digest: str) -> Path:
+        return self.directory / digest[:2] / digest[2:4] / digest
+
+    def _put(self, blobs: Dict[str, bytes]):
+        for digest, data in blobs.items():
+            path = self._path(digest)
+            if path.exists():
+                os.utime(path)
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so readers never see a partial blob
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+
+    def _get(self, digests: List[str]) -> Dict[str, bytes]:
+        blobs = {}
+        for digest in digests:
+            try:
+                blobs[digest] = self._path(digest).read_bytes()
+            except FileNotFoundError:
+                continue
+        return blobs
+
+    def _purge(self, max_age: float) -> int:
+        cutoff = time.time() - max_age
+        removed = 0
+        for path in self.directory.glob("*/*/*"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        return removed
+
+    async def put_many(self, blobs: Dict[str, bytes]):
+        """Store blobs keyed by their digest."""
+        await asyncio.to_thread(self._put, blobs)
+
+    async def get_many(self, digests: List[str]) -> Dict[str, bytes]:
+        """Load blobs by digest; missing blobs are left out."""
+        return await asyncio.to_thread(self._get, digests)
+
+    async def purge(self, max_age: float) -> int:
+        """Delete blobs not written for max_age seconds."""
+        return await asyncio.to_thread(self._purge, max_age)
+
+
+class PayloadStore:
+    """Moves large top-level payload and result fields out of Redis.
+
+    Fields whose JSON encoding exceeds the threshold are written to a
+    content-addressed blob store and replaced with a small reference, so queue
+    entries and result keys only carry ids. Identical content is stored once.
+    """
+
+    def __init__(self, blob_store=None, threshold: int = 4096, codec=None):
+        self.blob_store = blob_store
+        self.threshold = threshold
+        self.codec = codec or get_codec()
+        self.spilled_bytes = 0
+        self.spilled_fields = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.blob_store is not None
+
+    @staticmethod
+    def is_ref(value: Any) -> bool:
+        return isinstance(value, dict) and BLOB_REF_KEY in value
+
+    async def spill(self, data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Return a copy of data with large fields replaced by blob references."""
+        if not self.enabled or not data:
+            return data
+
+        spilled = dict(data)
+        blobs: Dict[str, bytes] = {}
+        for field, value in data.items():
+            if value is None or self.is_ref(value):
+                continue
+            encoded = self.codec.dumps(value).encode("utf-8")
+            if len(encoded) <= self.threshold:
+                continue
+            digest = hashlib.sha256(encoded).hexdigest()
+            blobs[digest] = encoded
+            spilled[field] = {BLOB_REF_KEY: digest, "size": len(encoded)}
+
+        if blobs:
+            await self.blob_store.put_many(blobs)
+            self.spilled_fields += len(blobs)
+            self.spilled_bytes += sum(len(blob) for blob in blobs.values())
+        return spilled
+
+    async def hydrate(self, data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Return a copy of data with blob references replaced by their content.
+
+        Raises:
+            LookupError: If a referenced blob no longer exists
+        """
+        if not data:
+            return data
+        refs = {field: value[BLOB_REF_KEY] for field, value in data.items() if self.is_ref(value)}
+        if not refs:
+            return data
+        if not self.enabled:
+            raise LookupError("Task data references a blob but no blob store is configured")
+
+        blobs = await self.blob_store.get_many(list(set(refs.values())))
+        hydrated = dict(data)
+        for field, digest in refs.items():
+            if digest not in blobs:
+                raise LookupError(f"Blob {digest} for field '{field}' is missing from the blob store")
+            hydrated[field] = self.codec.loads(blobs[digest])
+        return hydrated
+
+    async def hydrate_many(self, items: Iterable[Optional[Dict[str, Any]]]) -> List[Optional[Dict[str, Any]]]:
+        """Hydrate several dictionaries."""
+        return [await self.hydrate(item) for item in items]
+
+    async def purge(self, max_age: float) -> int:
+        """Delete blobs older than max_age seconds from the blob store."""
+        if not self.enabled:
+            return 0
+        return await self.blob_store.purge(max_age)
+
+
+def create_payload_store(knowledge_base=None) -> PayloadStore:
+    """Create the payload store configured by the TASK_BLOB_* environment variables.
+
+    TASK_BLOB_STORE selects the backend: "postgres" (shared by workers on several
+    hosts; the default when a knowledge base is given), "file" (the default
+    otherwise; every API and worker process must see TASK_BLOB_DIR on a shared
+    volume) or "none" to keep everything in Redis.
+    """
+    backend = os.getenv("TASK_BLOB_STORE", "postgres" if knowledge_base is not None else "file").lower()
+    threshold = int(os.getenv("TASK_BLOB_THRESHOLD_BYTES", "4096"))
+
+    if backend == "none":
+        return PayloadStore(None, threshold)
+
+    if backend == "postgres":
+        if knowledge_base is None:
+            logger.warning("TASK_BLOB_STORE=postgres requires a knowledge base; keeping payloads in Redis")
+            return PayloadStore(None, threshold)
+        from ..database.blob_repository import BlobRepository
+        return PayloadStore(BlobRepository(knowledge_base), threshold)
+
+    blob_dir = os.getenv("TASK_BLOB_DIR", "data/blobs")
+    logger.warning(
+        f"Task payloads spill to local files under {blob_dir}; API and worker processes on "
+        "other hosts can only read them if the directory is a shared volume"
+    )
+    return PayloadStore(FileBlobStore(blob_dir), threshold)
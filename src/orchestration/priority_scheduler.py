@@ -0,0 +1,95 @@
+"""Weighted round-robin priority scheduling and queue wait-time histograms."""
+
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+# Upper bounds in seconds of the queue wait-time histogram buckets
+WAIT_TIME_BUCKETS = (1, 5, 15, 60, 300, 900, 3600)
+
+
+def parse_priority_weights(spec: str) -> Dict[int, int]:
+    """Parse priority weights such as "high:6,normal:3,low:1".
+
+    Raises:
+        ValueError: If the specification names an unknown priority or a weight below 1
+    """
+    names = {"low": 0, "normal": 1, "high": 2}
+    weights = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        name, _, weight = item.partition(":")
+        name = name.strip().replace("_priority", "")
+        if name not in names:
+            raise ValueError(f"Unknown task priority '{name}'")
+        weights[names[name]] = int(weight)
+        if weights[names[name]] < 1:
+            raise ValueError(f"Weight of priority '{name}' must be at least 1")
+    return weights
+
+
+class PriorityScheduler:
+    """Chooses which priority queue a worker claims from next.
+
+    Strict priority order starves low-priority work under sustained
+    high-priority load. This scheduler uses smooth weighted round-robin: with
+    weights 6/3/1, ten consecutive claims prefer high six times, normal three
+    times and low once, interleaved. The preferred queue is tried first and
+    the others follow in descending priority, so an empty queue never leaves
+    a worker idle.
+    """
+
+    def __init__(self, weights: Optional[Dict[int, int]] = None):
+        self.weights = {2: 6, 1: 3, 0: 1}
+        self.weights.update(weights or {})
+        self._current = {priority: 0 for priority in self.weights}
+
+    def next_order(self) -> Tuple[int, ...]:
+        """Get the priorities to try for the next claim, preferred one first."""
+        total = sum(self.weights.values())
+        for priority, weight in self.weights.items():
+            self._current[priority] += weight
+        preferred = max(self._current, key=lambda priority: (self._current[priority], priority))
+        self._current[preferred] -= total
+
+        others = sorted((p for p in self.weights if p != preferred), reverse=True)
+        return (preferred, *others)
+
+
+class WaitTimeHistogram:
+    """Cumulative histogram of how long tasks waited in their queue, per priority."""
+
+    def __init__(self, priority_names: Dict[int, str], buckets: Sequence[float] = WAIT_TIME_BUCKETS):
+        self.priority_names = priority_names
+        self.buckets = tuple(buckets)
+        self._counts: Dict[str, List[int]] = {
+            name: [0] * (len(self.buckets) + 1) for name in priority_names.values()
+        }
+        self._sums: Dict[str, float] = {name: 0.0 for name in priority_names.values()}
+
+    def observe(self, priority: int, enqueued_at: Optional[float], now: Optional[float] = None):
+        """Record the queue wait of a claimed task; tasks without an enqueue time are ignored."""
+        if enqueued_at is None:
+            return
+        name = self.priority_names.get(priority, self.priority_names[1])
+        wait = max(0.0, (now or time.time()) - enqueued_at)
+        index = next((i for i, bound in enumerate(self.buckets) if wait <= bound), len(self.buckets))
+        self._counts[name][index] += 1
+        self._sums[name] += wait
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Get cumulative bucket counts ("le_<seconds>" and "le_inf"), count and sum per priority."""
+        snapshot = {}
+        for name, counts in self._counts.items():
+            cumulative = 0
+            buckets: Dict[str, float] = {}
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                buckets[f"le_{bound}"] = cumulative
+            cumulative += counts[-1]
+            buckets["le_inf"] = cumulative
+            buckets["count"] = cumulative
+            buckets["sum_seconds"] = round(self._sums[name], 3)
+            snapshot[name] = buckets
+        return snapshot
@@ -41,6 +41,12 @@ class TokenBucket:
             # Wait before retrying
             await asyncio.sleep(0.1)
     
+    def headroom(self) -> float:
+        """Get the fraction of capacity currently available, without taking tokens."""
+        elapsed = time.time() - self.last_refill
+        tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+        return tokens / self.capacity if self.capacity else 0.0
+    
     async def try_acquire(self, tokens: int = 1) -> bool:
         """Try to acquire tokens without blocking."""
         async with self.lock:
@@ -136,6 +142,14 @@ class RateLimiter:
         bucket = self.mcp_buckets[bucket_key]
         return await bucket.try_acquire(tokens)
     
+    def llm_headroom(self) -> float:
+        """Get the available capacity fraction of the most depleted LLM bucket."""
+        return min((bucket.headroom() for bucket in self.llm_buckets.values()), default=1.0)
+    
+    def mcp_headroom(self) -> float:
+        """Get the available capacity fraction of the most depleted MCP bucket."""
+        return min((bucket.headroom() for bucket in self.mcp_buckets.values()), default=1.0)
+    
     def update_llm_limit(self, model: str, limit: int):
         """Update rate limit for LLM model."""
         self.llm_limits[model] = limit
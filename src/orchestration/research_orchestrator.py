@@ -1130,8 +1130,9 @@ class ResearchOrchestrator:
         
         return "\n".join(report_sections)
     
-    async def execute_data_aggregation(self, task_id: str, config: Dict[str, Any]):
-        """Execute data aggregation workflow."""
+    async def execute_data_aggregation(self, task_id: str, config: Dict[str, Any],
+                                       lease_token: Optional[str] = None):
+        """Execute data aggregation workflow, optionally under a lease taken by the caller."""
         logger.info(f"Starting data aggregation workflow for task {task_id}")
         
         try:
@@ -1139,7 +1140,9 @@ class ResearchOrchestrator:
             await self.db.update_research_task_status(task_id, "processing")
             
             # Execute data aggregation using the dedicated orchestrator
-            result = await self.data_aggregation_orchestrator.execute_data_aggregation(task_id, config)
+            result = await self.data_aggregation_orchestrator.execute_data_aggregation(
+                task_id, config, lease_token=lease_token
+            )
             
             # Update task status to completed
             await self.db.update_research_task_status(task_id, "completed")
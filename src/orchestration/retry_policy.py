@@ -0,0 +1,67 @@
+"""Retry backoff policy for failed tasks."""
+
+import random
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Optional
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with jitter, honouring provider Retry-After hints."""
+    base_delay: float = 2.0  # seconds before the first retry
+    max_delay: float = 300.0  # upper bound for computed backoff
+    jitter: float = 0.5  # fraction of the delay that is randomized
+
+    def next_delay(self, retry_count: int, retry_after: Optional[float] = None) -> float:
+        """Get the delay in seconds before the given retry attempt.
+
+        Args:
+            retry_count: Number of attempts that have failed so far (1 for the first retry)
+            retry_after: Optional delay requested by the provider
+
+        Returns:
+            Delay in seconds
+        """
+        exponent = max(retry_count - 1, 0)
+        delay = min(self.max_delay, self.base_delay * (2 ** exponent))
+
+        # Equal jitter: keep part of the delay fixed so retries never collapse to zero
+        delay = delay * (1 - self.jitter) + random.uniform(0, delay * self.jitter)
+
+        # Never retry sooner than the provider asked us to
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+
+        return delay
+
+    @staticmethod
+    def retry_after_hint(error: BaseException) -> Optional[float]:
+        """Extract a Retry-After hint in seconds from a provider exception."""
+        hint = getattr(error, "retry_after", None)
+
+        if hint is None:
+            # HTTP client errors (openai, anthropic, httpx) expose the response
+            response = getattr(error, "response", None)
+            headers = getattr(response, "headers", None)
+            if headers is not None:
+                try:
+                    hint = headers.get("retry-after") or headers.get("Retry-After")
+                except Exception:
+                    hint = None
+
+        if hint is None:
+            return None
+
+        try:
+            return max(float(hint), 0.0)
+        except (TypeError, ValueError):
+            pass
+
+        # Retry-After may also be an HTTP date
+        try:
+            retry_at = parsedate_to_datetime(str(hint))
+            return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+        except (TypeError, ValueError):
+            return None
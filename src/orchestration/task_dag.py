@@ -0,0 +1,176 @@
+"""Dependency tracking that releases tasks as soon as their parents complete."""
+
+import logging
+import time
+from typing import List, Optional
+
+import redis.asyncio as aioredis
+
+from .task_queue import STAMP_ENQUEUED_LUA, ReliableTaskQueue
+
+
+logger = logging.getLogger(__name__)
+
+
+# Atomically hold a task until its dependencies are released.
+# KEYS[1] waiting-on set of the task, KEYS[2] held task key, KEYS[3] its queue,
+# then per dependency: released marker, status key, dependents set. ARGV[1]
+# task id, ARGV[2] serialized task, ARGV[3] TTL, ARGV[4] failed status,
+# ARGV[5] current time, then the dependency ids.
+# Returns 1 if the task was queued, 0 if it is held, -1 if a dependency failed.
+# Both scripts need the push_task helper of the queue backend.
+HOLD_SCRIPT = STAMP_ENQUEUED_LUA + """
+local deps = (#KEYS - 3) / 3
+for i = 0, deps - 1 do
+    if redis.call('GET', KEYS[4 + i * 3 + 1]) == ARGV[4] then
+        return -1
+    end
+end
+for i = 0, deps - 1 do
+    if redis.call('EXISTS', KEYS[4 + i * 3]) == 0 then
+        redis.call('SADD', KEYS[1], ARGV[6 + i])
+        redis.call('SADD', KEYS[4 + i * 3 + 2], ARGV[1])
+        redis.call('EXPIRE', KEYS[4 + i * 3 + 2], tonumber(ARGV[3]))
+    end
+end
+if redis.call('SCARD', KEYS[1]) == 0 then
+    push_task(KEYS[3], stamp_enqueued(ARGV[2], ARGV[5]))
+    return 1
+end
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[3]))
+redis.call('SET', KEYS[2], ARGV[2], 'EX', tonumber(ARGV[3]))
+return 0
+"""
+
+# Atomically stop a held task waiting on a released dependency and queue it
+# if that was its last one. KEYS[1] waiting-on set of the task, KEYS[2] held
+# task key, KEYS[3] its queue. ARGV[1] released dependency id, ARGV[2]
+# current time. Returns 1 if the task was queued.
+RELEASE_SCRIPT = STAMP_ENQUEUED_LUA + """
+redis.call('SREM', KEYS[1], ARGV[1])
+if redis.call('SCARD', KEYS[1]) == 0 then
+    local raw = redis.call('GET', KEYS[2])
+    if raw then
+        redis.call('DEL', KEYS[2])
+        push_task(KEYS[3], stamp_enqueued(raw, ARGV[2]))
+        return 1
+    end
+end
+return 0
+"""
+
+
+class TaskDependencyGraph:
+    """Holds tasks with unmet dependencies and queues them once all parents are released.
+
+    A task that declares depends_on is parked in a held key instead of its
+    priority queue. Each dependency records the task in its dependents set.
+    When a dependency completes and its results are stored, release() queues
+    every dependent whose last unmet dependency it was.
+
+    Once a task is marked released, new dependents no longer register with
+    it, so its dependents set can be worked off one dependent at a time. The
+    set is dropped only after every dependent was handled; a release that is
+    interrupted is completed by the next one, since re-releasing a dependent
+    is a no-op.
+    """
+
+    TASK_PREFIX = "nexus:task"
+    TTL = 86400
+
+    def __init__(self, redis_client: aioredis.Redis, task_queue: ReliableTaskQueue):
+        self.redis_client = redis_client
+        self.task_queue = task_queue
+        self._hold_script = None
+        self._release_script = None
+
+    def waiting_key(self, task_id: str) -> str:
+        """Get Redis key for the set of dependencies a task still waits on."""
+        return f"{self.TASK_PREFIX}:{task_id}:waiting_on"
+
+    def held_key(self, task_id: str) -> str:
+        """Get Redis key holding a serialized task until it is released."""
+        return f"{self.TASK_PREFIX}:{task_id}:held"
+
+    def dependents_key(self, task_id: str) -> str:
+        """Get Redis key for the set of tasks depending on a task."""
+        return f"{self.TASK_PREFIX}:{task_id}:dependents"
+
+    def released_key(self, task_id: str) -> str:
+        """Get Redis key marking a task's dependents as released."""
+        return f"{self.TASK_PREFIX}:{task_id}:released"
+
+    async def hold(self, task_id: str, task_json: str, task_type: str, priority: int,
+                   depends_on: List[str], failed_status: str) -> int:
+        """Queue a task if its dependencies are released, otherwise hold it.
+
+        Returns:
+            1 if the task was queued, 0 if it is held, -1 if a dependency already failed
+        """
+        if self._hold_script is None:
+            self._hold_script = self.redis_client.register_script(self.task_queue.push_task_lua + HOLD_SCRIPT)
+
+        keys = [self.waiting_key(task_id), self.held_key(task_id),
+                self.task_queue.queue_key_for(task_type, priority)]
+        for dependency in depends_on:
+            keys.extend([
+                self.released_key(dependency),
+                f"{self.TASK_PREFIX}:{dependency}:status",
+                self.dependents_key(dependency)
+            ])
+
+        return int(await self._hold_script(
+            keys=keys,
+            args=[task_id, task_json, self.TTL, failed_status, time.time(), *depends_on]
+        ))
+
+    async def release(self, task_id: str) -> List[str]:
+        """Mark a completed task released and queue dependents that are now ready.
+
+        Returns:
+            IDs of the dependents that were queued
+        """
+        if self._release_script is None:
+            self._release_script = self.redis_client.register_script(self.task_queue.push_task_lua + RELEASE_SCRIPT)
+
+        pipeline = self.redis_client.pipeline()
+        pipeline.set(self.released_key(task_id), "1", ex=self.TTL)
+        pipeline.smembers(self.dependents_key(task_id))
+        _, dependents = await pipeline.execute()
+        dependents = sorted(d.decode() if isinstance(d, bytes) else d for d in dependents or [])
+        if not dependents:
+            return []
+
+        # A held task never changes, so its queue can be read before the script runs
+        held = await self.redis_client.mget([self.held_key(d) for d in dependents])
+        released = []
+        for dependent, raw in zip(dependents, held):
+            if raw is None:
+                # Already queued by another release, or discarded
+                continue
+            raw = raw.decode() if isinstance(raw, bytes) else raw
+            queued = await self._release_script(
+                keys=[self.waiting_key(dependent), self.held_key(dependent), self.task_queue.queue_key_of(raw)],
+                args=[task_id, time.time()]
+            )
+            if queued:
+                released.append(dependent)
+
+        await self.redis_client.delete(self.dependents_key(task_id))
+        return released
+
+    async def pop_dependents(self, task_id: str) -> List[str]:
+        """Remove and return the held dependents of a task that will never be released."""
+        pipeline = self.redis_client.pipeline()
+        pipeline.smembers(self.dependents_key(task_id))
+        pipeline.delete(self.dependents_key(task_id))
+        dependents, _ = await pipeline.execute()
+        return [d.decode() if isinstance(d, bytes) else d for d in dependents or []]
+
+    async def discard(self, task_id: str) -> Optional[str]:
+        """Drop a held task and return its serialized form, if it was still held."""
+        pipeline = self.redis_client.pipeline()
+        pipeline.get(self.held_key(task_id))
+        pipeline.delete(self.held_key(task_id), self.waiting_key(task_id))
+        raw, _ = await pipeline.execute()
+        return raw.decode() if isinstance(raw, bytes) else raw
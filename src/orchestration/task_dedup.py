@@ -0,0 +1,229 @@
+"""Idempotency keys that suppress duplicate task submissions."""
+
+import hashlib
+import json
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+
+import redis.asyncio as aioredis
+
+from .task_types import Task
+
+
+logger = logging.getLogger(__name__)
+
+
+# Atomically claim the idempotency keys of a batch of tasks.
+# KEYS per task: its idempotency key, its duplicate_of key, and the status and
+# followers keys of the owner the idempotency key had when it was read (the
+# task's own keys if it had none). ARGV[1] TTL, ARGV[2] completed status,
+# ARGV[3] failed status, ARGV[4] JSON list of all task ids being submitted,
+# then (task id, parent id, owner read or '') per task.
+# A key whose owner has no status left and is not being submitted is stale
+# and taken over. For each task returns the owner and, for a duplicate with a
+# parent, the owner's terminal status or '' after registering the duplicate
+# as a follower of the owner. A task whose key changed owner since it was
+# read is left alone and returns '' as owner, to be claimed again.
+CLAIM_SCRIPT = """
+local ttl = tonumber(ARGV[1])
+local submitting = {}
+for _, task_id in ipairs(cjson.decode(ARGV[4])) do
+    submitting[task_id] = true
+end
+local result = {}
+for i = 0, #KEYS / 4 - 1 do
+    local key, alias_key = KEYS[i * 4 + 1], KEYS[i * 4 + 2]
+    local status_key, followers_key = KEYS[i * 4 + 3], KEYS[i * 4 + 4]
+    local task_id, parent_id, read_owner = ARGV[5 + i * 3], ARGV[6 + i * 3], ARGV[7 + i * 3]
+    local owner = redis.call('GET', key)
+    local status = ''
+    if (owner or '') ~= read_owner then
+        owner = ''
+    else
+        if owner and not submitting[owner] and redis.call('EXISTS', status_key) == 0 then
+            owner = false
+        end
+        if not owner then
+            redis.call('SET', key, task_id, 'EX', ttl)
+            owner = task_id
+        elseif owner ~= task_id then
+            redis.call('SET', alias_key, owner, 'EX', ttl)
+            if parent_id ~= '' then
+                local owner_status = redis.call('GET', status_key)
+                if owner_status == ARGV[2] or owner_status == ARGV[3] then
+                    status = owner_status
+                else
+                    redis.call('SADD', followers_key, parent_id .. '|' .. task_id)
+                    redis.call('EXPIRE', followers_key, ttl)
+                end
+            end
+        end
+    end
+    table.insert(result, owner)
+    table.insert(result, status)
+end
+return result
+"""
+
+# Drop an idempotency key only if it still belongs to the given task
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class TaskDeduplicator:
+    """Suppresses submissions of tasks identical to one submitted recently.
+
+    Each task claims an idempotency key for the suppression window. A task
+    whose key is already owned by another live task is not queued; it is
+    recorded as a duplicate of the owner so status lookups and task groups
+    resolve to the owner's outcome. Dependencies on a duplicate are redirected
+    to the owner, which makes the dependents themselves duplicates of the
+    owner's dependents.
+    """
+
+    KEY_PREFIX = "nexus:task_idempotency"
+    TASK_PREFIX = "nexus:task"
+
+    def __init__(self, redis_client: aioredis.Redis, window: int = 3600):
+        self.redis_client = redis_client
+        # Suppression window in seconds; 0 disables suppression
+        self.window = window
+        self._claim_script = None
+        self._release_script = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0
+
+    def key(self, idempotency_key: str) -> str:
+        """Get Redis key holding the owner of an idempotency key."""
+        return f"{self.KEY_PREFIX}:{idempotency_key}"
+
+    def alias_key(self, task_id: str) -> str:
+        """Get Redis key naming the task a duplicate was suppressed in favour of."""
+        return f"{self.TASK_PREFIX}:{task_id}:duplicate_of"
+
+    def followers_key(self, task_id: str) -> str:
+        """Get Redis key for the suppressed duplicates waiting on a task."""
+        return f"{self.TASK_PREFIX}:{task_id}:followers"
+
+    def status_key(self, task_id: str) -> str:
+        """Get Redis key holding a task's status."""
+        return f"{self.TASK_PREFIX}:{task_id}:status"
+
+    @staticmethod
+    def default_key(task: Task) -> str:
+        """Derive an idempotency key from a task's type, parent, payload and dependencies.
+
+        Dependencies are part of the key because tasks such as extractions
+        share a payload and differ only in the task whose output they consume.
+        """
+        canonical = json.dumps({
+            "type": task.type if isinstance(task.type, str) else task.type.value,
+            "parent": task.parent_task_id or task.payload.get("task_id"),
+            "payload": task.payload,
+            "depends_on": sorted(task.depends_on)
+        }, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    async def suppress(self, tasks: List[Task], completed_status: str,
+                       failed_status: str) -> Dict[str, Tuple[str, Optional[str]]]:
+        """Claim idempotency keys for tasks about to be submitted.
+
+        Assigns each task its idempotency key and rewrites dependencies on
+        duplicates to their owners. Tasks are claimed in dependency order so a
+        dependent's key is derived from its resolved dependencies.
+
+        Returns:
+            Mapping of duplicate task ID to (owner task ID, owner's terminal
+            status if it already finished, else None)
+        """
+        if not self.enabled or not tasks:
+            return {}
+        if self._claim_script is None:
+            self._claim_script = self.redis_client.register_script(CLAIM_SCRIPT)
+
+        batch_ids = {task.id for task in tasks}
+        aliases: Dict[str, str] = {}
+
+        # Dependencies submitted earlier may themselves have been duplicates
+        external = sorted({d for task in tasks for d in task.depends_on if d not in batch_ids})
+        if external:
+            owners = await self.redis_client.mget([self.alias_key(d) for d in external])
+            for dependency, owner in zip(external, owners):
+                if owner:
+                    aliases[dependency] = owner.decode() if isinstance(owner, bytes) else owner
+
+        duplicates: Dict[str, Tuple[str, Optional[str]]] = {}
+        decided: Set[str] = set()
+        remaining = list(tasks)
+        while remaining:
+            ready = [
+                task for task in remaining
+                if all(d not in batch_ids or d in decided for d in task.depends_on)
+            ]
+            if not ready:
+                # Dependency cycle within the batch; claim the rest as they are
+                ready = remaining
+
+            for task in ready:
+                task.depends_on = list(dict.fromkeys(aliases.get(d, d) for d in task.depends_on))
+                task.idempotency_key = task.idempotency_key or self.default_key(task)
+
+            # The script touches the keys of each current owner, so owners are read
+            # first and the claim is skipped for keys that changed owner meanwhile
+            owners = await self.redis_client.mget([self.key(task.idempotency_key) for task in ready])
+            keys = []
+            args = [self.window, completed_status, failed_status, json.dumps(sorted(batch_ids))]
+            for task, owner in zip(ready, owners):
+                owner = (owner.decode() if isinstance(owner, bytes) else owner) or ""
+                keys.extend([self.key(task.idempotency_key), self.alias_key(task.id),
+                             self.status_key(owner or task.id), self.followers_key(owner or task.id)])
+                args.extend([task.id, task.parent_task_id or task.payload.get("task_id") or "", owner])
+
+            result = await self._claim_script(keys=keys, args=args)
+            result = [r.decode() if isinstance(r, bytes) else r for r in result]
+
+            for i, task in enumerate(ready):
+                owner, status = result[i * 2], result[i * 2 + 1]
+                if not owner:
+                    continue
+                if owner != task.id:
+                    aliases[task.id] = owner
+                    duplicates[task.id] = (owner, status or None)
+                decided.add(task.id)
+            remaining = [task for task in remaining if task.id not in decided]
+
+        if duplicates:
+            logger.info(f"Suppressed {len(duplicates)} duplicate task submissions")
+        return duplicates
+
+    async def original_of(self, task_id: str) -> Optional[str]:
+        """Get the task a suppressed duplicate resolves to, if it was suppressed."""
+        owner = await self.redis_client.get(self.alias_key(task_id))
+        return owner.decode() if isinstance(owner, bytes) else owner
+
+    async def pop_followers(self, task_id: str) -> List[Tuple[str, str]]:
+        """Remove and return the (parent ID, duplicate ID) pairs following a task."""
+        pipeline = self.redis_client.pipeline()
+        pipeline.smembers(self.followers_key(task_id))
+        pipeline.delete(self.followers_key(task_id))
+        followers, _ = await pipeline.execute()
+
+        pairs = []
+        for follower in followers or []:
+            follower = follower.decode() if isinstance(follower, bytes) else follower
+            parent_id, _, duplicate_id = follower.rpartition("|")
+            pairs.append((parent_id, duplicate_id))
+        return pairs
+
+    async def release(self, idempotency_key: str, task_id: str) -> bool:
+        """Release a task's idempotency key so the task can be submitted again."""
+        if self._release_script is None:
+            self._release_script = self.redis_client.register_script(RELEASE_SCRIPT)
+        released = await self._release_script(keys=[self.key(idempotency_key)], args=[task_id])
+        return bool(released)
@@ -0,0 +1,277 @@
+"""Push-based completion tracking for groups of tasks sharing a parent task."""
+
+import asyncio
+import inspect
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Union
+
+import redis.asyncio as aioredis
+
+from ..utils.content_fingerprint import bands, hamming_distance
+
+
+logger = logging.getLogger(__name__)
+
+
+# Atomically settle a task in its group. The pending set makes settling
+# idempotent: a task counts once no matter how often it is delivered.
+# Publishes a progress message, which carries remaining == 0 when the group is done.
+SETTLE_SCRIPT = """
+if redis.call('SREM', KEYS[1], ARGV[1]) == 0 then
+    return -1
+end
+redis.call('HINCRBY', KEYS[2], ARGV[2], 1)
+redis.call('EXPIRE', KEYS[2], tonumber(ARGV[4]))
+local remaining = redis.call('SCARD', KEYS[1])
+local counts = redis.call('HGETALL', KEYS[2])
+local message = {task_id = ARGV[1], status = ARGV[2], pending = remaining}
+for i = 1, #counts, 2 do
+    message[counts[i]] = tonumber(counts[i + 1])
+end
+redis.call('PUBLISH', ARGV[3], cjson.encode(message))
+return remaining
+"""
+
+
+ProgressCallback = Callable[[Dict[str, Any]], Union[None, Awaitable[None]]]
+
+
+class TaskGroupTracker:
+    """Tracks outstanding tasks per parent task and signals group completion.
+
+    Every submitted task is added to its group's pending set. When a task
+    reaches a terminal state it is removed from the set and a progress message
+    is published on the group channel, so waiters are notified instead of
+    polling task statuses.
+    """
+
+    GROUP_PREFIX = "nexus:task_group"
+    GROUP_TTL = 86400
+
+    def __init__(self, redis_client: aioredis.Redis, recheck_interval: float = 30.0):
+        self.redis_client = redis_client
+        # Pub/sub is fire-and-forget; waiters re-read the pending count this often
+        # so a message lost during a reconnect cannot stall them forever
+        self.recheck_interval = recheck_interval
+        self._settle_script = None
+
+    def pending_key(self, parent_task_id: str) -> str:
+        """Get Redis key for the set of a group's unfinished tasks."""
+        return f"{self.GROUP_PREFIX}:{parent_task_id}:pending"
+
+    def counts_key(self, parent_task_id: str) -> str:
+        """Get Redis key for a group's terminal status counters."""
+        return f"{self.GROUP_PREFIX}:{parent_task_id}:counts"
+
+    def sources_key(self, parent_task_id: str) -> str:
+        """Get Redis key mapping a group's source URLs to the task processing them."""
+        return f"{self.GROUP_PREFIX}:{parent_task_id}:sources"
+
+    def fingerprints_key(self, parent_task_id: str) -> str:
+        """Get Redis key mapping a group's fingerprint bands to the source that claimed them."""
+        return f"{self.GROUP_PREFIX}:{parent_task_id}:fingerprints"
+
+    def duplicates_key(self, parent_task_id: str) -> str:
+        """Get Redis key for the set of a group's sources skipped as near-duplicates."""
+        return f"{self.GROUP_PREFIX}:{parent_task_id}:duplicates"
+
+    def results_key(self, parent_task_id: str) -> str:
+        """Get Redis key for the set of a group's tasks that stored a result."""
+        return f"{self.GROUP_PREFIX}:{parent_task_id}:results"
+
+    def channel(self, parent_task_id: str) -> str:
+        """Get the pub/sub channel carrying a group's progress messages."""
+        return f"{self.GROUP_PREFIX}:{parent_task_id}:events"
+
+    def add(self, pipeline, parent_task_id: str, task_id: str):
+        """Add a task to its group's pending set on a pipeline."""
+        pending_key = self.pending_key(parent_task_id)
+        pipeline.sadd(pending_key, task_id)
+        pipeline.expire(pending_key, self.GROUP_TTL)
+
+    def index_result(self, pipeline, parent_task_id: str, task_id: str):
+        """Record on a pipeline that a task of the group stored its result."""
+        results_key = self.results_key(parent_task_id)
+        pipeline.sadd(results_key, task_id)
+        pipeline.expire(results_key, self.GROUP_TTL)
+
+    async def result_task_ids(self, parent_task_id: str) -> List[str]:
+        """Get the IDs of the group's tasks that stored a result."""
+        members = await self.redis_client.smembers(self.results_key(parent_task_id))
+        return sorted(m.decode() if isinstance(m, bytes) else m for m in members or ())
+
+    async def settle(self, parent_task_id: str, task_id: str, status: str) -> int:
+        """Record that a task reached a terminal status.
+
+        Returns:
+            Number of tasks still pending in the group, or -1 if the task was
+            already settled
+        """
+        if self._settle_script is None:
+            self._settle_script = self.redis_client.register_script(SETTLE_SCRIPT)
+
+        remaining = await self._settle_script(
+            keys=[self.pending_key(parent_task_id), self.counts_key(parent_task_id)],
+            args=[task_id, status, self.channel(parent_task_id), self.GROUP_TTL]
+        )
+        return int(remaining)
+
+    async def claim_sources(self, parent_task_id: str, task_id: str, urls: List[str]) -> Set[str]:
+        """Claim source URLs for a task so each source is processed once per group.
+
+        Returns:
+            The URLs owned by the task, including ones it claimed on an earlier attempt
+        """
+        sources_key = self.sources_key(parent_task_id)
+        pipeline = self.redis_client.pipeline()
+        for url in urls:
+            pipeline.hsetnx(sources_key, url, task_id)
+        pipeline.expire(sources_key, self.GROUP_TTL)
+        pipeline.hmget(sources_key, urls)
+        results = await pipeline.execute()
+
+        owners = results[-1]
+        return {
+            url for url, owner in zip(urls, owners)
+            if (owner.decode() if isinstance(owner, bytes) else owner) == task_id
+        }
+
+    async def claim_fingerprints(self,
+                                 parent_task_id: str,
+                                 fingerprints: Dict[str, int],
+                                 max_distance: int) -> Set[str]:
+        """Claim source content fingerprints so near-duplicate sources are processed once per group.
+
+        Each band of a fingerprint is claimed for its source. A source is a
+        near-duplicate when a band it shares is held by another source whose
+        fingerprint is at most max_distance bits away; such sources are
+        recorded in the group's duplicate set.
+
+        Args:
+            parent_task_id: The parent task of the group
+            fingerprints: SimHash fingerprints keyed by source URL
+            max_distance: Largest Hamming distance treated as a near-duplicate
+
+        Returns:
+            The URLs that are not near-duplicates of another source, including
+            ones whose bands they claimed on an earlier attempt
+        """
+        if not fingerprints:
+            return set()
+
+        fingerprints_key = self.fingerprints_key(parent_task_id)
+        fields = {url: bands(fingerprint) for url, fingerprint in fingerprints.items()}
+        all_fields = [field for url_fields in fields.values() for field in url_fields]
+
+        pipeline = self.redis_client.pipeline()
+        for url, url_fields in fields.items():
+            for field in url_fields:
+                pipeline.hsetnx(fingerprints_key, field, f"{fingerprints[url]:016x}:{url}")
+        pipeline.expire(fingerprints_key, self.GROUP_TTL)
+        pipeline.hmget(fingerprints_key, all_fields)
+        owners = dict(zip(all_fields, (await pipeline.execute())[-1]))
+
+        kept, duplicates = set(), []
+        for url, url_fields in fields.items():
+            for field in url_fields:
+                owner = owners.get(field)
+                owner = owner.decode() if isinstance(owner, bytes) else owner
+                if not owner:
+                    continue
+                owner_fingerprint, owner_url = owner.split(":", 1)
+                if owner_url != url and hamming_distance(int(owner_fingerprint, 16), fingerprints[url]) <= max_distance:
+                    duplicates.append(url)
+                    break
+            else:
+                kept.add(url)
+
+        if duplicates:
+            duplicates_key = self.duplicates_key(parent_task_id)
+            pipeline = self.redis_client.pipeline()
+            pipeline.sadd(duplicates_key, *duplicates)
+            pipeline.expire(duplicates_key, self.GROUP_TTL)
+            await pipeline.execute()
+        return kept
+
+    async def duplicate_count(self, parent_task_id: str) -> int:
+        """Get the number of sources the group skipped as near-duplicates."""
+        return int(await self.redis_client.scard(self.duplicates_key(parent_task_id)) or 0)
+
+    async def progress(self, parent_task_id: str) -> Dict[str, Any]:
+        """Get the pending count and terminal status counts of a group."""
+        pipeline = self.redis_client.pipeline()
+        pipeline.scard(self.pending_key(parent_task_id))
+        pipeline.hgetall(self.counts_key(parent_task_id))
+        pending, counts = await pipeline.execute()
+
+        progress: Dict[str, Any] = {"pending": int(pending or 0)}
+        for status, count in (counts or {}).items():
+            status = status.decode() if isinstance(status, bytes) else status
+            progress[status] = int(count)
+        return progress
+
+    async def wait(self,
+                   parent_task_id: str,
+                   on_progress: Optional[ProgressCallback] = None,
+                   timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Wait until no task of the group is pending.
+
+        Args:
+            parent_task_id: The parent task whose child tasks to wait for
+            on_progress: Optional callback (sync or async) invoked with each
+                progress message
+            timeout: Optional maximum time to wait in seconds
+
+        Returns:
+            Final progress of the group
+
+        Raises:
+            asyncio.TimeoutError: If the group did not finish within the timeout
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        pubsub = self.redis_client.pubsub()
+        # Subscribe before reading the pending count so no completion is missed
+        await pubsub.subscribe(self.channel(parent_task_id))
+        try:
+            progress = await self.progress(parent_task_id)
+            await self._notify(on_progress, progress)
+
+            while progress["pending"] > 0:
+                wait_for = self.recheck_interval
+                if deadline is not None:
+                    wait_for = min(wait_for, deadline - time.monotonic())
+                    if wait_for <= 0:
+                        raise asyncio.TimeoutError(
+                            f"Task group {parent_task_id} still has {progress['pending']} pending tasks"
+                        )
+
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=wait_for)
+                if message is None:
+                    progress = await self.progress(parent_task_id)
+                    continue
+
+                try:
+                    progress = json.loads(message["data"])
+                except (ValueError, TypeError):
+                    logger.warning(f"Ignoring malformed progress message for task group {parent_task_id}")
+                    continue
+                await self._notify(on_progress, progress)
+
+            return progress
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+
+    @staticmethod
+    async def _notify(on_progress: Optional[ProgressCallback], progress: Dict[str, Any]):
+        if on_progress is None:
+            return
+        try:
+            result = on_progress(progress)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.warning(f"Task group progress callback failed: {e}")
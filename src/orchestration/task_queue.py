@@ -0,0 +1,464 @@
+"""Reliable Redis list-based task queue with per-consumer processing lists."""
+
+import json
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+import redis.asyncio as aioredis
+
+from .worker_pools import DEFAULT_POOL, POOL_NAMES, POOL_ROUTES, pool_for
+from ..utils.codec import get_codec
+
+
+logger = logging.getLogger(__name__)
+
+
+# Lua helper resolving the queue of a serialized task from its priority and
+# task type. routes maps task types to their worker pool; task types without
+# a dedicated pool use the default pool's queues.
+QUEUE_FOR_LUA = """
+local function queue_for(raw, prefix, routes)
+    local ok, task = pcall(cjson.decode, raw)
+    local priority = 1
+    local pool = nil
+    if ok and type(task) == 'table' then
+        if tonumber(task['priority']) then
+            priority = tonumber(task['priority'])
+        end
+        if type(task['type']) == 'string' then
+            pool = routes[task['type']]
+        end
+    end
+    local name = 'normal_priority'
+    if priority == 0 then
+        name = 'low_priority'
+    elseif priority == 2 then
+        name = 'high_priority'
+    end
+    if pool then
+        return prefix .. ':' .. pool .. ':' .. name
+    end
+    return prefix .. ':' .. name
+end
+"""
+
+# Lua helper stamping the time a held task became ready to claim into its
+# serialized form, so its queue wait is measured from its release.
+STAMP_ENQUEUED_LUA = """
+local function stamp_enqueued(raw, now)
+    return (string.gsub(raw, '"enqueued_at":%s*null', '"enqueued_at":' .. now, 1))
+end
+"""
+
+# Lua helper adding a serialized task to a queue. Scripts that queue tasks are
+# registered with the helper of the queue backend in use prepended.
+PUSH_TASK_LUA = """
+local function push_task(key, raw)
+    redis.call('LPUSH', key, raw)
+end
+"""
+
+# Atomically move a single in-flight task back onto its priority queue.
+# Only re-queues when the task was still present in the processing list, so a
+# task that was acknowledged concurrently is never duplicated.
+REQUEUE_SCRIPT = """
+local removed = redis.call('LREM', KEYS[1], 1, ARGV[1])
+redis.call('ZREM', KEYS[3], ARGV[2])
+if removed > 0 then
+    redis.call('RPUSH', KEYS[2], ARGV[1])
+    return 1
+end
+return 0
+"""
+
+# Atomically move scheduled tasks whose due time has passed onto their
+# queues. ARGV[3] is the queue key prefix, ARGV[4] the JSON pool routes.
+# Needs a push_task helper.
+PROMOTE_SCRIPT = QUEUE_FOR_LUA + """
+local routes = cjson.decode(ARGV[4])
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, raw in ipairs(due) do
+    redis.call('ZREM', KEYS[1], raw)
+    push_task(queue_for(raw, ARGV[3], routes), raw)
+end
+return #due
+"""
+
+# Atomically claim up to ARGV[3] tasks from the tail of a queue that share the
+# given task type and model type. Stops at the first incompatible task so queue
+# order is preserved. Each claimed task is moved into the processing list and
+# leased until ARGV[4].
+CLAIM_BATCH_SCRIPT = """
+local claimed = {}
+local limit = tonumber(ARGV[3])
+while #claimed < limit do
+    local raw = redis.call('LINDEX', KEYS[1], -1)
+    if not raw then
+        break
+    end
+    local ok, task = pcall(cjson.decode, raw)
+    if not ok or type(task) ~= 'table' or task['type'] ~= ARGV[1] then
+        break
+    end
+    local model_type = task['model_type']
+    if model_type == nil or model_type == cjson.null then
+        model_type = ''
+    end
+    if model_type ~= ARGV[2] then
+        break
+    end
+    redis.call('RPOP', KEYS[1])
+    redis.call('LPUSH', KEYS[2], raw)
+    redis.call('ZADD', KEYS[3], tonumber(ARGV[4]), ARGV[5] .. '|' .. tostring(task['id']))
+    table.insert(claimed, raw)
+end
+return claimed
+"""
+
+
+class ReliableTaskQueue:
+    """At-least-once task queue built on Redis lists.
+
+    Tasks are moved atomically from a priority queue into a per-consumer
+    processing list with LMOVE, so a task is never held only in worker memory.
+    Each claimed task gets a lease in a sorted set scored by its visibility
+    deadline. Every worker pool has its own set of priority queues; the
+    default pool keeps the original queue keys. Tasks are removed from the
+    processing list only when acknowledged; tasks owned by consumers whose
+    heartbeat expired, or whose lease ran out, are re-queued by the reaper.
+    """
+
+    # Redis key prefixes
+    QUEUE_PREFIX = "nexus:tasks"
+    PROCESSING_PREFIX = "nexus:tasks:processing"
+    LEASES_KEY = "nexus:tasks:leases"
+    CONSUMERS_KEY = "nexus:tasks:consumers"
+    HEARTBEAT_PREFIX = "nexus:worker:heartbeat"
+    SCHEDULED_KEY = "nexus:tasks:scheduled"
+    DEAD_LETTER_KEY = "nexus:tasks:dead_letter"
+
+    PRIORITY_NAMES = {
+        0: "low_priority",
+        1: "normal_priority",
+        2: "high_priority"
+    }
+
+    backend = "list"
+    push_task_lua = PUSH_TASK_LUA
+
+    def __init__(self, redis_client: aioredis.Redis, visibility_timeout: int = 900):
+        self.redis_client = redis_client
+        self.visibility_timeout = visibility_timeout
+        self._requeue_script = None
+        self._promote_script = None
+        self._claim_batch_script = None
+
+    def queue_key(self, priority: int, pool: str = DEFAULT_POOL) -> str:
+        """Get Redis key for a pool's priority queue."""
+        priority_name = self.PRIORITY_NAMES.get(priority, 'normal_priority')
+        if pool == DEFAULT_POOL:
+            return f"{self.QUEUE_PREFIX}:{priority_name}"
+        return f"{self.QUEUE_PREFIX}:{pool}:{priority_name}"
+
+    def queue_key_for(self, task_type: str, priority: int) -> str:
+        """Get Redis key for the priority queue serving a task type."""
+        return self.queue_key(priority, pool_for(task_type))
+
+    @staticmethod
+    def pool_routes() -> str:
+        """Get the task type to pool routes as JSON for the Lua scripts."""
+        return json.dumps(POOL_ROUTES)
+
+    def processing_key(self, consumer_id: str) -> str:
+        """Get Redis key for a consumer's processing list."""
+        return f"{self.PROCESSING_PREFIX}:{consumer_id}"
+
+    def heartbeat_key(self, consumer_id: str) -> str:
+        """Get Redis key for a consumer's heartbeat."""
+        return f"{self.HEARTBEAT_PREFIX}:{consumer_id}"
+
+    @staticmethod
+    def _lease_member(consumer_id: str, task_id: str) -> str:
+        return f"{consumer_id}|{task_id}"
+
+    def enqueue(self, pipeline, task_json: str, priority: int, pool: str = DEFAULT_POOL):
+        """Add a serialized task to its pool's priority queue on a pipeline."""
+        pipeline.lpush(self.queue_key(priority, pool), task_json)
+
+    async def register_consumer(self, consumer_id: str):
+        """Register a consumer so the reaper can find its processing list."""
+        await self.redis_client.sadd(self.CONSUMERS_KEY, consumer_id)
+
+    async def unregister_consumer(self, consumer_id: str):
+        """Unregister a consumer whose processing list is empty."""
+        if not await self.redis_client.llen(self.processing_key(consumer_id)):
+            await self.redis_client.srem(self.CONSUMERS_KEY, consumer_id)
+
+    async def claim(self, consumer_id: str, priorities: Tuple[int, ...] = (2, 1, 0),
+                    pool: str = DEFAULT_POOL) -> Optional[str]:
+        """Move the next task of a pool into the consumer's processing list and lease it.
+
+        Returns:
+            The raw serialized task, or None if all of the pool's queues are empty
+        """
+        processing_key = self.processing_key(consumer_id)
+        for priority in priorities:
+            task_json = await self.redis_client.lmove(
+                self.queue_key(priority, pool), processing_key, "RIGHT", "LEFT"
+            )
+            if task_json:
+                task_id = self._task_id(task_json)
+                if task_id:
+                    await self.redis_client.zadd(
+                        self.LEASES_KEY,
+                        {self._lease_member(consumer_id, task_id): time.time() + self.visibility_timeout}
+                    )
+                return task_json
+        return None
+
+    async def claim_batch(self, consumer_id: str, task_type: str, model_type: Optional[str],
+                          priority: int, max_size: int) -> List[str]:
+        """Claim further queued tasks compatible with an already claimed one.
+
+        Only tasks at the head of the queue with the same task type and model
+        type are claimed, so unrelated work is never reordered.
+
+        Returns:
+            The raw serialized tasks claimed, possibly empty
+        """
+        if max_size <= 0:
+            return []
+        if self._claim_batch_script is None:
+            self._claim_batch_script = self.redis_client.register_script(CLAIM_BATCH_SCRIPT)
+
+        claimed = await self._claim_batch_script(
+            keys=[self.queue_key_for(task_type, priority), self.processing_key(consumer_id), self.LEASES_KEY],
+            args=[task_type, model_type or "", max_size, time.time() + self.visibility_timeout, consumer_id]
+        )
+        return [raw.decode() if isinstance(raw, bytes) else raw for raw in claimed or []]
+
+    async def ack(self, consumer_id: str, task_json: str, task_id: str) -> bool:
+        """Acknowledge a task, removing it from the processing list.
+
+        Returns:
+            True if the task was still owned by the consumer
+        """
+        pipeline = self.redis_client.pipeline()
+        pipeline.lrem(self.processing_key(consumer_id), 1, task_json)
+        pipeline.zrem(self.LEASES_KEY, self._lease_member(consumer_id, task_id))
+        removed, _ = await pipeline.execute()
+        return bool(removed)
+
+    async def ack_many(self, consumer_id: str, tasks: List[Tuple[str, str]]) -> int:
+        """Acknowledge several tasks in one round trip.
+
+        Args:
+            consumer_id: Consumer holding the tasks
+            tasks: (task_id, raw serialized task) pairs
+
+        Returns:
+            Number of tasks that were still owned by the consumer
+        """
+        if not tasks:
+            return 0
+        pipeline = self.redis_client.pipeline()
+        for task_id, task_json in tasks:
+            pipeline.lrem(self.processing_key(consumer_id), 1, task_json)
+            pipeline.zrem(self.LEASES_KEY, self._lease_member(consumer_id, task_id))
+        results = await pipeline.execute()
+        return sum(1 for removed in results[::2] if removed)
+
+    async def discard(self, consumer_id: str, task_json: str, task_id: Optional[str] = None):
+        """Drop a claimed task without processing it."""
+        pipeline = self.redis_client.pipeline()
+        pipeline.lrem(self.processing_key(consumer_id), 1, task_json)
+        if task_id:
+            pipeline.zrem(self.LEASES_KEY, self._lease_member(consumer_id, task_id))
+        await pipeline.execute()
+
+    async def requeue(self, consumer_id: str, task_json: str) -> bool:
+        """Move an in-flight task back to the front of its priority queue."""
+        if self._requeue_script is None:
+            self._requeue_script = self.redis_client.register_script(REQUEUE_SCRIPT)
+
+        task_id = self._task_id(task_json) or ""
+        moved = await self._requeue_script(
+            keys=[self.processing_key(consumer_id), self.queue_key_of(task_json), self.LEASES_KEY],
+            args=[task_json, self._lease_member(consumer_id, task_id)]
+        )
+        return bool(moved)
+
+    def queue_key_of(self, task_json: str) -> str:
+        """Get the queue a serialized task belongs on from its type and priority."""
+        try:
+            task_data = get_codec().loads(task_json)
+            priority = int(task_data.get("priority", 1))
+            task_type = task_data.get("type", "")
+        except (ValueError, TypeError, AttributeError):
+            priority, task_type = 1, ""
+        return self.queue_key_for(task_type, priority)
+
+    async def reap(self) -> List[str]:
+        """Re-queue tasks owned by dead consumers or with expired leases.
+
+        Returns:
+            IDs of the tasks that were re-queued
+        """
+        requeued: List[str] = []
+
+        # Consumers whose heartbeat key expired are considered dead
+        consumers = await self.redis_client.smembers(self.CONSUMERS_KEY)
+        for consumer in consumers:
+            consumer_id = consumer.decode() if isinstance(consumer, bytes) else consumer
+            if await self.redis_client.exists(self.heartbeat_key(consumer_id)):
+                continue
+
+            in_flight = await self.redis_client.lrange(self.processing_key(consumer_id), 0, -1)
+            for task_json in in_flight:
+                if await self.requeue(consumer_id, task_json):
+                    requeued.append(self._task_id(task_json) or "unknown")
+
+            if in_flight:
+                logger.warning(f"Consumer {consumer_id} has no heartbeat; re-queued {len(in_flight)} in-flight tasks")
+            await self.unregister_consumer(consumer_id)
+
+        # Leases past their visibility deadline belong to stuck tasks
+        expired = await self.redis_client.zrangebyscore(self.LEASES_KEY, 0, time.time())
+        for member in expired:
+            member = member.decode() if isinstance(member, bytes) else member
+            consumer_id, _, task_id = member.partition("|")
+            in_flight = await self.redis_client.lrange(self.processing_key(consumer_id), 0, -1)
+            matches = [raw for raw in in_flight if self._task_id(raw) == task_id]
+            if not matches:
+                # Acknowledged between the range query and now
+                await self.redis_client.zrem(self.LEASES_KEY, member)
+                continue
+            for task_json in matches:
+                if await self.requeue(consumer_id, task_json):
+                    requeued.append(task_id)
+                    logger.warning(f"Lease expired for task {task_id} on consumer {consumer_id}; re-queued")
+
+        return requeued
+
+    async def schedule(self, task_json: str, due_at: float):
+        """Schedule a serialized task to be queued at the given epoch time."""
+        await self.redis_client.zadd(self.SCHEDULED_KEY, {task_json: due_at})
+
+    async def promote_due(self, limit: int = 100) -> int:
+        """Move scheduled tasks that are due onto their queues.
+
+        Returns:
+            Number of tasks promoted
+        """
+        if self._promote_script is None:
+            self._promote_script = self.redis_client.register_script(self.push_task_lua + PROMOTE_SCRIPT)
+
+        promoted = await self._promote_script(
+            keys=[self.SCHEDULED_KEY],
+            args=[time.time(), limit, self.QUEUE_PREFIX, self.pool_routes()]
+        )
+        return int(promoted or 0)
+
+    async def scheduled_count(self) -> int:
+        """Get the number of tasks waiting for a delayed retry."""
+        return await self.redis_client.zcard(self.SCHEDULED_KEY)
+
+    async def dead_letter(self, task_id: str, task_json: str, error: str):
+        """Park a task that exhausted its retries in the dead-letter queue."""
+        entry = {
+            "task": get_codec().loads(task_json),
+            "error": error,
+            "failed_at": time.time()
+        }
+        await self.redis_client.hset(self.DEAD_LETTER_KEY, task_id, get_codec().dumps(entry))
+
+    async def list_dead_letters(self, limit: int = 100) -> List[dict]:
+        """Get dead-lettered tasks, most recent failure first."""
+        raw_entries = await self.redis_client.hvals(self.DEAD_LETTER_KEY)
+        entries = []
+        for raw in raw_entries:
+            try:
+                entries.append(get_codec().loads(raw))
+            except (ValueError, TypeError):
+                continue
+        entries.sort(key=lambda entry: entry.get("failed_at", 0), reverse=True)
+        return entries[:limit]
+
+    async def pop_dead_letter(self, task_id: str) -> Optional[dict]:
+        """Remove a task from the dead-letter queue and return its entry."""
+        raw = await self.redis_client.hget(self.DEAD_LETTER_KEY, task_id)
+        if raw is None:
+            return None
+        # HDEL decides ownership when two callers requeue the same task
+        if not await self.redis_client.hdel(self.DEAD_LETTER_KEY, task_id):
+            return None
+        return get_codec().loads(raw)
+
+    async def depth(self, priority: int, pool: Optional[str] = None) -> int:
+        """Get the number of queued tasks for a priority, in one pool or all pools."""
+        pools = [pool] if pool else POOL_NAMES
+        pipeline = self.redis_client.pipeline()
+        for name in pools:
+            pipeline.llen(self.queue_key(priority, name))
+        return sum(await pipeline.execute())
+
+    async def pool_depths(self) -> Dict[str, int]:
+        """Get the number of queued tasks per pool across priorities."""
+        pipeline = self.redis_client.pipeline()
+        for pool in POOL_NAMES:
+            for priority in self.PRIORITY_NAMES:
+                pipeline.llen(self.queue_key(priority, pool))
+        lengths = await pipeline.execute()
+        per_pool = len(self.PRIORITY_NAMES)
+        return {
+            pool: sum(lengths[i * per_pool:(i + 1) * per_pool])
+            for i, pool in enumerate(POOL_NAMES)
+        }
+
+    async def memory_per_task(self) -> Optional[int]:
+        """Get the average Redis memory in bytes used per queued task.
+
+        Returns:
+            Average bytes per task across all pool queues, or None if the
+            queues are empty or the server does not support MEMORY USAGE
+        """
+        total_bytes = 0
+        total_tasks = 0
+        keys = [self.queue_key(priority, pool) for pool in POOL_NAMES for priority in self.PRIORITY_NAMES]
+        for key in keys:
+            length = await self._stored_length(key)
+            if not length:
+                continue
+            try:
+                usage = await self.redis_client.memory_usage(key)
+            except Exception:
+                return None
+            total_bytes += usage or 0
+            total_tasks += length
+        if not total_tasks:
+            return None
+        return total_bytes // total_tasks
+
+    async def _stored_length(self, key: str) -> int:
+        """Get the number of tasks stored in a queue key."""
+        return await self.redis_client.llen(key)
+
+    async def in_flight_count(self) -> int:
+        """Get the number of leased (in-flight) tasks."""
+        return await self.redis_client.zcard(self.LEASES_KEY)
+
+    async def trim(self) -> int:
+        """Remove acknowledged tasks kept for replay; lists keep none."""
+        return 0
+
+    async def consumer_lag(self) -> Dict[str, dict]:
+        """Get per-queue consumer lag; only stream queues track it."""
+        return {}
+
+    @staticmethod
+    def _task_id(task_json) -> Optional[str]:
+        try:
+            return get_codec().loads(task_json).get("id")
+        except (ValueError, TypeError, AttributeError):
+            return None
@@ -0,0 +1,550 @@
+"""Redis Streams task queue backend with consumer groups and lag metrics."""
+
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import redis.asyncio as aioredis
+from redis.exceptions import ResponseError
+
+from .task_queue import ReliableTaskQueue
+from .worker_pools import DEFAULT_POOL, POOL_NAMES
+
+
+logger = logging.getLogger(__name__)
+
+
+TRIM_POLICIES = ("acked", "maxlen", "none")
+
+# Atomically acknowledge a pending entry and add its task to the tail of a
+# queue. KEYS[1] stream holding the entry, KEYS[2] target queue. ARGV[1]
+# consumer group, ARGV[2] entry id, ARGV[3] serialized task. Only re-queues
+# when the entry was still pending, so an acknowledged task is never
+# duplicated. Needs a push_task helper.
+STREAM_REQUEUE_SCRIPT = """
+if redis.call('XACK', KEYS[1], ARGV[1], ARGV[2]) == 0 then
+    return 0
+end
+redis.call('XDEL', KEYS[1], ARGV[2])
+push_task(KEYS[2], ARGV[3])
+return 1
+"""
+
+# Atomically claim up to ARGV[5] undelivered entries of a stream that share
+# the given task type and model type. Entries after the group's last delivered
+# id are inspected first and only the compatible prefix is read into the
+# consumer's pending entries, so queue order is preserved. ARGV[1] consumer
+# group, ARGV[2] consumer, ARGV[3] task type, ARGV[4] model type.
+# Returns alternating entry ids and serialized tasks.
+STREAM_CLAIM_BATCH_SCRIPT = """
+local function field(pairs, name)
+    for i = 1, #pairs, 2 do
+        if pairs[i] == name then
+            return pairs[i + 1]
+        end
+    end
+    return nil
+end
+local last = nil
+for _, group in ipairs(redis.call('XINFO', 'GROUPS', KEYS[1])) do
+    if field(group, 'name') == ARGV[1] then
+        last = field(group, 'last-delivered-id')
+    end
+end
+if not last then
+    return {}
+end
+local claimed = {}
+local entries = redis.call('XRANGE', KEYS[1], '(' .. last, '+', 'COUNT', tonumber(ARGV[5]))
+for _, entry in ipairs(entries) do
+    local raw = field(entry[2], 'task')
+    if not raw then
+        break
+    end
+    local ok, task = pcall(cjson.decode, raw)
+    if not ok or type(task) ~= 'table' or task['type'] ~= ARGV[3] then
+        break
+    end
+    local model_type = task['model_type']
+    if model_type == nil or model_type == cjson.null then
+        model_type = ''
+    end
+    if model_type ~= ARGV[4] then
+        break
+    end
+    table.insert(claimed, entry[1])
+    table.insert(claimed, raw)
+end
+if #claimed > 0 then
+    redis.call('XREADGROUP', 'GROUP', ARGV[1], ARGV[2], 'COUNT', #claimed / 2, 'STREAMS', KEYS[1], '>')
+end
+return claimed
+"""
+
+
+def stream_push_lua(maxlen: Optional[int] = None) -> str:
+    """Get the push_task Lua helper appending to a stream, optionally capped."""
+    cap = f"'MAXLEN', '~', {int(maxlen)}, " if maxlen else ""
+    return f"""
+local function push_task(key, raw)
+    redis.call('XADD', key, {cap}'*', 'task', raw)
+end
+"""
+
+
+def parse_trim_policy(spec: str) -> Tuple[str, Optional[int]]:
+    """Parse a stream trim policy such as "acked", "none" or "maxlen:100000".
+
+    Raises:
+        ValueError: If the policy is unknown or its length is not positive
+    """
+    policy, _, value = spec.strip().lower().partition(":")
+    if policy not in TRIM_POLICIES:
+        raise ValueError(f"Unknown stream trim policy '{policy}', expected one of {TRIM_POLICIES}")
+    if policy != "maxlen":
+        return policy, None
+    maxlen = int(value) if value else 0
+    if maxlen <= 0:
+        raise ValueError(f"Stream trim policy '{spec}' needs a positive length")
+    return policy, maxlen
+
+
+def _parse_id(entry_id: str) -> Tuple[int, int]:
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+class StreamTaskQueue(ReliableTaskQueue):
+    """At-least-once task queue built on Redis Streams consumer groups.
+
+    Each pool and priority queue is a stream read by one consumer group, so
+    the group's pending entries take the place of the list backend's
+    processing lists and leases. Entries pending with a consumer whose
+    heartbeat expired, or idle for longer than the visibility timeout, are
+    re-queued by the reaper with XAUTOCLAIM. Acknowledged entries stay in the
+    stream for replay until trim() removes them, and the group's lag and
+    per-consumer pending counts are reported by consumer_lag().
+
+    Trim policies:
+        acked: drop acknowledged entries older than the retention period
+        maxlen: cap each stream at roughly maxlen entries when adding; this
+            can drop tasks that were never delivered
+        none: never trim
+
+    Needs Redis 7.0 or later.
+    """
+
+    QUEUE_PREFIX = "nexus:tasks:stream"
+    GROUP = "nexus-workers"
+    REAPER_CONSUMER = "reaper"
+
+    backend = "streams"
+
+    def __init__(self, redis_client: aioredis.Redis, visibility_timeout: int = 900,
+                 trim_policy: str = "acked", maxlen: Optional[int] = None, retention: float = 3600.0):
+        super().__init__(redis_client, visibility_timeout)
+        if trim_policy not in TRIM_POLICIES:
+            raise ValueError(f"Unknown stream trim policy '{trim_policy}', expected one of {TRIM_POLICIES}")
+        if trim_policy == "maxlen" and not maxlen:
+            raise ValueError("The maxlen trim policy needs a maximum length")
+        self.trim_policy = trim_policy
+        self.maxlen = maxlen if trim_policy == "maxlen" else None
+        self.retention = retention
+        self.push_task_lua = stream_push_lua(self.maxlen)
+        # Entry of each task handed to a consumer: (consumer, raw task) -> (stream, entry id)
+        self._deliveries: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        self._groups_ready = False
+        self._stream_requeue_script = None
+        self._stream_claim_batch_script = None
+
+    def stream_keys(self) -> List[str]:
+        """Get the stream keys of every pool's priority queues."""
+        return [self.queue_key(priority, pool) for pool in POOL_NAMES for priority in self.PRIORITY_NAMES]
+
+    @staticmethod
+    def _text(value) -> str:
+        return value.decode() if isinstance(value, bytes) else value
+
+    def _task_field(self, fields) -> Optional[str]:
+        raw = fields.get(b"task", fields.get("task"))
+        return self._text(raw) if raw is not None else None
+
+    async def _ensure_groups(self):
+        """Create the consumer group on every queue stream if it does not exist yet."""
+        if self._groups_ready:
+            return
+        pipeline = self.redis_client.pipeline()
+        for key in self.stream_keys():
+            # Start from the beginning so tasks added before the group are delivered
+            pipeline.xgroup_create(key, self.GROUP, id="0", mkstream=True)
+        for result in await pipeline.execute(raise_on_error=False):
+            if isinstance(result, Exception) and "BUSYGROUP" not in str(result):
+                raise result
+        self._groups_ready = True
+
+    def enqueue(self, pipeline, task_json: str, priority: int, pool: str = DEFAULT_POOL):
+        """Append a serialized task to its pool's priority stream on a pipeline."""
+        if self.maxlen:
+            pipeline.xadd(self.queue_key(priority, pool), {"task": task_json},
+                          maxlen=self.maxlen, approximate=True)
+        else:
+            pipeline.xadd(self.queue_key(priority, pool), {"task": task_json})
+
+    async def register_consumer(self, consumer_id: str):
+        """Register a consumer so the reaper can find its pending entries."""
+        await self._ensure_groups()
+        await super().register_consumer(consumer_id)
+
+    async def unregister_consumer(self, consumer_id: str):
+        """Remove a consumer that has no pending entries from the groups."""
+        await self._ensure_groups()
+        keys = self.stream_keys()
+        pipeline = self.redis_client.pipeline()
+        for key in keys:
+            pipeline.xpending_range(key, self.GROUP, "-", "+", 1, consumername=consumer_id)
+        if any(await pipeline.execute()):
+            return
+
+        pipeline = self.redis_client.pipeline()
+        for key in keys:
+            pipeline.xgroup_delconsumer(key, self.GROUP, consumer_id)
+        pipeline.srem(self.CONSUMERS_KEY, consumer_id)
+        await pipeline.execute()
+
+    async def claim(self, consumer_id: str, priorities: Tuple[int, ...] = (2, 1, 0),
+                    pool: str = DEFAULT_POOL) -> Optional[str]:
+        """Read the next task of a pool into the consumer's pending entries.
+
+        Returns:
+            The raw serialized task, or None if all of the pool's streams are drained
+        """
+        await self._ensure_groups()
+        for priority in priorities:
+            key = self.queue_key(priority, pool)
+            try:
+                response = await self.redis_client.xreadgroup(self.GROUP, consumer_id, {key: ">"}, count=1)
+            except ResponseError as e:
+                if "NOGROUP" not in str(e):
+                    raise
+                # The stream was deleted since the groups were created
+                self._groups_ready = False
+                await self._ensure_groups()
+                response = await self.redis_client.xreadgroup(self.GROUP, consumer_id, {key: ">"}, count=1)
+
+            for _, entries in response or []:
+                for entry_id, fields in entries:
+                    task_json = self._task_field(fields)
+                    if task_json is None:
+                        continue
+                    self._deliveries[(consumer_id, task_json)] = (key, self._text(entry_id))
+                    return task_json
+        return None
+
+    async def claim_batch(self, consumer_id: str, task_type: str, model_type: Optional[str],
+                          priority: int, max_size: int) -> List[str]:
+        """Claim further queued tasks compatible with an already claimed one.
+
+        Returns:
+            The raw serialized tasks claimed, possibly empty
+        """
+        if max_size <= 0:
+            return []
+        if self._stream_claim_batch_script is None:
+            self._stream_claim_batch_script = self.redis_client.register_script(STREAM_CLAIM_BATCH_SCRIPT)
+
+        key = self.queue_key_for(task_type, priority)
+        claimed = await self._stream_claim_batch_script(
+            keys=[key],
+            args=[self.GROUP, consumer_id, task_type, model_type or "", max_size]
+        )
+        claimed = [self._text(value) for value in claimed or []]
+        tasks = []
+        for entry_id, task_json in zip(claimed[::2], claimed[1::2]):
+            self._deliveries[(consumer_id, task_json)] = (key, entry_id)
+            tasks.append(task_json)
+        return tasks
+
+    async def _delivery(self, consumer_id: str, task_json: str) -> Optional[Tuple[str, str]]:
+        """Find and forget the stream entry a task was delivered as.
+
+        Tasks claimed by an earlier process are looked up in the consumer's
+        pending entries.
+        """
+        delivery = self._deliveries.pop((consumer_id, task_json), None)
+        if delivery is not None:
+            return delivery
+
+        for key in self.stream_keys():
+            pending = await self.redis_client.xpending_range(
+                key, self.GROUP, "-", "+", 1000, consumername=consumer_id
+            )
+            for entry in pending:
+                entry_id = self._text(entry["message_id"])
+                if await self._entry_task(key, entry_id) == task_json:
+                    return key, entry_id
+        return None
+
+    async def _entry_task(self, key: str, entry_id: str) -> Optional[str]:
+        """Get the serialized task of a stream entry, if it was not trimmed."""
+        entries = await self.redis_client.xrange(key, entry_id, entry_id)
+        return self._task_field(entries[0][1]) if entries else None
+
+    async def ack(self, consumer_id: str, task_json: str, task_id: str) -> bool:
+        """Acknowledge a task, removing it from the consumer's pending entries.
+
+        Returns:
+            True if the task was still pending
+        """
+        delivery = await self._delivery(consumer_id, task_json)
+        if delivery is None:
+            return False
+        key, entry_id = delivery
+        return bool(await self.redis_client.xack(key, self.GROUP, entry_id))
+
+    async def ack_many(self, consumer_id: str, tasks: List[Tuple[str, str]]) -> int:
+        """Acknowledge several tasks in one round trip.
+
+        Returns:
+            Number of tasks that were still pending
+        """
+        deliveries = [await self._delivery(consumer_id, task_json) for _, task_json in tasks]
+        deliveries = [delivery for delivery in deliveries if delivery is not None]
+        if not deliveries:
+            return 0
+        pipeline = self.redis_client.pipeline()
+        for key, entry_id in deliveries:
+            pipeline.xack(key, self.GROUP, entry_id)
+        return sum(1 for acked in await pipeline.execute() if acked)
+
+    async def discard(self, consumer_id: str, task_json: str, task_id: Optional[str] = None):
+        """Drop a claimed task without processing it."""
+        delivery = await self._delivery(consumer_id, task_json)
+        if delivery is None:
+            return
+        key, entry_id = delivery
+        pipeline = self.redis_client.pipeline()
+        pipeline.xack(key, self.GROUP, entry_id)
+        pipeline.xdel(key, entry_id)
+        await pipeline.execute()
+
+    async def requeue(self, consumer_id: str, task_json: str) -> bool:
+        """Move an in-flight task back to the tail of its priority stream."""
+        delivery = await self._delivery(consumer_id, task_json)
+        if delivery is None:
+            return False
+        return await self._requeue_entry(*delivery, task_json)
+
+    async def _requeue_entry(self, key: str, entry_id: str, task_json: str) -> bool:
+        if self._stream_requeue_script is None:
+            self._stream_requeue_script = self.redis_client.register_script(
+                self.push_task_lua + STREAM_REQUEUE_SCRIPT
+            )
+        moved = await self._stream_requeue_script(
+            keys=[key, self.queue_key_of(task_json)],
+            args=[self.GROUP, entry_id, task_json]
+        )
+        return bool(moved)
+
+    async def reap(self) -> List[str]:
+        """Re-queue entries pending with dead consumers or idle past the visibility timeout.
+
+        Returns:
+            IDs of the tasks that were re-queued
+        """
+        await self._ensure_groups()
+        requeued: List[str] = []
+        keys = self.stream_keys()
+
+        # Consumers whose heartbeat key expired are considered dead
+        consumers = await self.redis_client.smembers(self.CONSUMERS_KEY)
+        for consumer in consumers:
+            consumer_id = self._text(consumer)
+            if await self.redis_client.exists(self.heartbeat_key(consumer_id)):
+                continue
+
+            count = 0
+            for key in keys:
+                pending = await self.redis_client.xpending_range(
+                    key, self.GROUP, "-", "+", 1000, consumername=consumer_id
+                )
+                for entry in pending:
+                    entry_id = self._text(entry["message_id"])
+                    task_json = await self._entry_task(key, entry_id)
+                    if task_json is None:
+                        # Trimmed away; nothing left to re-queue
+                        await self.redis_client.xack(key, self.GROUP, entry_id)
+                    elif await self._requeue_entry(key, entry_id, task_json):
+                        requeued.append(self._task_id(task_json) or "unknown")
+                        count += 1
+
+            if count:
+                logger.warning(f"Consumer {consumer_id} has no heartbeat; re-queued {count} in-flight tasks")
+            await self.unregister_consumer(consumer_id)
+
+        # Entries idle past their visibility deadline belong to stuck tasks
+        min_idle = int(self.visibility_timeout * 1000)
+        for key in keys:
+            start = "0-0"
+            claimed_any = False
+            while True:
+                next_start, entries = (await self.redis_client.xautoclaim(
+                    key, self.GROUP, self.REAPER_CONSUMER, min_idle, start_id=start, count=100
+                ))[:2]
+                for entry_id, fields in entries:
+                    claimed_any = True
+                    entry_id = self._text(entry_id)
+                    task_json = self._task_field(fields or {})
+                    if task_json is None:
+                        await self.redis_client.xack(key, self.GROUP, entry_id)
+                        continue
+                    task_id = self._task_id(task_json) or "unknown"
+                    if await self._requeue_entry(key, entry_id, task_json):
+                        requeued.append(task_id)
+                        logger.warning(f"Task {task_id} idle past its visibility timeout in {key}; re-queued")
+                start = self._text(next_start)
+                if start == "0-0":
+                    break
+            if claimed_any:
+                await self.redis_client.xgroup_delconsumer(key, self.GROUP, self.REAPER_CONSUMER)
+
+        return requeued
+
+    async def _group_info(self, key: str) -> Optional[dict]:
+        for group in await self.redis_client.xinfo_groups(key):
+            if self._text(group["name"]) == self.GROUP:
+                return group
+        return None
+
+    async def trim(self) -> int:
+        """Remove acknowledged entries older than the retention period.
+
+        Entries before the oldest pending entry and up to the group's last
+        delivered id have all been acknowledged.
+
+        Returns:
+            Number of entries removed
+        """
+        if self.trim_policy != "acked":
+            return 0
+        await self._ensure_groups()
+
+        cutoff = (int((time.time() - self.retention) * 1000), 0)
+        removed = 0
+        for key in self.stream_keys():
+            group = await self._group_info(key)
+            if group is None:
+                continue
+            last_ms, last_seq = _parse_id(self._text(group["last-delivered-id"]))
+            bounds = [cutoff, (last_ms, last_seq + 1)]
+            summary = await self.redis_client.xpending(key, self.GROUP)
+            if summary["pending"]:
+                bounds.append(_parse_id(self._text(summary["min"])))
+            ms, seq = min(bounds)
+            if ms <= 0:
+                continue
+            removed += await self.redis_client.xtrim(key, minid=f"{ms}-{seq}", approximate=True)
+        return removed
+
+    async def _undelivered(self, keys: List[str]) -> List[int]:
+        """Get the entries not yet delivered to the group in each stream."""
+        await self._ensure_groups()
+        pipeline = self.redis_client.pipeline()
+        for key in keys:
+            pipeline.xinfo_groups(key)
+            pipeline.xlen(key)
+        results = await pipeline.execute()
+
+        counts = []
+        for groups, length in zip(results[::2], results[1::2]):
+            lag = next((g.get("lag") for g in groups if self._text(g["name"]) == self.GROUP), None)
+            # Lag is unknown after undelivered entries were trimmed; the length bounds it
+            counts.append(lag if lag is not None else length)
+        return counts
+
+    async def depth(self, priority: int, pool: Optional[str] = None) -> int:
+        """Get the number of undelivered tasks for a priority, in one pool or all pools."""
+        pools = [pool] if pool else POOL_NAMES
+        return sum(await self._undelivered([self.queue_key(priority, name) for name in pools]))
+
+    async def pool_depths(self) -> Dict[str, int]:
+        """Get the number of undelivered tasks per pool across priorities."""
+        counts = await self._undelivered(self.stream_keys())
+        per_pool = len(self.PRIORITY_NAMES)
+        return {
+            pool: sum(counts[i * per_pool:(i + 1) * per_pool])
+            for i, pool in enumerate(POOL_NAMES)
+        }
+
+    async def _stored_length(self, key: str) -> int:
+        return await self.redis_client.xlen(key)
+
+    async def in_flight_count(self) -> int:
+        """Get the number of delivered but unacknowledged tasks."""
+        await self._ensure_groups()
+        pipeline = self.redis_client.pipeline()
+        for key in self.stream_keys():
+            pipeline.xpending(key, self.GROUP)
+        return sum(summary["pending"] for summary in await pipeline.execute())
+
+    async def consumer_lag(self) -> Dict[str, dict]:
+        """Get the group lag and per-consumer pending entries of each active stream.
+
+        Returns:
+            Stream key -> {length, lag, pending, consumers: {name: {pending, idle_ms}}},
+            listing only consumers that hold pending entries
+        """
+        await self._ensure_groups()
+        keys = self.stream_keys()
+        pipeline = self.redis_client.pipeline()
+        for key in keys:
+            pipeline.xlen(key)
+            pipeline.xinfo_groups(key)
+            pipeline.xinfo_consumers(key, self.GROUP)
+        results = await pipeline.execute()
+
+        lag = {}
+        for i, key in enumerate(keys):
+            length, groups, consumers = results[i * 3:(i + 1) * 3]
+            group = next((g for g in groups if self._text(g["name"]) == self.GROUP), None)
+            if group is None or not (length or group.get("pending")):
+                continue
+            lag[key] = {
+                "length": length,
+                "lag": group.get("lag"),
+                "pending": group.get("pending", 0),
+                "consumers": {
+                    self._text(consumer["name"]): {
+                        "pending": consumer.get("pending", 0),
+                        "idle_ms": consumer.get("idle", 0)
+                    }
+                    for consumer in consumers
+                    if consumer.get("pending")
+                }
+            }
+        return lag
+
+
+def create_task_queue(redis_client: aioredis.Redis, visibility_timeout: Optional[int] = None) -> ReliableTaskQueue:
+    """Create the task queue configured by the TASK_QUEUE_* environment variables.
+
+    TASK_QUEUE_BACKEND selects "list" (default) or "streams"; TASK_STREAM_TRIM
+    and TASK_STREAM_RETENTION_SEC configure how stream entries are trimmed.
+    """
+    if visibility_timeout is None:
+        visibility_timeout = int(os.getenv("TASK_VISIBILITY_TIMEOUT_SEC", "900"))
+    backend = os.getenv("TASK_QUEUE_BACKEND", "list").lower()
+
+    if backend in ("streams", "stream"):
+        trim_policy, maxlen = parse_trim_policy(os.getenv("TASK_STREAM_TRIM", "acked"))
+        return StreamTaskQueue(
+            redis_client,
+            visibility_timeout=visibility_timeout,
+            trim_policy=trim_policy,
+            maxlen=maxlen,
+            retention=float(os.getenv("TASK_STREAM_RETENTION_SEC", "3600"))
+        )
+
+    if backend != "list":
+        logger.warning(f"Unknown TASK_QUEUE_BACKEND '{backend}'; using Redis lists")
+    return ReliableTaskQueue(redis_client, visibility_timeout=visibility_timeout)
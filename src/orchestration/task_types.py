@@ -1,7 +1,7 @@
 """Task types and models for parallel processing."""
 
 from enum import Enum
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime, timezone
 import uuid
@@ -50,6 +50,10 @@ class Task(BaseModel):
     retry_count: int = 0
     max_retries: int = 3
     parent_task_id: Optional[str] = None  # For subtask tracking
+    depends_on: List[str] = Field(default_factory=list)  # Task IDs that must complete first
+    idempotency_key: Optional[str] = None  # Defaults to a hash of type, parent, payload and dependencies
+    enqueued_at: Optional[float] = None  # Epoch time the task last became ready to claim
+    checkpoint: Optional[Dict[str, Any]] = None  # Partial progress kept when a drained worker re-queues the task
     
     model_config = ConfigDict(use_enum_values=True)
 
@@ -0,0 +1,170 @@
+"""Worker pool configuration and cluster-wide pool administration."""
+
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+import redis.asyncio as aioredis
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_POOL = "default"
+
+# Task types served by dedicated pools, each with its own queues and workers.
+# All other task types are served by the default pool.
+POOL_TASK_TYPES: Dict[str, List[str]] = {
+    "search": ["search", "data_aggregation_search"],
+    "llm": ["summarization", "dok_categorization", "entity_extraction",
+            "reasoning", "data_aggregation_extract"],
+}
+
+POOL_NAMES = [DEFAULT_POOL] + list(POOL_TASK_TYPES)
+
+# Task type -> pool name for every type with a dedicated pool
+POOL_ROUTES: Dict[str, str] = {
+    task_type: pool for pool, task_types in POOL_TASK_TYPES.items() for task_type in task_types
+}
+
+
+def pool_for(task_type) -> str:
+    """Get the name of the pool serving a task type."""
+    task_type = task_type.value if hasattr(task_type, "value") else str(task_type)
+    return POOL_ROUTES.get(task_type, DEFAULT_POOL)
+
+
+def default_pool_sizes(worker_pool_size: int) -> Dict[str, int]:
+    """Split a total worker count across pools.
+
+    Search is bounded by provider rate limits, so it gets the smaller share;
+    the default pool only serves simulated task types.
+    """
+    search = max(1, round(worker_pool_size * 0.3))
+    return {
+        "search": search,
+        "llm": max(1, worker_pool_size - search - 1),
+        DEFAULT_POOL: 1
+    }
+
+
+def parse_pool_sizes(spec: str) -> Dict[str, int]:
+    """Parse a pool size specification such as "search:3,llm:6,default:1".
+
+    Raises:
+        ValueError: If the specification names an unknown pool or an invalid size
+    """
+    sizes = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        name, _, size = item.partition(":")
+        name = name.strip()
+        if name not in POOL_NAMES:
+            raise ValueError(f"Unknown worker pool '{name}'")
+        sizes[name] = int(size)
+        if sizes[name] < 0:
+            raise ValueError(f"Worker pool '{name}' size must not be negative")
+    return sizes
+
+
+class WorkerPoolManager:
+    """Shares pool sizes and utilization between coordinators through Redis.
+
+    Pool sizes set through the admin API are stored in a hash that every
+    worker instance applies to its own pools. Each instance reports its pool
+    utilization in a short-lived key so the API can aggregate it, and marks
+    itself while it drains before shutting down.
+    """
+
+    SIZES_KEY = "nexus:worker_pools:sizes"
+    INSTANCES_KEY = "nexus:worker_pools:instances"
+    STATS_PREFIX = "nexus:worker_pools:stats"
+    DRAINING_KEY = "nexus:worker_pools:draining"
+
+    def __init__(self, redis_client: aioredis.Redis, stats_ttl: int = 30):
+        self.redis_client = redis_client
+        self.stats_ttl = stats_ttl
+
+    def stats_key(self, instance_id: str) -> str:
+        """Get Redis key for an instance's pool utilization."""
+        return f"{self.STATS_PREFIX}:{instance_id}"
+
+    async def get_sizes(self) -> Dict[str, int]:
+        """Get pool sizes set at runtime."""
+        raw_sizes = await self.redis_client.hgetall(self.SIZES_KEY)
+        sizes = {}
+        for name, size in (raw_sizes or {}).items():
+            name = name.decode() if isinstance(name, bytes) else name
+            if name in POOL_NAMES:
+                sizes[name] = int(size)
+        return sizes
+
+    async def set_size(self, pool: str, size: int):
+        """Set the per-instance size of a pool for all worker instances.
+
+        Raises:
+            ValueError: If the pool is unknown or the size is negative
+        """
+        if pool not in POOL_NAMES:
+            raise ValueError(f"Unknown worker pool '{pool}'")
+        if size < 0:
+            raise ValueError("Worker pool size must not be negative")
+        await self.redis_client.hset(self.SIZES_KEY, pool, size)
+        logger.info(f"Worker pool '{pool}' resized to {size} workers per instance")
+
+    async def report(self, instance_id: str, stats: Dict[str, Dict[str, Any]]):
+        """Report an instance's pool utilization."""
+        pipeline = self.redis_client.pipeline()
+        pipeline.set(self.stats_key(instance_id), json.dumps({"pools": stats, "ts": time.time()}), ex=self.stats_ttl)
+        pipeline.sadd(self.INSTANCES_KEY, instance_id)
+        await pipeline.execute()
+
+    async def cluster_stats(self) -> Dict[str, Any]:
+        """Aggregate pool utilization across live worker instances."""
+        instances = [
+            i.decode() if isinstance(i, bytes) else i
+            for i in await self.redis_client.smembers(self.INSTANCES_KEY)
+        ]
+        reports = await self.redis_client.mget([self.stats_key(i) for i in instances]) if instances else []
+
+        pools = {name: {"size": 0, "busy": 0, "processed": 0} for name in POOL_NAMES}
+        live = 0
+        for instance_id, raw in zip(instances, reports):
+            if raw is None:
+                # Instance stopped reporting
+                await self.redis_client.srem(self.INSTANCES_KEY, instance_id)
+                continue
+            live += 1
+            for name, stats in json.loads(raw).get("pools", {}).items():
+                totals = pools.setdefault(name, {"size": 0, "busy": 0, "processed": 0})
+                for field in totals:
+                    totals[field] += int(stats.get(field, 0))
+
+        for totals in pools.values():
+            totals["utilization"] = round(totals["busy"] / totals["size"], 3) if totals["size"] else 0.0
+
+        return {"instances": live, "pools": pools, "configured_sizes": await self.get_sizes()}
+
+    async def set_draining(self, instance_id: str, deadline: float):
+        """Mark an instance as draining until the given epoch time."""
+        await self.redis_client.zadd(self.DRAINING_KEY, {instance_id: deadline})
+
+    async def clear_draining(self, instance_id: str):
+        """Remove an instance's draining mark once it stopped."""
+        await self.redis_client.zrem(self.DRAINING_KEY, instance_id)
+
+    async def draining_instances(self) -> List[str]:
+        """Get the instances currently draining."""
+        pipeline = self.redis_client.pipeline()
+        # Marks of instances that died while draining expire at their deadline
+        pipeline.zremrangebyscore(self.DRAINING_KEY, "-inf", time.time())
+        pipeline.zrange(self.DRAINING_KEY, 0, -1)
+        _, instances = await pipeline.execute()
+        return [i.decode() if isinstance(i, bytes) else i for i in instances]
+
+    @staticmethod
+    def describe_pools() -> Dict[str, Optional[List[str]]]:
+        """Get the task types served by each pool (None means all other types)."""
+        return {DEFAULT_POOL: None, **POOL_TASK_TYPES}
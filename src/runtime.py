@@ -0,0 +1,170 @@
+"""
+Shared runtime for the API and worker processes.
+
+A process holds one NexusRuntime, which owns exactly one instance of each
+expensive resource: the PostgreSQL pool, the Redis client, the LLM client
+and the parsed configuration files. Resources are created on first use, so
+a process only pays for what it touches, and the time spent creating each
+one is recorded for the startup breakdown.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict, Optional
+
+import redis.asyncio as redis
+
+from src.config.search_providers import SearchProvidersConfig
+from src.llm import LLMClient
+from src.persistence.postgres_knowledge_base import PostgresKnowledgeBase
+
+
+logger = logging.getLogger(__name__)
+
+
+class NexusRuntime:
+    """Lazily initialized, process-wide resources."""
+
+    def __init__(self,
+                 redis_url: Optional[str] = None,
+                 storage_path: Optional[str] = None,
+                 llm_config_path: Optional[str] = None):
+        self.redis_url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        self.storage_path = storage_path or os.getenv("STORAGE_PATH", "data/storage")
+        self.llm_config_path = llm_config_path or os.getenv("LLM_CONFIG", "config/llm_config.json")
+
+        self.created_at = time.perf_counter()
+        self.timings: Dict[str, float] = {}  # Seconds spent creating each resource
+
+        self._knowledge_base: Optional[PostgresKnowledgeBase] = None
+        self._redis: Optional[redis.Redis] = None
+        self._llm_client: Optional[LLMClient] = None
+        self._llm_config: Optional[Dict[str, Any]] = None
+        self._search_providers_config: Optional[SearchProvidersConfig] = None
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @asynccontextmanager
+    async def _initializing(self, name: str):
+        """Serialize concurrent first uses of a resource."""
+        async with self._locks.setdefault(name, asyncio.Lock()):
+            yield
+
+    def _timed(self, name: str, start: float):
+        self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    @contextmanager
+    def timed(self, name: str):
+        """Record the time a startup step takes in the startup breakdown."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._timed(name, start)
+
+    @property
+    def knowledge_base(self) -> PostgresKnowledgeBase:
+        """Get the process's only knowledge base; repositories connect it on first query."""
+        if self._knowledge_base is None:
+            self._knowledge_base = PostgresKnowledgeBase(storage_path=self.storage_path)
+        return self._knowledge_base
+
+    async def connect_knowledge_base(self) -> PostgresKnowledgeBase:
+        """Get the knowledge base with its connection pool open."""
+        knowledge_base = self.knowledge_base
+        if knowledge_base.pool is None:
+            async with self._initializing("postgres"):
+                if knowledge_base.pool is None:
+                    start = time.perf_counter()
+                    await knowledge_base.connect()
+                    self._timed("postgres", start)
+        return knowledge_base
+
+    async def redis(self) -> redis.Redis:
+        """Get the connected Redis client."""
+        if self._redis is None:
+            async with self._initializing("redis"):
+                if self._redis is None:
+                    start = time.perf_counter()
+                    client = redis.Redis.from_url(self.redis_url)
+                    await client.ping()
+                    self._redis = client
+                    self._timed("redis", start)
+        return self._redis
+
+    @property
+    def llm_config(self) -> Dict[str, Any]:
+        """Get the parsed LLM configuration file, or an empty dict if there is none."""
+        if self._llm_config is None:
+            start = time.perf_counter()
+            try:
+                with open(self.llm_config_path, "r") as f:
+                    self._llm_config = json.load(f)
+            except FileNotFoundError:
+                logger.warning(f"LLM config {self.llm_config_path} not found, using defaults")
+                self._llm_config = {}
+            self._timed("llm_config", start)
+        return self._llm_config
+
+    @property
+    def llm_client(self) -> LLMClient:
+        """Get the LLM client shared by agents, orchestrators and task executors."""
+        if self._llm_client is None:
+            start = time.perf_counter()
+            if os.path.exists(self.llm_config_path):
+                self._llm_client = LLMClient(config_path=self.llm_config_path)
+            else:
+                self._llm_client = LLMClient()
+            self._timed("llm_client", start)
+        return self._llm_client
+
+    @property
+    def search_providers_config(self) -> SearchProvidersConfig:
+        """Get the search providers configuration read from the environment."""
+        if self._search_providers_config is None:
+            start = time.perf_counter()
+            self._search_providers_config = SearchProvidersConfig.from_env()
+            self._timed("search_providers_config", start)
+        return self._search_providers_config
+
+    def startup_report(self) -> Dict[str, Any]:
+        """Get the time spent creating each resource and since the runtime was created."""
+        return {
+            "total_ms": round((time.perf_counter() - self.created_at) * 1000, 1),
+            "resources_ms": {name: round(seconds * 1000, 1) for name, seconds in self.timings.items()},
+        }
+
+    def log_startup(self, component: str):
+        """Log the startup breakdown of a component."""
+        report = self.startup_report()
+        breakdown = ", ".join(f"{name}={ms}ms" for name, ms in report["resources_ms"].items())
+        logger.info(f"{component} started in {report['total_ms']}ms ({breakdown or 'no resources'})")
+
+    async def close(self):
+        """Close every resource that was created."""
+        if self._knowledge_base is not None:
+            await self._knowledge_base.disconnect()
+            self._knowledge_base = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+
+_runtime: Optional[NexusRuntime] = None
+
+
+def get_runtime() -> NexusRuntime:
+    """Get the process-wide runtime, creating it from the environment on first use."""
+    global _runtime
+    if _runtime is None:
+        _runtime = NexusRuntime()
+    return _runtime
+
+
+def set_runtime(runtime: Optional[NexusRuntime]):
+    """Install the process-wide runtime, or clear it with None."""
+    global _runtime
+    _runtime = runtime
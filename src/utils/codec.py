@@ -0,0 +1,93 @@
+"""
+Serialization codecs for queued tasks, task results and monitoring events.
+
+Everything these codecs produce is read by other components as JSON: the
+Lua queue scripts decode tasks with cjson and the monitoring websocket
+forwards events to the browser as they are. Codecs therefore differ only in
+speed, not in wire format, and can be switched without draining queues.
+"""
+
+import json
+import logging
+import os
+from datetime import date, datetime
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Union
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+logger = logging.getLogger(__name__)
+
+
+def _default(value: Any) -> Any:
+    """Encode values the JSON encoders do not handle natively."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class JsonCodec:
+    """Codec using the standard library json module."""
+
+    name = "json"
+
+    def dumps(self, value: Any) -> str:
+        return json.dumps(value, default=_default)
+
+    def loads(self, raw: Union[str, bytes]) -> Any:
+        return json.loads(raw)
+
+
+class OrjsonCodec:
+    """Codec using orjson, which emits compact JSON several times faster."""
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, value: Any) -> str:
+        return orjson.dumps(value, default=_default, option=self._options).decode("utf-8")
+
+    def loads(self, raw: Union[str, bytes]) -> Any:
+        return orjson.loads(raw)
+
+
+CODECS = {
+    JsonCodec.name: JsonCodec,
+    OrjsonCodec.name: OrjsonCodec,
+}
+
+
+@lru_cache(maxsize=None)
+def get_codec(name: str = "") -> Union[JsonCodec, OrjsonCodec]:
+    """Get a codec by name, defaulting to the TASK_CODEC setting.
+
+    Falls back to the standard library codec when orjson is not installed.
+
+    Raises:
+        ValueError: If the codec name is unknown
+    """
+    name = (name or os.getenv("TASK_CODEC", "orjson")).strip().lower()
+    if name not in CODECS:
+        raise ValueError(f"Unknown codec '{name}', expected one of {sorted(CODECS)}")
+    try:
+        return CODECS[name]()
+    except ImportError:
+        logger.warning(f"Codec '{name}' is not available, using '{JsonCodec.name}'")
+        return JsonCodec()
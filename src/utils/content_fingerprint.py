@@ -0,0 +1,69 @@
+"""
+SimHash content fingerprints for finding near-duplicate documents.
+
+Documents that share most of their word shingles get fingerprints that
+differ in few bits, so near-duplicates are found by Hamming distance. The
+64-bit fingerprint is split into bands; two fingerprints within
+MAX_BAND_DISTANCE bits of each other share at least one band exactly, which
+lets a key-value store find candidate duplicates without comparing every pair.
+"""
+
+import hashlib
+import re
+from collections import Counter
+from typing import List
+
+FINGERPRINT_BITS = 64
+BAND_COUNT = 4
+BAND_BITS = FINGERPRINT_BITS // BAND_COUNT
+
+# Fingerprints up to this many bits apart are guaranteed to share a band
+MAX_BAND_DISTANCE = BAND_COUNT - 1
+
+# Documents with fewer words carry too little text to call near-duplicates
+MIN_WORDS = 30
+
+SHINGLE_SIZE = 3
+
+_WORD = re.compile(r"\w+")
+
+
+def word_count(text: str) -> int:
+    """Count the words of a text as the fingerprint sees them."""
+    return len(_WORD.findall(text))
+
+
+def simhash(text: str) -> int:
+    """Compute the 64-bit SimHash of a text over its lowercased word shingles."""
+    words = _WORD.findall(text.lower())
+    shingles = Counter(
+        " ".join(words[start:start + SHINGLE_SIZE])
+        for start in range(max(1, len(words) - SHINGLE_SIZE + 1))
+    ) if words else Counter()
+
+    weights = [0] * FINGERPRINT_BITS
+    for shingle, count in shingles.items():
+        digest = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += count if digest >> bit & 1 else -count
+
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def content_hash(text: str) -> str:
+    """Get the fingerprint of a text as the hex string stored in sources.content_hash."""
+    return f"{simhash(text):016x}"
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """Count the bits in which two fingerprints differ."""
+    return bin(first ^ second).count("1")
+
+
+def bands(fingerprint: int) -> List[str]:
+    """Split a fingerprint into its bands, each tagged with its position."""
+    mask = (1 << BAND_BITS) - 1
+    return [
+        f"{index}:{fingerprint >> (index * BAND_BITS) & mask:04x}"
+        for index in range(BAND_COUNT)
+    ]
@@ -0,0 +1,57 @@
+"""
+In-process cache with per-entry expiry and least-recently-used eviction.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, Optional, Tuple, TypeVar
+
+
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[V]):
+    """Bounded mapping whose entries expire after a time to live.
+
+    Negative results can be cached too: store None with a shorter TTL, and
+    get() reports it as a hit so callers skip the lookup that produced it.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Optional[V]]:
+        """Get a cached value.
+
+        Returns:
+            (True, value) on a hit, which may be a cached None, or (False, None)
+        """
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING or entry[0] < time.monotonic():
+            if entry is not _MISSING:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[1]
+
+    def set(self, key: Hashable, value: Optional[V], ttl: Optional[float] = None):
+        """Cache a value, evicting the least recently used entry when full."""
+        self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        """Drop a cached value."""
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -25,13 +25,11 @@ from src.nexus_agents import NexusAgents
 from src.orchestration.communication_bus import CommunicationBus
 from src.orchestration.research_orchestrator import ResearchOrchestrator
 from src.orchestration.parallel_task_coordinator import ParallelTaskCoordinator
+from src.orchestration.payload_store import create_payload_store
 from src.agents.research.dok_workflow_orchestrator import DOKWorkflowOrchestrator
-from src.persistence.postgres_knowledge_base import PostgresKnowledgeBase
 from src.orchestration.rate_limiter import RateLimiter
 from src.orchestration.task_manager import TaskStatus
-from src.llm import LLMClient
-from src.config.search_providers import SearchProvidersConfig
-from src.mcp_config_loader import MCPConfigLoader
+from src.runtime import NexusRuntime, set_runtime
 
 # Load environment variables
 load_dotenv(override=True)
@@ -59,6 +57,10 @@ class ResearchWorker:
         self.storage_path = storage_path
         self.worker_id = worker_id or f"worker-{os.getpid()}"
         
+        # One pool per resource, shared by every component of the worker
+        self.runtime = NexusRuntime(redis_url=redis_url, storage_path=storage_path)
+        set_runtime(self.runtime)
+        
         # Redis clients
         self.redis_client: Optional[redis.Redis] = None
         self.task_queue_key = "nexus:task_queue"
@@ -72,6 +74,8 @@ class ResearchWorker:
         # Control flags
         self.running = False
         self.shutdown_event = asyncio.Event()
+        self._main_loop: Optional[asyncio.Task] = None
+        self._drain_task: Optional[asyncio.Task] = None
         
     async def start(self):
         """Start the worker process."""
@@ -79,24 +83,27 @@ class ResearchWorker:
         
         try:
             # Connect to Redis
-            self.redis_client = redis.Redis.from_url(self.redis_url)
-            await self.redis_client.ping()
+            self.redis_client = await self.runtime.redis()
             logger.info("Connected to Redis")
             
-            # PostgreSQL knowledge base will be initialized via NexusAgents
-            logger.info("PostgreSQL knowledge base will be initialized via NexusAgents")
+            # The PostgreSQL pool is created once and shared by every component
+            await self.runtime.connect_knowledge_base()
             
             # Initialize Nexus Agents system
-            await self._initialize_nexus_agents()
+            with self.runtime.timed("nexus_agents"):
+                await self._initialize_nexus_agents()
             logger.info("Initialized Nexus Agents system")
             
             # Initialize consolidated Research Orchestrator
-            await self._initialize_research_orchestrator()
+            with self.runtime.timed("research_orchestrator"):
+                await self._initialize_research_orchestrator()
             logger.info("Initialized consolidated Research Orchestrator")
+            self.runtime.log_startup(f"Worker {self.worker_id}")
             
-            # Start processing tasks
-            self.running = True
-            await self._process_tasks()
+            # Start processing tasks unless a shutdown was requested meanwhile
+            self.running = not self.shutdown_event.is_set()
+            self._main_loop = asyncio.create_task(self._process_tasks())
+            await self._main_loop
             
         except Exception as e:
             logger.error(f"Worker startup failed: {e}")
@@ -105,8 +112,11 @@ class ResearchWorker:
     async def stop(self):
         """Stop the worker process gracefully."""
         logger.info(f"Stopping worker {self.worker_id}")
-        self.running = False
-        self.shutdown_event.set()
+        self.begin_shutdown()
+        
+        # Let in-flight tasks finish; unfinished ones are re-queued with their checkpoints
+        if self._drain_task:
+            await self._drain_task
         
         # Cancel parallel task processor if it exists
         if hasattr(self, 'parallel_task_processor') and self.parallel_task_processor:
@@ -116,44 +126,61 @@ class ResearchWorker:
             except asyncio.CancelledError:
                 pass
         
-        # Clean up connections
+        # Clean up connections; the runtime closes the shared pools last
         if self.nexus_agents:
             await self.nexus_agents.stop()
             
-        if self.research_orchestrator and hasattr(self.research_orchestrator, 'db'):
-            await self.research_orchestrator.db.disconnect()
-            
-        if self.redis_client:
-            await self.redis_client.close()
+        await self.runtime.close()
             
         logger.info(f"Worker {self.worker_id} stopped")
         
+    def begin_shutdown(self):
+        """Stop taking work and start draining the task coordinator.
+        
+        Safe to call from a signal handler: claiming stops at once and the drain
+        runs in the background, bounded by TASK_DRAIN_TIMEOUT_SEC.
+        """
+        self.running = False
+        self.shutdown_event.set()
+        if self._drain_task is None and self.task_coordinator and not self.task_coordinator.draining:
+            self.task_coordinator.draining = True
+            self._drain_task = asyncio.create_task(self._drain())
+    
+    async def _drain(self):
+        """Drain the task coordinator, then interrupt a research task still running.
+        
+        The research task gets the same deadline as the coordinator's in-flight tasks.
+        """
+        deadline = time.monotonic() + self.task_coordinator.drain_timeout
+        try:
+            await self.task_coordinator.drain()
+        except Exception as e:
+            logger.error(f"Error draining task coordinator: {e}")
+        
+        if self._main_loop is None or self._main_loop.done():
+            return
+        await asyncio.wait([self._main_loop], timeout=max(0.0, deadline - time.monotonic()))
+        
+        # A data aggregation waiting on its task group would otherwise outlive the
+        # drain deadline; it is re-queued and resumes from its checkpoints
+        if not self._main_loop.done():
+            logger.warning("Drain deadline reached; interrupting the running research task")
+            self._main_loop.cancel()
+            await asyncio.gather(self._main_loop, return_exceptions=True)
+        
     async def _initialize_nexus_agents(self):
         """Initialize the Nexus Agents system."""
-        # Initialize LLM client
-        llm_config_path = os.environ.get("LLM_CONFIG", "config/llm_config.json")
-        if os.path.exists(llm_config_path):
-            llm_client = LLMClient(config_path=llm_config_path)
-        else:
-            llm_client = LLMClient()
-            
         # Initialize communication bus
         communication_bus = CommunicationBus(redis_url=self.redis_url)
         await communication_bus.connect()
         
-        # Load MCP configuration
-        mcp_config_loader = MCPConfigLoader()
-        mcp_config = mcp_config_loader.load_config()
-        
-        # Initialize search providers configuration from environment variables
-        search_providers_config = SearchProvidersConfig.from_env()
-        
-        # Initialize Nexus Agents
+        # Initialize Nexus Agents on the shared LLM client and knowledge base
         self.nexus_agents = NexusAgents(
-            llm_client=llm_client,
+            llm_client=self.runtime.llm_client,
             communication_bus=communication_bus,
-            search_providers_config=search_providers_config,
-            storage_path=self.storage_path
+            search_providers_config=self.runtime.search_providers_config,
+            storage_path=self.storage_path,
+            knowledge_base=await self.runtime.connect_knowledge_base()
         )
         
         # Start Nexus Agents system (connects PostgreSQL knowledge base for operation tracking)
@@ -161,9 +188,8 @@ class ResearchWorker:
     
     async def _initialize_research_orchestrator(self):
         """Initialize the consolidated research orchestrator."""
-        # Create database connection
-        db = PostgresKnowledgeBase()
-        await db.connect()
+        # Share the runtime's database pool
+        db = await self.runtime.connect_knowledge_base()
         
         # Create rate limiter
         rate_limiter = RateLimiter()
@@ -171,11 +197,11 @@ class ResearchWorker:
         # Create task coordinator
         task_coordinator = ParallelTaskCoordinator(
             redis_client=self.redis_client,
-            rate_limiter=rate_limiter
+            rate_limiter=rate_limiter,
+            payload_store=create_payload_store(db)
         )
         
-        # Create LLM client
-        llm_client = LLMClient()
+        llm_client = self.runtime.llm_client
         
         # Create DOK workflow orchestrator
         from src.database.dok_taxonomy_repository import DOKTaxonomyRepository
@@ -189,16 +215,12 @@ class ResearchWorker:
         dok_workflow.dok_repository.knowledge_base = db
         dok_workflow.dok_repository._pool = db.pool
         
-        # Load LLM config
-        llm_config_path = os.getenv("LLM_CONFIG", "config/llm_config.json")
-        with open(llm_config_path, 'r') as f:
-            llm_config = json.load(f)
-        
         # Store task coordinator reference
         self.task_coordinator = task_coordinator
         
         # Set the dok_repository on the task coordinator for DOK operations
         task_coordinator.dok_repository = dok_repository
+        task_coordinator.llm_client = llm_client
         
         # Set the data aggregation repository on the task coordinator
         from src.database.data_aggregation_repository import DataAggregationRepository
@@ -231,7 +253,7 @@ class ResearchWorker:
             task_coordinator=task_coordinator,
             dok_workflow=dok_workflow,
             db=db,
-            llm_config=llm_config
+            llm_config=self.runtime.llm_config
         )
         
     async def _process_tasks(self):
@@ -239,6 +261,7 @@ class ResearchWorker:
         logger.info(f"Worker {self.worker_id} started processing tasks")
         
         while self.running:
+            task_data = None
             try:
                 # Use blocking pop with timeout to get next task from main queue
                 task_data = await self.redis_client.blpop(
@@ -289,6 +312,11 @@ class ResearchWorker:
                 
             except asyncio.CancelledError:
                 logger.info("Task processing cancelled")
+                
+                # Hand the interrupted task to the next worker
+                if task_data:
+                    await self.redis_client.lpush(self.task_queue_key, task_json)
+                    await self.redis_client.srem(self.processing_key, task_json)
                 break
             except Exception as e:
                 logger.error(f"Error processing task: {e}")
@@ -376,13 +404,19 @@ class ResearchWorker:
 
 
 def setup_signal_handlers(worker: ResearchWorker):
-    """Setup signal handlers for graceful shutdown."""
-    def signal_handler(signum, frame):
+    """Setup signal handlers for graceful shutdown.
+    
+    A signal stops claiming at once and starts draining in-flight tasks; a
+    research task still running at the drain deadline is interrupted and
+    re-queued, so the main loop ends and main() stops the worker.
+    """
+    def signal_handler(signum):
         logger.info(f"Received signal {signum}, initiating shutdown...")
-        asyncio.create_task(worker.stop())
+        worker.begin_shutdown()
         
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, signal_handler, signum)
 
 
 async def main():
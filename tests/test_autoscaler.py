@@ -0,0 +1,62 @@
+"""Tests for the worker pool autoscaler."""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.orchestration.autoscaler import AutoscalePolicy, WorkerAutoscaler
+
+
+class TestWorkerAutoscaler:
+    """Test sizing decisions and the published recommendation."""
+
+    @pytest.fixture
+    def autoscaler(self):
+        """Create autoscaler with mocked Redis."""
+        policy = AutoscalePolicy(min_workers=1, max_workers=10, target_drain_seconds=60, scale_down_cooldown=30)
+        return WorkerAutoscaler(AsyncMock(), policy)
+
+    def test_needed_workers_follow_backlog_and_latency(self, autoscaler):
+        """Test that backlog times p95 latency sets the workers needed."""
+        for seconds in [1.0] * 19 + [12.0]:
+            autoscaler.observe("llm", seconds)
+
+        # p95 of 20 samples is the 19th smallest: 1s, so 120 tasks take 120 worker-seconds
+        assert autoscaler.p95_latency("llm") == 1.0
+        assert autoscaler.needed_workers("llm", backlog=120, busy=3, cluster_size=4, headroom=0.8) == 5
+
+    def test_exhausted_rate_limit_holds_pool_size(self, autoscaler):
+        """Test that a pool is not grown while its provider has no headroom."""
+        autoscaler.observe("search", 10.0)
+
+        assert autoscaler.needed_workers("search", backlog=600, busy=4, cluster_size=4, headroom=0.02) == 4
+
+    def test_decide_grows_at_once_and_shrinks_gradually(self, autoscaler):
+        """Test growth within bounds and cooldown-limited shrinking."""
+        assert autoscaler.decide("llm", current=2, needed=30, instances=2, now=100.0) == 10
+        assert autoscaler.decide("llm", current=10, needed=0, instances=2, now=100.0) == 9
+        # Still cooling down from the previous step
+        assert autoscaler.decide("llm", current=9, needed=0, instances=2, now=110.0) == 9
+        assert autoscaler.decide("llm", current=9, needed=0, instances=2, now=131.0) == 8
+
+    def test_decide_keeps_floor(self, autoscaler):
+        """Test that a pool sized by an administrator is not shrunk below that size."""
+        assert autoscaler.decide("llm", current=6, needed=0, instances=1, now=100.0, floor=6) == 6
+        assert autoscaler.decide("llm", current=6, needed=40, instances=1, now=100.0, floor=6) == 10
+        # A floor above the policy bounds is kept as set
+        assert autoscaler.decide("llm", current=12, needed=0, instances=1, now=200.0, floor=12) == 12
+
+    @pytest.mark.asyncio
+    async def test_publish_recommendation(self, autoscaler):
+        """Test that the process count covering every pool is stored in Redis."""
+        pipeline = Mock()
+        pipeline.execute = AsyncMock(return_value=[True, True])
+        autoscaler.redis_client.pipeline = Mock(return_value=pipeline)
+
+        processes = await autoscaler.publish_recommendation({"search": 4, "llm": 25}, instances=2)
+
+        assert processes == 3
+        key, value = pipeline.set.call_args_list[0].args
+        assert key == "nexus:autoscale:recommendation"
+        assert json.loads(value)["processes"] == 3
+        assert pipeline.set.call_args_list[1].args == ("nexus:autoscale:recommended_processes", 3)
@@ -4,7 +4,7 @@ Test suite for data aggregation functionality.
 
 import pytest
 import asyncio
-from unittest.mock import Mock, AsyncMock, patch
+from unittest.mock import ANY, Mock, AsyncMock, patch
 import json
 from typing import List, Dict, Any
 
@@ -48,6 +48,7 @@ class TestDataAggregationOrchestrator:
         coordinator = Mock()
         coordinator.submit_tasks = AsyncMock(return_value=True)
         coordinator.get_task_status = AsyncMock(return_value=TaskResult(task_id="test-task", status=TaskStatus.COMPLETED))
+        coordinator.wait_for_group = AsyncMock(return_value={"pending": 0, "completed": 1, "failed": 0})
         return coordinator
     
     @pytest.fixture
@@ -81,26 +82,171 @@ class TestDataAggregationOrchestrator:
         assert len(config["attributes"]) > 0
     
     @pytest.mark.asyncio
-    async def test_execute_data_aggregation(self, orchestrator, mock_dok_repository):
-        """Test executing data aggregation workflow."""
+    async def test_execute_data_aggregation(self, orchestrator, mock_dok_repository, mock_task_coordinator):
+        """Test executing data aggregation workflow, collecting entities from the extraction task results."""
+        from src.agents.aggregation.search_space_enumerator import SearchSubspace
         task_id = "test-task-123"
         config = {
             "entities": ["private schools"],
             "attributes": ["name", "address", "website"],
-            "search_space": "in California"
+            "search_space": "in California",
+            "pipeline_mode": "phased"
         }
         
-        # Mock the methods that would normally interact with external systems
-        with patch.object(orchestrator, '_collect_search_results', AsyncMock(return_value=[])):
-            with patch.object(orchestrator, '_collect_extracted_entities', AsyncMock(return_value=[])):
-                with patch.object(orchestrator.entity_resolver, '_general_resolution', AsyncMock(return_value=[])):
-                    result = await orchestrator.execute_data_aggregation(task_id, config)
-                    
-                    # Verify the result structure
-                    assert "entity_count" in result
-                    assert "csv_path" in result
-                    assert result["entity_count"] == 0
-                    assert result["csv_path"].endswith(".csv")
+        async def get_group_results(parent_task_id, prefix):
+            # Extraction results are indexed under the aggregation task by the workers
+            submitted = [task for call in mock_task_coordinator.submit_tasks.await_args_list for task in call.args[0]]
+            return {
+                task.id: {"status": "completed", "entities": [
+                    {"name": "Oak School", "attributes": {"website": "oak.edu"}, "confidence": 0.9}
+                ]}
+                for task in submitted if task.id.startswith(prefix) and prefix.startswith("extract_")
+            }
+        
+        mock_dok_repository.get_checkpoints = AsyncMock(return_value={})
+        mock_dok_repository.save_checkpoints = AsyncMock()
+        mock_dok_repository.delete_checkpoints = AsyncMock()
+        mock_dok_repository.store_data_aggregation_results = AsyncMock(return_value=1)
+        mock_dok_repository.knowledge_base.update_research_task_status = AsyncMock()
+        mock_task_coordinator.redis_client = AsyncMock()
+        mock_task_coordinator.redis_client.register_script = Mock(return_value=AsyncMock(return_value=1))
+        mock_task_coordinator.count_duplicate_sources = AsyncMock(return_value=0)
+        mock_task_coordinator.get_group_results = AsyncMock(side_effect=get_group_results)
+        orchestrator.search_enumerator.enumerate = AsyncMock(return_value=[
+            SearchSubspace(id="city_001", query="private schools in Oakland, California", metadata={})
+        ])
+        orchestrator.event_bus = Mock(publish_phase_event=AsyncMock(), publish_stats_snapshot=AsyncMock())
+        
+        result = await orchestrator.execute_data_aggregation(task_id, config)
+        
+        assert result["status"] == "completed"
+        assert result["successful_searches"] == 1
+        assert result["entity_count"] == 1
+        assert result["csv_url"] == f"/tasks/{task_id}/export/csv"
+        # Submitted tasks are not read back from Redis one by one
+        mock_task_coordinator.redis_client.get.assert_not_awaited()
+        stored = mock_dok_repository.store_data_aggregation_results.await_args.args[1]
+        assert [entity["entity_data"]["name"] for entity in stored] == ["Oak School"]
+    
+    @pytest.mark.asyncio
+    async def test_streaming_resolves_entities_as_extractions_finish(self, orchestrator, mock_task_coordinator):
+        """Test that each finished extraction feeds resolution and starts enrichment of new entities."""
+        from src.orchestration.task_types import Task, TaskResult, TaskStatus, TaskType
+        extraction_tasks = [
+            Task(id=f"extract_t1_{i}", type=TaskType.DATA_AGGREGATION_EXTRACT, payload={"task_id": "t1"})
+            for i in range(3)
+        ]
+        entities = {
+            "extract_t1_0": [{"name": "Oak School", "attributes": {"city": "Oakland"}}],
+            "extract_t1_1": [{"name": "oak school ", "attributes": {"website": "oak.edu"}},
+                             {"name": "Pine Academy", "attributes": {}}],
+            "extract_t1_2": [{"name": "Elm Prep", "attributes": {}}],
+        }
+        
+        async def get_task_status(task_id):
+            return TaskResult(task_id=task_id, status=TaskStatus.COMPLETED,
+                              result={"status": "completed", "entities": entities[task_id]})
+        
+        async def wait_for_group(parent_task_id, on_progress=None):
+            # The completion of extract_t1_2 is never pushed, as if its message was lost
+            if mock_task_coordinator.wait_for_group.await_count == 1:
+                for task_id in ("extract_t1_0", "extract_t1_1"):
+                    await on_progress({"task_id": task_id, "status": "completed", "pending": 1})
+            return {"pending": 0}
+        
+        mock_task_coordinator.get_task_status = AsyncMock(side_effect=get_task_status)
+        mock_task_coordinator.wait_for_group = AsyncMock(side_effect=wait_for_group)
+        orchestrator.event_bus = Mock(publish_stats_snapshot=AsyncMock())
+        
+        merged = await orchestrator._stream_extracted_entities("t1", None, extraction_tasks, ["website"])
+        
+        assert [entity["name"] for entity in merged] == ["Oak School", "Pine Academy", "Elm Prep"]
+        assert merged[0]["attributes"] == {"city": "Oakland", "website": "oak.edu"}
+        enrichment_ids = sorted(
+            task.id for call in mock_task_coordinator.submit_tasks.await_args_list for task in call.args[0]
+        )
+        assert enrichment_ids == ["enrich_t1_0", "enrich_t1_1", "enrich_t1_2"]
+        # Enrichment submitted for the last extraction is waited for too
+        assert mock_task_coordinator.wait_for_group.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_resumed_run_skips_checkpointed_work(self, orchestrator, mock_dok_repository, mock_task_coordinator):
+        """Test that a resumed run reuses the enumeration, skips extracted subspaces and keeps task IDs."""
+        from src.orchestration.task_types import TaskResult, TaskStatus
+        mock_dok_repository.get_checkpoints = AsyncMock(return_value={
+            "enumeration": {"subspaces": [
+                {"id": f"s{i}", "query": f"private schools in city {i}", "metadata": {}} for i in range(3)
+            ]},
+            "subspace:0": {"search_task_id": "t1_search_0", "extraction_task_id": "extract_t1_0_aaaa",
+                           "extracted": True, "sequence": 0, "entities": [{"name": "Oak School", "attributes": {}}]},
+            "subspace:1": {"search_task_id": "t1_search_1", "extraction_task_id": "extract_t1_1_bbbb"},
+        })
+        mock_dok_repository.save_checkpoints = AsyncMock()
+        mock_dok_repository.delete_checkpoints = AsyncMock()
+        mock_dok_repository.store_data_aggregation_results = AsyncMock(return_value=2)
+        mock_dok_repository.knowledge_base.update_research_task_status = AsyncMock()
+        mock_task_coordinator.redis_client = AsyncMock()
+        mock_task_coordinator.redis_client.register_script = Mock(return_value=AsyncMock(return_value=1))
+        mock_task_coordinator.get_group_results = AsyncMock(return_value={})
+        mock_task_coordinator.get_task_status = AsyncMock(return_value=TaskResult(
+            task_id="any", status=TaskStatus.COMPLETED,
+            result={"status": "completed", "entities": [{"name": "Elm Prep", "attributes": {}}]}
+        ))
+        orchestrator.search_enumerator.enumerate = AsyncMock()
+        orchestrator.entity_resolver.resolve_entities = AsyncMock(side_effect=lambda entities, domain_hint: entities)
+        orchestrator.event_bus = Mock(publish_phase_event=AsyncMock(), publish_stats_snapshot=AsyncMock())
+        config = {"entities": ["private schools"], "attributes": ["website"], "search_space": "in California"}
+        
+        result = await orchestrator.execute_data_aggregation("t1", config)
+        
+        orchestrator.search_enumerator.enumerate.assert_not_called()
+        submitted = [task.id for call in mock_task_coordinator.submit_tasks.await_args_list for task in call.args[0]]
+        assert "t1_search_0" not in submitted
+        assert submitted[:3] == ["t1_search_1", "t1_search_2", "extract_t1_1_bbbb"]
+        assert submitted[3].startswith("extract_t1_2_")
+        # Entities extracted before the interruption keep their enrichment task IDs
+        assert submitted[4:] == ["enrich_t1_0", "enrich_t1_1"]
+        assert result["successful_searches"] == 3
+        assert result["entity_count"] == 2
+        saved_steps = [step for call in mock_dok_repository.save_checkpoints.await_args_list for step in call.args[1]]
+        assert {"subspace:1", "subspace:2", "enrichment", "resolution"} <= set(saved_steps)
+        mock_dok_repository.delete_checkpoints.assert_awaited_once_with("t1")
+    
+    @pytest.mark.asyncio
+    async def test_lease_is_taken_once_and_released_by_owner(self, orchestrator, mock_task_coordinator):
+        """Test that a task's lease is taken atomically and only its owner releases it."""
+        mock_task_coordinator.instance_id = "host-1"
+        mock_task_coordinator.redis_client = Mock()
+        mock_task_coordinator.redis_client.set = AsyncMock(side_effect=[True, None])
+        release_script = AsyncMock(return_value=1)
+        mock_task_coordinator.redis_client.register_script = Mock(return_value=release_script)
+        
+        token = await orchestrator.acquire_lease("t1")
+        
+        assert token.startswith("host-1:")
+        assert await orchestrator.acquire_lease("t1") is None
+        mock_task_coordinator.redis_client.set.assert_awaited_with(
+            "nexus:data_aggregation:t1:lease", ANY, nx=True, ex=orchestrator.LEASE_TTL
+        )
+        
+        await orchestrator.release_lease("t1", token)
+        
+        release_script.assert_awaited_once_with(keys=["nexus:data_aggregation:t1:lease"], args=[token])
+        assert "GET" in mock_task_coordinator.redis_client.register_script.call_args.args[0]
+    
+    @pytest.mark.asyncio
+    async def test_leased_task_is_not_run_again(self, orchestrator, mock_dok_repository, mock_task_coordinator):
+        """Test that a workflow does not start, or fail the task, while another one holds its lease."""
+        mock_task_coordinator.redis_client = Mock()
+        mock_task_coordinator.redis_client.set = AsyncMock(return_value=None)
+        mock_dok_repository.knowledge_base.update_research_task_status = AsyncMock()
+        config = {"entities": ["private schools"], "attributes": ["website"], "search_space": "in California"}
+        
+        with pytest.raises(RuntimeError, match="already running"):
+            await orchestrator.execute_data_aggregation("t1", config)
+        
+        mock_dok_repository.knowledge_base.update_research_task_status.assert_not_awaited()
+        mock_task_coordinator.submit_tasks.assert_not_awaited()
     
     @pytest.mark.asyncio
     async def test_search_space_enumeration(self, orchestrator, mock_llm_client):
@@ -183,6 +329,92 @@ class TestDataAggregationOrchestrator:
             assert "confidence" in entity
             assert isinstance(entity["attributes"], dict)
     
+    @pytest.mark.asyncio
+    async def test_packed_entity_extraction(self, orchestrator, mock_llm_client):
+        """Test extracting entities from several documents in one prompt."""
+        contents = ["About Test School 1", "Nothing relevant", "About Test School 2"]
+        mock_llm_client.generate.return_value = json.dumps({
+            "1": [{"name": "Test School 1", "attributes": {"name": "Test School 1"}, "confidence": 0.9}],
+            "3": [{"name": "Test School 2", "attributes": {"name": "Test School 2"}, "confidence": 0.8}]
+        })
+        
+        results = await orchestrator.entity_extractor.extract_many(contents, "private schools", ["name"])
+        
+        mock_llm_client.generate.assert_called_once()
+        assert [len(entities) for entities in results] == [1, 0, 1]
+        assert results[2][0]["name"] == "Test School 2"
+    
+    @pytest.mark.asyncio
+    async def test_malformed_packed_answer_falls_back_under_rate_limit(self, orchestrator, mock_llm_client):
+        """Test that a malformed packed answer is retried per document, acquiring the rate limit for each."""
+        contents = ["About Test School 1", "About Test School 2"]
+        mock_llm_client.generate.side_effect = [
+            "not json",
+            json.dumps([{"name": "Test School 1", "attributes": {}, "confidence": 0.9}]),
+            json.dumps([{"name": "Test School 2", "attributes": {}, "confidence": 0.8}]),
+        ]
+        acquire_llm = AsyncMock()
+        
+        results = await orchestrator.entity_extractor.extract_many(
+            contents, "private schools", ["name"], acquire_llm=acquire_llm
+        )
+        
+        assert acquire_llm.await_count == 2
+        assert sorted(entities[0]["name"] for entities in results) == ["Test School 1", "Test School 2"]
+    
+    @pytest.mark.asyncio
+    async def test_packed_extraction_raises_llm_errors(self, orchestrator, mock_llm_client):
+        """Test that a failed LLM call is raised for the retry policy instead of fanned out per document."""
+        mock_llm_client.generate.side_effect = RuntimeError("429 Too Many Requests")
+        acquire_llm = AsyncMock()
+        
+        with pytest.raises(RuntimeError, match="429"):
+            await orchestrator.entity_extractor.extract_many(
+                ["About Test School 1", "About Test School 2"], "private schools", ["name"], acquire_llm=acquire_llm
+            )
+        
+        mock_llm_client.generate.assert_called_once()
+        acquire_llm.assert_not_awaited()
+    
+    def test_pack_documents(self, orchestrator):
+        """Test greedy packing of documents into a character budget."""
+        packs = orchestrator.entity_extractor.pack_documents(["a" * 40, "b" * 40, "c" * 40, "d" * 200], 100)
+        
+        assert packs == [[0, 1], [2], [3]]
+    
+    def test_long_documents_are_chunked_with_overlap(self):
+        """Test that long documents are split on headings and paragraphs within the token budget."""
+        from src.agents.aggregation.content_chunker import ContentChunker
+        chunker = ContentChunker(max_tokens=50, overlap_tokens=5)
+        sections = [f"# School {i}\n" + f"School {i} is a private school in Oakland. " * 3 for i in range(4)]
+        content = "\n".join(sections)
+    
+        chunks = chunker.split(content)
+    
+        assert len(chunks) > 1
+        assert all(len(chunk) <= chunker.max_chars for chunk in chunks)
+        assert chunks[0].startswith("# School 0")
+        # Each chunk repeats the end of the previous one
+        assert all(chunks[i + 1][:10] in chunks[i][-chunker.overlap_chars:] for i in range(len(chunks) - 1))
+        assert chunker.split("short") == ["short"]
+    
+    @pytest.mark.asyncio
+    async def test_chunked_extraction_merges_overlapping_entities(self, orchestrator, mock_llm_client):
+        """Test that chunks are extracted in parallel and entities repeated across chunks are merged."""
+        from src.agents.aggregation.content_chunker import ContentChunker
+        orchestrator.entity_extractor.chunker = ContentChunker(max_tokens=20, overlap_tokens=2)
+        mock_llm_client.generate.side_effect = [
+            json.dumps([{"name": "Oak School", "attributes": {"city": "Oakland"}, "confidence": 0.9}]),
+            json.dumps([{"name": "oak school", "attributes": {"website": "oak.edu"}, "confidence": 0.7},
+                        {"name": "Elm Prep", "attributes": {}, "confidence": 0.8}]),
+        ]
+    
+        entities = await orchestrator.entity_extractor.extract("Oak School. " * 6 + "\n\nElm Prep. " * 4, "schools", ["city"])
+    
+        assert mock_llm_client.generate.await_count == 2
+        assert [entity["name"] for entity in entities] == ["Oak School", "Elm Prep"]
+        assert entities[0]["attributes"] == {"city": "Oakland", "website": "oak.edu"}
+    
     @pytest.mark.asyncio
     async def test_entity_resolution(self, orchestrator, mock_llm_client):
         """Test entity resolution."""
@@ -216,53 +448,6 @@ class TestDataAggregationOrchestrator:
             assert "name" in resolved[0]
             assert "attributes" in resolved[0]
             assert "confidence" in resolved[0]
-    
-    @pytest.mark.asyncio
-    async def test_csv_export(self, orchestrator, mock_dok_repository):
-        """Test CSV export functionality."""
-        task_id = "test-task-123"
-        entities = [
-            {
-                "name": "Test School 1",
-                "attributes": {
-                    "name": "Test School 1",
-                    "address": "123 Main St, California",
-                    "website": "https://testschool1.edu"
-                },
-                "confidence": 0.95
-            },
-            {
-                "name": "Test School 2",
-                "attributes": {
-                    "name": "Test School 2",
-                    "address": "456 Oak Ave, California",
-                    "website": "https://testschool2.edu"
-                },
-                "confidence": 0.85
-            }
-        ]
-        
-        # Mock database fetch
-        mock_rows = [
-            Mock(
-                entity_data=json.dumps(entities[0]),
-                unique_identifier="school-1",
-                search_context=json.dumps({})
-            ),
-            Mock(
-                entity_data=json.dumps(entities[1]),
-                unique_identifier="school-2",
-                search_context=json.dumps({})
-            )
-        ]
-        mock_dok_repository.fetch_all.return_value = mock_rows
-        
-        csv_path = await orchestrator._generate_csv(task_id, entities)
-        
-        # Verify CSV path is returned
-        assert csv_path is not None
-        assert csv_path.endswith(".csv")
-        assert task_id in csv_path
 
 
 class TestDataAggregationIntegration:
@@ -337,15 +522,15 @@ class TestDataAggregationIntegration:
         with patch.object(research_orchestrator.data_aggregation_orchestrator, 'execute_data_aggregation') as mock_execute:
             mock_execute.return_value = {
                 "entity_count": 5,
-                "csv_path": "exports/test-data-aggregation-task_aggregation.csv"
+                "csv_url": "/tasks/test-data-aggregation-task/export/csv"
             }
             
             result = await research_orchestrator.execute_data_aggregation(task_id, config)
             
             # Verify the task execution
-            mock_execute.assert_called_once_with(task_id, config)
+            mock_execute.assert_called_once_with(task_id, config, lease_token=None)
             assert "entity_count" in result
-            assert "csv_path" in result
+            assert "csv_url" in result
             assert result["entity_count"] == 5
 
 
@@ -588,3 +773,349 @@ class TestDataAggregationRedisConsistency:
         assert isinstance(result, TaskResult)
         assert result.task_id == task_id
         assert result.status == TaskStatus.COMPLETED
+
+
+class TestGroupResultCollection:
+    """Test collecting child task results through the parent's result index."""
+    
+    @pytest.fixture
+    def mock_redis_client(self):
+        """Create a mock Redis client."""
+        redis_client = Mock()
+        redis_client.keys = AsyncMock(return_value=[])
+        return redis_client
+    
+    @pytest.fixture
+    def task_coordinator(self, mock_redis_client):
+        """Create a task coordinator on the mock Redis client."""
+        from src.orchestration.parallel_task_coordinator import ParallelTaskCoordinator
+        return ParallelTaskCoordinator(redis_client=mock_redis_client, rate_limiter=Mock())
+    
+    @pytest.mark.asyncio
+    async def test_group_results_read_from_result_index(self, task_coordinator, mock_redis_client):
+        """Test that child results are read through the parent's result index without KEYS."""
+        mock_redis_client.smembers = AsyncMock(return_value={b"extract_p1_1", b"extract_p1_0", b"enrich_p1_0"})
+        mock_redis_client.mget = AsyncMock(return_value=[json.dumps({"status": "completed", "entities": []}), None])
+        
+        results = await task_coordinator.get_group_results("p1", "extract_p1_")
+        
+        mock_redis_client.smembers.assert_awaited_once_with("nexus:task_group:p1:results")
+        mock_redis_client.mget.assert_awaited_once_with(
+            ["nexus:task:extract_p1_0:result", "nexus:task:extract_p1_1:result"]
+        )
+        mock_redis_client.keys.assert_not_called()
+        assert results == {"extract_p1_0": {"status": "completed", "entities": []}}
+    
+    @pytest.mark.asyncio
+    async def test_group_results_fall_back_to_scan(self, task_coordinator, mock_redis_client):
+        """Test that results stored before the index existed are found with SCAN."""
+        async def scan_iter(match, count):
+            assert match == "nexus:task:enrich_p1_*:result"
+            yield b"nexus:task:enrich_p1_0:result"
+        
+        mock_redis_client.smembers = AsyncMock(return_value=set())
+        mock_redis_client.scan_iter = scan_iter
+        mock_redis_client.mget = AsyncMock(return_value=[json.dumps({"status": "completed", "results": []})])
+        
+        results = await task_coordinator.get_group_results("p1", "enrich_p1_")
+        
+        assert list(results) == ["enrich_p1_0"]
+        mock_redis_client.keys.assert_not_called()
+
+
+class TestCompletionRecording:
+    """Test that tasks are marked completed only after their results are stored."""
+    
+    @pytest.fixture
+    def redis_store(self):
+        """Create the key-value store behind the mock Redis client."""
+        return {}
+    
+    @pytest.fixture
+    def task_coordinator(self, redis_store):
+        """Create a task coordinator whose Redis client keeps plain keys in a dictionary."""
+        from src.orchestration.parallel_task_coordinator import ParallelTaskCoordinator
+        
+        async def set_key(key, value, nx=False, ex=None):
+            if nx and key in redis_store:
+                return None
+            redis_store[key] = value
+            return True
+        
+        redis_client = Mock()
+        redis_client.set = AsyncMock(side_effect=set_key)
+        redis_client.exists = AsyncMock(side_effect=lambda key: int(key in redis_store))
+        pipeline = Mock()
+        pipeline.execute = AsyncMock(return_value=[])
+        redis_client.pipeline = Mock(return_value=pipeline)
+        
+        coordinator = ParallelTaskCoordinator(redis_client=redis_client, rate_limiter=AsyncMock())
+        coordinator.event_bus = AsyncMock()
+        coordinator.task_queue = AsyncMock()
+        coordinator.data_aggregation_repository = Mock()
+        coordinator._resolve_project_id = AsyncMock(return_value=None)
+        coordinator._on_task_completed = AsyncMock()
+        coordinator._execute_task = AsyncMock(return_value={
+            "status": "completed",
+            "results": [{"url": "https://example.com", "title": "Example", "content": "Lincoln High School"}]
+        })
+        return coordinator
+    
+    @pytest.mark.asyncio
+    async def test_retry_stores_sources_after_failed_storage(self, task_coordinator, redis_store):
+        """Test that a task whose source storage failed is retried instead of skipped as completed."""
+        from src.orchestration.task_types import Task, TaskType
+        task = Task(id="search_t1_0", type=TaskType.DATA_AGGREGATION_SEARCH,
+                    payload={"task_id": "t1", "query": "schools"})
+        repository = task_coordinator.data_aggregation_repository
+        repository.store_sources = AsyncMock(side_effect=[RuntimeError("database unavailable"), 1])
+        
+        await task_coordinator._process_task(task, worker_id=0)
+        
+        assert task_coordinator._completion_key(task.id) not in redis_store
+        task_coordinator.task_queue.schedule.assert_awaited_once()
+        task_coordinator._on_task_completed.assert_not_awaited()
+        
+        await task_coordinator._process_task(task, worker_id=0)
+        
+        assert repository.store_sources.await_count == 2
+        assert task_coordinator._completion_key(task.id) in redis_store
+        assert redis_store[f"nexus:task:{task.id}:status"] == "completed"
+        task_coordinator._on_task_completed.assert_awaited_once()
+
+
+class TestBulkPersistence:
+    """Test bulk writes of sources and aggregation results through staging tables."""
+    
+    @pytest.fixture
+    def mock_connection(self):
+        """Create a mock connection whose merge statements report their row counts."""
+        conn = Mock()
+        conn.transaction = Mock(return_value=AsyncMock())
+        conn.copy_records_to_table = AsyncMock()
+        conn.execute = AsyncMock(side_effect=["CREATE TABLE", "UPDATE 1", "INSERT 0 2"])
+        return conn
+    
+    @pytest.fixture
+    def repository(self, mock_connection):
+        """Create a data aggregation repository on the mock connection."""
+        from contextlib import asynccontextmanager
+        from src.database.data_aggregation_repository import DataAggregationRepository
+        
+        @asynccontextmanager
+        async def get_connection():
+            yield mock_connection
+        
+        repository = DataAggregationRepository(Mock())
+        repository.get_connection = get_connection
+        return repository
+    
+    @pytest.mark.asyncio
+    async def test_results_are_copied_and_merged_in_one_transaction(self, repository, mock_connection):
+        """Test that results are staged with COPY, then updated or inserted by identifier."""
+        results = [
+            {"entity_type": "School", "entity_data": {"name": "A"}, "unique_identifier": "a"},
+            {"entity_type": "School", "entity_data": {"name": "B"}, "unique_identifier": "b"},
+            {"entity_type": "School", "entity_data": {"name": "C"}, "search_context": {"query": "q"}},
+        ]
+        
+        written = await repository.store_data_aggregation_results("task-1", results)
+        
+        assert written == 3
+        mock_connection.transaction.assert_called_once()
+        statements = [call.args[0] for call in mock_connection.execute.call_args_list]
+        assert statements[0].startswith("CREATE TEMP TABLE data_aggregation_results_staging")
+        assert "UPDATE data_aggregation_results" in statements[1]
+        assert "INSERT INTO data_aggregation_results" in statements[2]
+        copy_call = mock_connection.copy_records_to_table.call_args
+        assert copy_call.args[0] == "data_aggregation_results_staging"
+        records = copy_call.kwargs["records"]
+        assert [record[3] for record in records] == ["a", "b", None]
+        assert json.loads(records[2][4]) == {"query": "q"}
+    
+    @pytest.mark.asyncio
+    async def test_sources_fall_back_to_row_writes(self, repository, mock_connection):
+        """Test that sources are stored one by one when the bulk write fails."""
+        mock_connection.copy_records_to_table.side_effect = RuntimeError("copy failed")
+        repository.store_source = AsyncMock(return_value=True)
+        sources = [{"source_id": f"s{i}", "metadata": {"task_id": "task-1"}} for i in range(3)]
+        
+        written = await repository.store_sources(sources)
+        
+        assert written == 3
+        assert repository.store_source.await_count == 3
+
+
+class TestBatchedEnrichment:
+    """Test enriching entity attributes in batches."""
+    
+    @pytest.fixture
+    def mock_llm_client(self):
+        """Create a mock LLM client."""
+        client = Mock(spec=LLMClient)
+        client.generate = AsyncMock(return_value=json.dumps({
+            "1": {"website": "oak.edu"},
+            "2": {"website": "elm.edu"}
+        }))
+        return client
+    
+    @pytest.fixture
+    def orchestrator(self, mock_llm_client):
+        """Create a data aggregation orchestrator with mock dependencies."""
+        repository = Mock()
+        repository.domain_registry = Mock()
+        coordinator = Mock()
+        coordinator.rate_limiter.acquire_llm = AsyncMock()
+        return DataAggregationOrchestrator(
+            llm_client=mock_llm_client,
+            data_aggregation_repository=repository,
+            task_coordinator=coordinator
+        )
+    
+    def test_entities_are_batched_by_locality(self, orchestrator):
+        """Test that entities missing attributes are grouped by locality and filled ones skipped."""
+        entities = [
+            {"name": "Oak School", "attributes": {"city": "Oakland"}},
+            {"name": "Pine Academy", "attributes": {"city": "Fresno"}},
+            {"name": "Elm Prep", "attributes": {"city": "Oakland", "website": "Unknown"}},
+            {"name": "Ash School", "attributes": {"city": "Oakland", "website": "ash.edu"}},
+        ]
+        
+        tasks = orchestrator._enrichment_tasks("t1", list(enumerate(entities)), ["website"])
+        
+        assert [task.id for task in tasks] == ["enrich_t1_0-2", "enrich_t1_1"]
+        assert tasks[0].payload["query"] == '"Oak School" OR "Elm Prep" Oakland website'
+        assert tasks[0].payload["entity_names"] == ["Oak School", "Elm Prep"]
+    
+    @pytest.mark.asyncio
+    async def test_batch_is_merged_with_one_llm_call(self, orchestrator, mock_llm_client):
+        """Test that a batch's search results fill the missing attributes of all its entities at once."""
+        entities = [
+            {"name": "Oak School", "attributes": {"city": "Oakland"}},
+            {"name": "Elm Prep", "attributes": {"city": "Oakland", "website": ""}},
+        ]
+        orchestrator.task_coordinator.get_group_results = AsyncMock(return_value={
+            "enrich_t1_0-1": {"status": "completed", "results": [{"title": "Schools", "content": "Oak and Elm"}]}
+        })
+        
+        enriched, counts = await orchestrator._merge_enrichment_results("t1", entities, ["city", "website"])
+        
+        mock_llm_client.generate.assert_awaited_once()
+        assert counts == {"enrichment_searches": 1, "enrichment_llm_calls": 1}
+        assert enriched[0]["attributes"] == {"city": "Oakland", "website": "oak.edu"}
+        assert enriched[1]["attributes"] == {"city": "Oakland", "website": "elm.edu"}
+        # The originals are left untouched
+        assert "website" not in entities[0]["attributes"]
+
+
+class TestIncrementalEntityResolver:
+    """Test resolving entities through blocking keys and union-find clusters."""
+    
+    def test_fuzzy_matches_within_locality(self):
+        """Test that near-identical names in the same place merge and other places stay apart."""
+        from src.agents.aggregation.entity_resolver import IncrementalEntityResolver
+        resolver = IncrementalEntityResolver()
+        
+        new_entities = resolver.add([
+            {"name": "St. Mary's Academy", "attributes": {"city": "Oakland"}, "confidence": 0.8},
+            {"name": "St Marys Academy", "attributes": {"city": "Oakland", "website": "stmarys.org"}, "confidence": 0.6},
+            {"name": "St. Mary's Academy", "attributes": {"city": "Fresno"}},
+        ])
+        
+        assert [index for index, _ in new_entities] == [0, 1]
+        merged = resolver.entities()
+        assert merged[0]["attributes"] == {"city": "Oakland", "website": "stmarys.org"}
+        assert merged[0]["confidence"] == pytest.approx(0.7)
+        assert merged[1]["attributes"] == {"city": "Fresno"}
+        
+        # An entity without a city matches both but does not chain the two places together
+        assert resolver.add([{"name": "Academy St Marys", "attributes": {}}]) == []
+        assert len(resolver.resolved()) == 2
+    
+    def test_near_identical_names_of_different_entities_stay_apart(self):
+        """Test that names one short word apart are not merged, while typos in long words are."""
+        from src.agents.aggregation.entity_resolver import IncrementalEntityResolver
+        resolver = IncrementalEntityResolver()
+        
+        new_entities = resolver.add([
+            {"name": "St. Mary School", "attributes": {"city": "Boston"}},
+            {"name": "St. Mark School", "attributes": {"city": "Boston"}},
+            {"name": "Hanson Elementary", "attributes": {"city": "Boston"}},
+            {"name": "Hansen Elementary", "attributes": {"city": "Boston"}},
+            {"name": "The St Marys Schools", "attributes": {"website": "stmary.org"}},
+            {"name": "Jefferson Middle School", "attributes": {"city": "Boston"}},
+            {"name": "Jeffersen Middle School", "attributes": {"city": "Boston", "phone": "555"}},
+        ])
+        
+        assert [entity["name"] for _, entity in new_entities] == [
+            "St. Mary School", "St. Mark School", "Hanson Elementary", "Hansen Elementary", "Jefferson Middle School"
+        ]
+        assert resolver.entities()[0]["attributes"] == {"city": "Boston", "website": "stmary.org"}
+        assert resolver.entities()[4]["attributes"] == {"city": "Boston", "phone": "555"}
+    
+    def test_bridging_entity_joins_clusters(self):
+        """Test that an entity matching two slots joins their clusters without moving slot indexes."""
+        from src.agents.aggregation.entity_resolver import IncrementalEntityResolver
+        resolver = IncrementalEntityResolver()
+        resolver.add([{"name": "Lincoln High", "unique_identifier": "0601", "attributes": {"city": "Oakland"}}])
+        resolver.add([{"name": "Lincoln Senior High", "attributes": {"website": "lincoln.edu"}}])
+        
+        new_entities = resolver.add([{"name": "Lincoln Senior High", "unique_identifier": "0601", "attributes": {}}])
+        
+        assert new_entities == []
+        assert len(resolver.entities()) == 2
+        resolved = resolver.resolved()
+        assert len(resolved) == 1
+        assert resolved[0]["attributes"] == {"city": "Oakland", "website": "lincoln.edu"}
+    
+    def test_conflicting_identifiers_are_not_merged(self):
+        """Test that entities with the same name but different unique identifiers stay apart."""
+        from src.agents.aggregation.entity_resolver import IncrementalEntityResolver
+        resolver = IncrementalEntityResolver()
+        
+        resolver.add([
+            {"name": "Trinity School", "unique_identifier": "A1", "attributes": {}},
+            {"name": "Trinity School", "unique_identifier": "B2", "attributes": {}},
+        ])
+        
+        assert len(resolver.resolved()) == 2
+
+
+class TestStreamingCSVExport:
+    """Test streaming CSV export of aggregation results."""
+    
+    @pytest.fixture
+    def exporter(self):
+        """Create a CSV exporter over a mock repository."""
+        from src.export.csv_exporter import CSVExporter
+        
+        async def iter_results(task_id, batch_size=500):
+            yield {"name": "Lincoln High", "unique_identifier": "0601", "attributes": {"city": "Oakland"}}
+            yield {"name": None, "unique_identifier": None, "attributes": {"website": "example.edu", "phone": "555"}}
+        
+        repository = Mock()
+        repository.get_data_aggregation_attribute_names = AsyncMock(return_value=["city", "website"])
+        repository.iter_data_aggregation_results = iter_results
+        return CSVExporter(repository)
+    
+    @pytest.mark.asyncio
+    async def test_stream_yields_header_then_rows(self, exporter):
+        """Test that the header is streamed first and rows follow it."""
+        chunks = [chunk async for chunk in exporter.stream("test_task")]
+        
+        assert chunks[0] == b"name,unique_identifier,city,website\r\n"
+        assert b"".join(chunks).decode("utf-8").splitlines() == [
+            "name,unique_identifier,city,website",
+            "Lincoln High,0601,Oakland,",
+            "Unknown,,,example.edu",
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_stream_gzip(self, exporter):
+        """Test that the compressed stream decompresses to the same CSV."""
+        import gzip
+        
+        plain = b"".join([chunk async for chunk in exporter.stream("test_task")])
+        compressed = b"".join([chunk async for chunk in exporter.stream("test_task", compress=True)])
+        
+        assert gzip.decompress(compressed) == plain
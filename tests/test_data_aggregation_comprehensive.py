@@ -15,6 +15,21 @@ from src.llm.client import LLMClient
 from src.models.research_types import ResearchType, DataAggregationConfig
 from src.domain_processors.private_schools import PrivateSchoolsProcessor
 from src.domain_processors.registry import DomainProcessorRegistry
+from src.agents.aggregation.search_space_enumerator import SearchSubspace
+
+
+def stub_extraction_results(task_coordinator, entities):
+    """Have every submitted extraction task report the given entities as its result."""
+    async def get_group_results(parent_task_id, prefix):
+        submitted = [task for call in task_coordinator.submit_tasks.await_args_list for task in call.args[0]]
+        if not prefix.startswith("extract_"):
+            return {}
+        return {
+            task.id: {"status": "completed", "entities": entities}
+            for task in submitted if task.id.startswith(prefix)
+        }
+    
+    task_coordinator.get_group_results = AsyncMock(side_effect=get_group_results)
 
 
 class TestDataAggregationComprehensive:
@@ -41,13 +56,27 @@ class TestDataAggregationComprehensive:
             "research_type": "data_aggregation",
             "status": "pending"
         })
+        repo.knowledge_base = AsyncMock()
+        repo.knowledge_base.get_research_task = AsyncMock(return_value={"task_id": "test-task-123"})
+        repo.get_checkpoints = AsyncMock(return_value={})
+        repo.save_checkpoints = AsyncMock()
+        repo.delete_checkpoints = AsyncMock()
+        repo.store_data_aggregation_results = AsyncMock(return_value=1)
         return repo
     
     @pytest.fixture
     def mock_task_coordinator(self):
         """Create a mock task coordinator."""
+        from src.orchestration.task_types import TaskResult, TaskStatus
         coordinator = Mock()
         coordinator.submit_tasks = AsyncMock(return_value=True)
+        coordinator.redis_client = AsyncMock()
+        coordinator.redis_client.register_script = Mock(return_value=AsyncMock(return_value=1))
+        coordinator.get_task_status = AsyncMock(return_value=TaskResult(task_id="any", status=TaskStatus.COMPLETED))
+        coordinator.wait_for_group = AsyncMock(return_value={"pending": 0, "completed": 1, "failed": 0})
+        coordinator.get_group_results = AsyncMock(return_value={})
+        coordinator.count_duplicate_sources = AsyncMock(return_value=0)
+        coordinator.event_bus = Mock(publish_phase_event=AsyncMock(), publish_stats_snapshot=AsyncMock())
         return coordinator
     
     @pytest.fixture
@@ -65,18 +94,25 @@ class TestDataAggregationComprehensive:
         # Create a data aggregation orchestrator with mock components
         data_agg_orchestrator = DataAggregationOrchestrator(
             llm_client=mock_llm_client,
-            dok_repository=mock_dok_repository,
+            data_aggregation_repository=mock_dok_repository,
             task_coordinator=mock_task_coordinator
         )
         
+        # Entities are collected from the extraction task results once all extractions finished
+        data_agg_orchestrator.pipeline_mode = "phased"
+        
         # Replace the components with AsyncMock objects
         data_agg_orchestrator.search_enumerator = Mock()
-        data_agg_orchestrator.search_enumerator.enumerate = AsyncMock()
+        data_agg_orchestrator.search_enumerator.enumerate = AsyncMock(return_value=[
+            SearchSubspace(id="city_001", query="private schools in Oakland, California", metadata={})
+        ])
         
         # Don't mock the entity extractor - let it use the real implementation
         # but with our mock domain processor registered in the global registry
         data_agg_orchestrator.entity_resolver = Mock()
-        data_agg_orchestrator.entity_resolver.resolve_entities = AsyncMock()
+        data_agg_orchestrator.entity_resolver.resolve_entities = AsyncMock(
+            side_effect=lambda entities, domain_hint=None: entities
+        )
         
         orchestrator = ResearchOrchestrator(
             task_coordinator=mock_task_coordinator,
@@ -104,22 +140,8 @@ class TestDataAggregationComprehensive:
         
         task_id = "test-complete-data-aggregation"
         
-        # Mock the _collect_search_results method to return mock search results
-        research_orchestrator.data_aggregation_orchestrator._collect_search_results = AsyncMock(return_value=[
-            {
-                "content": "Mock search result content 1",
-                "url": "https://example.com/result1",
-                "title": "Mock Result 1"
-            },
-            {
-                "content": "Mock search result content 2",
-                "url": "https://example.com/result2",
-                "title": "Mock Result 2"
-            }
-        ])
-        
-        # Mock the _collect_extracted_entities method to return mock extracted entities
-        research_orchestrator.data_aggregation_orchestrator._collect_extracted_entities = AsyncMock(return_value=[
+        # The extraction tasks report the extracted entities as their results
+        stub_extraction_results(research_orchestrator.data_aggregation_orchestrator.task_coordinator, [
             {
                 "name": "Test School 1",
                 "attributes": {
@@ -144,23 +166,13 @@ class TestDataAggregationComprehensive:
             }
         ])
         
-        # Mock the task coordinator submit_tasks method
-        research_orchestrator.data_aggregation_orchestrator.task_coordinator.submit_tasks = AsyncMock(return_value=None)
-        
-        # Mock the _generate_csv method
-        research_orchestrator.data_aggregation_orchestrator._generate_csv = AsyncMock(return_value=f"exports/{task_id}_aggregation.csv")
-        
-        # Mock the _store_aggregation_results method
-        research_orchestrator.data_aggregation_orchestrator._store_aggregation_results = AsyncMock(return_value=True)
-        
         # Execute the data aggregation workflow
         result = await research_orchestrator.execute_data_aggregation(task_id, config.model_dump())
         
         # Verify the result structure
-        assert "entity_count" in result
-        assert "csv_path" in result
-        assert result["entity_count"] >= 0
-        assert task_id in result["csv_path"]
+        assert result["status"] == "completed"
+        assert result["entity_count"] == 2
+        assert result["csv_url"] == f"/tasks/{task_id}/export/csv"
     
     @pytest.mark.asyncio
     async def test_private_schools_domain_processor_integration(self, research_orchestrator):
@@ -233,22 +245,8 @@ class TestDataAggregationComprehensive:
         
         task_id = "test-multiple-entities-aggregation"
         
-        # Mock the _collect_search_results method to return mock search results
-        research_orchestrator.data_aggregation_orchestrator._collect_search_results = AsyncMock(return_value=[
-            {
-                "content": "Mock search result content for private schools",
-                "url": "https://example.com/private_schools",
-                "title": "Private Schools Search Results"
-            },
-            {
-                "content": "Mock search result content for public schools",
-                "url": "https://example.com/public_schools",
-                "title": "Public Schools Search Results"
-            }
-        ])
-        
-        # Mock the _collect_extracted_entities method to return mock extracted entities
-        research_orchestrator.data_aggregation_orchestrator._collect_extracted_entities = AsyncMock(return_value=[
+        # The extraction tasks report the extracted entities as their results
+        stub_extraction_results(research_orchestrator.data_aggregation_orchestrator.task_coordinator, [
             {
                 "name": "Private School 1",
                 "attributes": {
@@ -269,23 +267,13 @@ class TestDataAggregationComprehensive:
             }
         ])
         
-        # Mock the task coordinator submit_tasks method
-        research_orchestrator.data_aggregation_orchestrator.task_coordinator.submit_tasks = AsyncMock(return_value=None)
-        
-        # Mock the _generate_csv method
-        research_orchestrator.data_aggregation_orchestrator._generate_csv = AsyncMock(return_value=f"exports/{task_id}_aggregation.csv")
-        
-        # Mock the _store_aggregation_results method
-        research_orchestrator.data_aggregation_orchestrator._store_aggregation_results = AsyncMock(return_value=True)
-        
         # Execute the data aggregation workflow
         result = await research_orchestrator.execute_data_aggregation(task_id, config.model_dump())
         
         # Verify the result structure
-        assert "entity_count" in result
-        assert "csv_path" in result
-        assert result["entity_count"] >= 0
-        assert task_id in result["csv_path"]
+        assert result["status"] == "completed"
+        assert result["entity_count"] == 2
+        assert result["csv_url"] == f"/tasks/{task_id}/export/csv"
     
     @pytest.mark.asyncio
     async def test_data_aggregation_error_handling(self, research_orchestrator, mock_dok_repository):
@@ -324,26 +312,8 @@ class TestDataAggregationComprehensive:
         
         task_id = "test-database-storage-aggregation"
         
-        # Set up the mock components directly on the orchestrator
-        research_orchestrator.data_aggregation_orchestrator.search_enumerator.enumerate = AsyncMock(return_value=[
-            Mock(id="subspace_1", query="private schools in California", metadata={"region": "California"})
-        ])
-        
-        research_orchestrator.data_aggregation_orchestrator.task_coordinator.submit_tasks = AsyncMock(return_value=None)
-        
-        research_orchestrator.data_aggregation_orchestrator.entity_extractor.extract = AsyncMock(return_value=[
-            {
-                "name": "Database Test School",
-                "attributes": {
-                    "name": "Database Test School",
-                    "address": "123 Database St, California",
-                    "website": "https://databasetestschool.edu"
-                },
-                "confidence": 0.95
-            }
-        ])
-        
-        research_orchestrator.data_aggregation_orchestrator.entity_resolver.resolve_entities = AsyncMock(return_value=[
+        # The extraction task reports one entity as its result
+        stub_extraction_results(research_orchestrator.data_aggregation_orchestrator.task_coordinator, [
             {
                 "name": "Database Test School",
                 "attributes": {
@@ -355,19 +325,13 @@ class TestDataAggregationComprehensive:
             }
         ])
         
-        research_orchestrator.data_aggregation_orchestrator._generate_csv = AsyncMock(return_value=f"exports/{task_id}_aggregation.csv")
-        
-        # Mock the database storage method
-        mock_dok_repository.store_data_aggregation_result = AsyncMock(return_value=True)
-        
         # Execute the data aggregation workflow
         result = await research_orchestrator.execute_data_aggregation(task_id, config.model_dump())
         
-        # Verify that the database storage method was called
-        assert mock_dok_repository.store_data_aggregation_result.called
+        # Verify that the extracted entity was stored in the database
+        stored = mock_dok_repository.store_data_aggregation_results.await_args.args[1]
+        assert [entity["entity_data"]["name"] for entity in stored] == ["Database Test School"]
         
         # Verify the result structure
-        assert "entity_count" in result
-        assert "csv_path" in result
-        assert result["entity_count"] >= 0
-        assert task_id in result["csv_path"]
+        assert result["entity_count"] == 1
+        assert result["csv_url"] == f"/tasks/{task_id}/export/csv"
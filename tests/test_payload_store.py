@@ -0,0 +1,69 @@
+"""Tests for out-of-band task payload storage."""
+
+import logging
+
+import pytest
+from unittest.mock import Mock
+
+from src.database.blob_repository import BlobRepository
+from src.orchestration.payload_store import FileBlobStore, PayloadStore, create_payload_store
+
+
+class TestPayloadStore:
+    """Test spilling large fields to the blob store and restoring them."""
+
+    @pytest.fixture
+    def payload_store(self, tmp_path):
+        """Create payload store backed by a temporary directory."""
+        return PayloadStore(FileBlobStore(str(tmp_path)), threshold=100)
+
+    @pytest.mark.asyncio
+    async def test_spill_replaces_only_large_fields(self, payload_store):
+        """Test that large fields become references and small fields stay inline."""
+        payload = {"content": "x" * 500, "entity_type": "schools"}
+
+        spilled = await payload_store.spill(payload)
+
+        assert spilled["entity_type"] == "schools"
+        assert set(spilled["content"].keys()) == {"$blob", "size"}
+        assert payload["content"] == "x" * 500
+        assert await payload_store.hydrate(spilled) == payload
+
+    @pytest.mark.asyncio
+    async def test_identical_content_is_stored_once(self, payload_store, tmp_path):
+        """Test that blobs are content-addressed."""
+        first = await payload_store.spill({"content": "y" * 500})
+        second = await payload_store.spill({"content": "y" * 500})
+
+        assert first["content"]["$blob"] == second["content"]["$blob"]
+        assert len([p for p in tmp_path.glob("*/*/*")]) == 1
+
+    @pytest.mark.asyncio
+    async def test_hydrate_missing_blob_raises(self, payload_store):
+        """Test that a dangling reference is reported."""
+        with pytest.raises(LookupError):
+            await payload_store.hydrate({"content": {"$blob": "0" * 64, "size": 10}})
+
+    @pytest.mark.asyncio
+    async def test_disabled_store_keeps_data_inline(self):
+        """Test that without a blob store nothing is spilled."""
+        payload = {"content": "z" * 500}
+
+        assert await PayloadStore(None, threshold=100).spill(payload) is payload
+
+    def test_knowledge_base_store_is_the_default(self, monkeypatch):
+        """Test that blobs go to the shared database when a knowledge base is configured."""
+        monkeypatch.delenv("TASK_BLOB_STORE", raising=False)
+
+        assert isinstance(create_payload_store(Mock()).blob_store, BlobRepository)
+
+    def test_file_store_warns_about_shared_volume(self, monkeypatch, tmp_path, caplog):
+        """Test that the host-local file store is flagged at startup."""
+        monkeypatch.delenv("TASK_BLOB_STORE", raising=False)
+        monkeypatch.setenv("TASK_BLOB_DIR", str(tmp_path))
+
+        with caplog.at_level(logging.WARNING):
+            store = create_payload_store()
+
+        assert isinstance(store.blob_store, FileBlobStore)
+        assert "shared volume" in caplog.text
@@ -0,0 +1,53 @@
+"""Tests for weighted priority scheduling and queue wait-time histograms."""
+
+import pytest
+
+from src.orchestration.priority_scheduler import (
+    PriorityScheduler, WaitTimeHistogram, parse_priority_weights
+)
+
+
+class TestPriorityScheduler:
+    """Test weighted round-robin across priority queues."""
+
+    def test_claims_follow_weights(self):
+        """Test that each priority is preferred in proportion to its weight."""
+        scheduler = PriorityScheduler({2: 6, 1: 3, 0: 1})
+
+        preferred = [scheduler.next_order()[0] for _ in range(100)]
+
+        assert preferred.count(2) == 60
+        assert preferred.count(1) == 30
+        assert preferred.count(0) == 10
+
+    def test_other_priorities_follow_in_descending_order(self):
+        """Test that empty preferred queues fall back to the remaining priorities."""
+        order = PriorityScheduler({2: 1, 1: 1, 0: 5}).next_order()
+
+        assert order == (0, 2, 1)
+
+    def test_parse_priority_weights(self):
+        """Test parsing priority weights."""
+        assert parse_priority_weights("high:6,normal_priority:3,low:1") == {2: 6, 1: 3, 0: 1}
+
+        with pytest.raises(ValueError):
+            parse_priority_weights("low:0")
+
+
+class TestWaitTimeHistogram:
+    """Test queue wait-time histograms."""
+
+    def test_snapshot_is_cumulative(self):
+        """Test that bucket counts include all shorter waits."""
+        histogram = WaitTimeHistogram({0: "low_priority", 1: "normal_priority"}, buckets=(1, 10))
+
+        histogram.observe(0, enqueued_at=100.0, now=100.5)
+        histogram.observe(0, enqueued_at=100.0, now=105.0)
+        histogram.observe(0, enqueued_at=100.0, now=200.0)
+        histogram.observe(1, enqueued_at=None)
+
+        snapshot = histogram.snapshot()
+        assert snapshot["low_priority"] == {
+            "le_1": 1, "le_10": 2, "le_inf": 3, "count": 3, "sum_seconds": 105.5
+        }
+        assert snapshot["normal_priority"]["count"] == 0
@@ -0,0 +1,47 @@
+"""Tests for the task retry backoff policy."""
+
+from types import SimpleNamespace
+
+from src.orchestration.retry_policy import RetryPolicy
+
+
+class TestRetryPolicy:
+    """Test backoff computation and Retry-After handling."""
+
+    def test_delay_grows_exponentially_within_jitter(self):
+        """Test that each retry waits roughly twice as long as the previous one."""
+        policy = RetryPolicy(base_delay=2.0, max_delay=300.0, jitter=0.5)
+
+        for retry_count, nominal in [(1, 2.0), (2, 4.0), (3, 8.0)]:
+            delay = policy.next_delay(retry_count)
+            assert nominal * 0.5 <= delay <= nominal
+
+    def test_delay_is_capped(self):
+        """Test that backoff never exceeds the configured maximum."""
+        policy = RetryPolicy(base_delay=2.0, max_delay=10.0)
+
+        assert policy.next_delay(20) <= 10.0
+
+    def test_retry_after_overrides_shorter_backoff(self):
+        """Test that a provider Retry-After hint is respected."""
+        policy = RetryPolicy(base_delay=1.0, max_delay=10.0)
+
+        assert policy.next_delay(1, retry_after=42.0) == 42.0
+
+    def test_retry_after_hint_from_response_headers(self):
+        """Test extracting Retry-After from an HTTP client exception."""
+        error = Exception("rate limited")
+        error.response = SimpleNamespace(headers={"retry-after": "17"})
+
+        assert RetryPolicy.retry_after_hint(error) == 17.0
+
+    def test_retry_after_hint_from_attribute(self):
+        """Test extracting Retry-After from an exception attribute."""
+        error = Exception("rate limited")
+        error.retry_after = 5
+
+        assert RetryPolicy.retry_after_hint(error) == 5.0
+
+    def test_retry_after_hint_missing(self):
+        """Test exceptions without a hint."""
+        assert RetryPolicy.retry_after_hint(ValueError("boom")) is None
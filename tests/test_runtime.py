@@ -0,0 +1,78 @@
+"""Tests for the shared process runtime."""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.runtime import NexusRuntime
+
+
+@pytest.fixture
+def knowledge_base_class():
+    """Patch the knowledge base so connecting creates a fake pool."""
+    with patch("src.runtime.PostgresKnowledgeBase") as kb_class:
+        def create(**kwargs):
+            kb = Mock()
+            kb.pool = None
+
+            async def connect():
+                await asyncio.sleep(0)
+                kb.pool = Mock()
+
+            async def disconnect():
+                kb.pool = None
+
+            kb.connect = AsyncMock(side_effect=connect)
+            kb.disconnect = AsyncMock(side_effect=disconnect)
+            return kb
+
+        kb_class.side_effect = create
+        yield kb_class
+
+
+class TestNexusRuntime:
+    """Test lazy creation and sharing of process-wide resources."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_uses_share_one_pool(self, knowledge_base_class):
+        """Test that components starting together get the same knowledge base."""
+        runtime = NexusRuntime(storage_path="/tmp/nexus-runtime-test")
+
+        first, second = await asyncio.gather(runtime.connect_knowledge_base(), runtime.connect_knowledge_base())
+
+        assert first is second
+        assert knowledge_base_class.call_count == 1
+        first.connect.assert_awaited_once()
+        assert "postgres" in runtime.startup_report()["resources_ms"]
+
+    @pytest.mark.asyncio
+    async def test_close_releases_resources(self, knowledge_base_class):
+        """Test that close disconnects the pool and Redis, and later uses reconnect."""
+        runtime = NexusRuntime(storage_path="/tmp/nexus-runtime-test")
+        redis_client = AsyncMock()
+        with patch("src.runtime.redis.Redis.from_url", return_value=redis_client):
+            assert await runtime.redis() is redis_client
+            assert await runtime.redis() is redis_client
+        kb = await runtime.connect_knowledge_base()
+
+        await runtime.close()
+
+        kb.disconnect.assert_awaited_once()
+        redis_client.aclose.assert_awaited_once()
+        assert await runtime.connect_knowledge_base() is not kb
+
+    def test_resources_are_created_lazily(self, tmp_path):
+        """Test that nothing is built until first use and config is parsed once."""
+        config_path = tmp_path / "llm_config.json"
+        config_path.write_text('{"task_model": {"provider": "openai"}}')
+        runtime = NexusRuntime(llm_config_path=str(config_path))
+        assert runtime.timings == {}
+
+        with patch("src.runtime.LLMClient") as llm_class:
+            assert runtime.llm_client is runtime.llm_client
+            llm_class.assert_called_once_with(config_path=str(config_path))
+        with patch("src.runtime.json.load", wraps=__import__("json").load) as load:
+            runtime._llm_config = None
+            assert runtime.llm_config == runtime.llm_config == {"task_model": {"provider": "openai"}}
+            assert load.call_count == 1
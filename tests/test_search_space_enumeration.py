@@ -2,10 +2,12 @@
 
 import pytest
 import asyncio
+import json
 from unittest.mock import AsyncMock, Mock, patch
 
 from src.agents.aggregation.search_space_enumerator import SearchSpaceEnumerator
 from src.agents.aggregation.search_space_enumerator import SearchSubspace
+from src.agents.aggregation.enumeration_cache import EnumerationCache
 from src.llm import LLMClient
 
 
@@ -225,5 +227,85 @@ class TestSearchSpaceEnumerator:
         assert "error" in subspace.metadata
 
 
+
+class TestEnumerationCache:
+    """Test reusing enumerations from the cache and the gazetteer."""
+    
+    @pytest.fixture
+    def mock_repository(self):
+        """Create a mock repository with an empty enumeration table."""
+        repository = Mock()
+        repository.get_enumeration = AsyncMock(return_value=None)
+        repository.save_enumeration = AsyncMock()
+        return repository
+    
+    @staticmethod
+    def llm_response(parent, level, names):
+        """Build an LLM enumeration response."""
+        return json.dumps({"subspaces": [
+            {"id": f"{level}_{i}", "query": f"private schools in {name}, {parent}",
+             "metadata": {"type": level, "parent": parent, "name": name, "level": level}}
+            for i, name in enumerate(names)
+        ]})
+    
+    @pytest.mark.asyncio
+    async def test_cached_enumeration_skips_llm(self, mock_repository):
+        """Test that a cached enumeration is returned without asking the LLM."""
+        client = Mock(spec=LLMClient)
+        client.generate = AsyncMock()
+        mock_repository.get_enumeration = AsyncMock(return_value=[
+            {"id": "county_001", "query": "private schools in Alameda County, California", "metadata": {"type": "county"}}
+        ])
+        enumerator = SearchSpaceEnumerator(client, EnumerationCache(mock_repository))
+        
+        subspaces = await enumerator.enumerate("private schools", "In  California")
+        
+        client.generate.assert_not_called()
+        assert [subspace.id for subspace in subspaces] == ["county_001"]
+        mock_repository.get_enumeration.assert_awaited_once_with("california|private schools|next")
+    
+    @pytest.mark.asyncio
+    async def test_gazetteer_seeds_enumeration(self, mock_repository, tmp_path):
+        """Test that places listed in the gazetteer are enumerated without the LLM and cached."""
+        gazetteer = tmp_path / "gazetteer.json"
+        gazetteer.write_text(json.dumps({"California": {"level": "county", "subdivisions": ["Alameda County", "Alpine County"]}}))
+        client = Mock(spec=LLMClient)
+        client.generate = AsyncMock()
+        enumerator = SearchSpaceEnumerator(client, EnumerationCache(mock_repository, str(gazetteer)))
+        
+        subspaces = await enumerator.enumerate("private schools", "in California")
+        
+        client.generate.assert_not_called()
+        assert [subspace.query for subspace in subspaces] == [
+            "private schools in Alameda County, California",
+            "private schools in Alpine County, California"
+        ]
+        assert mock_repository.save_enumeration.call_args.kwargs["source"] == "gazetteer"
+    
+    @pytest.mark.asyncio
+    async def test_hierarchical_enumeration_descends_to_granularity(self, mock_repository):
+        """Test that each county is enumerated down to cities and the whole result is cached."""
+        responses = {
+            "in California": self.llm_response("California", "county", ["Alameda County", "Alpine County"]),
+            "in Alameda County, California": self.llm_response("Alameda County", "city", ["Oakland", "Berkeley"]),
+            "in Alpine County, California": "not JSON",
+        }
+        client = Mock(spec=LLMClient)
+        client.generate = AsyncMock(side_effect=lambda prompt, **kwargs: next(
+            response for space, response in responses.items() if f'Search space constraint: {space}\n' in prompt
+        ))
+        enumerator = SearchSpaceEnumerator(client, EnumerationCache(mock_repository))
+        
+        subspaces = await enumerator.enumerate("private schools", "in California", granularity="cities")
+        
+        assert [subspace.metadata["name"] for subspace in subspaces] == ["Oakland", "Berkeley", "Alpine County"]
+        assert subspaces[0].id == "county_0_city_0"
+        assert client.generate.await_count == 3
+        saved_keys = [call.kwargs["cache_key"] for call in mock_repository.save_enumeration.call_args_list]
+        assert "california|private schools|cities" in saved_keys
+        # The county that could not be decomposed is not cached as a failure
+        assert "alpine county, california|private schools|next" not in saved_keys
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,83 @@
+"""Tests for task dependency tracking."""
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.orchestration.task_dag import TaskDependencyGraph
+from src.orchestration.task_queue import ReliableTaskQueue
+
+
+class TestTaskDependencyGraph:
+    """Test holding and releasing dependent tasks."""
+
+    @pytest.fixture
+    def mock_redis(self):
+        """Mock Redis client."""
+        redis_mock = AsyncMock()
+        redis_mock.pipeline = Mock(return_value=Mock())
+        return redis_mock
+
+    @pytest.fixture
+    def task_dag(self, mock_redis):
+        """Create dependency graph with mocked Redis."""
+        return TaskDependencyGraph(mock_redis, ReliableTaskQueue(mock_redis))
+
+    @pytest.mark.asyncio
+    async def test_hold_passes_keys_per_dependency(self, task_dag, mock_redis):
+        """Test that a held task registers with every dependency."""
+        script = AsyncMock(return_value=0)
+        mock_redis.register_script = Mock(return_value=script)
+
+        outcome = await task_dag.hold(
+            "extract-1", '{"id": "extract-1"}', "data_aggregation_extract", 1, ["search-1", "search-2"], "failed"
+        )
+
+        assert outcome == 0
+        assert script.call_args.kwargs["keys"] == [
+            "nexus:task:extract-1:waiting_on",
+            "nexus:task:extract-1:held",
+            "nexus:tasks:llm:normal_priority",
+            "nexus:task:search-1:released",
+            "nexus:task:search-1:status",
+            "nexus:task:search-1:dependents",
+            "nexus:task:search-2:released",
+            "nexus:task:search-2:status",
+            "nexus:task:search-2:dependents"
+        ]
+        assert script.call_args.kwargs["args"][-2:] == ["search-1", "search-2"]
+
+    @pytest.mark.asyncio
+    async def test_release_returns_queued_dependents(self, task_dag, mock_redis):
+        """Test that released dependents are reported and every key a script touches is declared."""
+        script = AsyncMock(side_effect=[1, 0])
+        mock_redis.register_script = Mock(return_value=script)
+        pipeline = mock_redis.pipeline.return_value
+        pipeline.execute = AsyncMock(return_value=[True, {b"extract-1", b"extract-2", b"extract-3"}])
+        mock_redis.mget = AsyncMock(return_value=[
+            b'{"id": "extract-1", "type": "data_aggregation_extract", "priority": 2}',
+            b'{"id": "extract-2", "type": "data_aggregation_extract", "priority": 1}',
+            None
+        ])
+
+        released = await task_dag.release("search-1")
+
+        assert released == ["extract-1"]
+        pipeline.set.assert_called_once_with("nexus:task:search-1:released", "1", ex=task_dag.TTL)
+        assert [call.kwargs["keys"] for call in script.call_args_list] == [
+            ["nexus:task:extract-1:waiting_on", "nexus:task:extract-1:held", "nexus:tasks:llm:high_priority"],
+            ["nexus:task:extract-2:waiting_on", "nexus:task:extract-2:held", "nexus:tasks:llm:normal_priority"]
+        ]
+        assert script.call_args.kwargs["args"][0] == "search-1"
+        # The dependents set is dropped only after every dependent was handled
+        mock_redis.delete.assert_awaited_once_with("nexus:task:search-1:dependents")
+
+    @pytest.mark.asyncio
+    async def test_discard_returns_held_task(self, task_dag, mock_redis):
+        """Test that discarding a held task returns it and clears its keys."""
+        pipeline = mock_redis.pipeline.return_value
+        pipeline.execute = AsyncMock(return_value=[b'{"id": "extract-1"}', 2])
+
+        task_json = await task_dag.discard("extract-1")
+
+        assert task_json == '{"id": "extract-1"}'
+        pipeline.delete.assert_called_once_with("nexus:task:extract-1:held", "nexus:task:extract-1:waiting_on")
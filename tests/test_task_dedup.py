@@ -0,0 +1,86 @@
+"""Tests for duplicate task suppression."""
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.orchestration.task_dedup import TaskDeduplicator
+from src.orchestration.task_types import Task, TaskType
+
+
+class TestTaskDeduplicator:
+    """Test idempotency keys and duplicate suppression."""
+
+    @pytest.fixture
+    def mock_redis(self):
+        """Mock Redis client."""
+        return AsyncMock()
+
+    def test_default_key_ignores_payload_order(self):
+        """Test that the default key depends on content, not task ID or field order."""
+        first = Task(type=TaskType.DATA_AGGREGATION_SEARCH, payload={"task_id": "p", "query": "q"})
+        second = Task(type=TaskType.DATA_AGGREGATION_SEARCH, payload={"query": "q", "task_id": "p"})
+        other = Task(type=TaskType.DATA_AGGREGATION_SEARCH, payload={"task_id": "p", "query": "r"})
+
+        assert TaskDeduplicator.default_key(first) == TaskDeduplicator.default_key(second)
+        assert TaskDeduplicator.default_key(first) != TaskDeduplicator.default_key(other)
+
+    @pytest.mark.asyncio
+    async def test_suppress_redirects_dependents_to_original(self, mock_redis):
+        """Test that dependents of a duplicate are keyed on the original task."""
+        calls = []
+
+        async def claim(keys, args):
+            calls.append(args)
+            # The search duplicates "search-0", so its extraction duplicates "extract-0"
+            owners = {"search-1": "search-0", "extract-1": "extract-0"}
+            task_ids = args[4::3]
+            return [value for task_id in task_ids for value in (owners[task_id], "")]
+
+        mock_redis.register_script = Mock(return_value=claim)
+        mock_redis.mget = AsyncMock(side_effect=lambda keys: [None] * len(keys))
+        search = Task(id="search-1", type=TaskType.DATA_AGGREGATION_SEARCH, payload={"task_id": "p", "query": "q"})
+        extract = Task(id="extract-1", type=TaskType.DATA_AGGREGATION_EXTRACT,
+                       payload={"task_id": "p"}, depends_on=["search-1"])
+
+        duplicates = await TaskDeduplicator(mock_redis).suppress([extract, search], "completed", "failed")
+
+        assert duplicates == {"search-1": ("search-0", None), "extract-1": ("extract-0", None)}
+        # The search is claimed before the extraction that depends on it
+        assert [args[4] for args in calls] == ["search-1", "extract-1"]
+        assert extract.depends_on == ["search-0"]
+        assert extract.idempotency_key is not None
+
+    @pytest.mark.asyncio
+    async def test_claim_declares_owner_keys_and_retries_changed_owners(self, mock_redis):
+        """Test that the owner's keys are passed as KEYS and a key that changed owner is claimed again."""
+        calls = []
+
+        async def claim(keys, args):
+            calls.append((keys, args))
+            # The first claim finds the key taken by "search-0" since it was read
+            return ["", ""] if len(calls) == 1 else ["search-0", ""]
+
+        mock_redis.register_script = Mock(return_value=claim)
+        mock_redis.mget = AsyncMock(side_effect=[[None], [b"search-0"]])
+        search = Task(id="search-1", type=TaskType.DATA_AGGREGATION_SEARCH, payload={"task_id": "p", "query": "q"})
+
+        duplicates = await TaskDeduplicator(mock_redis).suppress([search], "completed", "failed")
+
+        assert duplicates == {"search-1": ("search-0", None)}
+        keys, args = calls[1]
+        assert keys == [
+            f"nexus:task_idempotency:{search.idempotency_key}",
+            "nexus:task:search-1:duplicate_of",
+            "nexus:task:search-0:status",
+            "nexus:task:search-0:followers"
+        ]
+        assert args[4:] == ["search-1", "p", "search-0"]
+        assert calls[0][0][2] == "nexus:task:search-1:status"
+
+    @pytest.mark.asyncio
+    async def test_disabled_window_suppresses_nothing(self, mock_redis):
+        """Test that a zero window disables suppression."""
+        task = Task(type=TaskType.SUMMARIZATION, payload={"text": "t"})
+
+        assert await TaskDeduplicator(mock_redis, window=0).suppress([task], "completed", "failed") == {}
+        mock_redis.register_script.assert_not_called()
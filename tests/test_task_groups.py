@@ -0,0 +1,127 @@
+"""Tests for push-based task group completion tracking."""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.orchestration.task_groups import TaskGroupTracker
+
+
+class TestTaskGroupTracker:
+    """Test settling tasks and waiting for a group to finish."""
+
+    @pytest.fixture
+    def mock_redis(self):
+        """Mock Redis client with a pub/sub connection."""
+        redis_mock = AsyncMock()
+        redis_mock.pipeline = Mock(return_value=Mock())
+        redis_mock.pipeline.return_value.execute = AsyncMock(return_value=[0, {}])
+        redis_mock.pubsub = Mock(return_value=AsyncMock())
+        return redis_mock
+
+    @pytest.fixture
+    def tracker(self, mock_redis):
+        """Create tracker with mocked Redis."""
+        return TaskGroupTracker(mock_redis, recheck_interval=1.0)
+
+    @pytest.mark.asyncio
+    async def test_settle_runs_script_on_group_keys(self, tracker, mock_redis):
+        """Test that settling passes the group's keys and channel to the script."""
+        script = AsyncMock(return_value=3)
+        mock_redis.register_script = Mock(return_value=script)
+
+        remaining = await tracker.settle("parent-1", "task-1", "completed")
+
+        assert remaining == 3
+        assert script.call_args.kwargs["keys"] == [
+            "nexus:task_group:parent-1:pending",
+            "nexus:task_group:parent-1:counts"
+        ]
+        args = script.call_args.kwargs["args"]
+        assert args[:3] == ["task-1", "completed", "nexus:task_group:parent-1:events"]
+
+    @pytest.mark.asyncio
+    async def test_wait_returns_immediately_for_finished_group(self, tracker, mock_redis):
+        """Test that a group without pending tasks does not wait for messages."""
+        mock_redis.pipeline.return_value.execute = AsyncMock(return_value=[0, {b"completed": b"4"}])
+        pubsub = mock_redis.pubsub.return_value
+
+        progress = await tracker.wait("parent-1")
+
+        assert progress == {"pending": 0, "completed": 4}
+        pubsub.subscribe.assert_called_once_with("nexus:task_group:parent-1:events")
+        pubsub.get_message.assert_not_called()
+        pubsub.aclose.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_wait_reports_progress_until_done(self, tracker, mock_redis):
+        """Test that progress messages are passed to the callback until nothing is pending."""
+        mock_redis.pipeline.return_value.execute = AsyncMock(return_value=[2, {}])
+        pubsub = mock_redis.pubsub.return_value
+        pubsub.get_message = AsyncMock(side_effect=[
+            {"data": json.dumps({"task_id": "a", "status": "completed", "pending": 1, "completed": 1})},
+            {"data": json.dumps({"task_id": "b", "status": "failed", "pending": 0, "completed": 1, "failed": 1})}
+        ])
+        on_progress = Mock()
+
+        progress = await tracker.wait("parent-1", on_progress=on_progress)
+
+        assert progress["pending"] == 0
+        assert progress["failed"] == 1
+        assert [call[0][0]["pending"] for call in on_progress.call_args_list] == [2, 1, 0]
+
+
+class TestFingerprintClaims:
+    """Test suppressing near-duplicate sources by content fingerprint."""
+
+    @pytest.fixture
+    def duplicates(self):
+        """Duplicate set written by the fake Redis."""
+        return set()
+
+    @pytest.fixture
+    def mock_redis(self, duplicates):
+        """Mock Redis client whose pipelines apply HSETNX, HMGET and SADD to local state."""
+        bands = {}
+
+        def pipeline():
+            ops, pipe = [], Mock()
+            pipe.hsetnx = lambda key, field, value: ops.append(lambda: bands.setdefault(field, value.encode()))
+            pipe.hmget = lambda key, fields: ops.append(lambda: [bands.get(field) for field in fields])
+            pipe.expire = lambda key, ttl: ops.append(lambda: True)
+            pipe.sadd = lambda key, *members: ops.append(lambda: duplicates.update(members))
+
+            async def execute():
+                return [op() for op in ops]
+            pipe.execute = execute
+            return pipe
+
+        redis_mock = AsyncMock()
+        redis_mock.pipeline = Mock(side_effect=pipeline)
+        return redis_mock
+
+    @pytest.mark.asyncio
+    async def test_near_duplicates_are_claimed_once(self, mock_redis, duplicates):
+        """Test that a source within the distance of an earlier one is skipped and recorded."""
+        tracker = TaskGroupTracker(mock_redis)
+        original = 0x0123456789ABCDEF
+
+        first = await tracker.claim_fingerprints("parent-1", {"a": original, "c": ~original & (2**64 - 1)}, 3)
+        second = await tracker.claim_fingerprints("parent-1", {"b": original ^ 0b101, "a": original}, 3)
+
+        assert first == {"a", "c"}
+        # "a" was claimed by itself on the earlier attempt and is kept again
+        assert second == {"a"}
+        assert duplicates == {"b"}
+
+    def test_fingerprint_is_stable_and_similar_for_near_duplicates(self):
+        """Test that SimHash fingerprints of near-identical pages are close and of unrelated ones far."""
+        from src.utils.content_fingerprint import content_hash, hamming_distance, simhash
+        page = " ".join(f"School {i} is a private school in Alameda County, California." for i in range(40))
+        edited = page.replace("School 7 is", "School 7 was")
+        other = " ".join(f"Restaurant {i} serves food on Main Street in Fresno." for i in range(40))
+
+        assert content_hash(page) == content_hash(page)
+        assert len(content_hash(page)) == 16
+        assert hamming_distance(simhash(page), simhash(edited)) <= 3
+        assert hamming_distance(simhash(page), simhash(other)) > 3
@@ -0,0 +1,129 @@
+"""Tests for the reliable task queue."""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.orchestration.task_queue import ReliableTaskQueue
+
+
+class TestReliableTaskQueue:
+    """Test claim, acknowledge and recovery of in-flight tasks."""
+
+    @pytest.fixture
+    def mock_redis(self):
+        """Mock Redis client."""
+        redis_mock = AsyncMock()
+        redis_mock.lmove = AsyncMock(return_value=None)
+        redis_mock.zadd = AsyncMock()
+        redis_mock.pipeline = Mock(return_value=Mock())
+        redis_mock.pipeline.return_value.execute = AsyncMock(return_value=[1, 1])
+        return redis_mock
+
+    @pytest.fixture
+    def task_queue(self, mock_redis):
+        """Create queue with mocked Redis."""
+        return ReliableTaskQueue(mock_redis, visibility_timeout=60)
+
+    @pytest.mark.asyncio
+    async def test_claim_moves_task_into_processing_list(self, task_queue, mock_redis):
+        """Test that a claimed task is moved, not popped, and gets a lease."""
+        task_json = json.dumps({"id": "task-1", "priority": 2})
+        mock_redis.lmove = AsyncMock(return_value=task_json)
+
+        claimed = await task_queue.claim("host-1:0")
+
+        assert claimed == task_json
+        mock_redis.lmove.assert_called_once_with(
+            "nexus:tasks:high_priority", "nexus:tasks:processing:host-1:0", "RIGHT", "LEFT"
+        )
+        lease = mock_redis.zadd.call_args[0][1]
+        assert list(lease.keys()) == ["host-1:0|task-1"]
+
+    @pytest.mark.asyncio
+    async def test_claim_checks_queues_in_priority_order(self, task_queue, mock_redis):
+        """Test that all priority queues are tried from high to low."""
+        result = await task_queue.claim("host-1:0")
+
+        assert result is None
+        sources = [call[0][0] for call in mock_redis.lmove.call_args_list]
+        assert sources == [
+            "nexus:tasks:high_priority",
+            "nexus:tasks:normal_priority",
+            "nexus:tasks:low_priority"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_ack_removes_task_and_lease(self, task_queue, mock_redis):
+        """Test acknowledging a task."""
+        pipeline = mock_redis.pipeline.return_value
+
+        acked = await task_queue.ack("host-1:0", '{"id": "task-1"}', "task-1")
+
+        assert acked is True
+        pipeline.lrem.assert_called_once_with("nexus:tasks:processing:host-1:0", 1, '{"id": "task-1"}')
+        pipeline.zrem.assert_called_once_with("nexus:tasks:leases", "host-1:0|task-1")
+
+    def test_queue_key_routes_task_types_to_pools(self, task_queue):
+        """Test that task types with a dedicated pool get their own queues."""
+        assert task_queue.queue_key_for("search", 2) == "nexus:tasks:search:high_priority"
+        assert task_queue.queue_key_for("summarization", 1) == "nexus:tasks:llm:normal_priority"
+        # Task types without a dedicated pool keep the original queue keys
+        assert task_queue.queue_key_for("analysis", 0) == "nexus:tasks:low_priority"
+
+    @pytest.mark.asyncio
+    async def test_claim_batch_claims_compatible_tasks(self, task_queue, mock_redis):
+        """Test that a batch is claimed from the task's queue with its type and model."""
+        raw = json.dumps({"id": "task-2", "type": "entity_extraction"})
+        script = AsyncMock(return_value=[raw.encode()])
+        mock_redis.register_script = Mock(return_value=script)
+
+        claimed = await task_queue.claim_batch("host-1:0", "entity_extraction", "task_model", 2, 7)
+
+        assert claimed == [raw]
+        assert script.call_args.kwargs["keys"] == [
+            "nexus:tasks:llm:high_priority",
+            "nexus:tasks:processing:host-1:0",
+            "nexus:tasks:leases"
+        ]
+        args = script.call_args.kwargs["args"]
+        assert args[:3] == ["entity_extraction", "task_model", 7]
+        assert args[4] == "host-1:0"
+
+    @pytest.mark.asyncio
+    async def test_reap_requeues_tasks_of_dead_consumer(self, task_queue, mock_redis):
+        """Test that tasks held by a consumer without heartbeat are re-queued."""
+        task_json = json.dumps({"id": "task-1", "priority": 1})
+        mock_redis.smembers = AsyncMock(return_value={b"host-1:0", b"host-2:0"})
+        mock_redis.exists = AsyncMock(side_effect=lambda key: 1 if key.endswith("host-2:0") else 0)
+        mock_redis.lrange = AsyncMock(return_value=[task_json])
+        mock_redis.llen = AsyncMock(return_value=0)
+        mock_redis.zrangebyscore = AsyncMock(return_value=[])
+        script = AsyncMock(return_value=1)
+        mock_redis.register_script = Mock(return_value=script)
+
+        requeued = await task_queue.reap()
+
+        assert requeued == ["task-1"]
+        keys = script.call_args.kwargs["keys"]
+        assert keys == [
+            "nexus:tasks:processing:host-1:0",
+            "nexus:tasks:normal_priority",
+            "nexus:tasks:leases"
+        ]
+        mock_redis.srem.assert_called_once_with("nexus:tasks:consumers", "host-1:0")
+
+    @pytest.mark.asyncio
+    async def test_reap_requeues_expired_leases(self, task_queue, mock_redis):
+        """Test that tasks past their visibility timeout are re-queued."""
+        task_json = json.dumps({"id": "task-1", "priority": 0})
+        mock_redis.smembers = AsyncMock(return_value=set())
+        mock_redis.zrangebyscore = AsyncMock(return_value=[b"host-1:0|task-1"])
+        mock_redis.lrange = AsyncMock(return_value=[json.dumps({"id": "other"}), task_json])
+        script = AsyncMock(return_value=1)
+        mock_redis.register_script = Mock(return_value=script)
+
+        requeued = await task_queue.reap()
+
+        assert requeued == ["task-1"]
+        assert script.call_args.kwargs["args"] == [task_json, "host-1:0|task-1"]
@@ -0,0 +1,93 @@
+"""Tests for the Redis Streams task queue backend."""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.orchestration.task_queue import ReliableTaskQueue
+from src.orchestration.task_streams import StreamTaskQueue, create_task_queue, parse_trim_policy
+
+
+class TestStreamTaskQueue:
+    """Test claiming, acknowledging and trimming stream entries."""
+
+    @pytest.fixture
+    def mock_redis(self):
+        """Mock Redis client with existing consumer groups."""
+        redis_mock = AsyncMock()
+        redis_mock.pipeline = Mock(return_value=Mock())
+        redis_mock.pipeline.return_value.execute = AsyncMock(return_value=[])
+        return redis_mock
+
+    @pytest.fixture
+    def task_queue(self, mock_redis):
+        """Create stream queue with mocked Redis."""
+        return StreamTaskQueue(mock_redis, visibility_timeout=60)
+
+    @pytest.mark.asyncio
+    async def test_claim_and_ack_use_the_delivered_entry(self, task_queue, mock_redis):
+        """Test that a claimed task is acknowledged by its stream entry id."""
+        task_json = json.dumps({"id": "task-1", "type": "search", "priority": 2})
+        mock_redis.xreadgroup = AsyncMock(return_value=[
+            [b"nexus:tasks:stream:search:high_priority", [(b"1700000000000-0", {b"task": task_json.encode()})]]
+        ])
+        mock_redis.xack = AsyncMock(return_value=1)
+
+        claimed = await task_queue.claim("host-1:0", pool="search")
+        acked = await task_queue.ack("host-1:0", claimed, "task-1")
+
+        assert claimed == task_json
+        assert acked is True
+        mock_redis.xreadgroup.assert_called_once_with(
+            "nexus-workers", "host-1:0", {"nexus:tasks:stream:search:high_priority": ">"}, count=1
+        )
+        mock_redis.xack.assert_called_once_with(
+            "nexus:tasks:stream:search:high_priority", "nexus-workers", "1700000000000-0"
+        )
+
+    def test_enqueue_caps_stream_length(self, mock_redis):
+        """Test that the maxlen policy trims streams when adding tasks."""
+        task_queue = StreamTaskQueue(mock_redis, trim_policy="maxlen", maxlen=1000)
+        pipeline = Mock()
+
+        task_queue.enqueue(pipeline, "{}", 1, "llm")
+
+        pipeline.xadd.assert_called_once_with(
+            "nexus:tasks:stream:llm:normal_priority", {"task": "{}"}, maxlen=1000, approximate=True
+        )
+        assert "'MAXLEN', '~', 1000" in task_queue.push_task_lua
+
+    @pytest.mark.asyncio
+    async def test_trim_keeps_pending_entries(self, task_queue, mock_redis):
+        """Test that acknowledged entries are trimmed up to the oldest pending one."""
+        task_queue.retention = 0
+        task_queue.stream_keys = Mock(return_value=["stream"])
+        mock_redis.xinfo_groups = AsyncMock(return_value=[
+            {"name": b"nexus-workers", "last-delivered-id": b"1700000000500-3", "lag": 0}
+        ])
+        mock_redis.xpending = AsyncMock(return_value={"pending": 2, "min": b"1700000000200-0"})
+        mock_redis.xtrim = AsyncMock(return_value=5)
+
+        assert await task_queue.trim() == 5
+        mock_redis.xtrim.assert_called_once_with("stream", minid="1700000000200-0", approximate=True)
+
+    def test_parse_trim_policy(self):
+        """Test parsing stream trim policies."""
+        assert parse_trim_policy("acked") == ("acked", None)
+        assert parse_trim_policy("MAXLEN:5000") == ("maxlen", 5000)
+
+        with pytest.raises(ValueError):
+            parse_trim_policy("maxlen")
+        with pytest.raises(ValueError):
+            parse_trim_policy("oldest")
+
+    def test_backend_is_selected_by_configuration(self, mock_redis, monkeypatch):
+        """Test that TASK_QUEUE_BACKEND chooses between lists and streams."""
+        monkeypatch.setenv("TASK_QUEUE_BACKEND", "streams")
+        monkeypatch.setenv("TASK_STREAM_TRIM", "none")
+        task_queue = create_task_queue(mock_redis)
+        assert isinstance(task_queue, StreamTaskQueue)
+        assert task_queue.trim_policy == "none"
+
+        monkeypatch.delenv("TASK_QUEUE_BACKEND")
+        assert type(create_task_queue(mock_redis)) is ReliableTaskQueue
@@ -0,0 +1,97 @@
+"""Tests for the in-process TTL cache and project ID resolution."""
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.orchestration.parallel_task_coordinator import ParallelTaskCoordinator
+from src.orchestration.task_types import Task, TaskType
+from src.utils.ttl_cache import TTLCache
+
+
+class TestTTLCache:
+    """Test expiry, eviction and negative caching."""
+
+    def test_entries_expire(self):
+        """Test that entries are misses once their TTL has passed."""
+        cache = TTLCache(ttl=10)
+        with patch("src.utils.ttl_cache.time.monotonic", return_value=100.0):
+            cache.set("a", "1")
+            cache.set("b", None, ttl=1)
+        with patch("src.utils.ttl_cache.time.monotonic", return_value=105.0):
+            assert cache.get("a") == (True, "1")
+            assert cache.get("b") == (False, None)
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_least_recently_used_is_evicted(self):
+        """Test that a full cache drops the entry read least recently."""
+        cache = TTLCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert len(cache) == 2
+        assert cache.get("b") == (False, None)
+        assert cache.get("a") == (True, 1)
+
+
+class TestProjectIdResolution:
+    """Test project ID resolution in the task coordinator."""
+
+    @pytest.fixture
+    def coordinator(self):
+        """Create a coordinator with mocked Redis."""
+        redis_client = AsyncMock()
+        redis_client.pipeline = Mock()
+        return ParallelTaskCoordinator(redis_client=redis_client, rate_limiter=Mock())
+
+    def _task(self, payload=None):
+        return Task(id="t1", type=TaskType.SEARCH, payload=payload or {}, parent_task_id="parent-1")
+
+    @pytest.mark.asyncio
+    async def test_lookup_is_cached(self, coordinator):
+        """Test that Redis is asked once per parent task."""
+        coordinator.redis_client.hget = AsyncMock(return_value=b"project-1")
+
+        for _ in range(3):
+            assert await coordinator._resolve_project_id(self._task(), "parent-1") == "project-1"
+
+        coordinator.redis_client.hget.assert_awaited_once_with("nexus:task_meta:parent-1", "project_id")
+
+    @pytest.mark.asyncio
+    async def test_unknown_parent_is_cached_negatively(self, coordinator):
+        """Test that a parent without a project is not looked up on every call."""
+        coordinator.redis_client.hget = AsyncMock(return_value=None)
+        coordinator.data_aggregation_repository = None
+
+        assert await coordinator._resolve_project_id(self._task(), "parent-1") is None
+        assert await coordinator._resolve_project_id(self._task(), "parent-1") is None
+
+        coordinator.redis_client.hget.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_payload_project_skips_lookup(self, coordinator):
+        """Test that a project stamped into the payload is used directly."""
+        task = self._task({"project_id": "project-2"})
+
+        assert await coordinator._resolve_project_id(task, "parent-1") == "project-2"
+        coordinator.redis_client.hget.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_submit_resolves_project_once_per_task(self, coordinator):
+        """Test that the enqueued event reuses the project stamped into the payload."""
+        coordinator.redis_client.hget = AsyncMock(return_value=b"project-1")
+        coordinator.deduplicator.suppress = AsyncMock(return_value={})
+        coordinator.event_bus = Mock(publish_task_event=AsyncMock())
+        coordinator.redis_client.pipeline.return_value = Mock(execute=AsyncMock(return_value=[]))
+        resolve = AsyncMock(wraps=coordinator._resolve_project_id)
+        coordinator._resolve_project_id = resolve
+
+        await coordinator.submit_tasks([
+            Task(id=f"t{i}", type=TaskType.SEARCH, payload={}, parent_task_id="parent-1") for i in range(2)
+        ])
+
+        assert resolve.await_count == 2
+        events = coordinator.event_bus.publish_task_event.await_args_list
+        assert [event.kwargs["project_id"] for event in events] == ["project-1", "project-1"]
@@ -0,0 +1,94 @@
+"""Tests for the research worker process."""
+
+import asyncio
+import json
+import os
+import signal
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.orchestration.parallel_task_coordinator import ParallelTaskCoordinator
+from src.orchestration.worker_pools import DEFAULT_POOL
+from src.runtime import get_runtime, set_runtime
+from src.worker import ResearchWorker, setup_signal_handlers
+
+
+class TestGracefulShutdown:
+    """Test that a shutdown signal drains the worker within the drain timeout."""
+
+    @pytest.fixture
+    def coordinator(self):
+        """Create a coordinator whose workers find no queued tasks."""
+        coordinator = ParallelTaskCoordinator(redis_client=AsyncMock(), rate_limiter=Mock())
+        coordinator.drain_timeout = 0.5
+        coordinator.event_bus = Mock(publish_worker_event=AsyncMock())
+        coordinator.worker_pools = Mock(set_draining=AsyncMock(), clear_draining=AsyncMock())
+        coordinator.task_queue = Mock(
+            register_consumer=AsyncMock(),
+            unregister_consumer=AsyncMock(),
+            heartbeat_key=Mock(return_value="heartbeat")
+        )
+        coordinator.claims = 0
+
+        async def get_next_task(consumer_id, pool=DEFAULT_POOL):
+            coordinator.claims += 1
+            return None
+
+        coordinator._get_next_task = get_next_task
+        return coordinator
+
+    @pytest.fixture
+    def worker(self, coordinator):
+        """Create a worker that picks up one data aggregation which never finishes."""
+        previous = get_runtime()
+        worker = ResearchWorker(worker_id="test-worker")
+        set_runtime(previous)
+
+        task_json = json.dumps({"task_id": "agg-1", "research_type": "data_aggregation", "config": {}})
+        worker.redis_client = AsyncMock()
+        worker.redis_client.blpop = AsyncMock(side_effect=[("nexus:task_queue", task_json)] + [None] * 100)
+        worker.nexus_agents = Mock(knowledge_base=AsyncMock())
+        worker.task_coordinator = coordinator
+        worker.aggregation_started = asyncio.Event()
+
+        async def execute_data_aggregation(task_id, config):
+            # Waits on its task group, which never completes
+            worker.aggregation_started.set()
+            await asyncio.Event().wait()
+
+        worker.research_orchestrator = Mock(execute_data_aggregation=execute_data_aggregation)
+        return worker, task_json
+
+    @pytest.mark.asyncio
+    async def test_signal_drains_worker_with_running_aggregation(self, worker, coordinator):
+        """Test that a signal stops claiming at once and bounds the running aggregation by the drain timeout."""
+        worker, task_json = worker
+        pool_worker = asyncio.create_task(coordinator._worker(0, DEFAULT_POOL))
+        coordinator.active_workers.add(pool_worker)
+        worker.running = True
+        worker._main_loop = asyncio.create_task(worker._process_tasks())
+        await asyncio.wait_for(worker.aggregation_started.wait(), timeout=1)
+
+        loop = asyncio.get_running_loop()
+        setup_signal_handlers(worker)
+        try:
+            os.kill(os.getpid(), signal.SIGTERM)
+            await asyncio.sleep(0.05)
+
+            # Claiming stopped with the signal, not when the main loop ended
+            assert coordinator.draining
+            claims = coordinator.claims
+            await asyncio.sleep(0.2)
+            assert coordinator.claims == claims
+
+            await asyncio.wait_for(worker._drain_task, timeout=coordinator.drain_timeout + 0.5)
+        finally:
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                loop.remove_signal_handler(signum)
+
+        assert pool_worker.done()
+        assert worker._main_loop.done()
+        # The interrupted aggregation is handed back to the queue to resume from its checkpoints
+        worker.redis_client.lpush.assert_awaited_once_with("nexus:task_queue", task_json)
+        worker.redis_client.srem.assert_awaited_with("nexus:processing", task_json)
@@ -0,0 +1,84 @@
+"""Tests for per-task-type worker pools."""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.orchestration.worker_pools import (
+    WorkerPoolManager, default_pool_sizes, parse_pool_sizes, pool_for
+)
+
+
+class TestWorkerPoolConfiguration:
+    """Test pool routing and size configuration."""
+
+    def test_pool_for_routes_task_types(self):
+        """Test that task types map to their pools."""
+        assert pool_for("search") == "search"
+        assert pool_for("data_aggregation_extract") == "llm"
+        assert pool_for("analysis") == "default"
+
+    def test_parse_pool_sizes(self):
+        """Test parsing a pool size specification."""
+        assert parse_pool_sizes("search:3, llm:6,default:1") == {"search": 3, "llm": 6, "default": 1}
+
+        with pytest.raises(ValueError):
+            parse_pool_sizes("gpu:2")
+
+    def test_default_pool_sizes_split_total(self):
+        """Test that the default split covers every pool."""
+        assert default_pool_sizes(10) == {"search": 3, "llm": 6, "default": 1}
+
+
+class TestWorkerPoolManager:
+    """Test sharing pool sizes and utilization through Redis."""
+
+    @pytest.fixture
+    def mock_redis(self):
+        """Mock Redis client."""
+        return AsyncMock()
+
+    @pytest.mark.asyncio
+    async def test_set_size_validates_pool(self, mock_redis):
+        """Test that sizes are stored only for known pools."""
+        manager = WorkerPoolManager(mock_redis)
+
+        await manager.set_size("llm", 4)
+        mock_redis.hset.assert_awaited_once_with("nexus:worker_pools:sizes", "llm", 4)
+
+        with pytest.raises(ValueError):
+            await manager.set_size("gpu", 1)
+        with pytest.raises(ValueError):
+            await manager.set_size("llm", -1)
+
+    @pytest.mark.asyncio
+    async def test_cluster_stats_aggregates_instances(self, mock_redis):
+        """Test that utilization is summed across live instances."""
+        mock_redis.smembers = AsyncMock(return_value={b"host-1", b"host-2", b"host-3"})
+        reports = {
+            "nexus:worker_pools:stats:host-1": json.dumps({"pools": {"llm": {"size": 4, "busy": 3, "processed": 10}}}),
+            "nexus:worker_pools:stats:host-2": json.dumps({"pools": {"llm": {"size": 4, "busy": 1, "processed": 5}}}),
+            "nexus:worker_pools:stats:host-3": None
+        }
+        mock_redis.mget = AsyncMock(side_effect=lambda keys: [reports[key] for key in keys])
+        mock_redis.hgetall = AsyncMock(return_value={b"llm": b"4"})
+
+        stats = await WorkerPoolManager(mock_redis).cluster_stats()
+
+        assert stats["instances"] == 2
+        assert stats["pools"]["llm"] == {"size": 8, "busy": 4, "processed": 15, "utilization": 0.5}
+        assert stats["configured_sizes"] == {"llm": 4}
+        # Instances that stopped reporting are forgotten
+        mock_redis.srem.assert_awaited_once_with("nexus:worker_pools:instances", "host-3")
+
+    @pytest.mark.asyncio
+    async def test_draining_instances_drop_expired_marks(self, mock_redis):
+        """Test that instances that died while draining are no longer listed."""
+        pipeline = Mock()
+        pipeline.execute = AsyncMock(return_value=[1, [b"host-a-1"]])
+        mock_redis.pipeline = Mock(return_value=pipeline)
+        manager = WorkerPoolManager(mock_redis)
+
+        assert await manager.draining_instances() == ["host-a-1"]
+        key, low, _ = pipeline.zremrangebyscore.call_args.args
+        assert (key, low) == ("nexus:worker_pools:draining", "-inf")